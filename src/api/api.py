@@ -1,33 +1,258 @@
 """
 API FastAPI para servir o modelo de previsão de renda.
+
+Apenas o necessário para servir `/predict` é importado aqui: pandas (usado
+só pela implementação de referência `transformar_features`), pyarrow, o
+motor NumPy e o registro de modelos são importados quando usados. A duração
+de cada importação, da carga dos artefatos e do aquecimento é registrada em
+`cronometro_inicializacao` e relatada quando a API fica pronta.
 """
 
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel, Field
-import joblib
-import pandas as pd
-from typing import Dict, Any
+from src.api.inicializacao import CronometroInicializacao
+
+cronometro_inicializacao = CronometroInicializacao()
+
+with cronometro_inicializacao.etapa("import_fastapi"):
+    from fastapi import FastAPI, HTTPException, Header, Request
+    from fastapi.concurrency import run_in_threadpool
+    from starlette.requests import ClientDisconnect
+    from fastapi.responses import JSONResponse, PlainTextResponse, Response
+    from pydantic import BaseModel, Field, ValidationError
+
+with cronometro_inicializacao.etapa("import_numpy"):
+    import numpy as np
+
+from typing import Dict, Any, List, Optional, Tuple, TYPE_CHECKING
+import json
 import logging
+import math
 import os
+import random
+import time
+
+with cronometro_inicializacao.etapa("import_modulos_api"):
+    from src.api.transformador import RENOMEAR_COLUNAS, FEATURES_SEM_ENTRADA
+    from src.data.especificacao_features import (
+        ESPECIFICACAO, FEATURES_NUMERICAS, FEATURES_DISCRETIZADAS, MotorFeatures
+    )
+    from src.api.micro_batch import MicroBatcher, FilaCheiaError, MicroBatcherParadoError
+    from src.api.cache import CachePrevisoes
+    from src.api.explicacao import ExplicadorModelo
+    from src.api.coalescencia import CoalescedorPrevisoes
+    from src.api.executor import ExecutorInferencia
+    from src.api.saude import VerificadorSaude
+    from src.api.modelo import GerenciadorModelo, ArtefatosModelo
+    from src.api.versoes import (
+        VersoesResidentes, VERSAO_PADRAO, interpretar_pesos, escolher_versao,
+        versoes_desconhecidas, remover_versao
+    )
+    from src.api.streaming import (
+        RespostaStreaming, LinhaInvalidaError, FORMATOS_NDJSON, FORMATOS_CSV,
+        ler_linhas, ler_registros
+    )
+    from src.api.memoria import RelatorioMemoriaCache, relatorio_memoria, formatar_relatorio
+    from src.api.metricas import (
+        RegistroMetricas, LIMITES_LATENCIA, LIMITES_TAMANHO_LOTE, medir_overhead
+    )
+
+if TYPE_CHECKING:
+    import pandas as pd
 
-logging.basicConfig(level=logging.DEBUG)
+logging.basicConfig(level=os.getenv("API_NIVEL_LOG", "INFO").upper())
 logger = logging.getLogger(__name__)
 
+MAX_REGISTROS_LOTE = int(os.getenv("API_MAX_REGISTROS_LOTE", "50000"))
+MAX_REGISTROS_LOTE_ARROW = int(os.getenv("API_MAX_REGISTROS_LOTE_ARROW", "1000000"))
+
+# Tipo de conteúdo dos lotes Arrow; o módulo src.api.arrow (pyarrow) só é
+# importado quando um lote nesse formato é recebido
+TIPO_CONTEUDO_ARROW = "application/vnd.apache.arrow.stream"
+
+# Limite de linhas da grade contrafactual de /predict/whatif
+MAX_REGISTROS_WHATIF = int(os.getenv("API_MAX_REGISTROS_WHATIF", "10000"))
+# Horas semanais testadas por padrão em /predict/whatif
+WHATIF_HORAS_PADRAO = [20, 30, 40, 45, 50, 60]
+
+STREAM_TAMANHO_BLOCO = int(os.getenv("API_STREAM_TAMANHO_BLOCO", "1000"))
+STREAM_MAX_BYTES_LINHA = int(os.getenv("API_STREAM_MAX_BYTES_LINHA", "65536"))
+
+CAMINHO_MODELO = "models/melhor_modelo.joblib"
+CAMINHO_TRANSFORMADORES = "data/transformadores_features.joblib"
+
+# "joblib" carrega uma cópia dos artefatos por worker; "mmap" carrega o layout
+# exportado por `python -m src.models.serializacao`, com os arrays mapeados
+# em memória e compartilhados entre os workers
+MODO_ARTEFATOS = os.getenv("API_MODO_ARTEFATOS", "joblib")
+DIRETORIO_MMAP = os.getenv("API_DIRETORIO_MMAP", "models/mmap")
+
+# "modelo" chama predict/predict_proba do modelo; "numpy" usa o motor de
+# src.api.motor_numpy, que calcula classe e probabilidades em uma passada
+MOTOR_INFERENCIA = os.getenv("API_MOTOR_INFERENCIA", "modelo")
+MOTOR_LIMITE_LINHAS_ARVORES = int(os.getenv("API_MOTOR_LIMITE_LINHAS_ARVORES", "0")) or None
+
+# Versões de src.models.registro servidas sob demanda, além da versão padrão
+# (CAMINHO_MODELO). As menos usadas são descarregadas quando o tamanho das
+# versões residentes passa de API_VERSOES_MEMORIA_MB
+REGISTRO_DIRETORIO = os.getenv("API_REGISTRO_DIRETORIO", "models/registro")
+VERSOES_MEMORIA_MB = float(os.getenv("API_VERSOES_MEMORIA_MB", "512"))
+# Divisão do tráfego sem versão explícita, ex.: "padrao=0.9,<versao>=0.1".
+# Versões desconhecidas impedem a inicialização (ver `validar_roteamento`)
+ROTEAMENTO_PESOS = interpretar_pesos(os.getenv("API_ROTEAMENTO_PESOS", ""))
+
+CACHE_MAX_ENTRADAS = int(os.getenv("API_CACHE_MAX_ENTRADAS", "10000"))
+CACHE_TTL_SEGUNDOS = float(os.getenv("API_CACHE_TTL_SEGUNDOS", "3600"))
+# Explicações ocupam uma entrada por feature; o cache delas é menor
+CACHE_EXPLICACOES_MAX_ENTRADAS = int(os.getenv("API_CACHE_EXPLICACOES_MAX_ENTRADAS", "2000"))
+
+# Requisições concorrentes idênticas a /predict aguardam uma única pontuação
+COALESCENCIA_ATIVA = os.getenv("API_COALESCENCIA", "1") == "1"
+
+INFERENCIA_WORKERS = int(os.getenv("API_INFERENCIA_WORKERS", "0")) or None
+INFERENCIA_THREADS_NATIVAS = int(os.getenv("API_INFERENCIA_THREADS_NATIVAS", "1"))
+INFERENCIA_FIXAR_NUCLEOS = os.getenv("API_INFERENCIA_FIXAR_NUCLEOS", "0") == "1"
+
+RECARGA_INTERVALO_SEGUNDOS = float(os.getenv("API_RECARGA_INTERVALO_SEGUNDOS", "0"))
+ADMIN_TOKEN = os.getenv("API_ADMIN_TOKEN")
+
+# Tempo de vida do relatório de memória exportado em /metrics e /stats
+MEMORIA_TTL_SEGUNDOS = float(os.getenv("API_MEMORIA_TTL_SEGUNDOS", "5"))
+
+AUTOTESTE_INTERVALO_SEGUNDOS = float(os.getenv("API_AUTOTESTE_INTERVALO_SEGUNDOS", "30"))
+HEALTH_INTERVALO_MINIMO_SEGUNDOS = float(os.getenv("API_HEALTH_INTERVALO_MINIMO_SEGUNDOS", "10"))
+
+MICROBATCH_ATIVO = os.getenv("API_MICROBATCH", "0") == "1"
+MICROBATCH_MAX_LOTE = int(os.getenv("API_MICROBATCH_MAX_LOTE", "64"))
+MICROBATCH_ESPERA_MS = float(os.getenv("API_MICROBATCH_ESPERA_MS", "2"))
+MICROBATCH_MAX_FILA = int(os.getenv("API_MICROBATCH_MAX_FILA", "1024"))
+
+# Previsões executadas na inicialização, antes de a API ficar pronta, para
+# tirar a inicialização preguiçosa do pandas/XGBoost do caminho das primeiras
+# requisições: tamanhos de lote e repetições de cada um
+AQUECIMENTO_TAMANHOS = [
+    int(tamanho) for tamanho in os.getenv("API_AQUECIMENTO_TAMANHOS", "1,8,64,512").split(",") if tamanho.strip()
+]
+AQUECIMENTO_REPETICOES = int(os.getenv("API_AQUECIMENTO_REPETICOES", "3"))
+
 app = FastAPI(
     title="API de Previsão de Renda",
     description="API para prever a faixa de renda de uma pessoa",
     version="1.0.0"
 )
 
-try:
-    logger.info("Carregando modelo e transformadores...")
-    model = joblib.load("models/melhor_modelo.joblib")
-    transformers = joblib.load("data/transformadores_features.joblib")
-    logger.info(f"Modelo carregado com sucesso! Tipo: {type(model)}")
-    logger.info(f"Transformadores carregados: {transformers.keys()}")
-except Exception as e:
-    logger.error(f"Erro ao carregar modelo ou transformadores: {str(e)}")
-    raise
+metricas = RegistroMetricas()
+metrica_requisicoes = metricas.contador(
+    "previsao_requisicoes_total", "Requisições de previsão recebidas", "endpoint"
+)
+metrica_erros = metricas.contador(
+    "previsao_erros_total", "Requisições de previsão que falharam", "endpoint"
+)
+metrica_linhas_com_erro = metricas.contador(
+    "previsao_linhas_com_erro_total", "Registros de lotes reportados com erro"
+)
+metrica_latencia_requisicao = metricas.histograma(
+    "previsao_requisicao_segundos", "Latência das requisições de previsão",
+    LIMITES_LATENCIA, "endpoint"
+)
+metrica_latencia_etapa = metricas.histograma(
+    "previsao_etapa_segundos", "Latência de cada etapa da pontuação",
+    LIMITES_LATENCIA, "etapa"
+)
+metrica_tamanho_lote = metricas.histograma(
+    "previsao_tamanho_lote", "Registros por lote recebido e por chamada ao modelo",
+    LIMITES_TAMANHO_LOTE, "origem"
+)
+metrica_roteamento = metricas.contador(
+    "previsao_roteamento_total", "Requisições por origem da escolha de versão", "origem"
+)
+metrica_latencia_versao = metricas.histograma(
+    "previsao_versao_pontuacao_segundos", "Latência de transformação e modelo por versão",
+    LIMITES_LATENCIA, "versao"
+)
+metrica_registros_versao = metricas.contador(
+    "previsao_versao_registros_total", "Registros pontuados por versão", "versao"
+)
+metrica_em_andamento = metricas.medidor(
+    "previsao_em_andamento", "Requisições de previsão em andamento"
+)
+metrica_overhead = metricas.medidor(
+    "previsao_metricas_overhead_segundos",
+    "Custo medido da instrumentação por requisição"
+)
+
+# Séries de cada endpoint, etapa e origem, resolvidas uma vez: por
+# requisição, a API atualiza a série sem procurar o rótulo
+ENDPOINTS = ["predict", "predict_batch", "predict_stream", "predict_whatif"]
+serie_requisicoes = {endpoint: metrica_requisicoes.serie(endpoint) for endpoint in ENDPOINTS}
+serie_erros = {endpoint: metrica_erros.serie(endpoint) for endpoint in ENDPOINTS}
+serie_latencia_requisicao = {endpoint: metrica_latencia_requisicao.serie(endpoint) for endpoint in ENDPOINTS}
+serie_latencia_etapa = {
+    etapa: metrica_latencia_etapa.serie(etapa)
+    for etapa in [
+        "validacao", "colunas", "transformacao", "motor", "predict",
+        "predict_proba", "explicacao", "formatacao"
+    ]
+}
+serie_tamanho_lote = {origem: metrica_tamanho_lote.serie(origem) for origem in ["modelo"] + ENDPOINTS}
+serie_roteamento = {
+    origem: metrica_roteamento.serie(origem) for origem in ["padrao", "cabecalho", "parametro", "pesos"]
+}
+
+cache_previsoes = (
+    CachePrevisoes(CACHE_MAX_ENTRADAS, CACHE_TTL_SEGUNDOS or None)
+    if CACHE_MAX_ENTRADAS > 0 else None
+)
+cache_explicacoes = (
+    CachePrevisoes(CACHE_EXPLICACOES_MAX_ENTRADAS, CACHE_TTL_SEGUNDOS or None)
+    if CACHE_EXPLICACOES_MAX_ENTRADAS > 0 else None
+)
+
+coalescedor_previsoes = CoalescedorPrevisoes() if COALESCENCIA_ATIVA else None
+
+executor_inferencia = ExecutorInferencia(
+    n_workers=INFERENCIA_WORKERS,
+    threads_nativas=INFERENCIA_THREADS_NATIVAS,
+    fixar_nucleos=INFERENCIA_FIXAR_NUCLEOS
+)
+
+def construir_motor_numpy(model: Any) -> Optional[Any]:
+    """Exporta o modelo para o motor NumPy (importado só quando configurado)."""
+    from src.api.motor_numpy import construir_motor
+    return construir_motor(model, MOTOR_LIMITE_LINHAS_ARVORES)
+
+gerenciador_modelo = GerenciadorModelo(
+    CAMINHO_MODELO,
+    CAMINHO_TRANSFORMADORES,
+    preparar_modelo=executor_inferencia.configurar_modelo,
+    # testar_previsao é definida adiante, junto com as funções de pontuação
+    validar=lambda artefatos: testar_previsao(artefatos),
+    diretorio_mmap=DIRETORIO_MMAP if MODO_ARTEFATOS == "mmap" else None,
+    construir_motor=construir_motor_numpy if MOTOR_INFERENCIA == "numpy" else None
+)
+relatorio_memoria_processo = RelatorioMemoriaCache(gerenciador_modelo.diretorio_mmap, MEMORIA_TTL_SEGUNDOS)
+versoes_residentes = VersoesResidentes(
+    REGISTRO_DIRETORIO,
+    gerenciador_modelo.carregar_arquivos,
+    int(VERSOES_MEMORIA_MB * 2 ** 20)
+)
+if cache_previsoes is not None:
+    gerenciador_modelo.ao_trocar(lambda artefatos: cache_previsoes.definir_versao(artefatos.versao))
+if cache_explicacoes is not None:
+    gerenciador_modelo.ao_trocar(lambda artefatos: cache_explicacoes.definir_versao(artefatos.versao))
+
+EXEMPLO_ENTRADA = {
+    "age": 39,
+    "workclass": 4,
+    "education": 11,
+    "marital-status": 2,
+    "occupation": 10,
+    "relationship": 0,
+    "race": 4,
+    "sex": 1,
+    "capital_gain": 2174,
+    "capital_loss": 0,
+    "hours_per_week": 40,
+    "native-country": 39
+}
 
 class InputData(BaseModel):
     age: int
@@ -46,137 +271,67 @@ class InputData(BaseModel):
     class Config:
         allow_population_by_field_name = True
         json_schema_extra = {
-            "example": {
-                "age": 39,
-                "workclass": 4,
-                "education": 11,
-                "marital-status": 2,
-                "occupation": 10,
-                "relationship": 0,
-                "race": 4,
-                "sex": 1,
-                "capital_gain": 2174,
-                "capital_loss": 0,
-                "hours_per_week": 40,
-                "native-country": 39
-            }
+            "example": EXEMPLO_ENTRADA
         }
 
-def criar_features_idade(df: pd.DataFrame) -> pd.DataFrame:
-    """Cria features baseadas na idade."""
-    df_novo = df.copy()
-    
-    bins = [0, 25, 35, 45, 55, 65, 100]
-    labels = ['18-25', '26-35', '36-45', '46-55', '56-65', '65+']
-    df_novo['faixa_etaria'] = pd.cut(df_novo['age'], bins=bins, labels=labels)
-    
-    return df_novo
+class WhatIfInput(BaseModel):
+    """Registro base e valores alternativos a testar em `/predict/whatif`."""
+    record: InputData
+    # Campo (nome ou alias) -> valores a testar; por padrão, os campos acionáveis
+    variations: Optional[Dict[str, List[int]]] = None
+    # Se True, testa todas as combinações em vez de variar um campo por vez
+    combine: bool = False
 
-def criar_features_trabalho(df: pd.DataFrame) -> pd.DataFrame:
-    """Cria features baseadas em trabalho."""
-    df_novo = df.copy()
-    
-    df_novo['tipo_jornada'] = pd.cut(
-        df_novo['hours-per-week'],
-        bins=[0, 20, 40, 60, 168],
-        labels=['Parcial', 'Normal', 'Extra', 'Extenso']
-    )
-    
-    return df_novo
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "record": EXEMPLO_ENTRADA,
+                "variations": {"education": [9, 12, 13], "hours_per_week": [45, 50]}
+            }
+        }
 
-def criar_features_educacao(df: pd.DataFrame) -> pd.DataFrame:
-    """Cria features baseadas em educação."""
-    df_novo = df.copy()
+def transformar_features(df: "pd.DataFrame", transformers: Optional[Dict[str, Any]] = None) -> "pd.DataFrame":
+    """
+    Aplica todas as transformações nas features usando pandas.
     
-    bins = [0, 8, 12, 14, 16, 20]
-    labels = ['Básico', 'Médio', 'Superior Incompleto', 'Superior Completo', 'Pós-Graduação']
+    Implementação de referência: a API pontua com `transformar_registros`,
+    que produz o mesmo resultado sem passar por pandas. As features da
+    especificação vêm do mesmo motor do treino; aqui o One-Hot Encoding e a
+    seleção são os do scikit-learn.
     
-    df_novo['nivel_educacao'] = pd.cut(
-        df_novo['education-num'],
-        bins=bins,
-        labels=labels,
-        include_lowest=True
-    )
+    Args:
+        df: DataFrame com os campos de InputData
+        transformers: Transformadores a usar; por padrão, os da versão atual
+    """
+    import pandas as pd
     
-    return df_novo
-
-def education_to_num(education: int) -> int:
-    """Converte o código de educação para education_num."""
-    mapping = {
-        0: 1,   # Preschool
-        1: 2,   # 1st-4th
-        2: 16,  # Superior Completo
-        3: 7,   # 7th-8th
-        4: 8,   # 9th
-        5: 9,   # 10th
-        6: 10,  # 11th
-        7: 11,  # 12th
-        8: 12,  # HS-grad
-        9: 13,  # Some-college
-        10: 14, # Assoc-voc
-        11: 15, # Assoc-acdm
-        12: 16, # Bachelors
-        13: 17, # Masters
-        14: 18, # Doctorate
-        15: 16, # Prof-school
-    }
-    return mapping.get(education, 8)
-
-def transformar_features(df: pd.DataFrame) -> pd.DataFrame:
-    """Aplica todas as transformações nas features."""
+    if transformers is None:
+        transformers = gerenciador_modelo.atual.transformers
     try:
         logger.debug("Iniciando transformação das features...")
         
-        df['education_num'] = df['education'].apply(education_to_num)
-        
-        df = df.rename(columns={
-            'marital_status': 'marital-status',
-            'native_country': 'native-country',
-            'capital_gain': 'capital-gain',
-            'capital_loss': 'capital-loss',
-            'education_num': 'education-num',
-            'hours_per_week': 'hours-per-week'
-        })
+        df = df.rename(columns=RENOMEAR_COLUNAS)
         
         logger.debug(f"Colunas após renomear: {df.columns.tolist()}")
         
-        df['fnlwgt'] = 0
-        
-        df['razao_capital'] = df['capital-gain'] / (df['capital-loss'] + 1)
-        df['tem_ganho_capital'] = (df['capital-gain'] > 0).astype(int)
-        df['tem_perda_capital'] = (df['capital-loss'] > 0).astype(int)
-        df['idade_aposentadoria'] = 65 - df['age']
-        
-        df = criar_features_idade(df)
-        df = criar_features_trabalho(df)
-        
-        df['nivel_educacao'] = pd.cut(
-            df['education-num'],
-            bins=[0, 8, 12, 14, 16, 20],
-            labels=['Básico', 'Médio', 'Superior Incompleto', 'Superior Completo', 'Pós-Graduação'],
-            include_lowest=True
-        )
+        motor = MotorFeatures(transformers.get('especificacao'))
+        for nome, valores in motor.calcular({c: df[c].to_numpy() for c in df.columns}, brutas=True).items():
+            if nome in FEATURES_DISCRETIZADAS:
+                rotulos = ESPECIFICACAO[nome]['rotulos']
+                valores = pd.Categorical.from_codes(np.where(valores == len(rotulos), -1, valores), categories=rotulos)
+            df[nome] = valores
         
         logger.debug("Features criadas com sucesso")
         logger.debug(f"Colunas após criar features: {df.columns.tolist()}")
         
-        colunas_numericas = [
-            'age', 'fnlwgt', 'education-num', 'capital-gain', 
-            'capital-loss', 'hours-per-week', 'razao_capital', 
-            'idade_aposentadoria', 'tem_ganho_capital', 'tem_perda_capital'
-        ]
-        df_numericas = df[colunas_numericas].copy()
-        
-        colunas_categoricas = [
-            'workclass', 'education', 'marital-status',
-            'occupation', 'relationship', 'race', 'sex',
-            'native-country', 'faixa_etaria', 'tipo_jornada',
-            'nivel_educacao'
-        ]
+        df_numericas = df[FEATURES_NUMERICAS].copy()
+        for nome in FEATURES_SEM_ENTRADA:
+            df_numericas[nome] = 0
         
         encoder = transformers.get('one_hot_encoder')
         if encoder:
             logger.debug("Aplicando One-Hot Encoding...")
+            colunas_categoricas = list(encoder.feature_names_in_)
             features_encoded = encoder.transform(df[colunas_categoricas])
             feature_names = encoder.get_feature_names_out(colunas_categoricas)
             
@@ -191,6 +346,11 @@ def transformar_features(df: pd.DataFrame) -> pd.DataFrame:
             df_final = pd.concat([df_numericas, df_encoded], axis=1)
             logger.debug(f"Features combinadas: {df_final.shape}")
             
+            plano = transformers.get('plano_features')
+            if plano and not transformers.get('selector'):
+                # Encoder só com as categorias mantidas: as colunas vêm do plano
+                return df_final.reindex(columns=plano['colunas']).to_numpy()
+            
             selector = transformers.get('selector')
             if selector:
                 colunas_esperadas = selector.feature_names_in_
@@ -212,6 +372,112 @@ def transformar_features(df: pd.DataFrame) -> pd.DataFrame:
         logger.error(f"Erro ao transformar features: {str(e)}")
         raise
 
+# Campo de InputData -> nome da coluna na entrada (alias, quando houver)
+CAMPOS_ENTRADA = {
+    campo: info.alias or campo for campo, info in InputData.model_fields.items()
+}
+
+class LoteGrandeError(ValueError):
+    """Lote com mais registros que o limite configurado."""
+
+def registros_para_colunas(registros: List[InputData]) -> Dict[str, np.ndarray]:
+    """Monta as colunas de entrada (campo -> array) a partir dos registros."""
+    inicio = time.perf_counter()
+    colunas = {
+        campo: np.array([getattr(registro, campo) for registro in registros])
+        for campo in InputData.model_fields
+    }
+    serie_latencia_etapa["colunas"].observar(time.perf_counter() - inicio)
+    return colunas
+
+def chave_registro(registro: InputData) -> Tuple:
+    """Chave canônica de um registro, usada pelo cache de previsões."""
+    return tuple(getattr(registro, campo) for campo in InputData.model_fields)
+
+def transformar_registros(registros: List[InputData], artefatos: ArtefatosModelo) -> np.ndarray:
+    """
+    Transforma registros na matriz final de features com o transformador compilado.
+    
+    Args:
+        registros: Registros já validados
+        artefatos: Versão do modelo e dos transformadores a usar
+        
+    Returns:
+        Matriz (n_registros, n_features) pronta para o modelo
+    """
+    return transformar_colunas(registros_para_colunas(registros), artefatos)
+
+def transformar_colunas(colunas: Dict[str, np.ndarray], artefatos: ArtefatosModelo) -> np.ndarray:
+    """
+    Transforma colunas de entrada (campo de InputData -> array) na matriz final
+    de features com o transformador compilado.
+    """
+    transformador_compilado = artefatos.transformador
+    if transformador_compilado is None:
+        logger.error("Encoder não encontrado nos transformadores")
+        raise ValueError("Encoder não encontrado")
+    inicio = time.perf_counter()
+    X = transformador_compilado.transformar(colunas)
+    serie_latencia_etapa["transformacao"].observar(time.perf_counter() - inicio)
+    return X
+
+async def resolver_artefatos(request: Request, endpoint: str) -> Optional[ArtefatosModelo]:
+    """
+    Escolhe a versão do modelo de uma requisição.
+    
+    A ordem é: cabeçalho `X-Model-Version`, parâmetro `model_version` e, sem
+    nenhum dos dois, a divisão de `API_ROTEAMENTO_PESOS`. O nome "padrao" e
+    a versão em uso pelo gerenciador indicam a versão padrão.
+    
+    Args:
+        request: Requisição recebida
+        endpoint: Nome do endpoint, para as métricas de erro
+        
+    Returns:
+        Artefatos da versão do registro, ou None para a versão padrão (que
+        segue pelo cache e pelo micro-batcher); uma versão sorteada pelos
+        pesos que saiu do registro é removida da divisão e a requisição usa
+        a versão padrão
+    """
+    from src.models.registro import VersaoNaoEncontradaError
+    
+    versao = request.headers.get("x-model-version")
+    origem = "cabecalho"
+    if not versao:
+        versao = request.query_params.get("model_version")
+        origem = "parametro"
+    if not versao and ROTEAMENTO_PESOS:
+        versao = escolher_versao(ROTEAMENTO_PESOS, random.random())
+        origem = "pesos"
+    if not versao or versao in (VERSAO_PADRAO, gerenciador_modelo.atual.versao):
+        serie_roteamento[origem if versao else "padrao"].incrementar()
+        return None
+    
+    serie_roteamento[origem].incrementar()
+    try:
+        return await run_in_threadpool(versoes_residentes.obter, versao)
+    except VersaoNaoEncontradaError:
+        if origem == "pesos":
+            # Versão removida do registro depois da inicialização: sai da
+            # divisão e a requisição segue na versão padrão
+            ROTEAMENTO_PESOS[:] = remover_versao(ROTEAMENTO_PESOS, versao)
+            logger.error(
+                f"Versão {versao} de API_ROTEAMENTO_PESOS não está mais no registro; "
+                f"removida da divisão de tráfego: {ROTEAMENTO_PESOS}"
+            )
+            return None
+        serie_erros[endpoint].incrementar()
+        raise HTTPException(status_code=404, detail=f"Versão de modelo não encontrada: '{versao}'")
+    except Exception as e:
+        serie_erros[endpoint].incrementar()
+        logger.error(f"Falha ao carregar a versão {versao}: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Falha ao carregar a versão '{versao}': {str(e)}")
+
+def registrar_pontuacao(artefatos: ArtefatosModelo, n_registros: int, segundos: float):
+    """Acumula o custo de uma pontuação (transformação e modelo) na versão usada."""
+    metrica_latencia_versao.observar(segundos, artefatos.versao)
+    metrica_registros_versao.incrementar(artefatos.versao, n_registros)
+
 @app.get("/")
 def read_root():
     """
@@ -220,82 +486,1100 @@ def read_root():
     return {
         "message": "API de Previsão de Renda",
         "status": "online",
-        "model_loaded": model is not None
+        "model_loaded": gerenciador_modelo.atual is not None,
+        "model_version": gerenciador_modelo.atual.versao
+    }
+
+def prever_matriz(X: np.ndarray, model: Any, motor: Optional[Any] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Executa o modelo sobre uma matriz de features já transformadas.
+    
+    Args:
+        X: Matriz com as features selecionadas (uma linha por registro)
+        model: Modelo a executar
+        motor: Motor de inferência exportado do modelo; se informado, é usado
+               no lugar de `model`, com uma única passada
+        
+    Returns:
+        Tuple com as classes preditas e as probabilidades de cada classe
+    """
+    serie_tamanho_lote["modelo"].observar(len(X))
+    inicio = time.perf_counter()
+    if motor is not None:
+        predicoes, probabilidades = motor.prever(X)
+        serie_latencia_etapa["motor"].observar(time.perf_counter() - inicio)
+        return predicoes, probabilidades
+    predicoes = model.predict(X)
+    meio = time.perf_counter()
+    probabilidades = model.predict_proba(X)
+    fim = time.perf_counter()
+    serie_latencia_etapa["predict"].observar(meio - inicio)
+    serie_latencia_etapa["predict_proba"].observar(fim - meio)
+    return predicoes, probabilidades
+
+def formatar_previsao(predicao: int, probabilidades: np.ndarray, versao: str) -> Dict[str, Any]:
+    """Monta o dicionário de resposta de uma previsão."""
+    return {
+        "prediction": int(predicao),
+        "prediction_label": ">50K" if predicao == 1 else "<=50K",
+        "probability_<=50K": float(probabilidades[0]),
+        "probability_>50K": float(probabilidades[1]),
+        "model_version": versao
     }
 
 @app.post("/predict")
-def predict(data: InputData):
+async def predict(data: InputData, request: Request, explain: bool = False):
     """
     Endpoint para fazer previsões.
     
+    Com `API_MICROBATCH=1`, requisições concorrentes são agrupadas pelo
+    micro-batcher e pontuadas juntas; caso contrário cada requisição é
+    pontuada individualmente no executor de inferência.
+    
+    A versão do modelo pode ser escolhida pelo cabeçalho `X-Model-Version`
+    ou pelo parâmetro `model_version` (ver `resolver_artefatos`); versões do
+    registro não passam pelo cache nem pelo micro-batcher.
+    
+    Requisições concorrentes com o mesmo registro e a mesma versão
+    compartilham uma única pontuação (`API_COALESCENCIA`).
+    
     Args:
         data: Dados de entrada no formato definido pelo schema InputData
+        explain: Se True, inclui a contribuição de cada feature (ver
+                 `explicar_registros`)
         
     Returns:
         Dicionário com a previsão e probabilidades
     """
+    inicio = time.perf_counter()
+    serie_requisicoes["predict"].incrementar()
+    artefatos = await resolver_artefatos(request, "predict")
+    metrica_em_andamento.incrementar()
     try:
-        logger.debug(f"Dados recebidos: {data.dict()}")
-        df = pd.DataFrame([data.dict()])
-        logger.debug(f"DataFrame criado: {df.shape}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Dados recebidos: {data.dict()}")
         
-        X = transformar_features(df)
-        logger.debug(f"Features transformadas: {X.shape}")
+        chave = chave_registro(data)
+        em_cache = None
+        if cache_previsoes is not None and artefatos is None:
+            em_cache = cache_previsoes.obter(chave)
+            if em_cache is not None and not explain:
+                return em_cache
         
-        logger.debug("Iniciando predição...")
-        prediction = model.predict(X)
-        logger.debug(f"Predição realizada: {prediction}")
+        async def calcular() -> Dict[str, Any]:
+            if artefatos is not None:
+                return (await executor_inferencia.executar(prever_registros, [data], artefatos))[0]
+            if micro_batcher is not None:
+                resultado = await micro_batcher.submeter(data)
+            else:
+                resultado = (await executor_inferencia.executar(prever_registros, [data]))[0]
+            if cache_previsoes is not None and "error" not in resultado:
+                cache_previsoes.guardar(chave, resultado, resultado["model_version"])
+            return resultado
         
-        probabilities = model.predict_proba(X)
-        logger.debug(f"Probabilidades calculadas: {probabilities}")
+        async def calcular_explicado() -> Dict[str, Any]:
+            resultado = em_cache if em_cache is not None else await calcular()
+            if "error" in resultado:
+                return resultado
+            explicacoes = await executor_inferencia.executar(explicar_registros_com_cache, [data], artefatos)
+            return {**resultado, "explanation": explicacoes[0]}
         
-        response = {
-            "prediction": int(prediction[0]),
-            "prediction_label": ">50K" if prediction[0] == 1 else "<=50K",
-            "probability_<=50K": float(probabilities[0][0]),
-            "probability_>50K": float(probabilities[0][1])
-        }
+        calcular_resposta = calcular_explicado if explain else calcular
+        if coalescedor_previsoes is not None:
+            versao = artefatos.versao if artefatos is not None else VERSAO_PADRAO
+            response = await coalescedor_previsoes.executar((versao, chave, explain), calcular_resposta)
+        else:
+            response = await calcular_resposta()
+        
+        if "error" in response:
+            raise ValueError(response["error"])
         
         logger.info(f"Previsão realizada com sucesso: {response}")
         return response
         
+    except (FilaCheiaError, MicroBatcherParadoError) as e:
+        serie_erros["predict"].incrementar()
+        logger.warning(f"Previsão rejeitada: {str(e)}")
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
+        serie_erros["predict"].incrementar()
         logger.error(f"Erro ao fazer previsão: {str(e)}")
         logger.error("Traceback completo:", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        metrica_em_andamento.decrementar()
+        serie_latencia_requisicao["predict"].observar(time.perf_counter() - inicio)
 
-@app.get("/health")
-def health_check():
+def prever_registros(
+    registros: List[InputData],
+    artefatos: Optional[ArtefatosModelo] = None
+) -> List[Dict[str, Any]]:
     """
-    Endpoint para verificar a saúde da API.
+    Transforma e pontua uma lista de registros em uma única passada.
+    
+    Se a passada vetorizada falhar, cada registro é pontuado
+    individualmente para isolar as linhas com erro.
+    
+    Args:
+        registros: Registros já validados
+        artefatos: Versão dos artefatos a usar; por padrão, a atual. A mesma
+                   versão é usada do início ao fim, mesmo que o modelo seja
+                   recarregado durante a pontuação
+        
+    Returns:
+        Lista de respostas na mesma ordem da entrada; registros com erro
+        retornam um dicionário com a chave "error"
     """
+    if artefatos is None:
+        artefatos = gerenciador_modelo.atual
     try:
-        test_data = InputData(**{
-            "age": 39,
-            "workclass": 4,
-            "education": 11,
-            "marital-status": 2,
-            "occupation": 10,
-            "relationship": 0,
-            "race": 4,
-            "sex": 1,
-            "capital_gain": 2174,
-            "capital_loss": 0,
-            "hours_per_week": 40,
-            "native-country": 39
-        })
+        inicio = time.perf_counter()
+        X = transformar_registros(registros, artefatos)
         
-        _ = predict(test_data)
+        predictions, probabilities = prever_matriz(X, artefatos.model, artefatos.motor)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Features transformadas: {X.shape}")
+            logger.debug(f"Predição realizada: {predictions}")
+            logger.debug(f"Probabilidades calculadas: {probabilities}")
+        registrar_pontuacao(artefatos, len(registros), time.perf_counter() - inicio)
         
-        return {
-            "status": "healthy",
-            "model_loaded": model is not None,
-            "prediction_test": "ok"
+        inicio = time.perf_counter()
+        resultados = [
+            formatar_previsao(predicao, proba, artefatos.versao)
+            for predicao, proba in zip(predictions, probabilities)
+        ]
+        serie_latencia_etapa["formatacao"].observar(time.perf_counter() - inicio)
+        return resultados
+    except Exception as e:
+        if len(registros) == 1:
+            return [{"error": str(e)}]
+        logger.warning(f"Falha na pontuação vetorizada, pontuando linha a linha: {str(e)}")
+        return [prever_registros([registro], artefatos)[0] for registro in registros]
+
+def prever_registros_com_cache(registros: List[InputData]) -> List[Dict[str, Any]]:
+    """
+    Pontua registros consultando o cache antes e guardando os novos resultados.
+    
+    Apenas os registros ausentes do cache são enviados a `prever_registros`.
+    """
+    if cache_previsoes is None:
+        return prever_registros(registros)
+    
+    chaves = [chave_registro(registro) for registro in registros]
+    resultados = [cache_previsoes.obter(chave) for chave in chaves]
+    pendentes = [i for i, resultado in enumerate(resultados) if resultado is None]
+    
+    if pendentes:
+        novos = prever_registros([registros[i] for i in pendentes])
+        for i, resultado in zip(pendentes, novos):
+            resultados[i] = resultado
+            if "error" not in resultado:
+                cache_previsoes.guardar(chaves[i], resultado, resultado["model_version"])
+    
+    return resultados
+
+def explicar_registros(
+    registros: List[InputData],
+    artefatos: Optional[ArtefatosModelo] = None
+) -> List[Dict[str, Any]]:
+    """
+    Calcula a contribuição de cada feature para a previsão de cada registro.
+    
+    Todos os registros são explicados com uma única transformação e uma
+    única chamada ao caminho nativo do modelo (ver `ExplicadorModelo`). As
+    contribuições são indexadas pelos nomes das features mantidas pelo
+    seletor (`selector.feature_names_in_`) e estão em log-odds: somadas a
+    `base_value`, resultam no logit da probabilidade de >50K.
+    
+    Args:
+        registros: Registros já validados
+        artefatos: Versão dos artefatos a usar; por padrão, a atual
+        
+    Returns:
+        Lista de explicações na mesma ordem da entrada
+    """
+    if artefatos is None:
+        artefatos = gerenciador_modelo.atual
+    if not registros:
+        return []
+    X = transformar_registros(registros, artefatos)
+    inicio = time.perf_counter()
+    explicador = ExplicadorModelo(artefatos.model, artefatos.transformador.colunas_saida)
+    explicacoes = explicador.explicar(X)
+    serie_latencia_etapa["explicacao"].observar(time.perf_counter() - inicio)
+    return explicacoes
+
+def explicar_registros_com_cache(
+    registros: List[InputData],
+    artefatos: Optional[ArtefatosModelo] = None
+) -> List[Dict[str, Any]]:
+    """
+    Explica registros consultando o cache de explicações antes e guardando
+    as novas; versões do registro de modelos não passam pelo cache.
+    """
+    if cache_explicacoes is None or artefatos is not None:
+        return explicar_registros(registros, artefatos)
+    
+    artefatos = gerenciador_modelo.atual
+    chaves = [chave_registro(registro) for registro in registros]
+    explicacoes = [cache_explicacoes.obter(chave) for chave in chaves]
+    pendentes = [i for i, explicacao in enumerate(explicacoes) if explicacao is None]
+    
+    if pendentes:
+        novas = explicar_registros([registros[i] for i in pendentes], artefatos)
+        for i, explicacao in zip(pendentes, novas):
+            explicacoes[i] = explicacao
+            cache_explicacoes.guardar(chaves[i], explicacao, artefatos.versao)
+    
+    return explicacoes
+
+def processar_lote(
+    registros: List[Any],
+    artefatos: Optional[ArtefatosModelo] = None,
+    explicar: bool = False
+) -> Dict[str, Any]:
+    """
+    Valida cada registro individualmente e pontua todos os válidos juntos.
+    
+    Args:
+        registros: Lista de registros no formato do schema InputData
+        artefatos: Versão do registro a usar; por padrão, a versão atual,
+                   com consulta ao cache
+        explicar: Se True, inclui a contribuição de cada feature nos
+                  registros pontuados com sucesso
+        
+    Returns:
+        Dicionário com os totais e os resultados na ordem de entrada
+    """
+    resultados: List[Dict[str, Any]] = [None] * len(registros)
+    validos: List[InputData] = []
+    indices_validos: List[int] = []
+    
+    inicio = time.perf_counter()
+    for i, registro in enumerate(registros):
+        try:
+            validos.append(InputData.model_validate(registro))
+            indices_validos.append(i)
+        except ValidationError as e:
+            resultados[i] = {"index": i, "error": str(e)}
+    serie_latencia_etapa["validacao"].observar(time.perf_counter() - inicio)
+    
+    if validos:
+        pontuados = (
+            prever_registros_com_cache(validos) if artefatos is None
+            else prever_registros(validos, artefatos)
+        )
+        for i, resultado in zip(indices_validos, pontuados):
+            resultados[i] = {"index": i, **resultado}
+        
+        if explicar:
+            pontuados_ok = [j for j, resultado in enumerate(pontuados) if "error" not in resultado]
+            explicacoes = explicar_registros_com_cache([validos[j] for j in pontuados_ok], artefatos)
+            for j, explicacao in zip(pontuados_ok, explicacoes):
+                resultados[indices_validos[j]]["explanation"] = explicacao
+    
+    falhas = sum(1 for resultado in resultados if "error" in resultado)
+    if falhas:
+        metrica_linhas_com_erro.incrementar(quantidade=falhas)
+    logger.info(f"Lote pontuado: {len(registros)} registros, {falhas} falhas")
+    
+    return {
+        "total": len(registros),
+        "succeeded": len(registros) - falhas,
+        "failed": falhas,
+        "results": resultados
+    }
+
+def prever_colunas_linha_a_linha(
+    colunas: Dict[str, np.ndarray],
+    artefatos: ArtefatosModelo
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, List[Tuple[int, str]]]:
+    """
+    Pontua cada linha das colunas individualmente, para isolar as linhas
+    com erro quando a passada vetorizada falha (como em `prever_registros`).
+    
+    Returns:
+        Tuple com as posições pontuadas, as classes, as probabilidades dessas
+        posições e a lista de (posição, mensagem) das linhas com erro
+    """
+    n = len(next(iter(colunas.values())))
+    pontuadas, predicoes, probabilidades, falhas = [], [], [], []
+    for i in range(n):
+        try:
+            X = transformar_colunas({campo: valores[i:i + 1] for campo, valores in colunas.items()}, artefatos)
+            predicao, proba = prever_matriz(X, artefatos.model, artefatos.motor)
+        except Exception as e:
+            falhas.append((i, str(e)))
+            continue
+        pontuadas.append(i)
+        predicoes.append(predicao[0])
+        probabilidades.append(proba[0])
+    return (
+        np.asarray(pontuadas, dtype=np.int64),
+        np.asarray(predicoes, dtype=np.int8),
+        np.asarray(probabilidades, dtype=np.float64).reshape(-1, 2),
+        falhas
+    )
+
+def processar_lote_arrow(corpo: bytes, artefatos: Optional[ArtefatosModelo] = None) -> bytes:
+    """
+    Valida por coluna e pontua um lote recebido como stream Arrow IPC.
+    
+    Diferente do lote JSON, não consulta o cache: o custo de uma consulta por
+    linha seria maior que o da pontuação vetorizada. Como no lote JSON, se a
+    passada vetorizada falhar, cada linha é pontuada individualmente e as
+    linhas com erro são reportadas na coluna "error".
+    
+    Args:
+        corpo: Bytes do stream Arrow com as colunas de InputData
+        artefatos: Versão a usar; por padrão, a atual
+        
+    Returns:
+        Bytes do stream Arrow com os resultados na ordem de entrada
+        
+    Raises:
+        LoteGrandeError: Lote com mais linhas que `API_MAX_REGISTROS_LOTE_ARROW`,
+                         detectado antes da validação das colunas
+    """
+    from src.api.arrow import ler_entrada, escrever_resposta, LoteArrowGrandeError
+    
+    if artefatos is None:
+        artefatos = gerenciador_modelo.atual
+    inicio = time.perf_counter()
+    try:
+        colunas, erros = ler_entrada(corpo, CAMPOS_ENTRADA, MAX_REGISTROS_LOTE_ARROW)
+    except LoteArrowGrandeError as e:
+        raise LoteGrandeError(str(e))
+    serie_latencia_etapa["validacao"].observar(time.perf_counter() - inicio)
+    
+    n_validos = len(next(iter(colunas.values())))
+    n = n_validos + len(erros)
+    serie_tamanho_lote["predict_batch"].observar(n)
+    
+    indices_validos = np.ones(n, dtype=bool)
+    indices_validos[[i for i, _ in erros]] = False
+    indices_validos = np.flatnonzero(indices_validos)
+    
+    if n_validos:
+        inicio = time.perf_counter()
+        try:
+            predicoes, probabilidades = prever_matriz(
+                transformar_colunas(colunas, artefatos), artefatos.model, artefatos.motor
+            )
+        except Exception as e:
+            logger.warning(f"Falha na pontuação vetorizada do lote Arrow, pontuando linha a linha: {str(e)}")
+            pontuadas, predicoes, probabilidades, falhas = prever_colunas_linha_a_linha(colunas, artefatos)
+            erros = sorted(erros + [(int(indices_validos[j]), mensagem) for j, mensagem in falhas])
+            indices_validos = indices_validos[pontuadas]
+            n_validos = len(indices_validos)
+        registrar_pontuacao(artefatos, n_validos, time.perf_counter() - inicio)
+    else:
+        predicoes, probabilidades = np.zeros(0, dtype=np.int8), np.zeros((0, 2))
+    
+    if erros:
+        metrica_linhas_com_erro.incrementar(quantidade=len(erros))
+    logger.info(f"Lote Arrow pontuado: {n} registros, {len(erros)} falhas")
+    
+    inicio = time.perf_counter()
+    resposta = escrever_resposta(n, indices_validos, predicoes, probabilidades, erros, {
+        "model_version": artefatos.versao,
+        "total": str(n),
+        "succeeded": str(n_validos),
+        "failed": str(len(erros))
+    })
+    serie_latencia_etapa["formatacao"].observar(time.perf_counter() - inicio)
+    return resposta
+
+@app.post("/predict/batch", openapi_extra={
+    "requestBody": {
+        "required": True,
+        "content": {
+            "application/json": {
+                "schema": {"type": "array", "items": {"$ref": "#/components/schemas/InputData"}}
+            },
+            "application/vnd.apache.arrow.stream": {
+                "schema": {"type": "string", "format": "binary"}
+            }
         }
+    }
+})
+async def predict_batch(request: Request):
+    """
+    Endpoint para previsões em lote.
+    
+    Valida cada registro individualmente e pontua todos os válidos com uma
+    única chamada de transformação e de modelo. Falhas são reportadas por
+    linha, sem invalidar o lote inteiro.
+    
+    Aceita uma lista JSON de registros no formato do schema InputData ou,
+    com `Content-Type: application/vnd.apache.arrow.stream`, um stream Arrow
+    com uma coluna inteira por campo; nesse caso a validação é vetorizada e a
+    resposta também é um stream Arrow.
+    
+    Com `?explain=true`, cada resultado JSON inclui a contribuição de cada
+    feature (não disponível no formato Arrow).
+    
+    Returns:
+        Dicionário com os totais e os resultados na ordem de entrada
+    """
+    serie_requisicoes["predict_batch"].incrementar()
+    tipo = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    corpo = await request.body()
+    artefatos = await resolver_artefatos(request, "predict_batch")
+    
+    explicar = request.query_params.get("explain", "").lower() in ("1", "true")
+    
+    if tipo == TIPO_CONTEUDO_ARROW:
+        if explicar:
+            serie_erros["predict_batch"].incrementar()
+            raise HTTPException(status_code=422, detail="Explicações não estão disponíveis no formato Arrow")
+        return await predict_batch_arrow(corpo, artefatos)
+    
+    try:
+        registros = json.loads(corpo)
+    except ValueError as e:
+        serie_erros["predict_batch"].incrementar()
+        raise HTTPException(status_code=422, detail=f"JSON inválido: {str(e)}")
+    if not isinstance(registros, list):
+        serie_erros["predict_batch"].incrementar()
+        raise HTTPException(status_code=422, detail="O corpo deve ser uma lista de registros")
+    
+    if len(registros) > MAX_REGISTROS_LOTE:
+        serie_erros["predict_batch"].incrementar()
+        raise HTTPException(
+            status_code=413,
+            detail=f"Lote com {len(registros)} registros excede o limite de {MAX_REGISTROS_LOTE}"
+        )
+    
+    inicio = time.perf_counter()
+    serie_tamanho_lote["predict_batch"].observar(len(registros))
+    metrica_em_andamento.incrementar()
+    try:
+        resposta = await executor_inferencia.executar(processar_lote, registros, artefatos, explicar)
+        # Os resultados já contêm apenas tipos nativos; JSONResponse evita
+        # a passada do jsonable_encoder, que domina o tempo em lotes grandes.
+        return JSONResponse(content=resposta)
+        
+    except Exception as e:
+        serie_erros["predict_batch"].incrementar()
+        logger.error(f"Erro ao fazer previsão em lote: {str(e)}")
+        logger.error("Traceback completo:", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        metrica_em_andamento.decrementar()
+        serie_latencia_requisicao["predict_batch"].observar(time.perf_counter() - inicio)
+
+async def predict_batch_arrow(corpo: bytes, artefatos: Optional[ArtefatosModelo] = None) -> Response:
+    """Pontua um lote em formato Arrow IPC (ver `predict_batch`)."""
+    from src.api.arrow import EntradaArrowInvalidaError
+    
+    inicio = time.perf_counter()
+    metrica_em_andamento.incrementar()
+    try:
+        resposta = await executor_inferencia.executar(processar_lote_arrow, corpo, artefatos)
+        return Response(content=resposta, media_type=TIPO_CONTEUDO_ARROW)
+    
+    except EntradaArrowInvalidaError as e:
+        serie_erros["predict_batch"].incrementar()
+        raise HTTPException(status_code=422, detail=str(e))
+    except LoteGrandeError as e:
+        serie_erros["predict_batch"].incrementar()
+        raise HTTPException(status_code=413, detail=str(e))
+    except Exception as e:
+        serie_erros["predict_batch"].incrementar()
+        logger.error(f"Erro ao fazer previsão em lote Arrow: {str(e)}")
+        logger.error("Traceback completo:", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        metrica_em_andamento.decrementar()
+        serie_latencia_requisicao["predict_batch"].observar(time.perf_counter() - inicio)
+
+def pontuar_bloco_stream(
+    itens: List[Any],
+    primeiro_indice: int,
+    artefatos: ArtefatosModelo
+) -> Tuple[bytes, int]:
+    """
+    Valida e pontua um bloco de registros lidos de `/predict/stream`.
+    
+    Args:
+        itens: Registros lidos do corpo ou LinhaInvalidaError, na ordem de entrada
+        primeiro_indice: Posição do primeiro item no fluxo inteiro
+        artefatos: Versão dos artefatos usada em todo o fluxo
+        
+    Returns:
+        Tuple com as linhas NDJSON do bloco e o número de linhas com erro
+    """
+    resultados: List[Dict[str, Any]] = [None] * len(itens)
+    validos: List[InputData] = []
+    indices_validos: List[int] = []
+    
+    for i, item in enumerate(itens):
+        if isinstance(item, LinhaInvalidaError):
+            resultados[i] = {"index": primeiro_indice + i, "error": str(item)}
+            continue
+        try:
+            validos.append(InputData.model_validate(item))
+            indices_validos.append(i)
+        except ValidationError as e:
+            resultados[i] = {"index": primeiro_indice + i, "error": str(e)}
+    
+    if validos:
+        for i, resultado in zip(indices_validos, prever_registros(validos, artefatos)):
+            resultados[i] = {"index": primeiro_indice + i, **resultado}
+    
+    falhas = sum(1 for resultado in resultados if "error" in resultado)
+    saida = "".join(json.dumps(resultado) + "\n" for resultado in resultados)
+    return saida.encode("utf-8"), falhas
+
+@app.post("/predict/stream")
+async def predict_stream(request: Request):
+    """
+    Endpoint para pontuação de arquivos grandes em streaming.
+    
+    Lê o corpo (NDJSON, um registro por linha, ou CSV com cabeçalho)
+    incrementalmente, pontua em blocos de `API_STREAM_TAMANHO_BLOCO` registros
+    e devolve um resultado NDJSON por registro enquanto ainda lê a entrada.
+    O próximo bloco só é lido depois que o anterior foi enviado, então a
+    memória usada não depende do tamanho do arquivo e um cliente lento
+    desacelera a leitura em vez de acumular saída no servidor.
+    
+    Todo o fluxo é pontuado com a versão do modelo em uso no seu início, ou
+    com a versão escolhida como em `/predict`.
+    Erros de linha são reportados por linha; um erro que interrompe o fluxo
+    é enviado como última linha, no formato {"error": ...}.
+    """
+    tipo = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if tipo in FORMATOS_NDJSON:
+        formato = "ndjson"
+    elif tipo in FORMATOS_CSV:
+        formato = "csv"
+    else:
+        raise HTTPException(
+            status_code=415,
+            detail=f"Content-Type não suportado: '{tipo}'. Use application/x-ndjson ou text/csv"
+        )
+    
+    serie_requisicoes["predict_stream"].incrementar()
+    artefatos = await resolver_artefatos(request, "predict_stream") or gerenciador_modelo.atual
+    
+    async def processar(partes):
+        inicio = time.perf_counter()
+        metrica_em_andamento.incrementar()
+        contagem = {"total": 0, "falhas": 0}
+        
+        async def pontuar(bloco: List[Any]) -> bytes:
+            saida, falhas_bloco = await executor_inferencia.executar(
+                pontuar_bloco_stream, bloco, contagem["total"], artefatos
+            )
+            serie_tamanho_lote["predict_stream"].observar(len(bloco))
+            contagem["total"] += len(bloco)
+            contagem["falhas"] += falhas_bloco
+            return saida
+        
+        bloco: List[Any] = []
+        try:
+            async for item in ler_registros(ler_linhas(partes, STREAM_MAX_BYTES_LINHA), formato):
+                bloco.append(item)
+                if len(bloco) >= STREAM_TAMANHO_BLOCO:
+                    yield await pontuar(bloco)
+                    bloco = []
+            if bloco:
+                yield await pontuar(bloco)
+            logger.info(f"Stream pontuado: {contagem['total']} registros, {contagem['falhas']} falhas")
+            
+        except ClientDisconnect:
+            logger.warning(f"Cliente desconectou após {contagem['total']} registros")
+            raise
+        except Exception as e:
+            serie_erros["predict_stream"].incrementar()
+            logger.error(f"Stream interrompido após {contagem['total']} registros: {str(e)}")
+            if not isinstance(e, LinhaInvalidaError):
+                logger.error("Traceback completo:", exc_info=True)
+            yield (json.dumps({"error": str(e)}) + "\n").encode("utf-8")
+        finally:
+            if contagem["falhas"]:
+                metrica_linhas_com_erro.incrementar(quantidade=contagem["falhas"])
+            metrica_em_andamento.decrementar()
+            serie_latencia_requisicao["predict_stream"].observar(time.perf_counter() - inicio)
+    
+    return RespostaStreaming(processar)
+
+class VariacaoInvalidaError(ValueError):
+    """Variações de `/predict/whatif` malformadas."""
+
+def variacoes_padrao(artefatos: ArtefatosModelo) -> Dict[str, List[int]]:
+    """
+    Variações testadas quando a requisição não as informa: as categorias de
+    escolaridade, ocupação e tipo de trabalho vistas no treino (pelo
+    one-hot encoder) e algumas jornadas semanais.
+    """
+    encoder = artefatos.transformers.get('one_hot_encoder')
+    categorias = dict(zip(encoder.feature_names_in_, encoder.categories_)) if encoder is not None else {}
+    variacoes = {
+        campo: [int(valor) for valor in categorias[campo]]
+        for campo in ("education", "occupation", "workclass")
+        if campo in categorias
+    }
+    variacoes["hours_per_week"] = list(WHATIF_HORAS_PADRAO)
+    return variacoes
+
+def normalizar_variacoes(
+    variacoes: Optional[Dict[str, List[int]]],
+    combinar: bool,
+    artefatos: ArtefatosModelo
+) -> Dict[str, List[int]]:
+    """
+    Valida as variações pedidas e converte os aliases em nomes de campo.
+    
+    Raises:
+        VariacaoInvalidaError: Campo desconhecido ou sem valores
+        LoteGrandeError: Grade com mais linhas que `API_MAX_REGISTROS_WHATIF`
+    """
+    if variacoes is None:
+        variacoes = variacoes_padrao(artefatos)
+    campos = {**{alias: campo for campo, alias in CAMPOS_ENTRADA.items()}, **{c: c for c in CAMPOS_ENTRADA}}
+    
+    normalizadas: Dict[str, List[int]] = {}
+    for nome, valores in variacoes.items():
+        if nome not in campos:
+            raise VariacaoInvalidaError(f"Campo desconhecido em variations: '{nome}'")
+        if not valores:
+            raise VariacaoInvalidaError(f"Nenhum valor informado para '{nome}'")
+        normalizadas.setdefault(campos[nome], []).extend(valores)
+    if not normalizadas:
+        raise VariacaoInvalidaError("Nenhuma variação informada")
+    
+    n = math.prod(len(v) for v in normalizadas.values()) if combinar else sum(len(v) for v in normalizadas.values())
+    if n > MAX_REGISTROS_WHATIF:
+        raise LoteGrandeError(f"Grade com {n} variações excede o limite de {MAX_REGISTROS_WHATIF}")
+    return normalizadas
+
+def calcular_whatif(
+    registro: InputData,
+    variacoes: Dict[str, List[int]],
+    combinar: bool,
+    artefatos: ArtefatosModelo
+) -> Dict[str, Any]:
+    """
+    Monta a grade contrafactual como uma única matriz e a pontua de uma vez.
+    
+    A linha 0 é o registro original; as demais repetem o registro trocando
+    apenas os campos variados (um campo por vez, ou todas as combinações
+    com `combinar`).
+    
+    Returns:
+        Dicionário com a previsão do registro original e, para cada variação,
+        os campos alterados, a previsão e a diferença de probabilidade de >50K
+    """
+    inicio = time.perf_counter()
+    campos = list(variacoes)
+    if combinar:
+        grades = np.meshgrid(*[np.asarray(variacoes[c], dtype=np.int64) for c in campos], indexing="ij")
+        valores = {campo: grade.ravel() for campo, grade in zip(campos, grades)}
+        n = grades[0].size
+    else:
+        n = sum(len(v) for v in variacoes.values())
+    
+    colunas = {
+        campo: np.full(n + 1, getattr(registro, campo), dtype=np.int64)
+        for campo in InputData.model_fields
+    }
+    if combinar:
+        for campo in campos:
+            colunas[campo][1:] = valores[campo]
+        mudancas = [
+            {CAMPOS_ENTRADA[campo]: int(valores[campo][i]) for campo in campos}
+            for i in range(n)
+        ]
+    else:
+        mudancas = []
+        posicao = 1
+        for campo in campos:
+            fim = posicao + len(variacoes[campo])
+            colunas[campo][posicao:fim] = variacoes[campo]
+            mudancas.extend({CAMPOS_ENTRADA[campo]: int(valor)} for valor in variacoes[campo])
+            posicao = fim
+    
+    X = transformar_colunas(colunas, artefatos)
+    predicoes, probabilidades = prever_matriz(X, artefatos.model, artefatos.motor)
+    registrar_pontuacao(artefatos, n + 1, time.perf_counter() - inicio)
+    
+    prob_alta = probabilidades[:, 1]
+    delta = prob_alta[1:] - prob_alta[0]
+    return {
+        "model_version": artefatos.versao,
+        "baseline": {"prediction": int(predicoes[0]), "probability_>50K": float(prob_alta[0])},
+        "variations": [
+            {
+                "changes": alteracao,
+                "prediction": int(predicao),
+                "probability_>50K": float(probabilidade),
+                "delta": float(diferenca)
+            }
+            for alteracao, predicao, probabilidade, diferenca
+            in zip(mudancas, predicoes[1:], prob_alta[1:], delta)
+        ]
+    }
+
+@app.post("/predict/whatif")
+async def predict_whatif(data: WhatIfInput, request: Request):
+    """
+    Endpoint de sensibilidade ("e se?") para um registro.
+    
+    Testa valores alternativos dos campos em `variations` (por padrão,
+    escolaridade, ocupação, tipo de trabalho e horas semanais) e devolve a
+    variação da probabilidade de >50K de cada alternativa em relação ao
+    registro original. Toda a grade é pontuada em uma única chamada ao
+    modelo. A versão do modelo é escolhida como em `/predict`.
+    """
+    serie_requisicoes["predict_whatif"].incrementar()
+    artefatos = await resolver_artefatos(request, "predict_whatif") or gerenciador_modelo.atual
+    inicio = time.perf_counter()
+    metrica_em_andamento.incrementar()
+    try:
+        variacoes = normalizar_variacoes(data.variations, data.combine, artefatos)
+        resposta = await executor_inferencia.executar(
+            calcular_whatif, data.record, variacoes, data.combine, artefatos
+        )
+        serie_tamanho_lote["predict_whatif"].observar(len(resposta["variations"]))
+        return resposta
+    
+    except VariacaoInvalidaError as e:
+        serie_erros["predict_whatif"].incrementar()
+        raise HTTPException(status_code=422, detail=str(e))
+    except LoteGrandeError as e:
+        serie_erros["predict_whatif"].incrementar()
+        raise HTTPException(status_code=413, detail=str(e))
     except Exception as e:
-        logger.error(f"Erro no health check: {str(e)}")
+        serie_erros["predict_whatif"].incrementar()
+        logger.error(f"Erro ao calcular variações: {str(e)}")
+        logger.error("Traceback completo:", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        metrica_em_andamento.decrementar()
+        serie_latencia_requisicao["predict_whatif"].observar(time.perf_counter() - inicio)
+
+micro_batcher = (
+    MicroBatcher(
+        prever_registros,
+        max_lote=MICROBATCH_MAX_LOTE,
+        espera_max_ms=MICROBATCH_ESPERA_MS,
+        max_fila=MICROBATCH_MAX_FILA,
+        executar=executor_inferencia.executar
+    )
+    if MICROBATCH_ATIVO else None
+)
+
+def testar_previsao(artefatos: Optional[ArtefatosModelo] = None):
+    """
+    Executa uma previsão real com o registro de exemplo, sem passar pelo cache.
+    
+    Args:
+        artefatos: Versão a testar; por padrão, a atual
+        
+    Raises:
+        ValueError: Se a previsão falhar ou devolver probabilidades inválidas
+    """
+    resultado = prever_registros([InputData(**EXEMPLO_ENTRADA)], artefatos)[0]
+    if "error" in resultado:
+        raise ValueError(resultado["error"])
+    probabilidade = resultado["probability_>50K"]
+    if not 0.0 <= probabilidade <= 1.0:
+        raise ValueError(f"Probabilidade fora do intervalo [0, 1]: {probabilidade}")
+
+def aquecer(artefatos: Optional[ArtefatosModelo] = None) -> int:
+    """
+    Executa previsões de aquecimento com os tamanhos de `API_AQUECIMENTO_TAMANHOS`.
+    
+    Os registros variam a partir do exemplo para percorrer as faixas de
+    idade, jornada e educação; o cache não é usado nem alterado.
+    
+    Returns:
+        Número de previsões executadas
+    """
+    base = InputData(**EXEMPLO_ENTRADA)
+    maior = max(AQUECIMENTO_TAMANHOS, default=0)
+    registros = [
+        base.model_copy(update={
+            "age": 17 + (i * 7) % 74,
+            "hours_per_week": 1 + (i * 13) % 99,
+            "education": i % 16,
+            "capital_gain": (0, 0, 2174, 15024)[i % 4]
+        })
+        for i in range(maior)
+    ]
+    total = 0
+    for tamanho in AQUECIMENTO_TAMANHOS:
+        for _ in range(AQUECIMENTO_REPETICOES):
+            resultados = prever_registros(registros[:tamanho], artefatos)
+            falhas = [resultado["error"] for resultado in resultados if "error" in resultado]
+            if falhas:
+                raise ValueError(f"Falha no aquecimento com lote de {tamanho}: {falhas[0]}")
+            total += tamanho
+    return total
+
+try:
+    logger.info("Carregando modelo e transformadores...")
+    artefatos_iniciais = gerenciador_modelo.inicializar()
+    for etapa, ms in artefatos_iniciais.etapas_carga_ms.items():
+        cronometro_inicializacao.registrar(f"carga_{etapa}", ms / 1000)
+    logger.info(f"Modelo carregado com sucesso! Tipo: {type(artefatos_iniciais.model)}")
+    logger.info(f"Transformadores carregados: {artefatos_iniciais.transformers.keys()}")
+    logger.info(
+        f"Worker pid {os.getpid()}: artefatos ({MODO_ARTEFATOS}) carregados em "
+        f"{artefatos_iniciais.tempo_carga_ms:.1f} ms; "
+        f"{formatar_relatorio(relatorio_memoria(gerenciador_modelo.diretorio_mmap))}"
+    )
+except Exception as e:
+    logger.error(f"Erro ao carregar modelo ou transformadores: {str(e)}")
+    raise
+
+verificador_saude = VerificadorSaude(
+    testar_previsao,
+    executar=executor_inferencia.executar,
+    intervalo_segundos=AUTOTESTE_INTERVALO_SEGUNDOS,
+    intervalo_minimo_profundo_segundos=HEALTH_INTERVALO_MINIMO_SEGUNDOS
+)
+
+def validar_roteamento(pesos: List[Tuple[str, float]]):
+    """
+    Confere se as versões de `API_ROTEAMENTO_PESOS` existem no registro.
+    
+    Raises:
+        ValueError: Se alguma versão não for "padrao", a versão em uso nem
+                    uma versão do registro
+    """
+    from src.models.registro import listar_versoes
+    
+    conhecidas = [metadados["versao"] for metadados in listar_versoes(REGISTRO_DIRETORIO)]
+    conhecidas.append(gerenciador_modelo.atual.versao)
+    desconhecidas = versoes_desconhecidas(pesos, conhecidas)
+    if desconhecidas:
+        raise ValueError(
+            f"Versões de API_ROTEAMENTO_PESOS ausentes do registro {REGISTRO_DIRETORIO}: {desconhecidas}"
+        )
+
+@app.on_event("startup")
+async def iniciar():
+    """
+    Valida a divisão de tráfego, aquece o modelo, executa o autoteste de
+    inicialização e agenda os periódicos. A API só aceita requisições (e
+    `/readyz` só responde 200) depois disso.
+    """
+    validar_roteamento(ROTEAMENTO_PESOS)
+    with cronometro_inicializacao.etapa("medicao_overhead"):
+        metrica_overhead.definir(medir_overhead(2000))
+    with cronometro_inicializacao.etapa("aquecimento"):
+        previsoes = await executor_inferencia.executar(aquecer, gerenciador_modelo.atual)
+    with cronometro_inicializacao.etapa("autoteste"):
+        await verificador_saude.iniciar()
+    gerenciador_modelo.iniciar_monitoramento(RECARGA_INTERVALO_SEGUNDOS)
+    cronometro_inicializacao.concluir()
+    logger.info(
+        f"Worker pid {os.getpid()} pronto em {cronometro_inicializacao.formatar()}; "
+        f"{previsoes} previsões de aquecimento"
+    )
+
+@app.on_event("shutdown")
+async def encerrar():
+    """Interrompe as tarefas de fundo e o executor ao desligar a aplicação."""
+    await verificador_saude.parar()
+    gerenciador_modelo.parar_monitoramento()
+    if micro_batcher is not None:
+        await micro_batcher.parar()
+    executor_inferencia.encerrar()
+
+def coletar_estatisticas():
+    """Exporta os contadores dos caches, da coalescência, do micro-batcher, das versões e do executor e a memória do processo para `/metrics`."""
+    if cache_previsoes is not None:
+        estatisticas = cache_previsoes.estatisticas()
+        yield "previsao_cache_entradas", "gauge", "Entradas no cache de previsões", {}, estatisticas["entries"]
+        for evento, chave in [("acerto", "hits"), ("falha", "misses"), ("remocao", "evictions"),
+                              ("expiracao", "expirations"), ("invalidacao", "invalidations")]:
+            yield ("previsao_cache_eventos_total", "counter", "Eventos do cache de previsões",
+                   {"evento": evento}, estatisticas[chave])
+    if cache_explicacoes is not None:
+        estatisticas = cache_explicacoes.estatisticas()
+        yield "previsao_cache_explicacoes_entradas", "gauge", "Entradas no cache de explicações", {}, estatisticas["entries"]
+        for evento, chave in [("acerto", "hits"), ("falha", "misses")]:
+            yield ("previsao_cache_explicacoes_eventos_total", "counter", "Eventos do cache de explicações",
+                   {"evento": evento}, estatisticas[chave])
+    if micro_batcher is not None:
+        estatisticas = micro_batcher.estatisticas()
+        yield "previsao_microbatch_fila", "gauge", "Itens na fila do micro-batcher", {}, estatisticas["queue_depth"]
+        yield "previsao_microbatch_lotes_total", "counter", "Lotes pontuados pelo micro-batcher", {}, estatisticas["batches"]
+        yield "previsao_microbatch_rejeitados_total", "counter", "Itens rejeitados por fila cheia", {}, estatisticas["rejected"]
+    estatisticas = gerenciador_modelo.estatisticas()
+    yield "previsao_modelo_recargas_total", "counter", "Recargas de modelo concluídas", {}, estatisticas["reloads"]
+    yield "previsao_modelo_falhas_recarga_total", "counter", "Recargas de modelo que falharam", {}, estatisticas["reload_failures"]
+    yield ("previsao_modelo_info", "gauge", "Versão do modelo em uso",
+           {"versao": estatisticas["model_version"]}, 1)
+    for tipo, valor in relatorio_memoria_processo.relatorio().items():
+        yield "previsao_processo_memoria_bytes", "gauge", "Memória do processo (smaps)", {"tipo": tipo}, valor
+    if coalescedor_previsoes is not None:
+        estatisticas = coalescedor_previsoes.estatisticas()
+        yield "previsao_coalescencia_em_andamento", "gauge", "Pontuações compartilhadas em andamento", {}, estatisticas["in_flight"]
+        for resultado, chave in [("calculada", "computations"), ("coalescida", "coalesced")]:
+            yield ("previsao_coalescencia_total", "counter",
+                   "Requisições de /predict pontuadas ou atendidas por uma pontuação em andamento",
+                   {"resultado": resultado}, estatisticas[chave])
+    estatisticas = versoes_residentes.estatisticas()
+    yield "previsao_versoes_residentes", "gauge", "Versões do registro em memória", {}, len(estatisticas["resident"])
+    yield "previsao_versoes_residentes_bytes", "gauge", "Tamanho estimado das versões do registro em memória", {}, estatisticas["resident_bytes"]
+    yield "previsao_versoes_cargas_total", "counter", "Versões do registro carregadas", {}, estatisticas["loads"]
+    yield "previsao_versoes_descargas_total", "counter", "Versões do registro descarregadas pelo orçamento", {}, estatisticas["evictions"]
+    for etapa, ms in cronometro_inicializacao.relatorio()["stages_ms"].items():
+        yield "previsao_inicializacao_segundos", "gauge", "Duração de cada etapa da inicialização", {"etapa": etapa}, ms / 1000
+    estatisticas = executor_inferencia.estatisticas()
+    yield "previsao_executor_em_execucao", "gauge", "Tarefas em execução no executor", {}, estatisticas["in_flight"]
+
+metricas.adicionar_coletor(coletar_estatisticas)
+
+@app.get("/metrics")
+def metrics():
+    """
+    Endpoint com as métricas de serviço no formato de texto do Prometheus.
+    """
+    return PlainTextResponse(
+        metricas.renderizar(),
+        media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+def estatisticas_versoes() -> Dict[str, Any]:
+    """Custo acumulado por versão: chamadas ao modelo, registros, latência média e vazão."""
+    uso = {}
+    for versao in metrica_latencia_versao.valores_rotulo():
+        chamadas = metrica_latencia_versao.total(versao)
+        segundos = metrica_latencia_versao.soma(versao)
+        registros = metrica_registros_versao.valor(versao)
+        uso[versao] = {
+            "calls": chamadas,
+            "rows": int(registros),
+            "mean_ms": segundos / chamadas * 1000 if chamadas else 0.0,
+            "rows_per_second": registros / segundos if segundos else 0.0
+        }
+    return {
+        "default_version": gerenciador_modelo.atual.versao,
+        "routing_weights": dict(ROTEAMENTO_PESOS),
+        **versoes_residentes.estatisticas(),
+        "usage": uso
+    }
+
+@app.get("/models")
+def models():
+    """
+    Endpoint com as versões do registro de modelos, suas métricas de
+    avaliação e quais estão carregadas neste worker.
+    """
+    from src.models.registro import listar_versoes
+    
+    residentes = {r["version"] for r in versoes_residentes.estatisticas()["resident"]}
+    return {
+        "default_version": gerenciador_modelo.atual.versao,
+        "routing_weights": dict(ROTEAMENTO_PESOS),
+        "versions": [
+            {
+                "version": metadados["versao"],
+                "name": metadados["nome"],
+                "algorithm": metadados["algoritmo"],
+                "metrics": metadados["metricas"],
+                "created_at": metadados["criado_em"],
+                "registry_default": metadados["padrao"],
+                "resident": metadados["versao"] in residentes
+            }
+            for metadados in listar_versoes(REGISTRO_DIRETORIO)
+        ]
+    }
+
+@app.get("/stats")
+def stats():
+    """
+    Endpoint com estatísticas internas de serviço.
+    """
+    return {
+        "model": gerenciador_modelo.estatisticas(),
+        "cache": (
+            cache_previsoes.estatisticas() if cache_previsoes is not None
+            else {"enabled": False}
+        ),
+        "explanation_cache": (
+            cache_explicacoes.estatisticas() if cache_explicacoes is not None
+            else {"enabled": False}
+        ),
+        "coalescing": (
+            coalescedor_previsoes.estatisticas() if coalescedor_previsoes is not None
+            else {"enabled": False}
+        ),
+        "micro_batch": (
+            micro_batcher.estatisticas() if micro_batcher is not None
+            else {"enabled": False}
+        ),
+        "executor": executor_inferencia.estatisticas(),
+        "versions": estatisticas_versoes(),
+        "startup": cronometro_inicializacao.relatorio(),
+        "memory": {"pid": os.getpid(), **relatorio_memoria_processo.relatorio()}
+    }
+
+@app.post("/admin/reload")
+async def admin_reload(force: bool = False, x_admin_token: Optional[str] = Header(None)):
+    """
+    Recarrega o modelo e os transformadores do disco sem interromper o serviço.
+    
+    A nova versão é carregada, aquecida e validada em segundo plano; só então
+    substitui a atual. Requisições em andamento terminam na versão anterior.
+    Se `API_ADMIN_TOKEN` estiver definido, exige o cabeçalho `X-Admin-Token`.
+    
+    Args:
+        force: Recarrega mesmo que os arquivos não tenham mudado
+    """
+    if ADMIN_TOKEN and x_admin_token != ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Token de administração inválido")
+    
+    resultado = await run_in_threadpool(gerenciador_modelo.recarregar, force)
+    if "error" in resultado:
+        return JSONResponse(content=resultado, status_code=500)
+    return resultado
+
+@app.get("/livez")
+def livez():
+    """
+    Sonda de vivacidade: responde sem executar nenhum trabalho de modelo.
+    """
+    return {"status": "alive"}
+
+@app.get("/readyz")
+def readyz():
+    """
+    Sonda de prontidão: devolve o resultado do último autoteste.
+    
+    O autoteste roda na inicialização e depois periodicamente em segundo
+    plano; esta sonda apenas lê o resultado guardado.
+    """
+    estado = verificador_saude.estado_prontidao()
+    status_code = 200 if verificador_saude.pronto else 503
+    return JSONResponse(content=estado, status_code=status_code)
+
+@app.get("/health")
+async def health_check():
+    """
+    Verificação profunda: executa uma previsão real.
+    
+    Limitada a uma execução por `API_HEALTH_INTERVALO_MINIMO_SEGUNDOS`; dentro
+    desse intervalo devolve o último resultado.
+    """
+    resultado = await verificador_saude.verificacao_profunda()
+    if resultado["ok"]:
         return {
-            "status": "unhealthy",
-            "model_loaded": model is not None,
-            "error": str(e)
-        }
\ No newline at end of file
+            "status": "healthy",
+            "model_loaded": gerenciador_modelo.atual is not None,
+            "model_version": gerenciador_modelo.atual.versao,
+            "prediction_test": "ok",
+            "cached": resultado["cached"]
+        }
+    return {
+        "status": "unhealthy",
+        "model_loaded": gerenciador_modelo.atual is not None,
+        "error": resultado["error"],
+        "cached": resultado["cached"]
+    }
@@ -0,0 +1,178 @@
+"""
+Formato Apache Arrow IPC para pontuação em lote.
+
+A entrada é um stream Arrow com uma coluna inteira por campo de `InputData`
+(com os mesmos nomes do JSON). A validação é feita por coluna, com
+operações vetorizadas, em vez de um objeto pydantic por linha; a resposta é
+um record batch com a previsão e as probabilidades de cada linha.
+"""
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+from typing import Dict, List, Optional, Tuple
+
+ROTULOS_PREVISAO = ["<=50K", ">50K"]
+
+SCHEMA_RESPOSTA = pa.schema([
+    pa.field("index", pa.int64(), nullable=False),
+    pa.field("prediction", pa.int8()),
+    pa.field("prediction_label", pa.dictionary(pa.int8(), pa.string())),
+    pa.field("probability_<=50K", pa.float64()),
+    pa.field("probability_>50K", pa.float64()),
+    pa.field("error", pa.string())
+])
+
+class EntradaArrowInvalidaError(ValueError):
+    """Stream Arrow ilegível ou com colunas ausentes ou de tipo inválido."""
+
+class LoteArrowGrandeError(ValueError):
+    """Stream Arrow com mais linhas que o limite informado a `ler_entrada`."""
+
+def schema_entrada(campos: Dict[str, str]) -> pa.Schema:
+    """
+    Schema esperado da entrada.
+
+    Args:
+        campos: Mapeamento campo de InputData -> nome da coluna (alias)
+    """
+    return pa.schema([pa.field(coluna, pa.int64()) for coluna in campos.values()])
+
+def ler_entrada(
+    corpo: bytes,
+    campos: Dict[str, str],
+    max_linhas: Optional[int] = None
+) -> Tuple[Dict[str, np.ndarray], List[Tuple[int, str]]]:
+    """
+    Lê e valida um stream Arrow coluna a coluna.
+
+    Colunas inteiras de qualquer largura são aceitas; colunas de ponto
+    flutuante são aceitas quando os valores são inteiros. Valores nulos ou
+    fracionários invalidam apenas as linhas em que aparecem. Colunas extras
+    são ignoradas.
+
+    Args:
+        corpo: Bytes do stream Arrow IPC
+        campos: Mapeamento campo de InputData -> nome da coluna (alias)
+        max_linhas: Limite de linhas; os record batches são contados à
+                    medida que são lidos (sem copiar os dados), antes de
+                    qualquer conversão ou validação
+
+    Returns:
+        Tuple com as colunas (campo -> array int64) das linhas válidas e a
+        lista de (índice, mensagem) das linhas inválidas
+
+    Raises:
+        EntradaArrowInvalidaError: Se o stream for ilegível ou uma coluna
+                                   estiver ausente ou tiver tipo não numérico
+        LoteArrowGrandeError: Se o stream tiver mais que `max_linhas` linhas
+    """
+    try:
+        leitor = pa.ipc.open_stream(pa.py_buffer(corpo))
+        batches = []
+        linhas = 0
+        for batch in leitor:
+            linhas += batch.num_rows
+            if max_linhas is not None and linhas > max_linhas:
+                raise LoteArrowGrandeError(f"Lote excede o limite de {max_linhas} registros")
+            batches.append(batch)
+        tabela = pa.Table.from_batches(batches, schema=leitor.schema)
+    except (pa.ArrowInvalid, OSError) as e:
+        raise EntradaArrowInvalidaError(f"Stream Arrow inválido: {str(e)}")
+
+    ausentes = [coluna for coluna in campos.values() if coluna not in tabela.column_names]
+    if ausentes:
+        raise EntradaArrowInvalidaError(f"Colunas ausentes: {ausentes}")
+
+    n = tabela.num_rows
+    invalido = np.zeros(n, dtype=bool)
+    motivos: Dict[int, List[str]] = {}
+    brutas: Dict[str, np.ndarray] = {}
+
+    for campo, coluna in campos.items():
+        dados = tabela.column(coluna)
+        if not (pa.types.is_integer(dados.type) or pa.types.is_floating(dados.type)):
+            raise EntradaArrowInvalidaError(
+                f"Coluna '{coluna}' deve ser numérica inteira, recebido {dados.type}"
+            )
+
+        nulos = pc.is_null(dados, nan_is_null=True).to_numpy(zero_copy_only=False)
+        if pa.types.is_floating(dados.type):
+            valores = pc.fill_null(dados, 0).to_numpy(zero_copy_only=False)
+            valores = np.where(np.isnan(valores), 0, valores)
+            limite = float(2 ** 63)
+            problema = ~nulos & ((np.mod(valores, 1) != 0) | (np.abs(valores) >= limite))
+            valores = np.where(problema, 0, valores).astype(np.int64)
+            for i in np.flatnonzero(problema):
+                motivos.setdefault(int(i), []).append(f"{coluna}: valor não é um inteiro válido")
+            invalido |= problema
+        else:
+            if dados.type == pa.uint64() and n:
+                maximo = pc.max(dados).as_py()
+                if maximo is not None and maximo >= 2 ** 63:
+                    raise EntradaArrowInvalidaError(f"Coluna '{coluna}' excede o intervalo de int64")
+            valores = pc.fill_null(pc.cast(dados, pa.int64()), 0).to_numpy(zero_copy_only=False)
+
+        for i in np.flatnonzero(nulos):
+            motivos.setdefault(int(i), []).append(f"{coluna}: campo obrigatório ausente")
+        invalido |= nulos
+        brutas[campo] = valores
+
+    validos = ~invalido
+    colunas = {campo: valores[validos] for campo, valores in brutas.items()}
+    erros = [(i, "; ".join(motivos[i])) for i in sorted(motivos)]
+    return colunas, erros
+
+def escrever_resposta(
+    n: int,
+    indices_validos: np.ndarray,
+    predicoes: np.ndarray,
+    probabilidades: np.ndarray,
+    erros: List[Tuple[int, str]],
+    metadados: Dict[str, str]
+) -> bytes:
+    """
+    Monta o record batch de resposta, na ordem da entrada.
+
+    Args:
+        n: Número total de linhas recebidas
+        indices_validos: Posições das linhas pontuadas
+        predicoes: Classe predita de cada linha pontuada
+        probabilidades: Matriz (n_validos, 2) de probabilidades
+        erros: Lista de (índice, mensagem) das linhas inválidas
+        metadados: Metadados do schema (ex.: versão do modelo, totais)
+
+    Returns:
+        Bytes do stream Arrow IPC
+    """
+    pontuada = np.zeros(n, dtype=bool)
+    pontuada[indices_validos] = True
+
+    classe = np.zeros(n, dtype=np.int8)
+    classe[indices_validos] = predicoes
+    proba_menor = np.zeros(n, dtype=np.float64)
+    proba_menor[indices_validos] = probabilidades[:, 0]
+    proba_maior = np.zeros(n, dtype=np.float64)
+    proba_maior[indices_validos] = probabilidades[:, 1]
+
+    mensagens = [None] * n
+    for i, mensagem in erros:
+        mensagens[i] = mensagem
+
+    mascara = ~pontuada
+    batch = pa.record_batch([
+        pa.array(np.arange(n, dtype=np.int64)),
+        pa.array(classe, mask=mascara),
+        pa.DictionaryArray.from_arrays(
+            pa.array(classe, mask=mascara),
+            pa.array(ROTULOS_PREVISAO)
+        ),
+        pa.array(proba_menor, mask=mascara),
+        pa.array(proba_maior, mask=mascara),
+        pa.array(mensagens, type=pa.string())
+    ], schema=SCHEMA_RESPOSTA.with_metadata(metadados))
+
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, batch.schema) as writer:
+        writer.write_batch(batch)
+    return sink.getvalue().to_pybytes()
@@ -0,0 +1,116 @@
+"""
+Cache LRU em memória para previsões da API.
+
+As entradas são indexadas pela tupla canônica dos campos de `InputData` e
+ficam associadas à versão dos artefatos carregados: quando o modelo ou os
+transformadores mudam, o cache inteiro é invalidado.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+class CachePrevisoes:
+    """
+    Cache LRU limitado por número de entradas, com expiração opcional (TTL).
+
+    Seguro para uso concorrente a partir de várias threads.
+    """
+
+    def __init__(self, max_entradas: int = 10000, ttl_segundos: Optional[float] = None):
+        """
+        Args:
+            max_entradas: Número máximo de entradas mantidas
+            ttl_segundos: Tempo de vida de cada entrada; None para não expirar
+        """
+        self.max_entradas = max_entradas
+        self.ttl_segundos = ttl_segundos
+        self.versao: Optional[str] = None
+
+        self._entradas: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.acertos = 0
+        self.falhas = 0
+        self.remocoes = 0
+        self.expiracoes = 0
+        self.invalidacoes = 0
+
+    def obter(self, chave: Hashable) -> Optional[Any]:
+        """Retorna o valor em cache para a chave, ou None."""
+        with self._lock:
+            entrada = self._entradas.get(chave)
+            if entrada is None:
+                self.falhas += 1
+                return None
+
+            valor, expira_em = entrada
+            if expira_em is not None and time.monotonic() >= expira_em:
+                del self._entradas[chave]
+                self.expiracoes += 1
+                self.falhas += 1
+                return None
+
+            self._entradas.move_to_end(chave)
+            self.acertos += 1
+            return valor
+
+    def guardar(self, chave: Hashable, valor: Any, versao: Optional[str] = None):
+        """
+        Guarda um valor, removendo a entrada menos usada se necessário.
+
+        Args:
+            chave: Chave canônica do registro
+            valor: Resultado da previsão
+            versao: Versão dos artefatos que produziram o valor; se informada
+                    e diferente da versão atual do cache, o valor é descartado
+        """
+        if versao is not None and versao != self.versao:
+            return
+        expira_em = (
+            time.monotonic() + self.ttl_segundos if self.ttl_segundos else None
+        )
+        with self._lock:
+            self._entradas[chave] = (valor, expira_em)
+            self._entradas.move_to_end(chave)
+            while len(self._entradas) > self.max_entradas:
+                self._entradas.popitem(last=False)
+                self.remocoes += 1
+
+    def invalidar(self):
+        """Remove todas as entradas."""
+        with self._lock:
+            self._entradas.clear()
+            self.invalidacoes += 1
+
+    def definir_versao(self, versao: str):
+        """
+        Associa o cache à versão dos artefatos, invalidando-o se ela mudou.
+
+        Args:
+            versao: Identificador da versão do modelo e dos transformadores
+        """
+        if versao != self.versao:
+            if self.versao is not None:
+                self.invalidar()
+            self.versao = versao
+
+    def __len__(self) -> int:
+        return len(self._entradas)
+
+    def estatisticas(self) -> Dict[str, Any]:
+        """Retorna tamanho, configuração e contadores do cache."""
+        consultas = self.acertos + self.falhas
+        return {
+            "entries": len(self._entradas),
+            "max_entries": self.max_entradas,
+            "ttl_seconds": self.ttl_segundos,
+            "artifacts_version": self.versao,
+            "hits": self.acertos,
+            "misses": self.falhas,
+            "hit_rate": self.acertos / consultas if consultas else 0.0,
+            "evictions": self.remocoes,
+            "expirations": self.expiracoes,
+            "invalidations": self.invalidacoes
+        }
@@ -0,0 +1,64 @@
+"""
+Coalescência de previsões idênticas em andamento (single-flight).
+
+Requisições concorrentes com a mesma chave aguardam uma única computação
+compartilhada em vez de pontuar o mesmo registro várias vezes. Complementa o
+cache de previsões: o cache atende registros já pontuados, a coalescência
+atende os que ainda estão sendo pontuados.
+
+A computação roda em uma tarefa própria, então o cancelamento de uma das
+requisições (ex.: cliente desconectado) não afeta as demais que a aguardam.
+Deve ser usado a partir de um único event loop.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+class CoalescedorPrevisoes:
+    """Agrupa computações concorrentes com a mesma chave em uma só."""
+
+    def __init__(self):
+        self._em_andamento: Dict[Hashable, asyncio.Future] = {}
+
+        self.computacoes = 0
+        self.coalescidas = 0
+
+    async def executar(self, chave: Hashable, calcular: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Executa `calcular` ou aguarda a computação em andamento com a mesma chave.
+
+        Args:
+            chave: Chave canônica do registro (incluindo a versão do modelo)
+            calcular: Função assíncrona que produz o resultado
+
+        Returns:
+            O resultado da computação compartilhada; exceções também são
+            propagadas a todas as requisições que a aguardavam
+        """
+        tarefa = self._em_andamento.get(chave)
+        if tarefa is None:
+            tarefa = asyncio.ensure_future(calcular())
+            self._em_andamento[chave] = tarefa
+            tarefa.add_done_callback(lambda concluida: self._remover(chave, concluida))
+            self.computacoes += 1
+        else:
+            self.coalescidas += 1
+        return await asyncio.shield(tarefa)
+
+    def _remover(self, chave: Hashable, tarefa: asyncio.Future):
+        if self._em_andamento.get(chave) is tarefa:
+            del self._em_andamento[chave]
+        # Evita o aviso de exceção não lida se todas as requisições foram canceladas
+        if not tarefa.cancelled():
+            tarefa.exception()
+
+    def estatisticas(self) -> Dict[str, Any]:
+        """Retorna as computações feitas, as evitadas e as em andamento."""
+        requisicoes = self.computacoes + self.coalescidas
+        return {
+            "enabled": True,
+            "in_flight": len(self._em_andamento),
+            "computations": self.computacoes,
+            "coalesced": self.coalescidas,
+            "saved_ratio": self.coalescidas / requisicoes if requisicoes else 0.0
+        }
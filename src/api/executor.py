@@ -0,0 +1,141 @@
+"""
+Executor dedicado para a inferência da API.
+
+Concentra o trabalho de CPU (transformação e modelo) em um pool de threads
+de tamanho configurável, fora do event loop, e limita as threads nativas
+usadas por cada chamada (XGBoost `nthread` e BLAS via threadpoolctl) para
+que requisições concorrentes não disputem todos os núcleos.
+
+No modo de núcleos fixos, cada thread de inferência é presa a um núcleo
+diferente e roda com uma única thread nativa, o que troca throughput de
+pico por latência previsível.
+"""
+
+import asyncio
+import itertools
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional
+from threadpoolctl import threadpool_limits
+
+logger = logging.getLogger(__name__)
+
+def nucleos_disponiveis() -> List[int]:
+    """Retorna os núcleos que o processo pode usar."""
+    if hasattr(os, 'sched_getaffinity'):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+class ExecutorInferencia:
+    """
+    Pool de threads de inferência com orçamento de threads nativas por chamada.
+    """
+
+    def __init__(
+        self,
+        n_workers: Optional[int] = None,
+        threads_nativas: int = 1,
+        fixar_nucleos: bool = False
+    ):
+        """
+        Args:
+            n_workers: Número de threads de inferência; se None, uma por núcleo
+            threads_nativas: Threads nativas (XGBoost/BLAS) por chamada
+            fixar_nucleos: Se True, prende cada thread de inferência a um
+                           núcleo e força uma thread nativa por chamada
+        """
+        nucleos = nucleos_disponiveis()
+        self.fixar_nucleos = fixar_nucleos and hasattr(os, 'sched_setaffinity')
+        if fixar_nucleos and not self.fixar_nucleos:
+            logger.warning("Fixação de núcleos não suportada nesta plataforma")
+
+        if self.fixar_nucleos:
+            n_workers = min(n_workers or len(nucleos), len(nucleos))
+            threads_nativas = 1
+
+        self.n_workers = n_workers or len(nucleos)
+        self.threads_nativas = threads_nativas
+        self._nucleos = itertools.cycle(nucleos)
+        self._lock = threading.Lock()
+        self._em_execucao = 0
+        self.tarefas = 0
+
+        # Os limites de BLAS/OpenMP são globais ao processo: aplicá-los uma
+        # única vez evita o custo de inspecionar as bibliotecas a cada chamada.
+        self._limites = threadpool_limits(limits=self.threads_nativas)
+
+        self.pool = ThreadPoolExecutor(
+            max_workers=self.n_workers,
+            thread_name_prefix='inferencia',
+            initializer=self._inicializar_thread
+        )
+        logger.info(
+            f"Executor de inferência: {self.n_workers} workers, "
+            f"{self.threads_nativas} thread(s) nativa(s) por chamada, "
+            f"núcleos fixos: {self.fixar_nucleos}"
+        )
+
+    def _inicializar_thread(self):
+        if self.fixar_nucleos:
+            with self._lock:
+                nucleo = next(self._nucleos)
+            # No Linux, pid 0 refere-se à thread que faz a chamada
+            os.sched_setaffinity(0, {nucleo})
+            logger.debug(f"Thread {threading.current_thread().name} fixada no núcleo {nucleo}")
+
+    def configurar_modelo(self, model: Any) -> Any:
+        """
+        Aplica o orçamento de threads nativas ao modelo.
+
+        Args:
+            model: Modelo carregado (XGBClassifier ou estimador scikit-learn)
+
+        Returns:
+            O próprio modelo, configurado
+        """
+        if hasattr(model, 'get_booster'):
+            model.set_params(n_jobs=self.threads_nativas)
+        return model
+
+    def _executar_contando(self, funcao: Callable, *args) -> Any:
+        with self._lock:
+            self._em_execucao += 1
+            self.tarefas += 1
+        try:
+            return funcao(*args)
+        finally:
+            with self._lock:
+                self._em_execucao -= 1
+
+    async def executar(self, funcao: Callable, *args) -> Any:
+        """
+        Executa uma função síncrona no pool sem bloquear o event loop.
+
+        Args:
+            funcao: Função a executar
+            args: Argumentos posicionais da função
+
+        Returns:
+            O retorno da função
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.pool, partial(self._executar_contando, funcao, *args)
+        )
+
+    def encerrar(self):
+        """Encerra o pool, aguardando as tarefas em andamento."""
+        self.pool.shutdown(wait=True)
+
+    def estatisticas(self) -> Dict[str, Any]:
+        """Retorna a configuração e os contadores do executor."""
+        return {
+            "workers": self.n_workers,
+            "native_threads_per_call": self.threads_nativas,
+            "pinned_cores": self.fixar_nucleos,
+            "tasks": self.tarefas,
+            "in_flight": self._em_execucao
+        }
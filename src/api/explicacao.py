@@ -0,0 +1,73 @@
+"""
+Contribuição de cada feature para as previsões (explicações).
+
+Usa o caminho nativo de cada tipo de modelo, vetorizado sobre o lote: para
+o XGBoost, `pred_contribs` do booster (valores SHAP exatos das árvores,
+calculados em C++); para a regressão logística, coeficiente × valor. As
+contribuições estão na escala da margem (log-odds de >50K): somadas ao
+valor base, resultam no logit da probabilidade prevista.
+"""
+
+import numpy as np
+from typing import Any, Dict, List, Sequence, Tuple
+
+class ExplicadorModelo:
+    """Calcula as contribuições por feature de um XGBClassifier ou de uma LogisticRegression."""
+
+    def __init__(self, model: Any, nomes_features: Sequence[str]):
+        """
+        Args:
+            model: Modelo treinado, o mesmo usado na pontuação
+            nomes_features: Nomes das colunas da matriz de entrada do modelo
+                            (as features mantidas pelo seletor)
+
+        Raises:
+            ValueError: Se o tipo de modelo não for suportado
+        """
+        self.nomes_features = list(nomes_features)
+        if hasattr(model, "get_booster"):
+            self._booster = model.get_booster()
+            self._linear = None
+        elif hasattr(model, "coef_") and np.asarray(model.coef_).shape[0] == 1:
+            self._booster = None
+            self._linear = (
+                np.asarray(model.coef_, dtype=np.float64).ravel(),
+                float(np.asarray(model.intercept_).ravel()[0])
+            )
+        else:
+            raise ValueError(f"Explicações não suportadas para o modelo {type(model).__name__}")
+
+    def contribuicoes(self, X: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Args:
+            X: Matriz com as features selecionadas (uma linha por registro)
+
+        Returns:
+            Tuple com a matriz (n, n_features) de contribuições e o vetor (n,)
+            de valores base
+        """
+        if self._booster is not None:
+            import xgboost as xgb
+            matriz = xgb.DMatrix(X, feature_names=self._booster.feature_names)
+            contribuicoes = self._booster.predict(matriz, pred_contribs=True)
+            # A última coluna é o viés (margem inicial do modelo)
+            return contribuicoes[:, :-1], contribuicoes[:, -1]
+        coeficientes, intercepto = self._linear
+        contribuicoes = np.asarray(X, dtype=np.float64) * coeficientes
+        return contribuicoes, np.full(len(contribuicoes), intercepto)
+
+    def explicar(self, X: np.ndarray) -> List[Dict[str, Any]]:
+        """
+        Returns:
+            Uma explicação por linha de `X`, com o valor base e a contribuição
+            de cada feature
+        """
+        contribuicoes, base = self.contribuicoes(X)
+        nomes = self.nomes_features
+        return [
+            {
+                "base_value": float(valor_base),
+                "contributions": dict(zip(nomes, linha))
+            }
+            for valor_base, linha in zip(base.tolist(), contribuicoes.tolist())
+        ]
@@ -0,0 +1,88 @@
+"""
+Medição do tempo de inicialização da API.
+
+Registra a duração de cada etapa (importações, carga dos artefatos,
+aquecimento, autoteste) e o tempo desde o início do processo, que inclui o
+interpretador e o próprio uvicorn, para acompanhar o tempo de partida a frio
+à medida que o modelo cresce.
+"""
+
+import os
+import sys
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+def segundos_desde_inicio_processo() -> Optional[float]:
+    """
+    Tempo decorrido desde a criação do processo, lido de /proc (apenas Linux).
+
+    Returns:
+        Segundos desde o início do processo, ou None se /proc não estiver disponível
+    """
+    try:
+        with open("/proc/self/stat") as f:
+            # O nome do executável (campo 2) pode conter espaços; os campos
+            # seguintes começam depois do último ')'
+            campos = f.read().rsplit(")", 1)[1].split()
+        with open("/proc/uptime") as f:
+            uptime = float(f.read().split()[0])
+    except OSError:
+        return None
+    inicio_desde_boot = int(campos[19]) / os.sysconf("SC_CLK_TCK")
+    return uptime - inicio_desde_boot
+
+class CronometroInicializacao:
+    """Acumula a duração das etapas de inicialização, na ordem em que ocorrem."""
+
+    def __init__(self):
+        self.etapas: List[Tuple[str, float]] = []
+        self.criado_em = time.perf_counter()
+        self.processo_antes_s = segundos_desde_inicio_processo()
+        self.concluido_em: Optional[float] = None
+
+    @contextmanager
+    def etapa(self, nome: str) -> Iterator[None]:
+        """Mede o bloco como uma etapa com o nome informado."""
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.etapas.append((nome, time.perf_counter() - inicio))
+
+    def registrar(self, nome: str, segundos: float):
+        """Registra uma etapa medida em outro lugar."""
+        self.etapas.append((nome, segundos))
+
+    def concluir(self):
+        """Marca o fim da inicialização (serviço pronto)."""
+        self.concluido_em = time.perf_counter()
+
+    def relatorio(self) -> Dict[str, Any]:
+        """
+        Returns:
+            Dicionário com a duração de cada etapa (ms), o total medido desde a
+            importação da API e, quando disponível, desde o início do processo
+        """
+        fim = self.concluido_em if self.concluido_em is not None else time.perf_counter()
+        total_api = fim - self.criado_em
+        return {
+            "ready": self.concluido_em is not None,
+            "stages_ms": {nome: segundos * 1000 for nome, segundos in self.etapas},
+            "api_ms": total_api * 1000,
+            "process_ms": (
+                (self.processo_antes_s + total_api) * 1000
+                if self.processo_antes_s is not None else None
+            ),
+            "python": sys.version.split()[0]
+        }
+
+    def formatar(self) -> str:
+        """Resumo de uma linha para o log de inicialização."""
+        relatorio = self.relatorio()
+        etapas = ", ".join(f"{nome} {ms:.0f} ms" for nome, ms in relatorio["stages_ms"].items())
+        processo = (
+            f"; {relatorio['process_ms']:.0f} ms desde o início do processo"
+            if relatorio["process_ms"] is not None else ""
+        )
+        return f"{relatorio['api_ms']:.0f} ms desde a importação da API{processo} ({etapas})"
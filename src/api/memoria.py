@@ -0,0 +1,129 @@
+"""
+Relatório de memória do processo a partir de /proc (Linux).
+
+O RSS conta as páginas compartilhadas integralmente em cada processo; o PSS
+divide cada página compartilhada pelo número de processos que a mapeiam e
+é a medida correta para somar o uso de vários workers.
+"""
+
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+CAMPOS_SMAPS = {
+    "Rss": "rss",
+    "Pss": "pss",
+    "Shared_Clean": "shared_clean",
+    "Shared_Dirty": "shared_dirty",
+    "Private_Clean": "private_clean",
+    "Private_Dirty": "private_dirty"
+}
+
+def ler_smaps_rollup(pid: str = "self") -> Dict[str, int]:
+    """
+    Lê os totais de memória do processo, em bytes.
+
+    Returns:
+        Dicionário com rss, pss e as parcelas compartilhada/privada; vazio se
+        /proc não estiver disponível
+    """
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            linhas = f.readlines()
+    except OSError:
+        return {}
+    totais = {}
+    for linha in linhas:
+        partes = linha.split()
+        if len(partes) == 3 and partes[0].rstrip(":") in CAMPOS_SMAPS:
+            totais[CAMPOS_SMAPS[partes[0].rstrip(":")]] = int(partes[1]) * 1024
+    return totais
+
+def memoria_mapeada(diretorio: str, pid: str = "self") -> Dict[str, int]:
+    """
+    Soma o RSS e o PSS das regiões mapeadas a partir de arquivos do diretório.
+
+    Args:
+        diretorio: Diretório dos artefatos mapeados
+
+    Returns:
+        Dicionário com rss e pss (bytes) dos mapeamentos; vazio se /proc não
+        estiver disponível
+    """
+    prefixo = os.path.realpath(diretorio) + os.sep
+    totais = {"rss": 0, "pss": 0}
+    try:
+        with open(f"/proc/{pid}/smaps") as f:
+            dentro = False
+            for linha in f:
+                partes = linha.split()
+                if not partes:
+                    continue
+                if "-" in partes[0] and not partes[0].endswith(":"):
+                    # Cabeçalho de uma região: endereço, permissões, ..., caminho
+                    dentro = len(partes) >= 6 and partes[5].startswith(prefixo)
+                elif dentro and partes[0] in ("Rss:", "Pss:"):
+                    totais[partes[0][:-1].lower()] += int(partes[1]) * 1024
+    except OSError:
+        return {}
+    return totais
+
+def relatorio_memoria(diretorio_mapeado: Optional[str] = None) -> Dict[str, int]:
+    """
+    Relatório de memória do processo atual, em bytes.
+
+    Args:
+        diretorio_mapeado: Se informado, inclui o RSS/PSS das páginas
+                           mapeadas a partir desse diretório
+    """
+    relatorio = ler_smaps_rollup()
+    if diretorio_mapeado is not None:
+        mapeada = memoria_mapeada(diretorio_mapeado)
+        if mapeada:
+            relatorio["mapped_artifacts_rss"] = mapeada["rss"]
+            relatorio["mapped_artifacts_pss"] = mapeada["pss"]
+    return relatorio
+
+class RelatorioMemoriaCache:
+    """
+    Guarda o último `relatorio_memoria` por um tempo de vida curto.
+
+    No modo `mmap`, o relatório percorre `/proc/self/smaps` inteiro, com
+    custo proporcional ao número de mapeamentos; `/metrics` e `/stats`
+    reaproveitam o valor em vez de recalculá-lo a cada coleta.
+    """
+
+    def __init__(self, diretorio_mapeado: Optional[str] = None, ttl_segundos: float = 5.0):
+        """
+        Args:
+            diretorio_mapeado: Diretório repassado a `relatorio_memoria`
+            ttl_segundos: Tempo de vida do relatório; 0 recalcula a cada chamada
+        """
+        self.diretorio_mapeado = diretorio_mapeado
+        self.ttl_segundos = ttl_segundos
+        self._relatorio: Optional[Dict[str, int]] = None
+        self._expira_em = 0.0
+        self._lock = threading.Lock()
+
+    def relatorio(self) -> Dict[str, int]:
+        """Relatório de memória, recalculado apenas quando expirado."""
+        with self._lock:
+            if self._relatorio is None or time.monotonic() >= self._expira_em:
+                self._relatorio = relatorio_memoria(self.diretorio_mapeado)
+                self._expira_em = time.monotonic() + self.ttl_segundos
+            return self._relatorio
+
+def formatar_relatorio(relatorio: Dict[str, int]) -> str:
+    """Resumo de uma linha, em MB, para o log de inicialização."""
+    if not relatorio:
+        return "memória indisponível (/proc não encontrado)"
+    mb = {chave: valor / 2 ** 20 for chave, valor in relatorio.items()}
+    texto = (
+        f"RSS {mb['rss']:.1f} MB, PSS {mb['pss']:.1f} MB "
+        f"(compartilhada {mb['shared_clean'] + mb['shared_dirty']:.1f} MB, "
+        f"privada {mb['private_clean'] + mb['private_dirty']:.1f} MB)"
+    )
+    if "mapped_artifacts_rss" in mb:
+        texto += f", artefatos mapeados {mb['mapped_artifacts_rss']:.2f} MB"
+    return texto
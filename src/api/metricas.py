@@ -0,0 +1,253 @@
+"""
+Métricas de serviço da API no formato de texto do Prometheus.
+
+Implementação mínima e de baixo custo de contadores, medidores e
+histogramas, sem dependências externas. Cada observação custa uma busca
+binária nos limites do histograma e algumas somas sob um lock.
+
+Métricas com rótulo devolvem, em `serie(valor_rotulo)`, a série daquele
+valor; a API resolve uma vez as séries de cada endpoint e etapa e, por
+requisição, atualiza a série diretamente, sem procurar o rótulo.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+LIMITES_LATENCIA = [
+    0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025,
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5
+]
+LIMITES_TAMANHO_LOTE = [1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024, 4096, 16384, 65536]
+
+def _escapar(valor) -> str:
+    return str(valor).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _formatar_rotulos(rotulos: Dict[str, str]) -> str:
+    if not rotulos:
+        return ""
+    pares = ",".join(f'{chave}="{_escapar(valor)}"' for chave, valor in rotulos.items())
+    return "{" + pares + "}"
+
+def _formatar_valor(valor: float) -> str:
+    if valor == float('inf'):
+        return "+Inf"
+    return repr(float(valor)) if isinstance(valor, float) else str(valor)
+
+class SerieContador:
+    """Série de um contador para um valor do rótulo."""
+
+    __slots__ = ("valor", "_lock")
+
+    def __init__(self, lock: threading.Lock):
+        self.valor = 0
+        self._lock = lock
+
+    def incrementar(self, quantidade: float = 1):
+        with self._lock:
+            self.valor += quantidade
+
+class Contador:
+    """Contador monotônico, opcionalmente com um rótulo."""
+
+    tipo = "counter"
+
+    def __init__(self, nome: str, ajuda: str, rotulo: Optional[str] = None):
+        self.nome = nome
+        self.ajuda = ajuda
+        self.rotulo = rotulo
+        self._series: Dict[str, SerieContador] = {}
+        self._lock = threading.Lock()
+
+    def serie(self, valor_rotulo: str = "") -> SerieContador:
+        """Série do valor do rótulo, criada na primeira chamada."""
+        serie = self._series.get(valor_rotulo)
+        if serie is None:
+            with self._lock:
+                serie = self._series.setdefault(valor_rotulo, SerieContador(self._lock))
+        return serie
+
+    def incrementar(self, valor_rotulo: str = "", quantidade: float = 1):
+        self.serie(valor_rotulo).incrementar(quantidade)
+
+    def valor(self, valor_rotulo: str = "") -> float:
+        serie = self._series.get(valor_rotulo)
+        return serie.valor if serie is not None else 0
+
+    def amostras(self) -> Iterable[Tuple[str, Dict[str, str], float]]:
+        for valor_rotulo, serie in sorted(self._series.items()):
+            rotulos = {self.rotulo: valor_rotulo} if self.rotulo else {}
+            yield self.nome, rotulos, serie.valor
+
+class Medidor:
+    """Medidor que pode subir e descer, ou ser lido de uma função."""
+
+    tipo = "gauge"
+
+    def __init__(self, nome: str, ajuda: str, funcao: Optional[Callable[[], float]] = None):
+        self.nome = nome
+        self.ajuda = ajuda
+        self.funcao = funcao
+        self._valor = 0.0
+        self._lock = threading.Lock()
+
+    def incrementar(self, quantidade: float = 1):
+        with self._lock:
+            self._valor += quantidade
+
+    def decrementar(self, quantidade: float = 1):
+        with self._lock:
+            self._valor -= quantidade
+
+    def definir(self, valor: float):
+        self._valor = valor
+
+    def amostras(self) -> Iterable[Tuple[str, Dict[str, str], float]]:
+        yield self.nome, {}, self.funcao() if self.funcao is not None else self._valor
+
+class SerieHistograma:
+    """Série de um histograma para um valor do rótulo."""
+
+    __slots__ = ("limites", "contagens", "soma", "total", "_lock")
+
+    def __init__(self, limites: List[float], lock: threading.Lock):
+        self.limites = limites
+        # Contagens por faixa, com +Inf no fim
+        self.contagens = [0] * (len(limites) + 1)
+        self.soma = 0.0
+        self.total = 0
+        self._lock = lock
+
+    def observar(self, valor: float):
+        indice = bisect_left(self.limites, valor)
+        with self._lock:
+            self.contagens[indice] += 1
+            self.soma += valor
+            self.total += 1
+
+class Histograma:
+    """Histograma de limites fixos, opcionalmente com um rótulo."""
+
+    tipo = "histogram"
+
+    def __init__(self, nome: str, ajuda: str, limites: List[float], rotulo: Optional[str] = None):
+        self.nome = nome
+        self.ajuda = ajuda
+        self.limites = list(limites)
+        self.rotulo = rotulo
+        self._series: Dict[str, SerieHistograma] = {}
+        self._lock = threading.Lock()
+
+    def serie(self, valor_rotulo: str = "") -> SerieHistograma:
+        """Série do valor do rótulo, criada na primeira chamada."""
+        serie = self._series.get(valor_rotulo)
+        if serie is None:
+            with self._lock:
+                serie = self._series.setdefault(valor_rotulo, SerieHistograma(self.limites, self._lock))
+        return serie
+
+    def observar(self, valor: float, valor_rotulo: str = ""):
+        self.serie(valor_rotulo).observar(valor)
+
+    def total(self, valor_rotulo: str = "") -> int:
+        serie = self._series.get(valor_rotulo)
+        return serie.total if serie is not None else 0
+
+    def soma(self, valor_rotulo: str = "") -> float:
+        serie = self._series.get(valor_rotulo)
+        return serie.soma if serie is not None else 0.0
+
+    def valores_rotulo(self) -> List[str]:
+        return sorted(self._series)
+
+    def amostras(self) -> Iterable[Tuple[str, Dict[str, str], float]]:
+        for valor_rotulo, serie in sorted(self._series.items()):
+            contagens, soma, total = serie.contagens, serie.soma, serie.total
+            base = {self.rotulo: valor_rotulo} if self.rotulo else {}
+            acumulado = 0
+            for limite, contagem in zip(self.limites + [float('inf')], contagens):
+                acumulado += contagem
+                yield f"{self.nome}_bucket", {**base, "le": _formatar_valor(limite)}, acumulado
+            yield f"{self.nome}_sum", base, soma
+            yield f"{self.nome}_count", base, total
+
+class RegistroMetricas:
+    """
+    Conjunto de métricas renderizado em `/metrics`.
+
+    Além das métricas próprias, aceita coletores: funções chamadas a cada
+    renderização que devolvem amostras (nome, tipo, ajuda, rótulos, valor),
+    usadas para exportar contadores de outros componentes.
+    """
+
+    def __init__(self):
+        self._metricas: List = []
+        self._coletores: List[Callable[[], Iterable[Tuple[str, str, str, Dict[str, str], float]]]] = []
+
+    def registrar(self, metrica):
+        self._metricas.append(metrica)
+        return metrica
+
+    def contador(self, nome: str, ajuda: str, rotulo: Optional[str] = None) -> Contador:
+        return self.registrar(Contador(nome, ajuda, rotulo))
+
+    def medidor(self, nome: str, ajuda: str, funcao: Optional[Callable[[], float]] = None) -> Medidor:
+        return self.registrar(Medidor(nome, ajuda, funcao))
+
+    def histograma(self, nome: str, ajuda: str, limites: List[float], rotulo: Optional[str] = None) -> Histograma:
+        return self.registrar(Histograma(nome, ajuda, limites, rotulo))
+
+    def adicionar_coletor(self, coletor: Callable[[], Iterable[Tuple[str, str, str, Dict[str, str], float]]]):
+        self._coletores.append(coletor)
+
+    def renderizar(self) -> str:
+        """Gera o texto no formato de exposição do Prometheus (0.0.4)."""
+        linhas = []
+        for metrica in self._metricas:
+            linhas.append(f"# HELP {metrica.nome} {metrica.ajuda}")
+            linhas.append(f"# TYPE {metrica.nome} {metrica.tipo}")
+            for nome, rotulos, valor in metrica.amostras():
+                linhas.append(f"{nome}{_formatar_rotulos(rotulos)} {_formatar_valor(valor)}")
+
+        declaradas = set()
+        for coletor in self._coletores:
+            for nome, tipo, ajuda, rotulos, valor in coletor():
+                if nome not in declaradas:
+                    linhas.append(f"# HELP {nome} {ajuda}")
+                    linhas.append(f"# TYPE {nome} {tipo}")
+                    declaradas.add(nome)
+                linhas.append(f"{nome}{_formatar_rotulos(rotulos)} {_formatar_valor(valor)}")
+
+        return "\n".join(linhas) + "\n"
+
+def medir_overhead(repeticoes: int = 20000) -> float:
+    """
+    Mede o custo, em segundos, da instrumentação de uma requisição típica:
+    um contador, um medidor (sobe e desce) e cinco observações de histograma
+    com as respectivas leituras de relógio, em séries resolvidas antes, como
+    na API.
+
+    Args:
+        repeticoes: Número de requisições simuladas
+
+    Returns:
+        Custo médio por requisição, em segundos
+    """
+    registro = RegistroMetricas()
+    contador = registro.contador("c", "c", "endpoint")
+    medidor = registro.medidor("g", "g")
+    histograma = registro.histograma("h", "h", LIMITES_LATENCIA, "etapa")
+    requisicoes = contador.serie("predict")
+    etapas = [histograma.serie(etapa) for etapa in ["a", "b", "c", "d", "e"]]
+    relogio = time.perf_counter
+
+    inicio = relogio()
+    for _ in range(repeticoes):
+        medidor.incrementar()
+        requisicoes.incrementar()
+        for etapa in etapas:
+            t0 = relogio()
+            etapa.observar(relogio() - t0)
+        medidor.decrementar()
+    return (relogio() - inicio) / repeticoes
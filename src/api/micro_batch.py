@@ -0,0 +1,204 @@
+"""
+Micro-batching adaptativo para requisições concorrentes de previsão.
+
+Requisições individuais são enfileiradas e pontuadas juntas em uma única
+matriz quando o lote atinge o tamanho máximo ou quando o tempo máximo de
+espera expira. Enquanto um lote está sendo pontuado, novas requisições se
+acumulam na fila, de modo que o tamanho do lote cresce com a carga.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+LIMITES_HISTOGRAMA_LOTE = [1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024]
+
+class FilaCheiaError(RuntimeError):
+    """Levantada quando a fila do micro-batcher atinge a profundidade máxima."""
+
+class MicroBatcherParadoError(RuntimeError):
+    """Levantada nas chamadas pendentes quando o micro-batcher é parado."""
+
+class MicroBatcher:
+    """
+    Agrupa chamadas concorrentes em lotes e resolve o future de cada chamador
+    com o resultado da sua própria linha.
+    """
+
+    def __init__(
+        self,
+        funcao_lote: Callable[[List[Any]], List[Any]],
+        max_lote: int = 64,
+        espera_max_ms: float = 2.0,
+        max_fila: int = 1024,
+        executar: Optional[Callable[..., Awaitable[Any]]] = None
+    ):
+        """
+        Args:
+            funcao_lote: Função síncrona que recebe uma lista de itens e
+                         devolve uma lista de resultados na mesma ordem
+            max_lote: Número máximo de itens por lote
+            espera_max_ms: Tempo máximo, em milissegundos, que o primeiro item
+                           de um lote espera por outros itens
+            max_fila: Profundidade máxima da fila; acima dela as chamadas
+                      são rejeitadas com FilaCheiaError
+            executar: Corrotina `executar(funcao, itens)` usada para pontuar
+                      os lotes fora do event loop; se None, usa o executor
+                      padrão do loop
+        """
+        self.funcao_lote = funcao_lote
+        self.max_lote = max_lote
+        self.espera_max = espera_max_ms / 1000
+        self.max_fila = max_fila
+        self.executar = executar
+
+        self._fila: Optional[asyncio.Queue] = None
+        self._tarefa: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        # Itens já retirados da fila: o lote em coleta ou em pontuação
+        self._lote_atual: List[Tuple[Any, asyncio.Future]] = []
+
+        self.lotes = 0
+        self.itens = 0
+        self.rejeitados = 0
+        self.contagem_tamanhos = [0] * (len(LIMITES_HISTOGRAMA_LOTE) + 1)
+
+    def _garantir_iniciado(self):
+        loop = asyncio.get_running_loop()
+        if self._tarefa is None or self._tarefa.done() or self._loop is not loop:
+            self._loop = loop
+            self._fila = asyncio.Queue(maxsize=self.max_fila)
+            self._tarefa = loop.create_task(self._processar())
+
+    async def submeter(self, item: Any) -> Any:
+        """
+        Enfileira um item e aguarda o resultado da sua linha.
+
+        Raises:
+            FilaCheiaError: Se a fila estiver cheia
+        """
+        self._garantir_iniciado()
+        futuro = asyncio.get_running_loop().create_future()
+        try:
+            self._fila.put_nowait((item, futuro))
+        except asyncio.QueueFull:
+            self.rejeitados += 1
+            raise FilaCheiaError(f"Fila de previsões cheia ({self.max_fila} itens)")
+        return await futuro
+
+    async def parar(self):
+        """
+        Cancela o processamento. As chamadas pendentes, do lote em andamento
+        e da fila, recebem MicroBatcherParadoError.
+        """
+        pendentes = list(self._lote_atual)
+        while self._fila is not None and not self._fila.empty():
+            pendentes.append(self._fila.get_nowait())
+        self._lote_atual = []
+
+        for _, futuro in pendentes:
+            if not futuro.done():
+                futuro.set_exception(MicroBatcherParadoError("Micro-batcher parado antes de pontuar a requisição"))
+
+        if self._tarefa is not None:
+            self._tarefa.cancel()
+            try:
+                await self._tarefa
+            except asyncio.CancelledError:
+                pass
+            self._tarefa = None
+
+    async def _coletar_lote(self) -> List[Tuple[Any, asyncio.Future]]:
+        self._lote_atual = lote = []
+        lote.append(await self._fila.get())
+        prazo = time.monotonic() + self.espera_max
+
+        while len(lote) < self.max_lote:
+            try:
+                lote.append(self._fila.get_nowait())
+                continue
+            except asyncio.QueueEmpty:
+                pass
+            restante = prazo - time.monotonic()
+            if restante <= 0:
+                break
+            item = await self._esperar_item(restante)
+            if item is None:
+                break
+            lote.append(item)
+        return lote
+
+    async def _esperar_item(self, restante: float) -> Optional[Tuple[Any, asyncio.Future]]:
+        """
+        Espera até `restante` segundos por um item da fila.
+
+        Com `wait_for`, um `get()` que completa no mesmo ciclo do timeout é
+        descartado antes do Python 3.12 e o chamador nunca é resolvido; aqui a
+        tarefa do `get()` é cancelada e, se ainda assim tiver retirado um
+        item, ele é devolvido.
+        """
+        tarefa = asyncio.ensure_future(self._fila.get())
+        try:
+            await asyncio.wait({tarefa}, timeout=restante)
+            if not tarefa.done():
+                tarefa.cancel()
+                await asyncio.wait({tarefa})
+        except asyncio.CancelledError:
+            tarefa.cancel()
+            if tarefa.done() and not tarefa.cancelled():
+                _, futuro = tarefa.result()
+                if not futuro.done():
+                    futuro.set_exception(MicroBatcherParadoError("Micro-batcher parado antes de pontuar a requisição"))
+            raise
+        return None if tarefa.cancelled() else tarefa.result()
+
+    async def _processar(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            lote = await self._coletar_lote()
+            self._registrar_lote(len(lote))
+            itens = [item for item, _ in lote]
+
+            try:
+                if self.executar is not None:
+                    resultados = await self.executar(self.funcao_lote, itens)
+                else:
+                    resultados = await loop.run_in_executor(None, self.funcao_lote, itens)
+            except Exception as e:
+                logger.error(f"Erro ao pontuar micro-lote de {len(lote)} itens: {str(e)}")
+                for _, futuro in lote:
+                    if not futuro.done():
+                        futuro.set_exception(e)
+                continue
+
+            for (_, futuro), resultado in zip(lote, resultados):
+                if not futuro.done():
+                    futuro.set_result(resultado)
+
+    def _registrar_lote(self, tamanho: int):
+        self.lotes += 1
+        self.itens += tamanho
+        for i, limite in enumerate(LIMITES_HISTOGRAMA_LOTE):
+            if tamanho <= limite:
+                self.contagem_tamanhos[i] += 1
+                return
+        self.contagem_tamanhos[-1] += 1
+
+    def estatisticas(self) -> Dict[str, Any]:
+        """Retorna contadores e a distribuição de tamanhos de lote."""
+        rotulos = [f"<={limite}" for limite in LIMITES_HISTOGRAMA_LOTE]
+        rotulos.append(f">{LIMITES_HISTOGRAMA_LOTE[-1]}")
+        return {
+            "max_batch_size": self.max_lote,
+            "max_wait_ms": self.espera_max * 1000,
+            "max_queue_depth": self.max_fila,
+            "queue_depth": self._fila.qsize() if self._fila is not None else 0,
+            "batches": self.lotes,
+            "items": self.itens,
+            "rejected": self.rejeitados,
+            "mean_batch_size": self.itens / self.lotes if self.lotes else 0.0,
+            "batch_size_distribution": dict(zip(rotulos, self.contagem_tamanhos))
+        }
@@ -0,0 +1,300 @@
+"""
+Gerenciamento do modelo servido pela API, com recarga sem interrupção.
+
+O modelo e os transformadores são mantidos em um único objeto imutável
+(`ArtefatosModelo`). Cada requisição lê a referência atual uma vez e usa
+esse mesmo objeto até o fim, de modo que uma recarga — carregar, aquecer e
+validar a nova versão em segundo plano e depois trocar a referência — não
+afeta as requisições que já estão em andamento.
+"""
+
+import hashlib
+import joblib
+import logging
+import os
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+from src.api.transformador import TransformadorCompilado, construir_transformador
+
+logger = logging.getLogger(__name__)
+
+def versao_artefatos(*caminhos: str) -> str:
+    """
+    Calcula um identificador de versão a partir dos arquivos de artefatos.
+
+    Args:
+        caminhos: Caminhos dos arquivos do modelo e dos transformadores
+
+    Returns:
+        Hash curto baseado no caminho, data de modificação e tamanho de cada arquivo
+    """
+    h = hashlib.sha1()
+    for caminho in caminhos:
+        info = os.stat(caminho)
+        h.update(f"{caminho}:{info.st_mtime_ns}:{info.st_size}".encode())
+    return h.hexdigest()[:12]
+
+class ArtefatosModelo:
+    """
+    Versão carregada do modelo e dos transformadores. Não deve ser alterada
+    depois de publicada.
+    """
+
+    def __init__(
+        self,
+        model: Any,
+        transformers: Dict[str, Any],
+        transformador: Optional[TransformadorCompilado],
+        versao: str,
+        tempo_carga_ms: Optional[float] = None,
+        motor: Optional[Any] = None,
+        etapas_carga_ms: Optional[Dict[str, float]] = None
+    ):
+        self.model = model
+        self.motor = motor
+        self.transformers = transformers
+        self.transformador = transformador
+        self.versao = versao
+        self.tempo_carga_ms = tempo_carga_ms
+        # Duração de cada etapa da carga (desserialização, preparação, validação)
+        self.etapas_carga_ms = etapas_carga_ms or {}
+        self.carregado_em = time.time()
+
+class GerenciadorModelo:
+    """
+    Mantém a versão atual dos artefatos e a substitui atomicamente.
+
+    A recarga pode ser disparada manualmente (`recarregar`) ou pelo
+    monitoramento periódico dos arquivos (`iniciar_monitoramento`).
+    """
+
+    def __init__(
+        self,
+        caminho_modelo: str,
+        caminho_transformadores: str,
+        preparar_modelo: Optional[Callable[[Any], Any]] = None,
+        validar: Optional[Callable[[ArtefatosModelo], None]] = None,
+        diretorio_mmap: Optional[str] = None,
+        construir_motor: Optional[Callable[[Any], Any]] = None
+    ):
+        """
+        Args:
+            caminho_modelo: Caminho do modelo serializado
+            caminho_transformadores: Caminho dos transformadores serializados
+            preparar_modelo: Função aplicada ao modelo recém-carregado
+                             (ex.: configurar threads nativas)
+            validar: Função que executa uma previsão de teste com os novos
+                     artefatos e levanta uma exceção se ela falhar
+            diretorio_mmap: Se informado, carrega os artefatos exportados por
+                            `src.models.serializacao` nesse diretório, com os
+                            arrays mapeados em memória, em vez dos dois caminhos
+            construir_motor: Função que exporta o modelo para um motor de
+                             inferência alternativo (ex.: `motor_numpy`); se
+                             ela falhar, o próprio modelo é usado
+        """
+        self.caminho_modelo = caminho_modelo
+        self.caminho_transformadores = caminho_transformadores
+        self.diretorio_mmap = diretorio_mmap
+        self.construir_motor = construir_motor
+        self.preparar_modelo = preparar_modelo
+        self.validar = validar
+
+        self._atual: Optional[ArtefatosModelo] = None
+        self._ao_trocar: List[Callable[[ArtefatosModelo], None]] = []
+        self._lock_recarga = threading.Lock()
+        self._parar = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._versao_com_falha: Optional[str] = None
+
+        self.recargas = 0
+        self.falhas_recarga = 0
+
+    @property
+    def atual(self) -> ArtefatosModelo:
+        """Versão em uso. Leia uma vez por requisição e reutilize o objeto."""
+        return self._atual
+
+    def ao_trocar(self, callback: Callable[[ArtefatosModelo], None]):
+        """Registra uma função chamada sempre que uma nova versão é publicada."""
+        self._ao_trocar.append(callback)
+
+    def versao_em_disco(self) -> str:
+        if self.diretorio_mmap is not None:
+            from src.models.serializacao import arquivos_artefatos_mmap
+            return versao_artefatos(*arquivos_artefatos_mmap(self.diretorio_mmap))
+        return versao_artefatos(self.caminho_modelo, self.caminho_transformadores)
+
+    def carregar(self) -> ArtefatosModelo:
+        """
+        Carrega, prepara e valida os artefatos do disco, sem publicá-los.
+
+        Returns:
+            Nova versão dos artefatos
+        """
+        return self._carregar(
+            self.versao_em_disco(), self.caminho_modelo, self.caminho_transformadores, self.diretorio_mmap
+        )
+
+    def carregar_arquivos(self, caminho_modelo: str, caminho_transformadores: str, versao: str) -> ArtefatosModelo:
+        """
+        Carrega outros artefatos (ex.: uma versão do registro de modelos) com a
+        mesma preparação, motor e validação da versão principal, sem publicá-los.
+
+        Args:
+            caminho_modelo: Caminho do modelo serializado com joblib
+            caminho_transformadores: Caminho dos transformadores serializados
+            versao: Identificador da versão carregada
+
+        Returns:
+            Artefatos carregados
+        """
+        return self._carregar(versao, caminho_modelo, caminho_transformadores, None)
+
+    def _carregar(
+        self,
+        versao: str,
+        caminho_modelo: str,
+        caminho_transformadores: str,
+        diretorio_mmap: Optional[str]
+    ) -> ArtefatosModelo:
+        inicio = time.perf_counter()
+        etapas: Dict[str, float] = {}
+        modulos_antes = set(sys.modules)
+
+        def marcar(etapa: str, desde: float) -> float:
+            agora = time.perf_counter()
+            etapas[etapa] = (agora - desde) * 1000
+            return agora
+
+        if diretorio_mmap is not None:
+            from src.models.serializacao import carregar_artefatos_mmap
+            model, transformers = carregar_artefatos_mmap(diretorio_mmap)
+            marco = marcar("artefatos_mmap", inicio)
+        else:
+            model = joblib.load(caminho_modelo)
+            marco = marcar("modelo", inicio)
+            transformers = joblib.load(caminho_transformadores)
+            marco = marcar("transformadores", marco)
+        if self.preparar_modelo is not None:
+            model = self.preparar_modelo(model)
+        tempo_carga_ms = (time.perf_counter() - inicio) * 1000
+        # Bibliotecas importadas pela desserialização (só na primeira carga)
+        bibliotecas = sorted({
+            nome.split(".")[0] for nome in set(sys.modules) - modulos_antes
+        } & {"xgboost", "sklearn", "pandas", "scipy"})
+        motor = None
+        if self.construir_motor is not None:
+            try:
+                motor = self.construir_motor(model)
+            except ValueError as e:
+                logger.warning(f"Motor de inferência indisponível; usando o modelo: {str(e)}")
+        transformador = construir_transformador(transformers, model)
+        marco = marcar("preparacao", marco)
+        artefatos = ArtefatosModelo(
+            model, transformers, transformador, versao, tempo_carga_ms, motor, etapas
+        )
+
+        # A previsão de teste valida a nova versão e já a aquece
+        if self.validar is not None:
+            self.validar(artefatos)
+            marcar("validacao", marco)
+
+        logger.info(
+            f"Artefatos versão {versao} carregados em {tempo_carga_ms:.1f} ms, "
+            f"prontos em {(time.perf_counter() - inicio) * 1000:.1f} ms "
+            f"(modelo: {type(model).__name__}, "
+            f"motor: {type(motor).__name__ if motor is not None else 'modelo'}, "
+            f"formato: {'mmap' if diretorio_mmap is not None else 'joblib'}; "
+            f"etapas: {', '.join(f'{etapa} {ms:.1f} ms' for etapa, ms in etapas.items())}"
+            f"{'; importou ' + ', '.join(bibliotecas) if bibliotecas else ''})"
+        )
+        return artefatos
+
+    def _publicar(self, artefatos: ArtefatosModelo):
+        self._atual = artefatos
+        for callback in self._ao_trocar:
+            callback(artefatos)
+
+    def inicializar(self) -> ArtefatosModelo:
+        """Carrega e publica a primeira versão. Falhas são propagadas."""
+        artefatos = self.carregar()
+        self._publicar(artefatos)
+        return artefatos
+
+    def recarregar(self, forcar: bool = False) -> Dict[str, Any]:
+        """
+        Carrega a versão em disco e, se for válida, a publica.
+
+        Args:
+            forcar: Recarrega mesmo que a versão em disco seja a atual
+
+        Returns:
+            Dicionário com o resultado da recarga
+        """
+        with self._lock_recarga:
+            anterior = self._atual.versao if self._atual is not None else None
+            try:
+                versao = self.versao_em_disco()
+                if not forcar and versao == anterior:
+                    return {"reloaded": False, "model_version": anterior}
+
+                novo = self.carregar()
+                self._publicar(novo)
+                self.recargas += 1
+                self._versao_com_falha = None
+                logger.info(f"Modelo trocado: {anterior} -> {novo.versao}")
+                return {"reloaded": True, "previous_version": anterior, "model_version": novo.versao}
+
+            except Exception as e:
+                self.falhas_recarga += 1
+                logger.error(f"Falha ao recarregar artefatos; mantendo a versão {anterior}: {str(e)}")
+                return {"reloaded": False, "model_version": anterior, "error": str(e)}
+
+    def _monitorar(self, intervalo: float):
+        while not self._parar.wait(intervalo):
+            try:
+                versao = self.versao_em_disco()
+            except OSError as e:
+                logger.warning(f"Artefatos indisponíveis para verificação: {str(e)}")
+                continue
+            # Uma versão que já falhou só é tentada de novo quando os arquivos mudarem
+            if versao != self._atual.versao and versao != self._versao_com_falha:
+                resultado = self.recarregar()
+                if "error" in resultado:
+                    self._versao_com_falha = versao
+
+    def iniciar_monitoramento(self, intervalo_segundos: float):
+        """Verifica periodicamente os arquivos e recarrega quando mudarem."""
+        if self._thread is not None or intervalo_segundos <= 0:
+            return
+        self._parar.clear()
+        self._thread = threading.Thread(
+            target=self._monitorar, args=(intervalo_segundos,),
+            name='monitor-artefatos', daemon=True
+        )
+        self._thread.start()
+        logger.info(f"Monitorando artefatos a cada {intervalo_segundos} s")
+
+    def parar_monitoramento(self):
+        """Interrompe o monitoramento dos arquivos."""
+        if self._thread is not None:
+            self._parar.set()
+            self._thread.join()
+            self._thread = None
+
+    def estatisticas(self) -> Dict[str, Any]:
+        """Retorna a versão em uso e os contadores de recarga."""
+        return {
+            "model_version": self._atual.versao if self._atual is not None else None,
+            "loaded_at": self._atual.carregado_em if self._atual is not None else None,
+            "load_ms": self._atual.tempo_carga_ms if self._atual is not None else None,
+            "artifacts_format": "mmap" if self.diretorio_mmap is not None else "joblib",
+            "engine": (
+                type(self._atual.motor).__name__
+                if self._atual is not None and self._atual.motor is not None else "model"
+            ),
+            "reloads": self.recargas,
+            "reload_failures": self.falhas_recarga
+        }
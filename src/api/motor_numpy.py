@@ -0,0 +1,192 @@
+"""
+Motor de inferência em NumPy puro para os modelos salvos por `modelagem`.
+
+O modelo é exportado uma vez para arrays planos: para o XGBoost, os nós de
+todas as árvores (feature, limiar, filhos, direção dos valores ausentes e
+valor das folhas); para a regressão logística, os coeficientes e o
+intercepto. A avaliação é vetorizada sobre o lote e produz a classe e as
+duas probabilidades em uma única passada, sem construir DMatrix e sem
+chamar `predict` e `predict_proba` separadamente.
+
+A descida nas árvores em NumPy é limitada por acessos indexados e só vence
+o preditor em C++ do XGBoost em lotes pequenos, onde o custo fixo domina.
+Acima de `limite_linhas` linhas, o motor de árvores chama
+`Booster.inplace_predict`, que também faz uma única passada sem DMatrix.
+
+A semântica segue a do preditor do XGBoost: entradas convertidas para
+float32, desvio à esquerda quando `x < limiar`, valores ausentes (NaN)
+seguindo `default_left`, margem acumulada em float32 árvore a árvore a
+partir de `base_score` e sigmoide no fim.
+"""
+
+import json
+import numpy as np
+from scipy.special import expit
+from typing import Any, Optional, Tuple
+
+# Visitas a nós (linhas x árvores x profundidade) abaixo das quais a descida
+# em NumPy é mais rápida que inplace_predict; medido com
+# `python -m src.benchmarks.motor_numpy`
+ORCAMENTO_VISITAS_NUMPY = 16000
+
+class MotorArvores:
+    """Avaliação vetorizada de um XGBClassifier binário (binary:logistic)."""
+
+    def __init__(self, model: Any, limite_linhas: Optional[int] = None):
+        """
+        Args:
+            model: XGBClassifier treinado com objetivo binary:logistic
+            limite_linhas: Lotes maiores que isso usam `inplace_predict`; por
+                           padrão, calculado a partir do número de árvores e
+                           da profundidade
+
+        Raises:
+            ValueError: Se o modelo usar recursos não suportados
+                        (multiclasse, splits categóricos, outro objetivo)
+        """
+        learner = json.loads(model.get_booster().save_raw("json"))["learner"]
+        objetivo = learner["objective"]["name"]
+        if objetivo != "binary:logistic":
+            raise ValueError(f"Objetivo não suportado pelo motor NumPy: {objetivo}")
+
+        parametros = learner["learner_model_param"]
+        base_score = np.float32(float(parametros["base_score"].strip("[]")))
+        # Margem inicial: logit(base_score), como em ProbToMargin do XGBoost.
+        # logf/expf da libm são corretamente arredondadas; calcular em float64
+        # e arredondar para float32 reproduz o resultado, o que o log/exp em
+        # float32 do NumPy nem sempre faz
+        razao = np.float32(1.0) / base_score - np.float32(1.0)
+        self.margem_base = np.float32(-np.log(np.float64(razao)))
+
+        arvores = learner["gradient_booster"]["model"]["trees"]
+        n_paralelas = int(learner["gradient_booster"]["model"]["gbtree_model_param"]["num_parallel_tree"])
+        melhor_iteracao = learner.get("attributes", {}).get("best_iteration")
+        if melhor_iteracao is not None:
+            arvores = arvores[:(int(melhor_iteracao) + 1) * n_paralelas]
+        self.iteracoes = len(arvores) // n_paralelas
+        self.booster = model.get_booster()
+
+        features, limiares, esquerda, direita, padrao_esquerda, folhas, raizes = [], [], [], [], [], [], []
+        deslocamento = 0
+        for arvore in arvores:
+            if any(tipo != 0 for tipo in arvore["split_type"]):
+                raise ValueError("Splits categóricos não são suportados pelo motor NumPy")
+            filhos_esquerda = np.asarray(arvore["left_children"], dtype=np.int64)
+            filhos_direita = np.asarray(arvore["right_children"], dtype=np.int64)
+            eh_folha = filhos_esquerda == -1
+            condicoes = np.asarray(arvore["split_conditions"], dtype=np.float32)
+
+            # Folhas apontam para si mesmas: a descida fica parada nelas
+            proprios = np.arange(len(filhos_esquerda)) + deslocamento
+            esquerda.append(np.where(eh_folha, proprios, filhos_esquerda + deslocamento))
+            direita.append(np.where(eh_folha, proprios, filhos_direita + deslocamento))
+            features.append(np.where(eh_folha, 0, arvore["split_indices"]))
+            limiares.append(condicoes)
+            padrao_esquerda.append(np.asarray(arvore["default_left"], dtype=bool))
+            # Nas folhas, split_conditions guarda o valor da folha
+            folhas.append(np.where(eh_folha, condicoes, np.float32(0)))
+            raizes.append(deslocamento)
+            deslocamento += len(filhos_esquerda)
+
+        self.feature = np.concatenate(features).astype(np.intp)
+        self.limiar = np.concatenate(limiares)
+        self.esquerda = np.concatenate(esquerda)
+        self.direita = np.concatenate(direita)
+        self.padrao_esquerda = np.concatenate(padrao_esquerda)
+        self.folha = np.concatenate(folhas).astype(np.float32)
+        self.raizes = np.asarray(raizes, dtype=np.int64)
+        self.profundidade = self._profundidade_maxima()
+        self.limite_linhas = limite_linhas or max(
+            1, ORCAMENTO_VISITAS_NUMPY // (len(self.raizes) * max(self.profundidade, 1))
+        )
+        self.classes = np.asarray(model.classes_)
+        self.n_features = int(parametros["num_feature"])
+
+    def _profundidade_maxima(self) -> int:
+        profundidade = 0
+        nivel = self.raizes
+        while True:
+            proximos = np.concatenate([self.esquerda[nivel], self.direita[nivel]])
+            proximos = proximos[(proximos != np.concatenate([nivel, nivel]))]
+            if len(proximos) == 0:
+                return profundidade
+            nivel = np.unique(proximos)
+            profundidade += 1
+
+    def margem(self, X: np.ndarray) -> np.ndarray:
+        """Margem (logit) de cada linha, acumulada em float32."""
+        X = np.asarray(X, dtype=np.float32)
+        n = len(X)
+        linhas = np.arange(n)[:, None]
+        nos = np.broadcast_to(self.raizes, (n, len(self.raizes))).copy()
+        for _ in range(self.profundidade):
+            valores = X[linhas, self.feature[nos]]
+            vai_esquerda = np.where(np.isnan(valores), self.padrao_esquerda[nos], valores < self.limiar[nos])
+            nos = np.where(vai_esquerda, self.esquerda[nos], self.direita[nos])
+
+        folhas = self.folha[nos]
+        margem = np.full(n, self.margem_base, dtype=np.float32)
+        # Soma sequencial, na ordem das árvores, como no preditor do XGBoost
+        for j in range(folhas.shape[1]):
+            margem += folhas[:, j]
+        return margem
+
+    def prever(self, X: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns:
+            Tuple com as classes preditas e a matriz (n, 2) de probabilidades
+        """
+        if len(X) > self.limite_linhas:
+            positiva = self.booster.inplace_predict(X, iteration_range=(0, self.iteracoes))
+        else:
+            margem = self.margem(X)
+            exponencial = np.exp(-margem.astype(np.float64)).astype(np.float32)
+            positiva = np.float32(1.0) / (np.float32(1.0) + exponencial)
+        probabilidades = np.column_stack([np.float32(1.0) - positiva, positiva])
+        return self.classes[(positiva > 0.5).astype(np.intp)], probabilidades
+
+class MotorLinear:
+    """Avaliação de uma LogisticRegression binária."""
+
+    def __init__(self, model: Any):
+        """
+        Args:
+            model: LogisticRegression binária treinada
+
+        Raises:
+            ValueError: Se o modelo não for binário
+        """
+        if len(model.classes_) != 2:
+            raise ValueError("O motor NumPy suporta apenas regressão logística binária")
+        self.coeficientes = np.ascontiguousarray(model.coef_.T, dtype=np.float64)
+        self.intercepto = np.asarray(model.intercept_, dtype=np.float64)
+        self.classes = np.asarray(model.classes_)
+        self.n_features = self.coeficientes.shape[0]
+
+    def prever(self, X: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns:
+            Tuple com as classes preditas e a matriz (n, 2) de probabilidades
+        """
+        decisao = (np.asarray(X, dtype=np.float64) @ self.coeficientes + self.intercepto).ravel()
+        positiva = expit(decisao)
+        probabilidades = np.column_stack([1.0 - positiva, positiva])
+        return self.classes[(decisao > 0).astype(np.intp)], probabilidades
+
+def construir_motor(model: Any, limite_linhas_arvores: Optional[int] = None) -> Optional[Any]:
+    """
+    Exporta o modelo para o motor NumPy correspondente.
+
+    Args:
+        model: Modelo treinado
+        limite_linhas_arvores: Tamanho máximo de lote avaliado em NumPy pelo
+                               motor de árvores; por padrão, automático
+
+    Returns:
+        MotorArvores, MotorLinear ou None se o tipo de modelo não for suportado
+    """
+    if hasattr(model, "get_booster"):
+        return MotorArvores(model, limite_linhas_arvores)
+    if hasattr(model, "coef_") and hasattr(model, "predict_proba"):
+        return MotorLinear(model)
+    return None
@@ -0,0 +1,126 @@
+"""
+Verificações de saúde da API.
+
+Separa as sondas baratas das verificações que executam o modelo:
+- vivacidade (liveness): não faz nenhum trabalho de modelo;
+- prontidão (readiness): devolve o resultado do último autoteste, executado
+  na inicialização e depois periodicamente em segundo plano;
+- verificação profunda: executa uma previsão real, limitada a uma execução
+  por intervalo mínimo.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+class VerificadorSaude:
+    """
+    Executa e guarda o resultado dos autotestes de previsão.
+    """
+
+    def __init__(
+        self,
+        funcao_teste: Callable[[], Any],
+        executar: Callable[..., Awaitable[Any]],
+        intervalo_segundos: float = 30.0,
+        intervalo_minimo_profundo_segundos: float = 10.0
+    ):
+        """
+        Args:
+            funcao_teste: Função síncrona que executa uma previsão de teste e
+                          levanta uma exceção em caso de falha
+            executar: Corrotina `executar(funcao)` que roda a função fora do
+                      event loop (ex.: o executor de inferência)
+            intervalo_segundos: Intervalo entre autotestes em segundo plano
+            intervalo_minimo_profundo_segundos: Intervalo mínimo entre duas
+                                                verificações profundas
+        """
+        self.funcao_teste = funcao_teste
+        self.executar = executar
+        self.intervalo = intervalo_segundos
+        self.intervalo_minimo_profundo = intervalo_minimo_profundo_segundos
+
+        self.ultimo_autoteste: Optional[Dict[str, Any]] = None
+        self.ultima_verificacao_profunda: Optional[Dict[str, Any]] = None
+        self._tarefa: Optional[asyncio.Task] = None
+        # Criado dentro do event loop do servidor: no Python 3.9, um Lock
+        # criado na importação fica preso ao loop de `get_event_loop()`
+        self._lock_profundo: Optional[asyncio.Lock] = None
+
+    def _lock(self) -> asyncio.Lock:
+        if self._lock_profundo is None:
+            self._lock_profundo = asyncio.Lock()
+        return self._lock_profundo
+
+    async def _testar(self) -> Dict[str, Any]:
+        inicio = time.perf_counter()
+        try:
+            await self.executar(self.funcao_teste)
+            resultado = {"ok": True}
+        except Exception as e:
+            logger.error(f"Autoteste de previsão falhou: {str(e)}")
+            resultado = {"ok": False, "error": str(e)}
+        resultado["duration_ms"] = (time.perf_counter() - inicio) * 1000
+        resultado["timestamp"] = time.time()
+        return resultado
+
+    async def executar_autoteste(self) -> Dict[str, Any]:
+        """Executa o autoteste e atualiza o estado de prontidão."""
+        self.ultimo_autoteste = await self._testar()
+        return self.ultimo_autoteste
+
+    async def _autotestes_periodicos(self):
+        while True:
+            await asyncio.sleep(self.intervalo)
+            await self.executar_autoteste()
+
+    async def iniciar(self):
+        """Executa o autoteste de inicialização e agenda os periódicos."""
+        self._lock()
+        resultado = await self.executar_autoteste()
+        logger.info(f"Autoteste de inicialização: {'ok' if resultado['ok'] else 'falhou'}")
+        if self.intervalo > 0:
+            self._tarefa = asyncio.get_running_loop().create_task(self._autotestes_periodicos())
+
+    async def parar(self):
+        """Cancela os autotestes periódicos."""
+        if self._tarefa is not None:
+            self._tarefa.cancel()
+            try:
+                await self._tarefa
+            except asyncio.CancelledError:
+                pass
+            self._tarefa = None
+
+    @property
+    def pronto(self) -> bool:
+        return self.ultimo_autoteste is not None and self.ultimo_autoteste["ok"]
+
+    def estado_prontidao(self) -> Dict[str, Any]:
+        """Retorna o estado de prontidão sem executar o modelo."""
+        if self.ultimo_autoteste is None:
+            return {"status": "not_ready", "self_test": None}
+        return {
+            "status": "ready" if self.pronto else "not_ready",
+            "self_test": {
+                **self.ultimo_autoteste,
+                "age_seconds": time.time() - self.ultimo_autoteste["timestamp"]
+            }
+        }
+
+    async def verificacao_profunda(self) -> Dict[str, Any]:
+        """
+        Executa uma previsão real, no máximo uma vez por intervalo mínimo.
+
+        Dentro do intervalo, devolve o último resultado marcado como `cached`.
+        """
+        async with self._lock():
+            ultima = self.ultima_verificacao_profunda
+            if ultima is not None and time.time() - ultima["timestamp"] < self.intervalo_minimo_profundo:
+                return {**ultima, "cached": True}
+
+            self.ultima_verificacao_profunda = await self._testar()
+            return {**self.ultima_verificacao_profunda, "cached": False}
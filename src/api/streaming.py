@@ -0,0 +1,147 @@
+"""
+Leitura incremental de corpos NDJSON/CSV e resposta em streaming.
+
+`RespostaStreaming` é uma resposta ASGI que lê o corpo da requisição e
+escreve a resposta no mesmo laço: o próximo pedaço do corpo só é lido depois
+que o resultado do pedaço anterior foi entregue ao servidor. Como `send`
+aguarda o esvaziamento do buffer de escrita quando o cliente lê devagar,
+nem a entrada nem a saída acumulam sem limite na memória.
+
+A `StreamingResponse` do Starlette não serve aqui porque consome o canal
+`receive` para detectar a desconexão do cliente, o que descartaria o corpo.
+"""
+
+import csv
+import json
+from typing import Any, AsyncIterator, Callable, Dict, Mapping, Optional, Union
+from starlette.background import BackgroundTask
+from starlette.requests import ClientDisconnect
+from starlette.responses import Response
+
+FORMATOS_NDJSON = ("application/x-ndjson", "application/ndjson", "application/jsonlines")
+FORMATOS_CSV = ("text/csv",)
+
+class LinhaInvalidaError(ValueError):
+    """Linha do corpo que não pôde ser interpretada."""
+
+async def ler_corpo(receive) -> AsyncIterator[bytes]:
+    """
+    Lê o corpo da requisição diretamente do canal ASGI, pedaço a pedaço.
+
+    Raises:
+        ClientDisconnect: Se o cliente desconectar antes do fim do corpo
+    """
+    while True:
+        mensagem = await receive()
+        if mensagem["type"] == "http.disconnect":
+            raise ClientDisconnect()
+        corpo = mensagem.get("body", b"")
+        if corpo:
+            yield corpo
+        if not mensagem.get("more_body", False):
+            return
+
+async def ler_linhas(partes: AsyncIterator[bytes], max_bytes_linha: int) -> AsyncIterator[bytes]:
+    """
+    Divide um fluxo de bytes em linhas, mantendo em memória apenas a linha
+    incompleta.
+
+    Raises:
+        LinhaInvalidaError: Se uma linha exceder `max_bytes_linha`
+    """
+    resto = b""
+    async for parte in partes:
+        resto += parte
+        *linhas, resto = resto.split(b"\n")
+        for linha in linhas:
+            yield linha
+        if len(resto) > max_bytes_linha:
+            raise LinhaInvalidaError(f"Linha excede o limite de {max_bytes_linha} bytes")
+    if resto:
+        yield resto
+
+async def ler_registros(
+    linhas: AsyncIterator[bytes],
+    formato: str
+) -> AsyncIterator[Union[Dict[str, Any], LinhaInvalidaError]]:
+    """
+    Converte as linhas em registros (dicionários).
+
+    Linhas que não puderem ser interpretadas são devolvidas como
+    LinhaInvalidaError, na mesma posição, para serem reportadas por linha.
+
+    Args:
+        linhas: Linhas do corpo, sem o separador
+        formato: 'ndjson' ou 'csv' (a primeira linha do CSV é o cabeçalho)
+    """
+    cabecalho = None
+    async for linha in linhas:
+        linha = linha.rstrip(b"\r")
+        if not linha.strip():
+            continue
+        try:
+            texto = linha.decode("utf-8")
+            if formato == "ndjson":
+                registro = json.loads(texto)
+                if not isinstance(registro, dict):
+                    raise ValueError("Cada linha deve ser um objeto JSON")
+                yield registro
+            elif cabecalho is None:
+                cabecalho = [coluna.strip() for coluna in next(csv.reader([texto]))]
+            else:
+                valores = next(csv.reader([texto]))
+                if len(valores) != len(cabecalho):
+                    raise ValueError(
+                        f"Linha com {len(valores)} colunas; o cabeçalho tem {len(cabecalho)}"
+                    )
+                yield dict(zip(cabecalho, valores))
+        except (ValueError, UnicodeDecodeError) as e:
+            yield LinhaInvalidaError(str(e))
+
+class RespostaStreaming(Response):
+    """
+    Resposta que consome o corpo da requisição enquanto produz a saída.
+    """
+
+    media_type = "application/x-ndjson"
+
+    def __init__(
+        self,
+        processar: Callable[[AsyncIterator[bytes]], AsyncIterator[bytes]],
+        status_code: int = 200,
+        headers: Optional[Mapping[str, str]] = None,
+        media_type: Optional[str] = None,
+        background: Optional[BackgroundTask] = None
+    ):
+        """
+        Args:
+            processar: Função que recebe os pedaços do corpo e gera os
+                       pedaços da resposta
+            status_code: Status HTTP da resposta
+            headers: Cabeçalhos adicionais
+            media_type: Tipo de conteúdo da resposta; por padrão, NDJSON
+            background: Tarefa executada depois do último pedaço
+        """
+        self.processar = processar
+        super().__init__(None, status_code=status_code, headers=headers, media_type=media_type, background=background)
+
+    def render(self, content: Any) -> None:
+        # Sem `body`, init_headers não declara Content-Length e a resposta
+        # é enviada com Transfer-Encoding: chunked
+        return None
+
+    async def __call__(self, scope, receive, send):
+        await send({
+            "type": "http.response.start",
+            "status": self.status_code,
+            "headers": self.raw_headers
+        })
+        try:
+            async for saida in self.processar(ler_corpo(receive)):
+                await send({"type": "http.response.body", "body": saida, "more_body": True})
+        except ClientDisconnect:
+            return
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+        if self.background is not None:
+            await self.background()
@@ -0,0 +1,219 @@
+"""
+Transformador de features "compilado" para a API.
+
+Reproduz o resultado de `transformar_features` (pandas) usando apenas NumPy:
+as categorias do OneHotEncoder e a máscara do SelectKBest são convertidas,
+uma única vez, em tabelas de índices que levam os campos brutos de
+`InputData` diretamente ao vetor final de features selecionadas. As features
+numéricas e discretizadas são calculadas pelo mesmo motor do treino
+(`src.data.especificacao_features`).
+"""
+
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+from src.data.especificacao_features import ESPECIFICACAO, FEATURES_NUMERICAS, MotorFeatures
+
+RENOMEAR_COLUNAS = {
+    'marital_status': 'marital-status',
+    'native_country': 'native-country',
+    'capital_gain': 'capital-gain',
+    'capital_loss': 'capital-loss',
+    'education_num': 'education-num',
+    'hours_per_week': 'hours-per-week'
+}
+
+# Features de artefatos anteriores à especificação que a API não recebe;
+# continuam indo como 0
+FEATURES_SEM_ENTRADA = ['fnlwgt']
+
+def _e_nan(valor) -> bool:
+    return isinstance(valor, float) and np.isnan(valor)
+
+def verificar_rotulos(encoder) -> None:
+    """
+    Confere se as faixas codificadas pelo encoder são as de `ESPECIFICACAO`.
+
+    Encoders de antes da especificação compartilhada têm `nivel_educacao`
+    em quartis ('Superior', 'Avançado'); com `handle_unknown='ignore'`,
+    essas colunas sairiam sempre zeradas e as previsões ficariam
+    distorcidas sem nenhum erro.
+
+    Raises:
+        ValueError: Se o encoder tiver rótulos que a especificação não gera
+    """
+    for coluna, categorias in zip(encoder.feature_names_in_, encoder.categories_):
+        if coluna not in ESPECIFICACAO:
+            continue
+        desconhecidos = [c for c in categorias if not _e_nan(c) and c not in ESPECIFICACAO[coluna]['rotulos']]
+        if desconhecidos:
+            raise ValueError(
+                f"O encoder foi treinado com faixas de '{coluna}' que a especificação de features "
+                f"não gera mais ({desconhecidos}); rode novamente o pré-processamento, o feature "
+                f"engineering e o treino do modelo"
+            )
+
+class TransformadorCompilado:
+    """
+    Mapeia os campos brutos de entrada para o vetor final de features.
+
+    Construído uma vez a partir do OneHotEncoder e do SelectKBest ajustados;
+    apenas as features que sobrevivem à seleção são calculadas.
+    """
+
+    def __init__(
+        self,
+        encoder,
+        selector=None,
+        zeros_ausentes: bool = False,
+        colunas: Optional[List[str]] = None,
+        motor: Optional[MotorFeatures] = None
+    ):
+        """
+        Args:
+            encoder: OneHotEncoder ajustado (`one_hot_encoder` dos transformadores)
+            selector: SelectKBest ajustado (opcional)
+            colunas: Features de saída, na ordem do modelo; por padrão, as do
+                     selector (as do plano de features, quando o encoder só
+                     tem as categorias mantidas e não há selector)
+            zeros_ausentes: Se True, zeros saem como NaN: é assim que o
+                            XGBoost vê as entradas não armazenadas de uma
+                            matriz esparsa, então um modelo de árvores
+                            treinado em CSR recebe a mesma entrada do treino
+            motor: Especificação de features compilada com os parâmetros do
+                   treino; por padrão, os campos são usados como valores brutos
+        """
+        verificar_rotulos(encoder)
+        self.zeros_ausentes = zeros_ausentes
+        self.motor = motor or MotorFeatures()
+        colunas_categoricas = list(encoder.feature_names_in_)
+        nomes_encoder = list(encoder.get_feature_names_out(colunas_categoricas))
+
+        if colunas is not None:
+            self.colunas_saida = list(colunas)
+        elif selector is not None:
+            self.colunas_saida = list(selector.feature_names_in_[selector.get_support()])
+        else:
+            self.colunas_saida = FEATURES_NUMERICAS + nomes_encoder
+
+        posicao_encoder: Dict[str, Tuple[int, object]] = {}
+        i = 0
+        for indice_coluna, categorias in enumerate(encoder.categories_):
+            for categoria in categorias:
+                posicao_encoder[nomes_encoder[i]] = (indice_coluna, categoria)
+                i += 1
+
+        self._numericas: List[Tuple[int, str]] = []
+        self._ausentes: List[int] = []
+        selecionadas: Dict[int, List[Tuple[int, object]]] = {}
+        for j, nome in enumerate(self.colunas_saida):
+            if nome in FEATURES_NUMERICAS:
+                self._numericas.append((j, nome))
+            elif nome in posicao_encoder:
+                indice_coluna, categoria = posicao_encoder[nome]
+                selecionadas.setdefault(indice_coluna, []).append((j, categoria))
+            elif nome not in FEATURES_SEM_ENTRADA:
+                # Mesmo comportamento do `reindex`: coluna inexistente vira NaN
+                self._ausentes.append(j)
+
+        self._tabelas: List[Tuple[str, np.ndarray, int]] = []
+        self._discretizadas: List[Tuple[str, np.ndarray]] = []
+        for indice_coluna, saidas in selecionadas.items():
+            coluna = colunas_categoricas[indice_coluna]
+            if coluna in ESPECIFICACAO:
+                rotulos = ESPECIFICACAO[coluna]['rotulos']
+                # Última posição representa valores fora dos intervalos (NaN)
+                tabela = np.full(len(rotulos) + 1, -1, dtype=np.int64)
+                for j, categoria in saidas:
+                    if _e_nan(categoria):
+                        tabela[len(rotulos)] = j
+                    elif categoria in rotulos:
+                        tabela[rotulos.index(categoria)] = j
+                self._discretizadas.append((coluna, tabela))
+            else:
+                categorias = [int(categoria) for _, categoria in saidas]
+                minimo = min(categorias)
+                tabela = np.full(max(categorias) - minimo + 1, -1, dtype=np.int64)
+                for j, categoria in saidas:
+                    tabela[int(categoria) - minimo] = j
+                self._tabelas.append((coluna, tabela, minimo))
+
+        # Features que o motor precisa calcular (as demais não são pedidas)
+        self._features_motor = [nome for _, nome in self._numericas] + [coluna for coluna, _ in self._discretizadas]
+
+    @property
+    def n_features(self) -> int:
+        return len(self.colunas_saida)
+
+    def transformar(self, colunas: Dict[str, np.ndarray]) -> np.ndarray:
+        """
+        Transforma colunas brutas de entrada na matriz final de features.
+
+        Args:
+            colunas: Dicionário campo -> array, com os nomes de campo de
+                     `InputData` (ex.: `marital_status`, `hours_per_week`)
+
+        Returns:
+            Matriz float64 (n_registros, n_features) na ordem do selector
+        """
+        entrada = {
+            RENOMEAR_COLUNAS.get(campo, campo): np.asarray(valores)
+            for campo, valores in colunas.items()
+        }
+        n = len(entrada['age'])
+        X = np.zeros((n, self.n_features), dtype=np.float64)
+        linhas = np.arange(n)
+
+        calculadas = self.motor.calcular(entrada, self._features_motor, brutas=True)
+
+        for j, nome in self._numericas:
+            X[:, j] = calculadas[nome].astype(self.motor.tipo_saida, copy=False)
+
+        for j in self._ausentes:
+            X[:, j] = np.nan
+
+        for coluna, tabela, minimo in self._tabelas:
+            posicoes = entrada[coluna] - minimo
+            validos = (posicoes >= 0) & (posicoes < len(tabela))
+            destino = np.full(n, -1, dtype=np.int64)
+            destino[validos] = tabela[posicoes[validos]]
+            self._marcar(X, linhas, destino)
+
+        for coluna, tabela in self._discretizadas:
+            self._marcar(X, linhas, tabela[calculadas[coluna]])
+
+        if self.zeros_ausentes:
+            X[X == 0] = np.nan
+        return X
+
+    @staticmethod
+    def _marcar(X: np.ndarray, linhas: np.ndarray, destino: np.ndarray):
+        ativos = destino >= 0
+        X[linhas[ativos], destino[ativos]] = 1.0
+
+def construir_transformador(transformers: Dict, model=None) -> Optional[TransformadorCompilado]:
+    """
+    Constrói o transformador compilado a partir dos transformadores salvos.
+
+    Args:
+        transformers: Conteúdo de `transformadores_features.joblib`
+        model: Modelo que vai receber as features; um XGBoost treinado
+               sobre features esparsas (`formato` 'csr') recebe zeros como NaN
+
+    Transformadores sem `especificacao` (de antes da especificação
+    compartilhada) usam os campos como valores brutos.
+
+    Returns:
+        TransformadorCompilado, ou None se não houver encoder
+
+    Raises:
+        ValueError: Se o encoder tiver faixas diferentes das da especificação
+    """
+    encoder = transformers.get('one_hot_encoder')
+    if encoder is None:
+        return None
+    zeros_ausentes = transformers.get('formato') == 'csr' and hasattr(model, 'get_booster')
+    plano = transformers.get('plano_features')
+    return TransformadorCompilado(
+        encoder, transformers.get('selector'), zeros_ausentes, plano['colunas'] if plano else None,
+        MotorFeatures(transformers.get('especificacao'))
+    )
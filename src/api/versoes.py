@@ -0,0 +1,190 @@
+"""
+Versões do registro de modelos (`src.models.registro`) mantidas residentes
+na API, além da versão padrão servida pelo `GerenciadorModelo`.
+
+Cada versão é carregada na primeira requisição que a usa e fica em memória
+em ordem LRU. Quando a soma dos tamanhos passa do orçamento, as versões
+usadas há mais tempo são descarregadas; requisições em andamento mantêm a
+referência aos artefatos que estão usando, então a descarga não as afeta.
+O tamanho de cada versão é estimado pelos arquivos em disco (modelo e
+transformadores).
+"""
+
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from src.api.modelo import ArtefatosModelo
+
+logger = logging.getLogger(__name__)
+
+# Nome reservado para a versão padrão (a do GerenciadorModelo)
+VERSAO_PADRAO = "padrao"
+
+def interpretar_pesos(texto: str) -> List[Tuple[str, float]]:
+    """
+    Interpreta a divisão de tráfego no formato "versao=peso,versao=peso".
+
+    Args:
+        texto: Ex.: "padrao=0.9,20250309-142501-xgboost-otimizado=0.1"
+
+    Returns:
+        Lista de (versão, peso) com pesos positivos; vazia se o texto for vazio
+
+    Raises:
+        ValueError: Se algum item estiver malformado ou com peso negativo
+    """
+    pesos = []
+    for item in texto.split(","):
+        if not item.strip():
+            continue
+        versao, separador, peso = item.partition("=")
+        if not separador or not versao.strip():
+            raise ValueError(f"Peso de roteamento malformado: '{item}'")
+        valor = float(peso)
+        if valor < 0:
+            raise ValueError(f"Peso de roteamento negativo: '{item}'")
+        if valor > 0:
+            pesos.append((versao.strip(), valor))
+    return pesos
+
+def escolher_versao(pesos: List[Tuple[str, float]], sorteio: float) -> str:
+    """
+    Escolhe uma versão proporcionalmente aos pesos.
+
+    Args:
+        pesos: Lista de (versão, peso), não vazia
+        sorteio: Número uniforme em [0, 1)
+    """
+    alvo = sorteio * sum(peso for _, peso in pesos)
+    acumulado = 0.0
+    for versao, peso in pesos:
+        acumulado += peso
+        if alvo < acumulado:
+            return versao
+    return pesos[-1][0]
+
+def versoes_desconhecidas(pesos: List[Tuple[str, float]], conhecidas: List[str]) -> List[str]:
+    """
+    Versões da divisão de tráfego que não estão entre as conhecidas.
+
+    Args:
+        pesos: Lista de (versão, peso), como em `interpretar_pesos`
+        conhecidas: Versões do registro e a versão em uso; "padrao" é sempre
+                    conhecida
+    """
+    return [versao for versao, _ in pesos if versao != VERSAO_PADRAO and versao not in conhecidas]
+
+def remover_versao(pesos: List[Tuple[str, float]], versao: str) -> List[Tuple[str, float]]:
+    """Divisão de tráfego sem a versão; o peso dela passa para as demais."""
+    return [(nome, peso) for nome, peso in pesos if nome != versao]
+
+class VersoesResidentes:
+    """
+    Cache LRU de versões do registro, limitado por um orçamento de bytes.
+
+    Seguro para uso concorrente; cada versão é carregada uma única vez mesmo
+    que várias requisições a peçam ao mesmo tempo.
+    """
+
+    def __init__(
+        self,
+        diretorio_registro: str,
+        carregar: Callable[[str, str, str], ArtefatosModelo],
+        orcamento_bytes: int
+    ):
+        """
+        Args:
+            diretorio_registro: Diretório do registro de modelos
+            carregar: Função (caminho_modelo, caminho_transformadores, versao)
+                      que carrega, prepara e valida uma versão
+            orcamento_bytes: Tamanho total máximo das versões residentes; a
+                             versão pedida por último fica residente mesmo que
+                             sozinha passe do orçamento
+        """
+        self.diretorio_registro = diretorio_registro
+        self.carregar = carregar
+        self.orcamento_bytes = orcamento_bytes
+
+        self._residentes: "OrderedDict[str, Tuple[ArtefatosModelo, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._locks_carga: Dict[str, threading.Lock] = {}
+
+        self.cargas = 0
+        self.descargas = 0
+        self.falhas_carga = 0
+
+    def _residente(self, versao: str) -> Optional[ArtefatosModelo]:
+        with self._lock:
+            entrada = self._residentes.get(versao)
+            if entrada is None:
+                return None
+            self._residentes.move_to_end(versao)
+            return entrada[0]
+
+    def obter(self, versao: str) -> ArtefatosModelo:
+        """
+        Retorna os artefatos de uma versão, carregando-a se necessário.
+
+        Bloqueia durante a carga; chame fora do event loop.
+
+        Raises:
+            VersaoNaoEncontradaError: Se a versão não estiver no registro
+        """
+        artefatos = self._residente(versao)
+        if artefatos is not None:
+            return artefatos
+
+        from src.models.registro import caminhos_versao
+        caminhos = caminhos_versao(versao, self.diretorio_registro)
+        with self._lock:
+            lock_carga = self._locks_carga.setdefault(versao, threading.Lock())
+
+        with lock_carga:
+            artefatos = self._residente(versao)
+            if artefatos is not None:
+                return artefatos
+            tamanho = os.path.getsize(caminhos['modelo']) + os.path.getsize(caminhos['transformadores'])
+            try:
+                artefatos = self.carregar(caminhos['modelo'], caminhos['transformadores'], versao)
+            except Exception:
+                self.falhas_carga += 1
+                raise
+            with self._lock:
+                self._residentes[versao] = (artefatos, tamanho)
+                self.cargas += 1
+                self._liberar()
+        return artefatos
+
+    def _liberar(self):
+        """Descarrega as versões menos usadas até caber no orçamento. Chamar com o lock."""
+        total = sum(tamanho for _, tamanho in self._residentes.values())
+        while total > self.orcamento_bytes and len(self._residentes) > 1:
+            versao, (_, tamanho) = self._residentes.popitem(last=False)
+            total -= tamanho
+            self.descargas += 1
+            logger.info(f"Versão {versao} descarregada ({tamanho / 2 ** 20:.1f} MB) para respeitar o orçamento")
+
+    def estatisticas(self) -> Dict[str, Any]:
+        """Retorna as versões residentes, o uso do orçamento e os contadores."""
+        with self._lock:
+            residentes = [
+                {
+                    "version": versao,
+                    "size_bytes": tamanho,
+                    "loaded_at": artefatos.carregado_em,
+                    "load_ms": artefatos.tempo_carga_ms,
+                    "engine": type(artefatos.motor).__name__ if artefatos.motor is not None else "model"
+                }
+                for versao, (artefatos, tamanho) in self._residentes.items()
+            ]
+        return {
+            "registry": self.diretorio_registro,
+            "budget_bytes": self.orcamento_bytes,
+            "resident_bytes": sum(r["size_bytes"] for r in residentes),
+            "resident": residentes,
+            "loads": self.cargas,
+            "evictions": self.descargas,
+            "load_failures": self.falhas_carga
+        }
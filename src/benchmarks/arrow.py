@@ -0,0 +1,97 @@
+"""
+Benchmark do lote em JSON contra o lote em Arrow IPC em `/predict/batch`.
+
+Envia o mesmo lote de 100.000 registros nos dois formatos, pela aplicação
+em processo (TestClient), e mede o tempo de ponta a ponta (codificação no
+cliente, requisição e decodificação da resposta) e o tamanho dos corpos. A
+paridade entre os formatos é verificada em `tests/test_api_arrow.py`.
+
+Uso (a partir da raiz do projeto, com o modelo já treinado):
+    python -m src.benchmarks.arrow
+"""
+
+import json
+import logging
+import time
+import numpy as np
+import pyarrow as pa
+from typing import Callable, Dict, Tuple
+from src.benchmarks.transformador import gerar_entradas
+from src.utils.logger import configurar_logger
+
+logger = configurar_logger('benchmark_arrow')
+
+N_REGISTROS = 100000
+
+def codificar_json(colunas: Dict[str, np.ndarray], campos: Dict[str, str]) -> bytes:
+    listas = {coluna: colunas[campo].tolist() for campo, coluna in campos.items()}
+    n = len(next(iter(listas.values())))
+    registros = [{coluna: valores[i] for coluna, valores in listas.items()} for i in range(n)]
+    return json.dumps(registros).encode()
+
+def codificar_arrow(colunas: Dict[str, np.ndarray], campos: Dict[str, str]) -> bytes:
+    tabela = pa.table({coluna: pa.array(colunas[campo], type=pa.int64()) for campo, coluna in campos.items()})
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, tabela.schema) as writer:
+        writer.write_table(tabela)
+    return sink.getvalue().to_pybytes()
+
+def medir(funcao: Callable[[], Tuple], repeticoes: int = 3) -> Tuple[float, Tuple]:
+    """Retorna o melhor tempo em segundos e o resultado da última execução."""
+    melhor = float('inf')
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = funcao()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor, resultado
+
+def main():
+    """
+    Função principal para executar o benchmark JSON x Arrow.
+    """
+    logging.getLogger('src.api.api').setLevel(logging.WARNING)
+    from fastapi.testclient import TestClient
+    from src.api import api
+
+    try:
+        api.MAX_REGISTROS_LOTE = max(api.MAX_REGISTROS_LOTE, N_REGISTROS)
+        cliente = TestClient(api.app)
+        colunas = gerar_entradas(N_REGISTROS)
+
+        def via_json():
+            corpo = codificar_json(colunas, api.CAMPOS_ENTRADA)
+            if api.cache_previsoes is not None:
+                api.cache_previsoes.invalidar()
+            resposta = cliente.post("/predict/batch", content=corpo,
+                                    headers={"content-type": "application/json"})
+            resposta.raise_for_status()
+            resultados = resposta.json()["results"]
+            return len(corpo), len(resposta.content), len(resultados)
+
+        def via_arrow():
+            corpo = codificar_arrow(colunas, api.CAMPOS_ENTRADA)
+            resposta = cliente.post("/predict/batch", content=corpo,
+                                    headers={"content-type": api.TIPO_CONTEUDO_ARROW})
+            resposta.raise_for_status()
+            tabela = pa.ipc.open_stream(resposta.content).read_all()
+            return len(corpo), len(resposta.content), tabela.num_rows
+
+        tempo_json, (entrada_json, saida_json, _) = medir(via_json)
+        tempo_arrow, (entrada_arrow, saida_arrow, _) = medir(via_arrow)
+
+        for nome, tempo, entrada, saida in [
+            ("JSON", tempo_json, entrada_json, saida_json),
+            ("Arrow", tempo_arrow, entrada_arrow, saida_arrow)
+        ]:
+            logger.info(
+                f"{nome}: {tempo:.3f} s ({N_REGISTROS / tempo:,.0f} registros/s), "
+                f"requisição {entrada / 1e6:.1f} MB, resposta {saida / 1e6:.1f} MB"
+            )
+        logger.info(f"Arrow {tempo_json / tempo_arrow:.1f}x mais rápido que JSON")
+
+    except Exception as e:
+        logger.error(f"Erro no benchmark JSON x Arrow: {str(e)}")
+        raise
+
+if __name__ == "__main__":
+    main()
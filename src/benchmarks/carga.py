@@ -0,0 +1,363 @@
+"""
+Teste de carga reprodutível do serviço de pontuação.
+
+Dispara requisições concorrentes com uma mistura configurável de `/predict`,
+`/predict/batch` e `/predict/stream` contra a aplicação em processo (padrão),
+um uvicorn local iniciado pelo próprio teste ou um servidor já em execução.
+Os registros são amostrados dos dados do Adult processados por
+`src.data.processar_dados` e convertidos de volta para o formato da API.
+
+O resultado (vazão, latências p50/p95/p99/máx e taxa de erros, no total e
+por tipo de requisição) é gravado em JSON. Com `--linha-base`, é comparado
+com um resultado salvo anteriormente: uma regressão além da tolerância
+encerra o teste com código de saída 1.
+
+Uso (a partir da raiz do projeto, com o modelo já treinado):
+    python -m src.benchmarks.carga --concorrencia 16 --duracao 20 --saida carga.json
+    python -m src.benchmarks.carga --mistura predict=0.8,batch=0.15,stream=0.05 \\
+        --alvo uvicorn --workers 2 --linha-base carga.json
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import subprocess
+import sys
+import time
+import httpx
+import joblib
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, List, Optional, Tuple
+from src.utils.logger import configurar_logger
+
+logger = configurar_logger('benchmark_carga')
+
+TIPOS = ("predict", "batch", "stream")
+CAMINHO_FEATURES = 'data/features_processadas.csv'
+CAMINHO_TRANSFORMADORES = 'data/transformadores.joblib'
+
+# Coluna dos dados do Adult -> nome do campo no JSON da API
+CAMPOS_API = {
+    'age': 'age',
+    'workclass': 'workclass',
+    'education': 'education',
+    'marital-status': 'marital-status',
+    'occupation': 'occupation',
+    'relationship': 'relationship',
+    'race': 'race',
+    'sex': 'sex',
+    'capital-gain': 'capital_gain',
+    'capital-loss': 'capital_loss',
+    'hours-per-week': 'hours_per_week',
+    'native-country': 'native-country'
+}
+
+# Aumento absoluto da taxa de erros tolerado em relação à linha de base
+TOLERANCIA_TAXA_ERROS = 0.01
+PORTA_UVICORN = 8798
+TEMPO_MAXIMO_INICIO_SEGUNDOS = 120
+
+def amostrar_registros(n: int, semente: int) -> List[Dict[str, int]]:
+    """
+    Amostra registros no formato da API a partir dos dados do Adult.
+
+    As colunas numéricas de `data/features_processadas.csv` são
+    desnormalizadas com o scaler do pré-processamento, e as categóricas já
+    estão nos códigos esperados pela API. Sem o CSV, os valores são sorteados
+    a partir das médias e desvios do scaler e das classes dos encoders.
+
+    Args:
+        n: Número de registros
+        semente: Semente aleatória
+
+    Returns:
+        Lista de registros (dicionários campo -> valor)
+    """
+    transformadores = joblib.load(CAMINHO_TRANSFORMADORES)
+    scaler = transformadores['scaler']
+    encoders = transformadores['encoders']
+    numericas = list(scaler.feature_names_in_)
+    rng = np.random.default_rng(semente)
+
+    if os.path.exists(CAMINHO_FEATURES):
+        dados = pd.read_csv(CAMINHO_FEATURES, usecols=numericas + list(encoders))
+        dados = dados.iloc[rng.integers(0, len(dados), n)]
+        valores = scaler.inverse_transform(dados[numericas])
+        colunas = {coluna: np.rint(valores[:, j]) for j, coluna in enumerate(numericas)}
+        colunas.update({coluna: dados[coluna].to_numpy() for coluna in encoders})
+    else:
+        logger.warning(f"{CAMINHO_FEATURES} não encontrado; amostrando das estatísticas do scaler e dos encoders")
+        colunas = {
+            coluna: np.rint(np.maximum(rng.normal(media, desvio, n), 0))
+            for coluna, media, desvio in zip(numericas, scaler.mean_, scaler.scale_)
+        }
+        colunas.update({coluna: rng.integers(0, len(e.classes_), n) for coluna, e in encoders.items()})
+
+    return [
+        {campo: int(colunas[coluna][i]) for coluna, campo in CAMPOS_API.items()}
+        for i in range(n)
+    ]
+
+def interpretar_mistura(texto: str) -> Dict[str, float]:
+    """Interpreta a mistura no formato "predict=0.8,batch=0.15,stream=0.05"."""
+    mistura = {}
+    for item in texto.split(","):
+        tipo, _, peso = item.partition("=")
+        if tipo.strip() not in TIPOS:
+            raise ValueError(f"Tipo de requisição desconhecido: '{tipo}'. Use {', '.join(TIPOS)}")
+        mistura[tipo.strip()] = float(peso)
+    total = sum(mistura.values())
+    if total <= 0:
+        raise ValueError("A mistura precisa de ao menos um peso positivo")
+    return {tipo: peso / total for tipo, peso in mistura.items() if peso > 0}
+
+async def enviar(cliente: httpx.AsyncClient, tipo: str, registros: List[Dict[str, int]]) -> Tuple[bool, int]:
+    """
+    Envia uma requisição e lê a resposta inteira.
+
+    Returns:
+        Tuple com o sucesso da requisição e o número de linhas com erro
+    """
+    if tipo == "predict":
+        resposta = await cliente.post("/predict", json=registros[0])
+        return resposta.status_code == 200, 0
+    if tipo == "batch":
+        resposta = await cliente.post("/predict/batch", json=registros)
+        if resposta.status_code != 200:
+            return False, 0
+        return True, resposta.json()["failed"]
+
+    corpo = "".join(json.dumps(registro) + "\n" for registro in registros)
+    resposta = await cliente.post(
+        "/predict/stream", content=corpo, headers={"content-type": "application/x-ndjson"}
+    )
+    if resposta.status_code != 200:
+        return False, 0
+    linhas = [json.loads(linha) for linha in resposta.text.splitlines()]
+    # Um erro que interrompe o fluxo vem como última linha, sem "index"
+    completo = len(linhas) == len(registros) and all("index" in linha for linha in linhas)
+    return completo, sum(1 for linha in linhas if "error" in linha)
+
+async def gerar_carga(
+    cliente: httpx.AsyncClient,
+    args: argparse.Namespace,
+    mistura: Dict[str, float],
+    registros: List[Dict[str, int]]
+) -> Tuple[List[Tuple[str, float, bool, int, int]], float]:
+    """
+    Executa a carga: aquecimento seguido da janela de medição.
+
+    Returns:
+        Tuple com as amostras (tipo, latência em s, sucesso, registros,
+        linhas com erro) medidas e a duração efetiva da medição em segundos
+    """
+    tamanhos = {"predict": 1, "batch": args.tamanho_lote, "stream": args.tamanho_stream}
+    tipos = list(mistura)
+    pesos = [mistura[tipo] for tipo in tipos]
+    inicio_medicao = time.perf_counter() + args.aquecimento
+    fim = inicio_medicao + args.duracao
+    amostras: List[Tuple[str, float, bool, int, int]] = []
+
+    async def trabalhador(indice: int):
+        # Um gerador por trabalhador: a sequência de requisições não depende do escalonamento
+        rng = np.random.default_rng(args.semente + indice)
+        while True:
+            inicio = time.perf_counter()
+            if inicio >= fim:
+                return
+            tipo = tipos[rng.choice(len(tipos), p=pesos)]
+            carga = [registros[j] for j in rng.integers(0, len(registros), tamanhos[tipo])]
+            try:
+                ok, erros_linha = await enviar(cliente, tipo, carga)
+            except httpx.HTTPError as e:
+                logger.debug(f"Falha de transporte em {tipo}: {str(e)}")
+                ok, erros_linha = False, 0
+            if inicio >= inicio_medicao:
+                amostras.append((tipo, time.perf_counter() - inicio, ok, len(carga), erros_linha))
+
+    await asyncio.gather(*(trabalhador(i) for i in range(args.concorrencia)))
+    return amostras, time.perf_counter() - inicio_medicao
+
+def resumir(amostras: List[Tuple[str, float, bool, int, int]], duracao: float) -> Dict[str, Any]:
+    """Calcula vazão, latências e erros de um conjunto de amostras."""
+    if not amostras:
+        return {"requests": 0}
+    latencias = np.array([amostra[1] for amostra in amostras]) * 1000
+    falhas = sum(1 for amostra in amostras if not amostra[2])
+    n_registros = sum(amostra[3] for amostra in amostras)
+    return {
+        "requests": len(amostras),
+        "rps": len(amostras) / duracao,
+        "rows": n_registros,
+        "rows_per_second": n_registros / duracao,
+        "errors": falhas,
+        "error_rate": falhas / len(amostras),
+        "row_errors": sum(amostra[4] for amostra in amostras),
+        "latency_ms": {
+            "p50": float(np.percentile(latencias, 50)),
+            "p95": float(np.percentile(latencias, 95)),
+            "p99": float(np.percentile(latencias, 99)),
+            "max": float(latencias.max()),
+            "mean": float(latencias.mean())
+        }
+    }
+
+def comparar(resultado: Dict[str, Any], linha_base: Dict[str, Any], tolerancia: float) -> List[str]:
+    """
+    Compara um resultado com a linha de base.
+
+    Há regressão quando, no total ou em um tipo de requisição presente nos
+    dois, a vazão cai mais que `tolerancia`, o p95 ou o p99 sobem mais que
+    `tolerancia` (fração) ou a taxa de erros sobe mais que
+    TOLERANCIA_TAXA_ERROS.
+
+    Returns:
+        Lista de regressões encontradas, vazia se não houver
+    """
+    escopos = [("total", resultado["total"], linha_base["total"])] + [
+        (tipo, resultado["by_type"][tipo], linha_base["by_type"][tipo])
+        for tipo in TIPOS
+        if tipo in resultado["by_type"] and tipo in linha_base.get("by_type", {})
+    ]
+    regressoes = []
+    for escopo, atual, base in escopos:
+        if not atual.get("requests") or not base.get("requests"):
+            continue
+        if atual["rps"] < base["rps"] * (1 - tolerancia):
+            regressoes.append(f"{escopo}: RPS {atual['rps']:.1f} < {base['rps']:.1f}")
+        for percentil in ("p95", "p99"):
+            if atual["latency_ms"][percentil] > base["latency_ms"][percentil] * (1 + tolerancia):
+                regressoes.append(
+                    f"{escopo}: {percentil} {atual['latency_ms'][percentil]:.2f} ms > "
+                    f"{base['latency_ms'][percentil]:.2f} ms"
+                )
+        if atual["error_rate"] > base["error_rate"] + TOLERANCIA_TAXA_ERROS:
+            regressoes.append(f"{escopo}: taxa de erros {atual['error_rate']:.2%} > {base['error_rate']:.2%}")
+    return regressoes
+
+def iniciar_uvicorn(workers: int) -> subprocess.Popen:
+    """Sobe o uvicorn com a API e espera `/readyz` responder 200."""
+    processo = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "src.api.api:app",
+         "--port", str(PORTA_UVICORN), "--workers", str(workers), "--log-level", "warning"],
+        env={**os.environ, "PYTHONWARNINGS": "ignore"},
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    limite = time.monotonic() + TEMPO_MAXIMO_INICIO_SEGUNDOS
+    while time.monotonic() < limite:
+        if processo.poll() is not None:
+            raise RuntimeError(f"uvicorn terminou com código {processo.returncode}")
+        try:
+            if httpx.get(f"http://127.0.0.1:{PORTA_UVICORN}/readyz").status_code == 200:
+                return processo
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.5)
+    processo.terminate()
+    raise RuntimeError(f"uvicorn não ficou pronto em {TEMPO_MAXIMO_INICIO_SEGUNDOS} s")
+
+async def executar(args: argparse.Namespace, mistura: Dict[str, float], registros: List[Dict[str, int]]):
+    """Prepara o alvo, executa a carga e devolve as amostras e a duração."""
+    limites = httpx.Limits(max_connections=args.concorrencia, max_keepalive_connections=args.concorrencia)
+    if args.alvo == "processo":
+        logging.getLogger('src.api').setLevel(logging.WARNING)
+        from src.api import api
+        await api.app.router.startup()
+        try:
+            transporte = httpx.ASGITransport(app=api.app)
+            async with httpx.AsyncClient(transport=transporte, base_url="http://processo",
+                                         limits=limites, timeout=args.timeout) as cliente:
+                return await gerar_carga(cliente, args, mistura, registros)
+        finally:
+            await api.app.router.shutdown()
+
+    processo: Optional[subprocess.Popen] = None
+    url = args.alvo
+    if args.alvo == "uvicorn":
+        processo = iniciar_uvicorn(args.workers)
+        url = f"http://127.0.0.1:{PORTA_UVICORN}"
+    try:
+        async with httpx.AsyncClient(base_url=url, limits=limites, timeout=args.timeout) as cliente:
+            return await gerar_carga(cliente, args, mistura, registros)
+    finally:
+        if processo is not None:
+            processo.terminate()
+            processo.wait()
+
+def interpretar_argumentos(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Teste de carga da API de previsão de renda")
+    parser.add_argument("--alvo", default="processo",
+                        help="'processo' (aplicação em processo), 'uvicorn' (sobe um servidor local) ou a URL de um servidor")
+    parser.add_argument("--workers", type=int, default=1, help="Workers do uvicorn com --alvo uvicorn")
+    parser.add_argument("--concorrencia", type=int, default=8, help="Clientes simultâneos")
+    parser.add_argument("--duracao", type=float, default=10.0, help="Duração da medição, em segundos")
+    parser.add_argument("--aquecimento", type=float, default=2.0, help="Carga descartada antes da medição, em segundos")
+    parser.add_argument("--mistura", default="predict=0.8,batch=0.15,stream=0.05",
+                        help="Pesos dos tipos de requisição (predict, batch, stream)")
+    parser.add_argument("--tamanho-lote", type=int, default=100, help="Registros por requisição de /predict/batch")
+    parser.add_argument("--tamanho-stream", type=int, default=2000, help="Registros por requisição de /predict/stream")
+    parser.add_argument("--registros-distintos", type=int, default=10000,
+                        help="Registros amostrados do Adult; valores pequenos simulam payloads repetidos")
+    parser.add_argument("--semente", type=int, default=42, help="Semente da amostragem e da sequência de requisições")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Timeout de cada requisição, em segundos")
+    parser.add_argument("--saida", help="Arquivo JSON para gravar o resultado")
+    parser.add_argument("--linha-base", help="Resultado JSON anterior para comparação")
+    parser.add_argument("--tolerancia", type=float, default=0.2,
+                        help="Piora relativa tolerada de RPS e p95/p99 em relação à linha de base")
+    return parser.parse_args(argv)
+
+def main(argv: Optional[List[str]] = None):
+    """
+    Função principal para executar o teste de carga.
+    """
+    args = interpretar_argumentos(argv)
+    try:
+        mistura = interpretar_mistura(args.mistura)
+        registros = amostrar_registros(args.registros_distintos, args.semente)
+        logger.info(
+            f"Carga contra '{args.alvo}': {args.concorrencia} clientes, {args.duracao:.0f} s, "
+            f"mistura {mistura}, {len(registros)} registros distintos"
+        )
+
+        amostras, duracao = asyncio.run(executar(args, mistura, registros))
+        resultado = {
+            "config": {
+                chave: getattr(args, chave) for chave in (
+                    "alvo", "workers", "concorrencia", "duracao", "mistura",
+                    "tamanho_lote", "tamanho_stream", "registros_distintos", "semente"
+                )
+            },
+            "duration_s": duracao,
+            "total": resumir(amostras, duracao),
+            "by_type": {
+                tipo: resumir([a for a in amostras if a[0] == tipo], duracao)
+                for tipo in TIPOS if tipo in mistura
+            }
+        }
+        texto = json.dumps(resultado, indent=2)
+        logger.info(f"Resultado:\n{texto}")
+        if args.saida:
+            with open(args.saida, "w") as f:
+                f.write(texto + "\n")
+
+        if args.linha_base:
+            with open(args.linha_base) as f:
+                linha_base = json.load(f)
+            if linha_base.get("config") != resultado["config"]:
+                logger.warning("A configuração da linha de base difere da atual; a comparação pode não ser válida")
+            regressoes = comparar(resultado, linha_base, args.tolerancia)
+            if regressoes:
+                for regressao in regressoes:
+                    logger.error(f"Regressão: {regressao}")
+                sys.exit(1)
+            logger.info(f"Sem regressões em relação a {args.linha_base} (tolerância {args.tolerancia:.0%})")
+
+    except Exception as e:
+        logger.error(f"Erro no teste de carga: {str(e)}")
+        raise
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Dados sintéticos no formato bruto do Adult e medição de memória para os
+benchmarks do pipeline de dados.
+
+Os registros têm as mesmas colunas, tipos e categorias do dataset original
+(as categorias vêm dos encoders salvos em `data/transformadores.joblib`),
+com valores ausentes em `workclass`, `occupation` e `native-country`, e
+podem ser gerados em qualquer escala sem baixar os dados do UCI.
+"""
+
+import multiprocessing
+import queue
+import resource
+import numpy as np
+import pandas as pd
+from typing import Any, Callable, Dict, List, Tuple
+from src.data.especificacao_features import ANOS_ESTUDO
+
+# Tamanho do dataset Adult original (treino + teste)
+LINHAS_ADULT = 48842
+
+COLUNAS_COM_AUSENTES = ['workclass', 'occupation', 'native-country']
+
+def _categorias(caminho_transformadores: str) -> Dict[str, List[str]]:
+    import joblib
+    encoders = joblib.load(caminho_transformadores)['encoders']
+    return {
+        coluna: [str(c) for c in encoder.classes_ if c not in ('?', 'MISSING')]
+        for coluna, encoder in encoders.items()
+    }
+
+def gerar_adult(
+    n: int,
+    seed: int = 0,
+    proporcao_ausentes: float = 0.02,
+    caminho_transformadores: str = 'data/transformadores.joblib'
+) -> pd.DataFrame:
+    """
+    Gera registros brutos no formato do Adult.
+
+    Args:
+        n: Número de linhas
+        seed: Semente do gerador
+        proporcao_ausentes: Fração de valores ausentes nas colunas que os
+                            têm no dataset original
+        caminho_transformadores: Transformadores de onde vêm as categorias
+
+    Returns:
+        DataFrame com as 14 colunas de features do Adult
+    """
+    rng = np.random.default_rng(seed)
+    categorias = _categorias(caminho_transformadores)
+
+    def sortear(coluna: str, favorita: str = None, peso: float = 0.0) -> np.ndarray:
+        valores = np.array(categorias[coluna], dtype=object)
+        p = np.full(len(valores), (1 - peso) / len(valores))
+        if favorita is not None:
+            p[list(valores).index(favorita)] += peso
+        return rng.choice(valores, size=n, p=p)
+
+    education = sortear('education', 'HS-grad', 0.3)
+    ganho = np.where(rng.random(n) < 0.08, rng.lognormal(8.5, 1.2, n), 0).astype(np.int64)
+    perda = np.where(rng.random(n) < 0.05, rng.normal(1900, 350, n), 0).clip(0).astype(np.int64)
+
+    X = pd.DataFrame({
+        'age': np.clip(rng.gamma(4.0, 5.5, n) + 17, 17, 90).astype(np.int64),
+        'workclass': sortear('workclass', 'Private', 0.6),
+        'fnlwgt': np.clip(rng.lognormal(12.0, 0.5, n), 12285, 1490400).astype(np.int64),
+        'education': education,
+        'education-num': pd.Series(education).map(ANOS_ESTUDO).to_numpy(np.int64),
+        'marital-status': sortear('marital-status', 'Married-civ-spouse', 0.4),
+        'occupation': sortear('occupation'),
+        'relationship': sortear('relationship', 'Husband', 0.3),
+        'race': sortear('race', 'White', 0.8),
+        'sex': sortear('sex', 'Male', 0.3),
+        'capital-gain': ganho,
+        'capital-loss': perda,
+        'hours-per-week': np.clip(rng.normal(40, 12, n), 1, 99).astype(np.int64),
+        'native-country': sortear('native-country', 'United-States', 0.9)
+    })
+    for coluna in COLUNAS_COM_AUSENTES:
+        X.loc[rng.random(n) < proporcao_ausentes, coluna] = np.nan
+    return X
+
+def gravar_adult(caminho: str, n: int, seed: int = 0, tamanho_bloco: int = 200_000) -> str:
+    """
+    Grava `n` registros sintéticos em CSV ou Parquet (pela extensão), em
+    blocos, sem manter o arquivo inteiro em memória.
+
+    Returns:
+        O caminho gravado
+    """
+    gravador = None
+    for i, inicio in enumerate(range(0, n, tamanho_bloco)):
+        bloco = gerar_adult(min(tamanho_bloco, n - inicio), seed + i)
+        if caminho.endswith('.parquet'):
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            tabela = pa.Table.from_pandas(bloco, preserve_index=False)
+            if gravador is None:
+                gravador = pq.ParquetWriter(caminho, tabela.schema)
+            gravador.write_table(tabela)
+        else:
+            bloco.to_csv(caminho, mode='w' if i == 0 else 'a', header=i == 0, index=False)
+    if gravador is not None:
+        gravador.close()
+    return caminho
+
+def _executar_e_medir(fila, funcao: Callable, args: Tuple) -> None:
+    try:
+        resultado = funcao(*args)
+        fila.put((resultado, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024, None))
+    except Exception as e:
+        fila.put((None, None, repr(e)))
+
+def medir_pico_memoria(funcao: Callable, *args) -> Tuple[Any, int]:
+    """
+    Executa `funcao(*args)` em um processo novo e mede o pico de RSS dele.
+
+    Cada medição parte de um processo limpo, então o pico não é afetado
+    pelo que já foi alocado no processo atual. O pico é o `ru_maxrss` do
+    processo no fim. `funcao` e o resultado precisam ser serializáveis
+    (funções de módulo e valores simples).
+
+    Returns:
+        Tuple com o resultado da função e o pico de RSS em bytes (apenas Linux)
+    """
+    contexto = multiprocessing.get_context('spawn')
+    fila = contexto.Queue()
+    processo = contexto.Process(target=_executar_e_medir, args=(fila, funcao, args))
+    processo.start()
+    while True:
+        try:
+            resultado, pico, erro = fila.get(timeout=0.1)
+            break
+        except queue.Empty:
+            if not processo.is_alive():
+                raise RuntimeError("O processo de medição terminou sem resultado")
+    processo.join()
+    if erro is not None:
+        raise RuntimeError(f"Falha no processo de medição: {erro}")
+    return resultado, pico
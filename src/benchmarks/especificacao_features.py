@@ -0,0 +1,122 @@
+"""
+Tempo por linha de cada caminho da especificação de features.
+
+Ajusta o pré-processamento e o feature engineering sobre dados sintéticos
+do tamanho do Adult e mede a entrada do modelo calculada:
+- no treino (`engenharia_features`, denso e esparso);
+- no treino em blocos (`aplicar_features_em_blocos`);
+- na API, a partir dos campos brutos de `InputData`, em um único lote e em
+  lotes do tamanho dos da fila de micro-batch.
+
+Os dois modos de tipos do pré-processamento são cobertos (compactos em
+float32 e float64). A paridade bit a bit entre os caminhos é verificada em
+`tests/test_especificacao_features.py`.
+
+Uso (a partir da raiz do projeto):
+    python -m src.benchmarks.especificacao_features [escala]
+"""
+
+import sys
+import time
+import numpy as np
+import pandas as pd
+from typing import Callable, Dict, Tuple
+from src.api.transformador import construir_transformador
+from src.benchmarks.dados_sinteticos import LINHAS_ADULT, gerar_adult
+from src.benchmarks.tipos_compactos import criar_target
+from src.data.feature_engineering import aplicar_features_em_blocos, engenharia_features
+from src.data.preprocessamento import preprocessar_dados
+from src.data.processar_dados import COLUNAS_NUMERICAS, COLUNAS_CATEGORICAS, ESTRATEGIA_NULOS
+from src.data.tipos import compactar_tipos
+from src.utils.logger import configurar_logger
+
+logger = configurar_logger('benchmark_especificacao_features')
+
+TAMANHO_BLOCO = 5000
+TAMANHO_LOTE_API = 64
+
+def campos_api(X_bruto: pd.DataFrame, X_processado: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """
+    Monta as colunas que a API recebe: numéricas brutas e os códigos das
+    categóricas, com os nomes de campo de `InputData`.
+    """
+    numericas = ['age', 'capital-gain', 'capital-loss', 'hours-per-week']
+    categoricas = [c for c in COLUNAS_CATEGORICAS if c in X_processado.columns]
+    campos = {c.replace('-', '_'): X_bruto[c].to_numpy(dtype=np.int64) for c in numericas}
+    campos.update({c.replace('-', '_'): X_processado[c].to_numpy(dtype=np.int64) for c in categoricas})
+    return campos
+
+def cronometrar(funcao: Callable[[], object]) -> Tuple[object, float]:
+    inicio = time.perf_counter()
+    resultado = funcao()
+    return resultado, time.perf_counter() - inicio
+
+def medir(
+    X_bruto: pd.DataFrame,
+    X_processado: pd.DataFrame,
+    y: pd.DataFrame,
+    preprocessamento: Dict,
+    esparsa: bool
+) -> Dict[str, float]:
+    """
+    Mede cada caminho sobre um ajuste.
+
+    Returns:
+        Caminho -> microssegundos por linha
+    """
+    n = len(X_processado)
+    (_, transformadores), tempo_treino = cronometrar(lambda: engenharia_features(
+        X_processado, y, COLUNAS_NUMERICAS, COLUNAS_CATEGORICAS,
+        esparsa=esparsa, preprocessamento=preprocessamento
+    ))
+
+    blocos = (X_processado.iloc[i:i + TAMANHO_BLOCO] for i in range(0, n, TAMANHO_BLOCO))
+    _, tempo_blocos = cronometrar(lambda: list(aplicar_features_em_blocos(blocos, transformadores)))
+
+    transformador = construir_transformador(transformadores)
+    campos = campos_api(X_bruto, X_processado)
+    _, tempo_lote = cronometrar(lambda: transformador.transformar(campos))
+
+    _, tempo_fila = cronometrar(lambda: [
+        transformador.transformar({c: v[i:i + TAMANHO_LOTE_API] for c, v in campos.items()})
+        for i in range(0, n, TAMANHO_LOTE_API)
+    ])
+
+    return {
+        'treino': tempo_treino / n * 1e6,
+        'treino_blocos': tempo_blocos / n * 1e6,
+        'api_lote': tempo_lote / n * 1e6,
+        'api_fila': tempo_fila / n * 1e6
+    }
+
+def main():
+    """
+    Função principal para executar o benchmark.
+    """
+    try:
+        escala = int(sys.argv[1]) if len(sys.argv) > 1 else 1
+        n = escala * LINHAS_ADULT
+        X = gerar_adult(n, seed=0)
+        y = criar_target(X)
+
+        for compactar in (True, False):
+            X_processado, preprocessamento = preprocessar_dados(
+                compactar_tipos(X) if compactar else X.copy(),
+                COLUNAS_NUMERICAS, COLUNAS_CATEGORICAS, ESTRATEGIA_NULOS
+            )
+            for esparsa in (False, True):
+                tempos = medir(X, X_processado, y, preprocessamento, esparsa)
+                logger.info(
+                    f"{n} linhas, tipos {preprocessamento['tipo_numericas']}, "
+                    f"{'esparso' if esparsa else 'denso'}: treino, blocos de {TAMANHO_BLOCO} e API "
+                    f"(lote único e lotes de {TAMANHO_LOTE_API}); µs por linha: "
+                    f"treino {tempos['treino']:.2f}, blocos {tempos['treino_blocos']:.2f}, "
+                    f"API {tempos['api_lote']:.2f} / {tempos['api_fila']:.2f}"
+                )
+
+    except Exception as e:
+        logger.error(f"Erro no benchmark da especificação de features: {str(e)}")
+        raise
+
+if __name__ == "__main__":
+    main()
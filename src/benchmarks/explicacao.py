@@ -0,0 +1,68 @@
+"""
+Benchmark das explicações por feature (`src.api.explicacao`).
+
+Treina um XGBClassifier e uma LogisticRegression em features sintéticas
+geradas pelo transformador da API (e inclui o modelo salvo em
+`models/melhor_modelo.joblib`, se existir) e compara, para 1 e 1.000
+linhas, a latência da pontuação simples (`predict` + `predict_proba`) com a
+da explicação. A soma das contribuições é verificada em
+`tests/test_explicacao.py`.
+
+O custo de `pred_contribs` cresce com o número de folhas e o quadrado da
+profundidade das árvores, então a razão entre explicar e pontuar depende
+bastante do modelo.
+
+Uso (a partir da raiz do projeto):
+    python -m src.benchmarks.explicacao
+"""
+
+import os
+import joblib
+import xgboost as xgb
+from typing import Any, Dict
+from sklearn.linear_model import LogisticRegression
+from src.api.explicacao import ExplicadorModelo
+from src.api.transformador import construir_transformador
+from src.benchmarks.motor_numpy import gerar_dados, medir
+from src.utils.logger import configurar_logger
+
+logger = configurar_logger('benchmark_explicacao')
+
+def main():
+    """
+    Função principal para executar o benchmark.
+    """
+    try:
+        X_treino, y_treino = gerar_dados(20000)
+        X_teste, _ = gerar_dados(1000, seed=1)
+        transformador = construir_transformador(joblib.load('data/transformadores_features.joblib'))
+
+        modelos: Dict[str, Any] = {
+            'XGBoost': xgb.XGBClassifier(n_estimators=200, max_depth=6, n_jobs=1).fit(X_treino, y_treino),
+            'Logistic Regression': LogisticRegression(max_iter=1000).fit(X_treino, y_treino)
+        }
+        if os.path.exists('models/melhor_modelo.joblib'):
+            modelos['melhor_modelo.joblib'] = joblib.load('models/melhor_modelo.joblib')
+
+        for nome, model in modelos.items():
+            if hasattr(model, 'get_booster'):
+                model.set_params(n_jobs=1)
+            explicador = ExplicadorModelo(model, transformador.colunas_saida)
+            for n, repeticoes in [(1, 200), (1000, 2)]:
+                X = X_teste[:n]
+                tempo_pontuacao = medir(lambda: (model.predict(X), model.predict_proba(X)), repeticoes)
+                tempo_contribuicoes = medir(lambda: explicador.contribuicoes(X), repeticoes)
+                tempo_explicacao = medir(lambda: explicador.explicar(X), repeticoes)
+                logger.info(
+                    f"{nome}, {n} linha(s): pontuação {tempo_pontuacao:.3f} ms, "
+                    f"contribuições {tempo_contribuicoes:.3f} ms "
+                    f"({tempo_contribuicoes / tempo_pontuacao:.1f}x), "
+                    f"explicação com nomes {tempo_explicacao:.3f} ms"
+                )
+
+    except Exception as e:
+        logger.error(f"Erro no benchmark de explicações: {str(e)}")
+        raise
+
+if __name__ == "__main__":
+    main()
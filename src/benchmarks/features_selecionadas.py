@@ -0,0 +1,116 @@
+"""
+Trabalho por linha com o plano de features (`registrar_plano_features`).
+
+Ajusta o pipeline completo de feature engineering sobre dados sintéticos
+no formato do Adult e compara, por linha, quantas colunas são geradas e
+quanto tempo leva o pipeline completo contra o do plano, no treino e no
+transformador da API. A paridade entre os dois é verificada em
+`tests/test_features_selecionadas.py`.
+
+Uso (a partir da raiz do projeto):
+    python -m src.benchmarks.features_selecionadas [escala]
+"""
+
+import sys
+import time
+import numpy as np
+from typing import Dict
+from src.api.transformador import TransformadorCompilado, construir_transformador
+from src.benchmarks.dados_sinteticos import LINHAS_ADULT, gerar_adult
+from src.benchmarks.tipos_compactos import criar_target
+from src.data.especificacao_features import ESPECIFICACAO, FEATURES_NUMERICAS, MotorFeatures
+from src.data.feature_engineering import engenharia_features
+from src.data.preprocessamento import preprocessar_dados
+from src.data.processar_dados import COLUNAS_NUMERICAS, COLUNAS_CATEGORICAS, ESTRATEGIA_NULOS
+from src.data.tipos import compactar_tipos
+from src.utils.logger import configurar_logger
+
+logger = configurar_logger('benchmark_features_selecionadas')
+
+LINHAS_API = 100_000
+
+def preparar(n: int, seed: int):
+    X = gerar_adult(n, seed)
+    X_processado, preprocessamento = preprocessar_dados(
+        compactar_tipos(X), COLUNAS_NUMERICAS, COLUNAS_CATEGORICAS, ESTRATEGIA_NULOS, inplace=True
+    )
+    return X_processado, criar_target(X), preprocessamento
+
+def entradas_api(n: int, seed: int = 0) -> Dict[str, np.ndarray]:
+    """Colunas de entrada da API (códigos dos campos de `InputData`)."""
+    rng = np.random.default_rng(seed)
+    maximos = {
+        'workclass': 9, 'education': 16, 'marital_status': 7, 'occupation': 15,
+        'relationship': 6, 'race': 5, 'sex': 2, 'native_country': 41
+    }
+    colunas = {campo: rng.integers(0, maximo, n) for campo, maximo in maximos.items()}
+    colunas.update({
+        'age': rng.integers(17, 91, n),
+        'capital_gain': np.where(rng.random(n) < 0.1, rng.integers(1, 99999, n), 0),
+        'capital_loss': np.where(rng.random(n) < 0.05, rng.integers(1, 4356, n), 0),
+        'hours_per_week': rng.integers(1, 100, n)
+    })
+    return colunas
+
+def medir(escala: int) -> Dict[str, Dict[str, float]]:
+    """Compara o pipeline completo e o do plano no treino e na API."""
+    n = escala * LINHAS_ADULT
+    X, y, preprocessamento = preparar(n, seed=0)
+
+    inicio = time.perf_counter()
+    _, transformadores = engenharia_features(
+        X, y, COLUNAS_NUMERICAS, COLUNAS_CATEGORICAS, preprocessamento=preprocessamento
+    )
+    tempo_completo = time.perf_counter() - inicio
+    plano = transformadores['plano_features']
+    inicio = time.perf_counter()
+    _, transformadores_plano = engenharia_features(
+        X, y, COLUNAS_NUMERICAS, COLUNAS_CATEGORICAS, plano=plano, preprocessamento=preprocessamento
+    )
+    tempo_plano = time.perf_counter() - inicio
+
+    encoder = transformadores['one_hot_encoder']
+    colunas_completo = len(FEATURES_NUMERICAS) + len(encoder.get_feature_names_out())
+    categorias_plano = sum(len(c) for c in plano['categorias'].values())
+    logger.info(
+        f"Treino ({n} linhas): {len(ESPECIFICACAO)} -> {len(plano['derivadas'])} features da especificação, "
+        f"{len(encoder.get_feature_names_out())} -> {categorias_plano} colunas de one-hot, "
+        f"{colunas_completo} -> {len(plano['colunas'])} colunas geradas por linha; "
+        f"{tempo_completo / n * 1e6:.2f} -> {tempo_plano / n * 1e6:.2f} µs por linha "
+        f"({tempo_completo:.2f} s -> {tempo_plano:.2f} s)"
+    )
+
+    # Na API: transformador sem seleção (todas as features) contra o do plano
+    entradas = entradas_api(LINHAS_API)
+    resultados = {'treino': {'completo_s': tempo_completo, 'plano_s': tempo_plano}}
+    for nome, transformador in [
+        ('completo', TransformadorCompilado(encoder, motor=MotorFeatures(transformadores['especificacao']))),
+        ('plano', construir_transformador(transformadores_plano))
+    ]:
+        inicio = time.perf_counter()
+        transformador.transformar(entradas)
+        resultados[nome] = {
+            'colunas': transformador.n_features,
+            'us_por_linha': (time.perf_counter() - inicio) / LINHAS_API * 1e6
+        }
+    logger.info(
+        f"API ({LINHAS_API} linhas): {resultados['completo']['colunas']} -> {resultados['plano']['colunas']} "
+        f"colunas por linha; {resultados['completo']['us_por_linha']:.2f} -> "
+        f"{resultados['plano']['us_por_linha']:.2f} µs por linha"
+    )
+    return resultados
+
+def main():
+    """
+    Função principal para executar o benchmark.
+    """
+    try:
+        escala = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+        medir(escala)
+
+    except Exception as e:
+        logger.error(f"Erro no benchmark do plano de features: {str(e)}")
+        raise
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Memória e tempo de carga por worker nos modos de artefatos joblib e mmap.
+
+Sobe o uvicorn com N workers em cada modo, espera todos carregarem o modelo
+e lê /proc/<pid>/smaps_rollup de cada worker. A soma do PSS é a memória
+efetivamente ocupada pelo conjunto de workers (páginas compartilhadas são
+divididas entre eles); a soma do RSS conta cada página compartilhada N vezes.
+
+Uso (a partir da raiz do projeto, com o modelo já treinado; apenas Linux):
+    python -m src.benchmarks.memoria_workers [n_workers]
+"""
+
+import os
+import re
+import subprocess
+import sys
+import threading
+import time
+from typing import Dict, List
+from src.api.memoria import ler_smaps_rollup
+from src.models.serializacao import (
+    DIRETORIO_MMAP_PADRAO, ARQUIVO_MANIFESTO, exportar_artefatos_mmap
+)
+from src.utils.logger import configurar_logger
+
+logger = configurar_logger('benchmark_memoria_workers')
+
+PADRAO_WORKER = re.compile(r"Worker pid (\d+): artefatos \((\w+)\) carregados em ([\d.]+) ms")
+PORTA = 8799
+TEMPO_MAXIMO_SEGUNDOS = 120
+
+def medir_modo(modo: str, n_workers: int) -> List[Dict[str, float]]:
+    """
+    Sobe o servidor em um modo e mede cada worker depois da carga.
+
+    Args:
+        modo: Valor de API_MODO_ARTEFATOS ('joblib' ou 'mmap')
+        n_workers: Número de workers do uvicorn
+
+    Returns:
+        Lista com pid, tempo de carga (ms), RSS e PSS (MB) de cada worker
+    """
+    ambiente = {**os.environ, "API_MODO_ARTEFATOS": modo, "PYTHONWARNINGS": "ignore"}
+    processo = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "src.api.api:app",
+         "--port", str(PORTA), "--workers", str(n_workers), "--log-level", "warning"],
+        env=ambiente, stderr=subprocess.PIPE, stdout=subprocess.DEVNULL, text=True
+    )
+    workers: Dict[int, float] = {}
+    prontos = threading.Event()
+
+    def ler_log():
+        for linha in processo.stderr:
+            encontrado = PADRAO_WORKER.search(linha)
+            if encontrado:
+                workers[int(encontrado.group(1))] = float(encontrado.group(3))
+                if len(workers) >= n_workers:
+                    prontos.set()
+
+    threading.Thread(target=ler_log, daemon=True).start()
+    try:
+        if not prontos.wait(TEMPO_MAXIMO_SEGUNDOS):
+            raise RuntimeError(f"Apenas {len(workers)} de {n_workers} workers carregaram no modo {modo}")
+        # Aguarda o autoteste de inicialização terminar em todos os workers
+        time.sleep(2)
+        resultados = []
+        for pid, tempo_carga in sorted(workers.items()):
+            memoria = ler_smaps_rollup(str(pid))
+            resultados.append({
+                "pid": pid,
+                "load_ms": tempo_carga,
+                "rss_mb": memoria.get("rss", 0) / 2 ** 20,
+                "pss_mb": memoria.get("pss", 0) / 2 ** 20
+            })
+        return resultados
+    finally:
+        processo.terminate()
+        processo.wait()
+
+def main():
+    """
+    Função principal para comparar os modos de artefatos com vários workers.
+    """
+    n_workers = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    try:
+        if not os.path.exists(os.path.join(DIRETORIO_MMAP_PADRAO, ARQUIVO_MANIFESTO)):
+            exportar_artefatos_mmap('models/melhor_modelo.joblib', 'data/transformadores_features.joblib')
+
+        for modo in ["joblib", "mmap"]:
+            resultados = medir_modo(modo, n_workers)
+            for r in resultados:
+                logger.info(
+                    f"[{modo}] worker {r['pid']}: carga {r['load_ms']:.1f} ms, "
+                    f"RSS {r['rss_mb']:.1f} MB, PSS {r['pss_mb']:.1f} MB"
+                )
+            logger.info(
+                f"[{modo}] {n_workers} workers: RSS somado {sum(r['rss_mb'] for r in resultados):.1f} MB, "
+                f"PSS somado {sum(r['pss_mb'] for r in resultados):.1f} MB, "
+                f"carga média {sum(r['load_ms'] for r in resultados) / len(resultados):.1f} ms"
+            )
+    except Exception as e:
+        logger.error(f"Erro no benchmark de memória dos workers: {str(e)}")
+        raise
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Benchmark do custo da instrumentação de métricas da API.
+
+Mede o custo de cada tipo de operação (contador, medidor, histograma, com o
+rótulo procurado a cada chamada e na série já resolvida) e o de uma
+requisição típica instrumentada, que deve ficar em poucos microssegundos.
+
+Uso:
+    python -m src.benchmarks.metricas
+"""
+
+import time
+from src.api.metricas import RegistroMetricas, LIMITES_LATENCIA, medir_overhead
+from src.utils.logger import configurar_logger
+
+logger = configurar_logger('benchmark_metricas')
+
+def medir_operacao(operacao, repeticoes: int = 200000) -> float:
+    """Retorna o custo médio de uma operação, em microssegundos."""
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        operacao()
+    return (time.perf_counter() - inicio) / repeticoes * 1e6
+
+def main():
+    """
+    Função principal para executar o benchmark.
+    """
+    try:
+        registro = RegistroMetricas()
+        contador = registro.contador("c", "c", "endpoint")
+        medidor = registro.medidor("g", "g")
+        histograma = registro.histograma("h", "h", LIMITES_LATENCIA, "etapa")
+        
+        logger.info(f"time.perf_counter(): {medir_operacao(time.perf_counter):.3f} µs")
+        serie_contador = contador.serie('predict')
+        serie_histograma = histograma.serie('predict')
+        
+        logger.info(f"Contador.incrementar: {medir_operacao(lambda: contador.incrementar('predict')):.3f} µs")
+        logger.info(f"SerieContador.incrementar: {medir_operacao(serie_contador.incrementar):.3f} µs")
+        logger.info(f"Medidor.incrementar: {medir_operacao(medidor.incrementar):.3f} µs")
+        logger.info(f"Histograma.observar: {medir_operacao(lambda: histograma.observar(0.001, 'predict')):.3f} µs")
+        logger.info(f"SerieHistograma.observar: {medir_operacao(lambda: serie_histograma.observar(0.001)):.3f} µs")
+        logger.info(f"Requisição instrumentada: {medir_overhead(50000) * 1e6:.3f} µs")
+        
+    except Exception as e:
+        logger.error(f"Erro no benchmark de métricas: {str(e)}")
+        raise
+
+if __name__ == "__main__":
+    main()
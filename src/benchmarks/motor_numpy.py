@@ -0,0 +1,87 @@
+"""
+Benchmark do motor de inferência NumPy (`src.api.motor_numpy`).
+
+Treina um XGBClassifier e uma LogisticRegression em features sintéticas
+geradas pelo transformador da API (e inclui o modelo salvo em
+`models/melhor_modelo.joblib`, se existir) e compara a latência de
+`predict` + `predict_proba` com a passada única do motor para 1 e 10.000
+linhas. A paridade com os modelos é verificada em
+`tests/test_motor_numpy.py`.
+
+Uso (a partir da raiz do projeto):
+    python -m src.benchmarks.motor_numpy
+"""
+
+import os
+import timeit
+import joblib
+import numpy as np
+import xgboost as xgb
+from typing import Any, Dict, Tuple
+from sklearn.linear_model import LogisticRegression
+from src.api.motor_numpy import construir_motor, MotorArvores
+from src.api.transformador import construir_transformador
+from src.benchmarks.transformador import gerar_entradas
+from src.utils.logger import configurar_logger
+
+logger = configurar_logger('benchmark_motor_numpy')
+
+def gerar_dados(n: int, seed: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Gera a matriz de features selecionadas e um alvo sintético.
+
+    Returns:
+        Tuple com X (n, n_features) e y binário
+    """
+    transformador = construir_transformador(joblib.load('data/transformadores_features.joblib'))
+    entradas = gerar_entradas(n, seed)
+    X = transformador.transformar(entradas)
+    rng = np.random.default_rng(seed)
+    escore = (
+        0.04 * (entradas['age'] - 40) + 0.3 * (entradas['education'] - 9)
+        + 0.02 * (entradas['hours_per_week'] - 40) + (entradas['capital_gain'] > 5000)
+        + rng.normal(0, 1, n)
+    )
+    return X, (escore > 0.5).astype(int)
+
+def medir(funcao, repeticoes: int) -> float:
+    """Retorna o melhor tempo médio por chamada, em milissegundos."""
+    tempos = timeit.repeat(funcao, number=repeticoes, repeat=5)
+    return min(tempos) / repeticoes * 1000
+
+def main():
+    """
+    Função principal para executar o benchmark.
+    """
+    try:
+        X_treino, y_treino = gerar_dados(20000)
+        X_teste, _ = gerar_dados(20000, seed=1)
+
+        modelos: Dict[str, Any] = {
+            'XGBoost': xgb.XGBClassifier(n_estimators=200, max_depth=6, n_jobs=1).fit(X_treino, y_treino),
+            'Logistic Regression': LogisticRegression(max_iter=1000).fit(X_treino, y_treino)
+        }
+        if os.path.exists('models/melhor_modelo.joblib'):
+            modelos['melhor_modelo.joblib'] = joblib.load('models/melhor_modelo.joblib')
+
+        for nome, model in modelos.items():
+            if hasattr(model, 'get_booster'):
+                model.set_params(n_jobs=1)
+            motor = construir_motor(model)
+            if isinstance(motor, MotorArvores):
+                logger.info(f"{nome}: descida em NumPy até {motor.limite_linhas} linha(s)")
+            for n, repeticoes in [(1, 500), (10000, 5)]:
+                X = X_teste[:n]
+                tempo_modelo = medir(lambda: (model.predict(X), model.predict_proba(X)), repeticoes)
+                tempo_motor = medir(lambda: motor.prever(X), repeticoes)
+                logger.info(
+                    f"{nome}, {n} linha(s): predict + predict_proba {tempo_modelo:.3f} ms, "
+                    f"motor NumPy {tempo_motor:.3f} ms ({tempo_modelo / tempo_motor:.1f}x)"
+                )
+
+    except Exception as e:
+        logger.error(f"Erro no benchmark do motor NumPy: {str(e)}")
+        raise
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Memória e tempo do feature engineering e do treino com One-Hot Encoding
+denso e esparso (`engenharia_features(..., esparsa=True)`).
+
+Mede, cada modo em um processo novo, o pico de RSS e o tempo do feature
+engineering (com a gravação do resultado: CSV no modo denso, .npz no
+esparso) e do treino da regressão logística e do XGBoost, sobre dados
+sintéticos no formato do Adult em várias escalas. A paridade entre os modos
+é verificada em `tests/test_one_hot_esparso.py`.
+
+Uso (a partir da raiz do projeto; apenas Linux):
+    python -m src.benchmarks.one_hot_esparso [escala ...]
+"""
+
+import os
+import sys
+import tempfile
+import time
+import pandas as pd
+import xgboost as xgb
+from scipy import sparse
+from typing import Dict
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import roc_auc_score
+from sklearn.model_selection import train_test_split
+from src.benchmarks.dados_sinteticos import LINHAS_ADULT, gravar_adult, medir_pico_memoria
+from src.benchmarks.tipos_compactos import criar_target
+from src.data.feature_engineering import engenharia_features
+from src.data.preprocessamento import preprocessar_dados
+from src.data.processar_dados import COLUNAS_NUMERICAS, COLUNAS_CATEGORICAS, ESTRATEGIA_NULOS
+from src.data.tipos import compactar_tipos
+from src.utils.logger import configurar_logger
+from src.utils.memoria import MedidorPicoMemoria
+
+logger = configurar_logger('benchmark_one_hot_esparso')
+
+def preparar(X: pd.DataFrame) -> pd.DataFrame:
+    X_processado, _ = preprocessar_dados(
+        compactar_tipos(X), COLUNAS_NUMERICAS, COLUNAS_CATEGORICAS, ESTRATEGIA_NULOS, inplace=True
+    )
+    return X_processado
+
+def executar_modo(entrada: str, esparsa: bool, destino: str) -> Dict[str, float]:
+    """
+    Returns:
+        Tempos (s) e acréscimos de RSS (MB) do feature engineering e do treino, e as AUCs
+    """
+    X = pd.read_parquet(entrada)
+    y = criar_target(X)
+    X_processado = preparar(X)
+    del X
+    resultado = {}
+
+    inicio = time.perf_counter()
+    with MedidorPicoMemoria() as medidor:
+        features, _ = engenharia_features(
+            X_processado, y, COLUNAS_NUMERICAS, COLUNAS_CATEGORICAS, esparsa=esparsa
+        )
+        if esparsa:
+            sparse.save_npz(destino, features)
+        else:
+            features.to_csv(destino, index=False)
+    resultado['features_s'] = time.perf_counter() - inicio
+    resultado['features_mb'] = medidor.acrescimo_bytes / 2 ** 20
+    resultado['arquivo_mb'] = os.path.getsize(destino) / 2 ** 20
+    del X_processado
+
+    alvo = (y['income'] == '>50K').astype(int).to_numpy()
+    X_treino, X_teste, y_treino, y_teste = train_test_split(
+        features, alvo, test_size=0.2, random_state=42, stratify=alvo
+    )
+    for nome, modelo in [('lr', LogisticRegression(max_iter=1000)), ('xgb', xgb.XGBClassifier())]:
+        inicio = time.perf_counter()
+        with MedidorPicoMemoria() as medidor:
+            modelo.fit(X_treino, y_treino)
+        resultado[f'{nome}_s'] = time.perf_counter() - inicio
+        resultado[f'{nome}_mb'] = medidor.acrescimo_bytes / 2 ** 20
+        resultado[f'{nome}_auc'] = roc_auc_score(y_teste, modelo.predict_proba(X_teste)[:, 1])
+    return resultado
+
+def medir_escala(escala: int, diretorio: str) -> Dict[str, Dict[str, float]]:
+    """Mede os dois modos sobre `escala` vezes o tamanho do Adult."""
+    n = escala * LINHAS_ADULT
+    entrada = gravar_adult(os.path.join(diretorio, f"adult_{escala}x.parquet"), n)
+    resultados = {}
+    for nome, esparsa, arquivo in [('denso', False, 'features.csv'), ('esparso', True, 'features.npz')]:
+        resultado, pico = medir_pico_memoria(executar_modo, entrada, esparsa, os.path.join(diretorio, arquivo))
+        resultado['pico_mb'] = pico / 2 ** 20
+        resultados[nome] = resultado
+        logger.info(
+            f"{escala}x ({n} linhas), {nome}: pico de RSS {resultado['pico_mb']:.0f} MB; "
+            f"features {resultado['features_s']:.2f} s (+{resultado['features_mb']:.0f} MB, "
+            f"arquivo {resultado['arquivo_mb']:.1f} MB); "
+            f"LR {resultado['lr_s']:.2f} s (+{resultado['lr_mb']:.0f} MB, AUC {resultado['lr_auc']:.4f}); "
+            f"XGBoost {resultado['xgb_s']:.2f} s (+{resultado['xgb_mb']:.0f} MB, AUC {resultado['xgb_auc']:.4f})"
+        )
+    os.remove(entrada)
+    return resultados
+
+def main():
+    """
+    Função principal para executar o benchmark.
+    """
+    try:
+        escalas = [int(e) for e in sys.argv[1:]] or [1, 20]
+        with tempfile.TemporaryDirectory() as diretorio:
+            for escala in escalas:
+                medir_escala(escala, diretorio)
+
+    except Exception as e:
+        logger.error(f"Erro no benchmark do One-Hot Encoding esparso: {str(e)}")
+        raise
+
+if __name__ == "__main__":
+    main()
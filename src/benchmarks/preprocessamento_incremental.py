@@ -0,0 +1,74 @@
+"""
+Memória do pré-processamento em blocos (`src.data.preprocessamento_incremental`).
+
+Gera arquivos sintéticos no formato do Adult e mede, cada um em um processo
+novo, o pico de RSS e o tempo do pipeline em memória (ler o CSV inteiro,
+processar e gravar) e do pipeline em blocos, em várias escalas do dataset
+original. A paridade com `preprocessar_dados` é verificada em
+`tests/test_preprocessamento_incremental.py`.
+
+Uso (a partir da raiz do projeto; apenas Linux):
+    python -m src.benchmarks.preprocessamento_incremental [escala ...]
+"""
+
+import os
+import sys
+import tempfile
+import time
+import pandas as pd
+from typing import Dict
+from src.benchmarks.dados_sinteticos import LINHAS_ADULT, gravar_adult, medir_pico_memoria
+from src.data.preprocessamento import preprocessar_dados
+from src.data.preprocessamento_incremental import PreprocessadorIncremental
+from src.data.processar_dados import COLUNAS_NUMERICAS, COLUNAS_CATEGORICAS, ESTRATEGIA_NULOS
+from src.utils.logger import configurar_logger
+
+logger = configurar_logger('benchmark_preprocessamento_incremental')
+
+TAMANHO_BLOCO = 50_000
+
+def pipeline_em_memoria(entrada: str, saida: str) -> float:
+    inicio = time.perf_counter()
+    X = pd.read_csv(entrada)
+    X_processado, _ = preprocessar_dados(X, COLUNAS_NUMERICAS, COLUNAS_CATEGORICAS, ESTRATEGIA_NULOS)
+    X_processado.to_csv(saida, index=False)
+    return time.perf_counter() - inicio
+
+def pipeline_em_blocos(entrada: str, saida: str) -> float:
+    inicio = time.perf_counter()
+    preprocessador = PreprocessadorIncremental(
+        COLUNAS_NUMERICAS, COLUNAS_CATEGORICAS, ESTRATEGIA_NULOS, tamanho_bloco=TAMANHO_BLOCO
+    )
+    preprocessador.fit(entrada)
+    preprocessador.transform(entrada, saida)
+    return time.perf_counter() - inicio
+
+def medir_escala(escala: int, diretorio: str) -> Dict[str, Dict[str, float]]:
+    """Mede os dois pipelines sobre um CSV com `escala` vezes o tamanho do Adult."""
+    n = escala * LINHAS_ADULT
+    entrada = gravar_adult(os.path.join(diretorio, f"adult_{escala}x.csv"), n)
+    saida = os.path.join(diretorio, "saida.csv")
+    resultados = {}
+    for nome, funcao in [("em memória", pipeline_em_memoria), ("em blocos", pipeline_em_blocos)]:
+        segundos, pico = medir_pico_memoria(funcao, entrada, saida)
+        resultados[nome] = {"segundos": segundos, "pico_mb": pico / 2 ** 20}
+        logger.info(f"{escala}x ({n} linhas), {nome}: {segundos:.1f} s, pico de RSS {pico / 2 ** 20:.0f} MB")
+    os.remove(entrada)
+    return resultados
+
+def main():
+    """
+    Função principal para executar o benchmark.
+    """
+    try:
+        escalas = [int(e) for e in sys.argv[1:]] or [1, 10]
+        with tempfile.TemporaryDirectory() as diretorio:
+            for escala in escalas:
+                medir_escala(escala, diretorio)
+
+    except Exception as e:
+        logger.error(f"Erro no benchmark do pré-processamento em blocos: {str(e)}")
+        raise
+
+if __name__ == "__main__":
+    main()
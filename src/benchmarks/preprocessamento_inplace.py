@@ -0,0 +1,76 @@
+"""
+Memória do modo in-place de `preprocessar_dados`.
+
+Mede, cada modo em um processo novo, o pico de RSS e o tempo de
+`preprocessar_dados` com e sem `inplace=True` sobre dados sintéticos no
+formato do Adult. Os dados são lidos de um Parquet antes do pipeline; o
+acréscimo informado é o pico menos o RSS com os dados já carregados. A
+paridade entre os modos é verificada em `tests/test_preprocessamento_inplace.py`.
+
+Uso (a partir da raiz do projeto; apenas Linux):
+    python -m src.benchmarks.preprocessamento_inplace [escala]
+"""
+
+import os
+import sys
+import tempfile
+import time
+import pandas as pd
+from typing import Dict, Tuple
+from src.benchmarks.dados_sinteticos import LINHAS_ADULT, gravar_adult, medir_pico_memoria
+from src.data.preprocessamento import preprocessar_dados
+from src.data.processar_dados import COLUNAS_NUMERICAS, COLUNAS_CATEGORICAS, ESTRATEGIA_NULOS
+from src.utils.logger import configurar_logger
+from src.utils.memoria import ler_memoria_processo
+
+logger = configurar_logger('benchmark_preprocessamento_inplace')
+
+def executar_pipeline(entrada: str, inplace: bool) -> Tuple[float, int]:
+    """
+    Returns:
+        Tuple com o tempo do pipeline (s) e o RSS com os dados carregados (bytes)
+    """
+    X = pd.read_parquet(entrada)
+    rss_dados = ler_memoria_processo()["rss"]
+    inicio = time.perf_counter()
+    preprocessar_dados(X, COLUNAS_NUMERICAS, COLUNAS_CATEGORICAS, ESTRATEGIA_NULOS, inplace=inplace)
+    return time.perf_counter() - inicio, rss_dados
+
+def medir_escala(escala: int, diretorio: str) -> Dict[str, Dict[str, float]]:
+    """Mede os dois modos sobre `escala` vezes o tamanho do Adult."""
+    n = escala * LINHAS_ADULT
+    entrada = gravar_adult(os.path.join(diretorio, f"adult_{escala}x.parquet"), n)
+    resultados = {}
+    for nome, inplace in [("cópias", False), ("in-place", True)]:
+        (segundos, rss_dados), pico = medir_pico_memoria(executar_pipeline, entrada, inplace)
+        resultados[nome] = {
+            "segundos": segundos,
+            "pico_mb": pico / 2 ** 20,
+            "acrescimo_mb": (pico - rss_dados) / 2 ** 20
+        }
+        logger.info(
+            f"{escala}x ({n} linhas), {nome}: {segundos:.1f} s, pico de RSS {pico / 2 ** 20:.0f} MB "
+            f"(+{(pico - rss_dados) / 2 ** 20:.0f} MB além dos dados carregados)"
+        )
+    reducao = 1 - resultados["in-place"]["acrescimo_mb"] / resultados["cópias"]["acrescimo_mb"]
+    logger.info(
+        f"{escala}x: pico {resultados['cópias']['pico_mb']:.0f} -> {resultados['in-place']['pico_mb']:.0f} MB, "
+        f"acréscimo do pipeline {reducao:.0%} menor"
+    )
+    return resultados
+
+def main():
+    """
+    Função principal para executar o benchmark.
+    """
+    try:
+        escala = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+        with tempfile.TemporaryDirectory() as diretorio:
+            medir_escala(escala, diretorio)
+
+    except Exception as e:
+        logger.error(f"Erro no benchmark do modo in-place: {str(e)}")
+        raise
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Escalabilidade do modo paralelo de `preprocessar_dados` (`n_workers`).
+
+Mede o tempo do pipeline com 1, 2, 4 e 8 processos sobre um dataset
+sintético largo e alto: as colunas do Adult repetidas `largura` vezes, com
+os valores embaralhados em cada cópia. O ganho depende dos núcleos
+disponíveis; com menos núcleos que processos, o tempo extra é o custo da
+memória compartilhada e do pool. A paridade com o modo sequencial é
+verificada em `tests/test_preprocessamento_paralelo.py`.
+
+Uso (a partir da raiz do projeto; apenas Linux):
+    python -m src.benchmarks.preprocessamento_paralelo [escala] [largura]
+"""
+
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Tuple
+from src.benchmarks.dados_sinteticos import LINHAS_ADULT, gerar_adult
+from src.data.preprocessamento import preprocessar_dados
+from src.data.processar_dados import COLUNAS_NUMERICAS, COLUNAS_CATEGORICAS, ESTRATEGIA_NULOS
+from src.utils.logger import configurar_logger
+
+logger = configurar_logger('benchmark_preprocessamento_paralelo')
+
+WORKERS = [1, 2, 4, 8]
+
+def gerar_largo(n: int, largura: int, seed: int = 0) -> Tuple[pd.DataFrame, List[str], List[str], Dict[str, str]]:
+    """
+    Returns:
+        Tuple com o DataFrame, as colunas numéricas, as categóricas e a
+        estratégia de nulos das `largura` cópias das colunas do Adult
+    """
+    base = gerar_adult(n, seed)
+    rng = np.random.default_rng(seed)
+    colunas = {}
+    for i in range(largura):
+        for coluna in base.columns:
+            colunas[f"{coluna}_{i}"] = base[coluna].to_numpy()[rng.permutation(n)]
+    sufixos = [f"_{i}" for i in range(largura)]
+    return (
+        pd.DataFrame(colunas),
+        [c + s for s in sufixos for c in COLUNAS_NUMERICAS],
+        [c + s for s in sufixos for c in COLUNAS_CATEGORICAS],
+        {c + s: metodo for s in sufixos for c, metodo in ESTRATEGIA_NULOS.items()}
+    )
+
+def medir(escala: int, largura: int) -> Dict[int, float]:
+    """Mede o pipeline com cada número de processos em `WORKERS`."""
+    n = escala * LINHAS_ADULT
+    X, numericas, categoricas, estrategia = gerar_largo(n, largura)
+    logger.info(f"Dataset: {n} linhas x {X.shape[1]} colunas; núcleos disponíveis: {len(os.sched_getaffinity(0))}")
+    tempos = {}
+    for n_workers in WORKERS:
+        inicio = time.perf_counter()
+        preprocessar_dados(X, numericas, categoricas, estrategia, n_workers=n_workers)
+        tempos[n_workers] = time.perf_counter() - inicio
+        logger.info(
+            f"{n_workers} processo(s): {tempos[n_workers]:.1f} s "
+            f"(aceleração {tempos[1] / tempos[n_workers]:.2f}x)"
+        )
+    return tempos
+
+def main():
+    """
+    Função principal para executar o benchmark.
+    """
+    try:
+        escala = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+        largura = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+        medir(escala, largura)
+
+    except Exception as e:
+        logger.error(f"Erro no benchmark do modo paralelo: {str(e)}")
+        raise
+
+if __name__ == "__main__":
+    main()
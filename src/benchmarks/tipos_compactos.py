@@ -0,0 +1,120 @@
+"""
+Memória por etapa com a política de tipos compactos (`src.data.tipos`).
+
+Executa as etapas de `preprocessamento` e `feature_engineering` sobre dados
+sintéticos no formato do Adult, com os tipos de hoje (texto em `object`,
+inteiros em `int64`) e com `compactar_tipos` aplicado na leitura, como faz
+`carregar_dados`. Para cada etapa registra o tamanho do DataFrame
+resultante, o pico de RSS acima do início da etapa e o tempo; cada modo
+roda em um processo novo. A paridade entre os dois modos (mesmas classes e
+códigos, mesmas features a menos da precisão float32) é verificada em
+`tests/test_tipos.py`.
+
+Uso (a partir da raiz do projeto; apenas Linux):
+    python -m src.benchmarks.tipos_compactos [escala]
+"""
+
+import os
+import sys
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+from typing import Callable, Dict, List, Tuple
+from src.benchmarks.dados_sinteticos import LINHAS_ADULT, gravar_adult, medir_pico_memoria
+from src.data import feature_engineering as fe
+from src.data import preprocessamento as pp
+from src.data.processar_dados import COLUNAS_NUMERICAS, COLUNAS_CATEGORICAS, ESTRATEGIA_NULOS
+from src.data.tipos import compactar_tipos, memoria_colunas
+from src.utils.logger import configurar_logger
+from src.utils.memoria import MedidorPicoMemoria
+
+logger = configurar_logger('benchmark_tipos_compactos')
+
+COLUNAS_ONE_HOT = COLUNAS_CATEGORICAS + ['faixa_etaria', 'tipo_jornada', 'nivel_educacao']
+FEATURES_DERIVADAS = [
+    'faixa_etaria', 'idade_aposentadoria', 'tipo_jornada', 'tem_ganho_capital',
+    'tem_perda_capital', 'razao_capital', 'nivel_educacao'
+]
+
+def criar_target(X: pd.DataFrame) -> pd.DataFrame:
+    """Target sintético ligado à escolaridade e às horas trabalhadas."""
+    renda_alta = (X['education-num'] >= 13) | (X['hours-per-week'] >= 50)
+    return pd.DataFrame({'income': np.where(renda_alta, '>50K', '<=50K')})
+
+def adicionar_features(X: pd.DataFrame) -> pd.DataFrame:
+    """Cópia de X com as features derivadas da especificação."""
+    return X.assign(**fe.calcular_features(X, fe.criar_motor(X), FEATURES_DERIVADAS))
+
+def etapas(y: pd.DataFrame) -> List[Tuple[str, Callable[[pd.DataFrame], pd.DataFrame]]]:
+    return [
+        ('nulos', lambda X: pp.remover_valores_nulos(X, ESTRATEGIA_NULOS)),
+        ('outliers', lambda X: pp.tratar_outliers(X, COLUNAS_NUMERICAS)),
+        ('normalizacao', lambda X: pp.normalizar_features(X, COLUNAS_NUMERICAS)[0]),
+        ('codificacao', lambda X: pp.codificar_categoricas(X, COLUNAS_CATEGORICAS)[0]),
+        ('features', adicionar_features),
+        ('one_hot', lambda X: fe.aplicar_one_hot_encoding(X, COLUNAS_ONE_HOT)[0]),
+        ('selecao', lambda X: fe.selecionar_melhores_features(X, y)[0])
+    ]
+
+def executar_etapas(entrada: str, compactar: bool) -> List[Dict[str, float]]:
+    """
+    Returns:
+        Lista com, por etapa, o tamanho dos dados (MB), o acréscimo de RSS (MB) e o tempo (s)
+    """
+    X = pd.read_parquet(entrada)
+    if compactar:
+        X = compactar_tipos(X)
+    y = criar_target(X)
+    relatorio = [{'etapa': 'carregados', 'dados_mb': sum(memoria_colunas(X).values()) / 2 ** 20}]
+    for nome, etapa in etapas(y):
+        inicio = time.perf_counter()
+        with MedidorPicoMemoria() as medidor:
+            X_novo = etapa(X)
+        segundos = time.perf_counter() - inicio
+        X = X_novo
+        del X_novo
+        relatorio.append({
+            'etapa': nome,
+            'dados_mb': sum(memoria_colunas(X).values()) / 2 ** 20,
+            'acrescimo_mb': medidor.acrescimo_bytes / 2 ** 20,
+            'segundos': segundos
+        })
+    return relatorio
+
+def medir_escala(escala: int, diretorio: str) -> Dict[str, List[Dict[str, float]]]:
+    """Executa as etapas nos dois modos sobre `escala` vezes o tamanho do Adult."""
+    n = escala * LINHAS_ADULT
+    entrada = gravar_adult(os.path.join(diretorio, f"adult_{escala}x.parquet"), n)
+    relatorios = {}
+    for nome, compactar in [('tipos atuais', False), ('compactos', True)]:
+        relatorios[nome], pico = medir_pico_memoria(executar_etapas, entrada, compactar)
+        logger.info(f"{escala}x ({n} linhas), {nome}: pico de RSS {pico / 2 ** 20:.0f} MB")
+
+    atuais, compactos = relatorios['tipos atuais'], relatorios['compactos']
+    logger.info(f"{'etapa':<14}{'dados (MB)':>22}{'acréscimo RSS (MB)':>24}{'tempo (s)':>18}")
+    for atual, compacto in zip(atuais, compactos):
+        linha = f"{atual['etapa']:<14}{atual['dados_mb']:>10.1f} -> {compacto['dados_mb']:<8.1f}"
+        if 'segundos' in atual:
+            linha += (
+                f"{atual['acrescimo_mb']:>12.0f} -> {compacto['acrescimo_mb']:<8.0f}"
+                f"{atual['segundos']:>8.2f} -> {compacto['segundos']:<6.2f}"
+            )
+        logger.info(linha)
+    return relatorios
+
+def main():
+    """
+    Função principal para executar o benchmark.
+    """
+    try:
+        escala = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+        with tempfile.TemporaryDirectory() as diretorio:
+            medir_escala(escala, diretorio)
+
+    except Exception as e:
+        logger.error(f"Erro no benchmark de tipos compactos: {str(e)}")
+        raise
+
+if __name__ == "__main__":
+    main()
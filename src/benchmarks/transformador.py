@@ -0,0 +1,79 @@
+"""
+Microbenchmark do transformador compilado da API.
+
+Mede o tempo de `TransformadorCompilado` e da implementação de referência em
+pandas (`transformar_features`) para 1 e 10.000 linhas. A paridade entre as
+duas é verificada em `tests/test_transformador.py`.
+
+Uso (a partir da raiz do projeto, com o modelo já treinado):
+    python -m src.benchmarks.transformador
+"""
+
+import logging
+import timeit
+import numpy as np
+import pandas as pd
+from typing import Dict
+from src.utils.logger import configurar_logger
+
+logger = configurar_logger('benchmark_transformador')
+
+def gerar_entradas(n: int, seed: int = 42) -> Dict[str, np.ndarray]:
+    """
+    Gera registros brutos aleatórios, incluindo valores fora das faixas
+    conhecidas (idades e horas fora dos bins, códigos desconhecidos).
+    
+    Args:
+        n: Número de registros
+        seed: Semente aleatória
+        
+    Returns:
+        Dicionário campo -> array, com os nomes de campo de InputData
+    """
+    rng = np.random.default_rng(seed)
+    return {
+        'age': rng.integers(-5, 121, n),
+        'workclass': rng.integers(-1, 11, n),
+        'education': rng.integers(-2, 19, n),
+        'marital_status': rng.integers(-1, 9, n),
+        'occupation': rng.integers(-1, 17, n),
+        'relationship': rng.integers(-1, 8, n),
+        'race': rng.integers(-1, 7, n),
+        'sex': rng.integers(-1, 4, n),
+        'capital_gain': rng.choice([0, 0, 0, 594, 2174, 99999], n),
+        'capital_loss': rng.choice([0, 0, 0, 1902, 4356], n),
+        'hours_per_week': rng.integers(0, 200, n),
+        'native_country': rng.integers(-1, 45, n)
+    }
+
+def medir(funcao, repeticoes: int) -> float:
+    """Retorna o melhor tempo médio por chamada, em milissegundos."""
+    tempos = timeit.repeat(funcao, number=repeticoes, repeat=5)
+    return min(tempos) / repeticoes * 1000
+
+def main():
+    """
+    Função principal para executar o benchmark.
+    """
+    logging.getLogger('src.api.api').setLevel(logging.WARNING)
+    from src.api import api
+    
+    try:
+        for n, repeticoes in [(1, 200), (10000, 5)]:
+            colunas = gerar_entradas(n, seed=n)
+            tempo_pandas = medir(lambda: api.transformar_features(pd.DataFrame(colunas)), repeticoes)
+            transformador = api.gerenciador_modelo.atual.transformador
+            tempo_compilado = medir(lambda: transformador.transformar(colunas), repeticoes)
+            
+            logger.info(
+                f"{n} linha(s): pandas {tempo_pandas:.3f} ms, "
+                f"compilado {tempo_compilado:.3f} ms "
+                f"({tempo_pandas / tempo_compilado:.1f}x mais rápido)"
+            )
+        
+    except Exception as e:
+        logger.error(f"Erro no benchmark do transformador: {str(e)}")
+        raise
+
+if __name__ == "__main__":
+    main()
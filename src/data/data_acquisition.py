@@ -9,17 +9,23 @@ URL: https://archive.ics.uci.edu/dataset/2/adult
 import pandas as pd
 from ucimlrepo import fetch_ucirepo
 from typing import Tuple, Dict, Any
+from src.data.tipos import compactar_tipos, memoria_colunas
 from src.utils.logger import configurar_logger
 
 logger = configurar_logger('aquisicao_dados')
 
-def carregar_dados() -> Tuple[pd.DataFrame, pd.DataFrame, Dict[str, Any]]:
+def carregar_dados(compactar: bool = True) -> Tuple[pd.DataFrame, pd.DataFrame, Dict[str, Any]]:
     """
     Carrega os dados do UCI ML Repository e retorna as features, target e metadados.
     
     Dataset utilizado: Adult Income (id=2)
     URL: https://archive.ics.uci.edu/dataset/2/adult
     
+    Args:
+        compactar: Se True, aplica a política de tipos compactos
+                   (`src.data.tipos.compactar_tipos`): campos nominais como
+                   `category` e inteiros na menor largura
+    
     Returns:
         Tuple contendo:
         - DataFrame com as features
@@ -32,6 +38,14 @@ def carregar_dados() -> Tuple[pd.DataFrame, pd.DataFrame, Dict[str, Any]]:
     
     X = adult.data.features
     y = adult.data.targets
+    
+    if compactar:
+        memoria_original = sum(memoria_colunas(X).values())
+        X = compactar_tipos(X)
+        logger.info(
+            f"Tipos compactos: {memoria_original / 2 ** 20:.1f} MB -> "
+            f"{sum(memoria_colunas(X).values()) / 2 ** 20:.1f} MB"
+        )
     metadados = {
         "nome": adult.metadata.name,
         "descricao": adult.metadata.description,
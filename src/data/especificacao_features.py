@@ -0,0 +1,265 @@
+"""
+Especificação declarativa das features, executada no treino e na API.
+
+`ESPECIFICACAO` define cada feature numérica ou discretizada em valores
+brutos, nas unidades dos campos de `InputData`: entradas, tabelas, razões,
+indicadores e faixas. As categóricas (`CATEGORICAS`) chegam como códigos do
+LabelEncoder e são codificadas com One-Hot pelo encoder ajustado no treino.
+
+`MotorFeatures` compila a especificação com o que o pré-processamento
+ajustou (limites de outliers, média e escala do StandardScaler, classes de
+`education`). As features são calculadas no domínio dos dados
+pré-processados, que é o que o feature engineering recebe; os limiares de
+faixas e indicadores são levados a esse domínio uma única vez. Na API, os
+campos brutos passam antes pela mesma limitação e normalização
+(`brutas=True`). Tudo é NumPy, vale para colunas inteiras ou blocos, e o
+módulo não importa pandas.
+"""
+
+import numpy as np
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+ANOS_ESTUDO = {
+    'Preschool': 1, '1st-4th': 2, '5th-6th': 3, '7th-8th': 4, '9th': 5,
+    '10th': 6, '11th': 7, '12th': 8, 'HS-grad': 9, 'Some-college': 10,
+    'Assoc-voc': 11, 'Assoc-acdm': 12, 'Bachelors': 13, 'Masters': 14,
+    'Prof-school': 15, 'Doctorate': 16
+}
+# Anos de estudo de códigos de `education` fora das classes do treino
+ANOS_ESTUDO_PADRAO = ANOS_ESTUDO['HS-grad']
+
+# Feature -> definição, em valores brutos. Tipos:
+# - 'entrada': campo numérico de entrada
+# - 'tabela': valor de `tabela` para a classe do código em `origem`
+# - 'razao': origem / (divisor + soma)
+# - 'indicador': 1 se `origem <operador> limiar`, senão 0
+# - 'faixas': intervalo de `origem`, com a semântica de `pd.cut` (fechados à
+#   direita); valores fora das bordas ficam na faixa ausente (NaN)
+# Entradas e tabelas passam pela limitação de outliers e pela normalização
+# ajustadas no pré-processamento da coluna de mesmo nome.
+ESPECIFICACAO: Dict[str, Dict[str, Any]] = {
+    'age': {'tipo': 'entrada'},
+    'education-num': {
+        'tipo': 'tabela', 'origem': 'education', 'tabela': ANOS_ESTUDO, 'padrao': ANOS_ESTUDO_PADRAO
+    },
+    'capital-gain': {'tipo': 'entrada'},
+    'capital-loss': {'tipo': 'entrada'},
+    'hours-per-week': {'tipo': 'entrada'},
+    'razao_capital': {'tipo': 'razao', 'origem': 'capital-gain', 'divisor': 'capital-loss', 'soma': 1},
+    'idade_aposentadoria': {'tipo': 'indicador', 'origem': 'age', 'operador': '>=', 'limiar': 65},
+    'tem_ganho_capital': {'tipo': 'indicador', 'origem': 'capital-gain', 'operador': '>', 'limiar': 0},
+    'tem_perda_capital': {'tipo': 'indicador', 'origem': 'capital-loss', 'operador': '>', 'limiar': 0},
+    'faixa_etaria': {
+        'tipo': 'faixas', 'origem': 'age',
+        'bordas': [0, 25, 35, 45, 55, 65, 100],
+        'rotulos': ['18-25', '26-35', '36-45', '46-55', '56-65', '65+'],
+        'incluir_menor': False
+    },
+    'tipo_jornada': {
+        'tipo': 'faixas', 'origem': 'hours-per-week',
+        'bordas': [0, 20, 40, 60, 168],
+        'rotulos': ['Parcial', 'Normal', 'Extra', 'Extenso'],
+        'incluir_menor': False
+    },
+    'nivel_educacao': {
+        'tipo': 'faixas', 'origem': 'education-num',
+        'bordas': [0, 8, 12, 14, 16, 20],
+        'rotulos': ['Básico', 'Médio', 'Superior Incompleto', 'Superior Completo', 'Pós-Graduação'],
+        'incluir_menor': True
+    },
+}
+
+# Categóricas de entrada (códigos do LabelEncoder), codificadas com One-Hot
+CATEGORICAS = [
+    'workclass', 'education', 'marital-status', 'occupation',
+    'relationship', 'race', 'sex', 'native-country'
+]
+
+# Features da especificação, na ordem dela
+FEATURES_NUMERICAS = [nome for nome, d in ESPECIFICACAO.items() if d['tipo'] != 'faixas']
+FEATURES_DISCRETIZADAS = [nome for nome, d in ESPECIFICACAO.items() if d['tipo'] == 'faixas']
+
+OPERADORES: Dict[str, Callable[[np.ndarray, Any], np.ndarray]] = {
+    '>': np.greater, '>=': np.greater_equal, '<': np.less, '<=': np.less_equal
+}
+
+def indice_bin(valores: np.ndarray, bordas: List[float], incluir_menor: bool = False) -> np.ndarray:
+    """
+    Calcula o índice do intervalo de cada valor com `np.searchsorted`.
+
+    Args:
+        valores: Valores a discretizar
+        bordas: Bordas dos intervalos, fechados à direita
+        incluir_menor: Se True, a primeira borda pertence ao primeiro intervalo
+
+    Returns:
+        Índice do intervalo de cada valor; valores fora das bordas recebem
+        `len(bordas) - 1`, equivalente ao NaN de `pd.cut`
+    """
+    bordas = np.asarray(bordas, dtype=np.float64)
+    n_bins = len(bordas) - 1
+    indices = np.searchsorted(bordas, valores, side='left') - 1
+    if incluir_menor:
+        indices[valores == bordas[0]] = 0
+    indices[(indices < 0) | (indices >= n_bins)] = n_bins
+    return indices
+
+def parametros_do_preprocessamento(
+    transformadores: Optional[Dict[str, Any]],
+    tipo_entrada: Any = np.float64
+) -> Dict[str, Any]:
+    """
+    Extrai dos transformadores de `preprocessar_dados` o que o motor precisa
+    para reproduzir o pré-processamento das colunas da especificação.
+
+    Args:
+        transformadores: Transformadores do pré-processamento ('scaler',
+                         'limites', 'encoders', 'tipo_numericas'), ou None
+                         se as features forem calculadas sobre valores brutos
+        tipo_entrada: Tipo das colunas numéricas recebidas pelo feature engineering
+
+    Returns:
+        Parâmetros para `MotorFeatures`, serializáveis com joblib
+    """
+    parametros: Dict[str, Any] = {'tipo_entrada': np.dtype(tipo_entrada).name, 'numericas': {}, 'classes': {}}
+    if not transformadores:
+        return parametros
+
+    parametros['tipo_calculo'] = transformadores.get('tipo_numericas', parametros['tipo_entrada'])
+    scaler = transformadores.get('scaler')
+    limites = transformadores.get('limites', {})
+    if scaler is not None:
+        for i, coluna in enumerate(scaler.feature_names_in_):
+            if coluna in ESPECIFICACAO:
+                parametros['numericas'][coluna] = {
+                    'limites': tuple(float(l) for l in limites[coluna]) if coluna in limites else None,
+                    'media': float(scaler.mean_[i]),
+                    'escala': float(scaler.scale_[i])
+                }
+    for coluna, encoder in transformadores.get('encoders', {}).items():
+        parametros['classes'][coluna] = [str(c) for c in encoder.classes_]
+    return parametros
+
+class MotorFeatures:
+    """
+    Calcula as features de `ESPECIFICACAO` a partir de colunas NumPy.
+
+    Construído uma vez com os parâmetros de `parametros_do_preprocessamento`
+    (gravados em `especificacao` nos transformadores do feature
+    engineering); sem parâmetros, as colunas são tratadas como valores brutos.
+    """
+
+    def __init__(self, parametros: Optional[Dict[str, Any]] = None):
+        parametros = parametros or {}
+        self.parametros = parametros
+        self.tipo = np.dtype(parametros.get('tipo_entrada', np.float64))
+        self.tipo_calculo = np.dtype(parametros.get('tipo_calculo', self.tipo))
+        # Tipo em que o modelo recebeu as numéricas (a matriz esparsa é float32)
+        self.tipo_saida = np.dtype(parametros.get('tipo_saida', self.tipo))
+        self._numericas: Dict[str, Dict[str, Any]] = parametros.get('numericas', {})
+
+        classes = parametros.get('classes', {})
+        self._tabelas: Dict[str, np.ndarray] = {}
+        self._limiares: Dict[str, Any] = {}
+        for nome, definicao in ESPECIFICACAO.items():
+            if definicao['tipo'] == 'tabela':
+                # Sem as classes do treino, vale a ordem do LabelEncoder (texto ordenado)
+                classes_origem = classes.get(definicao['origem'], sorted(definicao['tabela']))
+                self._tabelas[nome] = np.array(
+                    [definicao['tabela'].get(c, definicao['padrao']) for c in classes_origem], dtype=np.int64
+                )
+            elif definicao['tipo'] == 'indicador':
+                self._limiares[nome] = self.normalizar(definicao['origem'], [definicao['limiar']], limitar=False)[0]
+            elif definicao['tipo'] == 'faixas':
+                self._limiares[nome] = self.normalizar(definicao['origem'], definicao['bordas'], limitar=False)
+
+    def normalizar(self, nome: str, valores: Iterable, limitar: bool = True) -> np.ndarray:
+        """
+        Leva valores brutos de uma coluna ao domínio do pré-processamento,
+        com as mesmas operações de `tratar_outliers` e `normalizar_features`.
+
+        Args:
+            nome: Coluna da especificação
+            valores: Valores brutos
+            limitar: Se False, não aplica os limites de outliers (usado nos limiares)
+
+        Returns:
+            Valores no tipo das colunas numéricas do feature engineering
+        """
+        parametros = self._numericas.get(nome)
+        if parametros is None:
+            return np.asarray(valores, dtype=self.tipo)
+        valores = np.asarray(valores, dtype=np.float64)
+        if limitar and parametros['limites'] is not None:
+            valores = np.clip(valores, *parametros['limites'])
+        if self.tipo_calculo == np.float32:
+            # Como o StandardScaler sobre float32: cada operação em float64, arredondada para float32
+            valores = np.subtract(valores.astype(np.float32), parametros['media'], dtype=np.float64).astype(np.float32)
+            valores = np.divide(valores, parametros['escala'], dtype=np.float64).astype(np.float32)
+        else:
+            valores = (valores - parametros['media']) / parametros['escala']
+        return valores.astype(self.tipo, copy=False)
+
+    def _desnormalizar(self, nome: str, valores: np.ndarray) -> np.ndarray:
+        parametros = self._numericas.get(nome)
+        valores = np.asarray(valores, dtype=np.float64)
+        if parametros is None:
+            return valores
+        return valores * parametros['escala'] + parametros['media']
+
+    def _tabela(self, nome: str, codigos: np.ndarray) -> np.ndarray:
+        tabela = self._tabelas[nome]
+        codigos = np.asarray(codigos)
+        validos = (codigos >= 0) & (codigos < len(tabela))
+        anos = np.where(validos, tabela[np.where(validos, codigos, 0)], ESPECIFICACAO[nome]['padrao'])
+        return self.normalizar(nome, anos)
+
+    def calcular(
+        self,
+        colunas: Dict[str, np.ndarray],
+        nomes: Optional[Iterable[str]] = None,
+        brutas: bool = False
+    ) -> Dict[str, np.ndarray]:
+        """
+        Calcula features da especificação, e só as que forem pedidas (com as
+        de que elas dependem).
+
+        Args:
+            colunas: Coluna de entrada -> array (nomes do dataset, ex.: 'hours-per-week')
+            nomes: Features a calcular; por padrão, todas
+            brutas: Se True, as entradas numéricas são valores brutos (API) e
+                    passam antes pela limitação e normalização do treino
+
+        Returns:
+            Feature -> array. Numéricas no tipo das colunas do feature
+            engineering (indicadores em int8); faixas como índices em
+            `rotulos`, com `len(rotulos)` para a faixa ausente
+        """
+        calculadas: Dict[str, np.ndarray] = {}
+
+        def valor(nome: str) -> np.ndarray:
+            if nome not in calculadas:
+                definicao = ESPECIFICACAO[nome]
+                tipo = definicao['tipo']
+                if tipo == 'entrada':
+                    calculadas[nome] = (
+                        self.normalizar(nome, colunas[nome]) if brutas
+                        else np.asarray(colunas[nome], dtype=self.tipo)
+                    )
+                elif tipo == 'tabela':
+                    calculadas[nome] = self._tabela(nome, colunas[definicao['origem']])
+                elif tipo == 'razao':
+                    razao = self._desnormalizar(definicao['origem'], valor(definicao['origem'])) / (
+                        self._desnormalizar(definicao['divisor'], valor(definicao['divisor'])) + definicao['soma']
+                    )
+                    calculadas[nome] = razao.astype(self.tipo, copy=False)
+                elif tipo == 'indicador':
+                    operador = OPERADORES[definicao['operador']]
+                    calculadas[nome] = operador(valor(definicao['origem']), self._limiares[nome]).astype(np.int8)
+                else:
+                    calculadas[nome] = indice_bin(
+                        valor(definicao['origem']), self._limiares[nome], definicao['incluir_menor']
+                    )
+            return calculadas[nome]
+
+        return {nome: valor(nome) for nome in (ESPECIFICACAO if nomes is None else nomes)}
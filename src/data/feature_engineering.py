@@ -3,84 +3,93 @@ Módulo responsável pelo Feature Engineering.
 Implementa transformações e criação de novas features.
 """
 
+import argparse
+import numpy as np
 import pandas as pd
-from typing import Tuple, Dict, Any, List
+from scipy import sparse
+from typing import Tuple, Dict, Any, Iterable, Iterator, List, Union, Optional
 from sklearn.preprocessing import OneHotEncoder
 from sklearn.feature_selection import SelectKBest, f_classif
+from src.data.especificacao_features import (
+    ESPECIFICACAO, FEATURES_NUMERICAS, FEATURES_DISCRETIZADAS, MotorFeatures, parametros_do_preprocessamento
+)
+from src.data.tipos import compactar_tipos
 from src.utils.logger import configurar_logger
 import joblib
 
 logger = configurar_logger('feature_engineering')
 
-def criar_features_idade(X: pd.DataFrame) -> pd.DataFrame:
+# Features derivadas categóricas, codificadas junto com as categóricas originais
+COLUNAS_DISCRETIZADAS = FEATURES_DISCRETIZADAS
+
+def criar_motor(X: pd.DataFrame, preprocessamento: Optional[Dict[str, Any]] = None) -> MotorFeatures:
     """
-    Cria features baseadas na idade.
+    Compila a especificação de features para os dados de X.
     
     Args:
-        X: DataFrame com as features originais
+        X: DataFrame que vai receber as features (define o tipo das numéricas)
+        preprocessamento: Transformadores de `preprocessar_dados` que
+                          produziram X; sem eles, X é tratado como valores brutos
         
     Returns:
-        DataFrame com as novas features
+        MotorFeatures com os parâmetros do pré-processamento
     """
-    logger.info("Criando features baseadas na idade...")
-    X_novo = X.copy()
-    
-    bins = [0, 25, 35, 45, 55, 65, 100]
-    labels = ['18-25', '26-35', '36-45', '46-55', '56-65', '65+']
-    X_novo['faixa_etaria'] = pd.cut(X_novo['age'], bins=bins, labels=labels)
-    
-    X_novo['idade_aposentadoria'] = (X_novo['age'] >= 65).astype(int)
-    
-    logger.info("Features de idade criadas com sucesso")
-    return X_novo
+    tipos = [X[nome].dtype for nome in FEATURES_NUMERICAS if nome in X.columns]
+    if preprocessamento and 'limites' not in preprocessamento:
+        logger.warning("Transformadores do pré-processamento sem limites de outliers: a API não vai limitar as entradas")
+    return MotorFeatures(parametros_do_preprocessamento(preprocessamento, np.result_type(np.float32, *tipos)))
 
-def criar_features_trabalho(X: pd.DataFrame) -> pd.DataFrame:
+def calcular_features(
+    X: pd.DataFrame,
+    motor: MotorFeatures,
+    nomes: Optional[List[str]] = None
+) -> Dict[str, Any]:
     """
-    Cria features baseadas em informações de trabalho.
+    Calcula features da especificação sobre as colunas de X.
     
     Args:
         X: DataFrame com as features originais
+        motor: Especificação compilada (`criar_motor`)
+        nomes: Features a calcular; por padrão, todas
         
     Returns:
-        DataFrame com as novas features
+        Dicionário feature -> valores; as faixas saem como `category` com os
+        rótulos da especificação, como `pd.cut`
     """
-    logger.info("Criando features baseadas em trabalho...")
-    X_novo = X.copy()
-    
-    X_novo['tipo_jornada'] = pd.cut(
-        X_novo['hours-per-week'],
-        bins=[0, 20, 40, 60, 168],
-        labels=['Parcial', 'Normal', 'Extra', 'Extenso']
-    )
-    
-    X_novo['tem_ganho_capital'] = (X_novo['capital-gain'] > 0).astype(int)
-    X_novo['tem_perda_capital'] = (X_novo['capital-loss'] > 0).astype(int)
-    
-    X_novo['razao_capital'] = X_novo['capital-gain'] / (X_novo['capital-loss'] + 1)
-    
-    logger.info("Features de trabalho criadas com sucesso")
-    return X_novo
+    features = {}
+    for nome, valores in motor.calcular(X, nomes).items():
+        if nome in FEATURES_DISCRETIZADAS:
+            rotulos = ESPECIFICACAO[nome]['rotulos']
+            valores = pd.Categorical.from_codes(
+                np.where(valores == len(rotulos), -1, valores), categories=rotulos, ordered=True
+            )
+        features[nome] = valores
+    return features
 
-def criar_features_educacao(X: pd.DataFrame) -> pd.DataFrame:
+def criar_features(
+    X: pd.DataFrame,
+    motor: MotorFeatures,
+    colunas_categoricas: List[str]
+) -> pd.DataFrame:
     """
-    Cria features baseadas em educação.
+    Monta a entrada do One-Hot Encoding: as features da especificação, na
+    ordem dela, e as categóricas originais. As demais colunas de X (como
+    `fnlwgt`) ficam de fora, porque a API não as recebe.
     
     Args:
         X: DataFrame com as features originais
+        motor: Especificação compilada (`criar_motor`)
+        colunas_categoricas: Lista de colunas categóricas
         
     Returns:
         DataFrame com as novas features
     """
-    logger.info("Criando features baseadas em educação...")
-    X_novo = X.copy()
+    logger.info(f"Criando as {len(ESPECIFICACAO)} features da especificação...")
+    colunas = calcular_features(X, motor)
+    colunas.update({coluna: X[coluna] for coluna in colunas_categoricas})
+    X_novo = pd.DataFrame(colunas, index=X.index)
     
-    X_novo['nivel_educacao'] = pd.qcut(
-        X_novo['education-num'],
-        q=4,
-        labels=['Básico', 'Médio', 'Superior', 'Avançado']
-    )
-    
-    logger.info("Features de educação criadas com sucesso")
+    logger.info("Features criadas com sucesso")
     return X_novo
 
 def aplicar_one_hot_encoding(
@@ -88,7 +97,8 @@ def aplicar_one_hot_encoding(
     colunas_categoricas: List[str]
 ) -> Tuple[pd.DataFrame, OneHotEncoder]:
     """
-    Aplica One-Hot Encoding nas features categóricas.
+    Aplica One-Hot Encoding nas features categóricas. As colunas geradas
+    são uint8 (0 ou 1).
     
     Args:
         X: DataFrame com as features
@@ -102,7 +112,7 @@ def aplicar_one_hot_encoding(
     logger.info("Aplicando One-Hot Encoding...")
     
     try:
-        encoder = OneHotEncoder(sparse=False, handle_unknown='ignore')
+        encoder = OneHotEncoder(sparse_output=False, handle_unknown='ignore', dtype=np.uint8)
         features_encoded = encoder.fit_transform(X[colunas_categoricas])
         
         feature_names = encoder.get_feature_names_out(colunas_categoricas)
@@ -124,13 +134,56 @@ def aplicar_one_hot_encoding(
         logger.error(f"Erro ao aplicar One-Hot Encoding: {str(e)}")
         raise
 
+def aplicar_one_hot_encoding_esparso(
+    X: pd.DataFrame,
+    colunas_categoricas: List[str]
+) -> Tuple[sparse.csr_matrix, List[str], OneHotEncoder]:
+    """
+    Versão esparsa de `aplicar_one_hot_encoding`: as colunas restantes e as
+    categorias codificadas formam uma única matriz CSR float32, sem o bloco
+    denso de uma coluna por categoria.
+    
+    Args:
+        X: DataFrame com as features
+        colunas_categoricas: Lista de colunas para aplicar OHE
+        
+    Returns:
+        Tuple com:
+        - Matriz CSR, com as colunas na mesma ordem de `aplicar_one_hot_encoding`
+        - Nomes das colunas da matriz
+        - Objeto OneHotEncoder ajustado
+    """
+    logger.info("Aplicando One-Hot Encoding (esparso)...")
+    
+    try:
+        encoder = OneHotEncoder(sparse_output=True, handle_unknown='ignore', dtype=np.float32)
+        features_encoded = encoder.fit_transform(X[colunas_categoricas])
+        
+        restantes = X.drop(columns=colunas_categoricas)
+        matriz = sparse.hstack(
+            [sparse.csr_matrix(restantes.to_numpy(dtype=np.float32)), features_encoded],
+            format='csr'
+        )
+        nomes = list(restantes.columns) + list(encoder.get_feature_names_out(colunas_categoricas))
+        
+        logger.info(
+            f"One-Hot Encoding gerou {features_encoded.shape[1]} novas features; "
+            f"{matriz.nnz / (matriz.shape[0] * matriz.shape[1]):.1%} da matriz preenchida"
+        )
+        return matriz, nomes, encoder
+        
+    except Exception as e:
+        logger.error(f"Erro ao aplicar One-Hot Encoding: {str(e)}")
+        raise
+
 def selecionar_melhores_features(
     X: pd.DataFrame,
     y: pd.DataFrame,
     k: int = 20
 ) -> Tuple[pd.DataFrame, SelectKBest]:
     """
-    Seleciona as k melhores features usando o teste F-ANOVA.
+    Seleciona as k melhores features usando o teste F-ANOVA. As colunas
+    selecionadas mantêm os tipos de X.
     
     Args:
         X: DataFrame com as features
@@ -146,12 +199,10 @@ def selecionar_melhores_features(
     
     try:
         selector = SelectKBest(score_func=f_classif, k=k)
-        X_selected = selector.fit_transform(X, y)
-        
-        mask = selector.get_support()
-        features_selecionadas = X.columns[mask]
+        selector.fit(X, y)
         
-        X_final = pd.DataFrame(X_selected, columns=features_selecionadas, index=X.index)
+        # Seleciona as colunas do próprio DataFrame, em vez da matriz float64 de fit_transform
+        X_final = X.loc[:, selector.get_support()]
         
         scores = pd.DataFrame({
             'feature': X.columns,
@@ -168,42 +219,268 @@ def selecionar_melhores_features(
         logger.error(f"Erro ao selecionar features: {str(e)}")
         raise
 
+def selecionar_melhores_features_esparsas(
+    X: sparse.csr_matrix,
+    nomes: List[str],
+    y: pd.DataFrame,
+    k: int = 20
+) -> Tuple[sparse.csr_matrix, List[str], SelectKBest]:
+    """
+    Versão esparsa de `selecionar_melhores_features`: o teste F-ANOVA é
+    calculado sobre a matriz CSR e a saída continua esparsa.
+    
+    O seletor recebe `feature_names_in_` com os nomes das colunas, como se
+    tivesse sido ajustado em um DataFrame; é daí que a API tira os nomes
+    das features selecionadas.
+    
+    Args:
+        X: Matriz CSR com as features
+        nomes: Nomes das colunas de X
+        y: Series com a variável target
+        k: Número de features para selecionar
+        
+    Returns:
+        Tuple com:
+        - Matriz CSR com as features selecionadas
+        - Nomes das features selecionadas
+        - Objeto SelectKBest ajustado
+    """
+    logger.info(f"Selecionando as {k} melhores features (esparso)...")
+    
+    try:
+        selector = SelectKBest(score_func=f_classif, k=k)
+        selector.fit(X, np.ravel(y))
+        selector.feature_names_in_ = np.array(nomes, dtype=object)
+        
+        mask = selector.get_support()
+        X_final = X[:, np.flatnonzero(mask)]
+        
+        scores = pd.DataFrame({'feature': nomes, 'score': selector.scores_}).sort_values('score', ascending=False)
+        logger.info("\nTop 10 features mais importantes:")
+        for _, row in scores.head(10).iterrows():
+            logger.info(f"- {row['feature']}: {row['score']:.2f}")
+        
+        return X_final, list(selector.feature_names_in_[mask]), selector
+        
+    except Exception as e:
+        logger.error(f"Erro ao selecionar features: {str(e)}")
+        raise
+
+def registrar_plano_features(encoder: OneHotEncoder, selector: SelectKBest) -> Dict[str, Any]:
+    """
+    Registra quais features derivadas e quais categorias do One-Hot Encoding
+    sobrevivem à seleção.
+    
+    Args:
+        encoder: OneHotEncoder ajustado
+        selector: SelectKBest ajustado (com `feature_names_in_`)
+        
+    Returns:
+        Dicionário com:
+        - 'colunas': features selecionadas, na ordem do seletor
+        - 'derivadas': features da especificação que precisam ser calculadas
+        - 'categorias': coluna -> categorias do encoder que precisam ser codificadas
+    """
+    colunas = list(selector.feature_names_in_[selector.get_support()])
+    selecionadas = set(colunas)
+    
+    colunas_encoder = list(encoder.feature_names_in_)
+    nomes_encoder = iter(encoder.get_feature_names_out(colunas_encoder))
+    categorias = {}
+    for coluna, categorias_coluna in zip(colunas_encoder, encoder.categories_):
+        mantidas = [i for i in range(len(categorias_coluna)) if next(nomes_encoder) in selecionadas]
+        if mantidas:
+            categorias[coluna] = categorias_coluna[mantidas]
+    
+    return {
+        'colunas': colunas,
+        'derivadas': [nome for nome in ESPECIFICACAO if nome in selecionadas or nome in categorias],
+        'categorias': categorias
+    }
+
+def gerar_features_do_plano(
+    X: pd.DataFrame,
+    plano: Dict[str, Any],
+    motor: Optional[MotorFeatures] = None,
+    esparsa: bool = False
+) -> Tuple[Union[pd.DataFrame, sparse.csr_matrix], Optional[OneHotEncoder]]:
+    """
+    Gera apenas as features de um plano de `registrar_plano_features`:
+    calcula só as features da especificação usadas e codifica só as
+    categorias mantidas, sem One-Hot Encoding completo nem seleção.
+    
+    O resultado é igual às colunas selecionadas pelo pipeline completo
+    sobre os mesmos dados. Como as categorias vêm do plano, o resultado de
+    cada linha não depende das demais, e o plano pode ser aplicado em blocos.
+    
+    Args:
+        X: DataFrame com as features originais
+        plano: Plano de features
+        motor: Especificação compilada; por padrão, X em valores brutos
+        esparsa: Se True, o resultado é uma matriz CSR float32, montada como
+                 em `aplicar_one_hot_encoding_esparso`, sem bloco denso
+        
+    Returns:
+        Tuple com:
+        - DataFrame (ou matriz CSR) com as colunas do plano, na ordem do plano
+        - OneHotEncoder ajustado apenas com as categorias mantidas (ou None)
+    """
+    logger.info(
+        f"Gerando {len(plano['colunas'])} features do plano "
+        f"({len(plano['derivadas'])} da especificação, "
+        f"{sum(len(c) for c in plano['categorias'].values())} categorias codificadas)..."
+    )
+    derivadas = calcular_features(X, motor or criar_motor(X), plano['derivadas'])
+    
+    def coluna(nome: str) -> pd.Series:
+        return derivadas[nome] if nome in derivadas else X[nome]
+    
+    colunas = {}
+    encoder = None
+    codificadas = None
+    nomes_codificadas: List[str] = []
+    if plano['categorias']:
+        colunas_encoder = list(plano['categorias'])
+        encoder = OneHotEncoder(
+            categories=list(plano['categorias'].values()),
+            sparse_output=esparsa,
+            handle_unknown='ignore',
+            dtype=np.float32 if esparsa else np.uint8
+        )
+        entrada = pd.DataFrame({nome: coluna(nome) for nome in colunas_encoder}, index=X.index)
+        codificadas = encoder.fit_transform(entrada)
+        nomes_codificadas = list(encoder.get_feature_names_out(colunas_encoder))
+        if not esparsa:
+            for i, nome in enumerate(nomes_codificadas):
+                colunas[nome] = codificadas[:, i]
+    
+    if esparsa:
+        restantes = [nome for nome in plano['colunas'] if nome not in nomes_codificadas]
+        blocos = [sparse.csr_matrix(
+            pd.DataFrame({nome: coluna(nome) for nome in restantes}, index=X.index).to_numpy(dtype=np.float32)
+        )]
+        if codificadas is not None:
+            blocos.append(codificadas)
+        matriz = sparse.hstack(blocos, format='csr')
+        # Restantes antes das codificadas, como no pipeline completo; reordena se o plano diferir
+        posicoes = {nome: i for i, nome in enumerate(restantes + nomes_codificadas)}
+        ordem = [posicoes[nome] for nome in plano['colunas']]
+        if ordem != list(range(len(ordem))):
+            matriz = matriz[:, ordem]
+        return matriz, encoder
+    
+    X_plano = pd.DataFrame(
+        {nome: colunas[nome] if nome in colunas else coluna(nome) for nome in plano['colunas']},
+        index=X.index
+    )
+    return X_plano, encoder
+
 def engenharia_features(
     X: pd.DataFrame,
     y: pd.DataFrame = None,
     colunas_numericas: List[str] = None,
     colunas_categoricas: List[str] = None,
-    k_features: int = 20
-) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    k_features: int = 20,
+    esparsa: bool = False,
+    plano: Optional[Dict[str, Any]] = None,
+    preprocessamento: Optional[Dict[str, Any]] = None
+) -> Tuple[Union[pd.DataFrame, sparse.csr_matrix], Dict[str, Any]]:
     """
     Aplica todo o pipeline de feature engineering.
     
+    As features numéricas e discretizadas vêm de `ESPECIFICACAO`
+    (`src.data.especificacao_features`), a mesma que a API executa. Com os
+    transformadores do pré-processamento em `preprocessamento`, faixas,
+    indicadores e razões são calculados em valores brutos, e os parâmetros
+    que a API precisa para reproduzir as features a partir dos campos
+    brutos ficam em `especificacao` dos transformadores.
+    
+    Depois da seleção, os transformadores guardam em `plano_features` quais
+    features derivadas e categorias sobreviveram (`registrar_plano_features`).
+    Passando esse plano em `plano`, um novo treino gera só essas colunas,
+    sem One-Hot Encoding completo nem seleção; o encoder salvo passa a ter
+    apenas as categorias mantidas.
+    
+    Com `esparsa=True`, o One-Hot Encoding e a seleção trabalham sobre uma
+    matriz CSR e o resultado é essa matriz; os nomes das colunas ficam em
+    `nomes_features` dos transformadores, e `formato` indica 'csr'.
+    
     Args:
         X: DataFrame com as features originais
         y: DataFrame com a variável target (opcional)
         colunas_numericas: Lista de colunas numéricas
         colunas_categoricas: Lista de colunas categóricas
         k_features: Número de features para selecionar
+        esparsa: Se True, mantém as features em uma matriz CSR
+        plano: Plano de features de um ajuste anterior (opcional)
+        preprocessamento: Transformadores de `preprocessar_dados` que produziram X
         
     Returns:
         Tuple com:
-        - DataFrame com features transformadas
+        - DataFrame (ou matriz CSR) com features transformadas
         - Dicionário com os objetos de transformação
     """
     logger.info("Iniciando pipeline de feature engineering...")
     logger.info(f"Shape inicial: {X.shape}")
     
     try:
-        X_transformed = criar_features_idade(X)
-        X_transformed = criar_features_trabalho(X_transformed)
-        X_transformed = criar_features_educacao(X_transformed)
+        motor = criar_motor(X, preprocessamento)
+        
+        if plano is not None:
+            X_transformed, encoder = gerar_features_do_plano(X, plano, motor, esparsa=esparsa)
+            transformadores = {
+                'one_hot_encoder': encoder,
+                'selector': None,
+                'plano_features': plano,
+                'especificacao': motor.parametros
+            }
+            if esparsa:
+                transformadores.update({
+                    'formato': 'csr',
+                    'nomes_features': plano['colunas'],
+                    'especificacao': dict(motor.parametros, tipo_saida='float32')
+                })
+            logger.info(f"Shape final: {X_transformed.shape}")
+            logger.info("Pipeline de feature engineering concluído com sucesso!")
+            return X_transformed, transformadores
+        
+        X_transformed = criar_features(X, motor, colunas_categoricas or [])
         
         logger.info(f"Shape após criação de features: {X_transformed.shape}")
         
+        if colunas_categoricas and esparsa:
+            X_transformed, nomes, encoder = aplicar_one_hot_encoding_esparso(
+                X_transformed,
+                colunas_categoricas + COLUNAS_DISCRETIZADAS
+            )
+            logger.info(f"Shape após One-Hot Encoding: {X_transformed.shape}")
+            
+            selector = None
+            if y is not None and k_features:
+                X_transformed, nomes, selector = selecionar_melhores_features_esparsas(
+                    X_transformed,
+                    nomes,
+                    y,
+                    k=k_features
+                )
+                logger.info(f"Shape final após seleção: {X_transformed.shape}")
+            
+            transformadores = {
+                'one_hot_encoder': encoder,
+                'selector': selector,
+                'formato': 'csr',
+                'nomes_features': nomes,
+                'especificacao': dict(motor.parametros, tipo_saida='float32')
+            }
+            if selector is not None:
+                transformadores['plano_features'] = registrar_plano_features(encoder, selector)
+            logger.info("Pipeline de feature engineering concluído com sucesso!")
+            return X_transformed, transformadores
+        
         if colunas_categoricas:
             X_transformed, encoder = aplicar_one_hot_encoding(
                 X_transformed,
-                colunas_categoricas + ['faixa_etaria', 'tipo_jornada', 'nivel_educacao']
+                colunas_categoricas + COLUNAS_DISCRETIZADAS
             )
             logger.info(f"Shape após One-Hot Encoding: {X_transformed.shape}")
         else:
@@ -221,8 +498,11 @@ def engenharia_features(
             
         transformadores = {
             'one_hot_encoder': encoder,
-            'selector': selector
+            'selector': selector,
+            'especificacao': motor.parametros
         }
+        if encoder is not None and selector is not None:
+            transformadores['plano_features'] = registrar_plano_features(encoder, selector)
         
         logger.info("Pipeline de feature engineering concluído com sucesso!")
         return X_transformed, transformadores
@@ -231,14 +511,72 @@ def engenharia_features(
         logger.error(f"Erro durante feature engineering: {str(e)}")
         raise
 
+def aplicar_features(
+    X: pd.DataFrame,
+    transformadores: Dict[str, Any]
+) -> Union[pd.DataFrame, sparse.csr_matrix]:
+    """
+    Aplica um feature engineering já ajustado a novos dados pré-processados,
+    sem reajustar encoder nem seleção.
+    
+    Args:
+        X: DataFrame pré-processado com as mesmas transformações do ajuste
+        transformadores: Transformadores de `engenharia_features` com `plano_features`
+        
+    Returns:
+        DataFrame (ou matriz CSR, se o ajuste foi esparso) com as features
+        selecionadas, igual às linhas correspondentes do resultado do ajuste
+        
+    Raises:
+        ValueError: Se os transformadores não tiverem plano de features
+    """
+    plano = transformadores.get('plano_features')
+    if plano is None:
+        raise ValueError("Os transformadores não têm plano de features (ajuste sem seleção)")
+    return gerar_features_do_plano(
+        X, plano, MotorFeatures(transformadores.get('especificacao')),
+        esparsa=transformadores.get('formato') == 'csr'
+    )[0]
+
+def aplicar_features_em_blocos(
+    blocos: Iterable[pd.DataFrame],
+    transformadores: Dict[str, Any]
+) -> Iterator[Union[pd.DataFrame, sparse.csr_matrix]]:
+    """
+    Aplica `aplicar_features` um bloco por vez, por exemplo aos blocos de
+    `PreprocessadorIncremental.transformar_blocos`.
+    """
+    for bloco in blocos:
+        yield aplicar_features(bloco, transformadores)
+
 def main():
     """
     Função principal para executar o feature engineering.
     """
+    parser = argparse.ArgumentParser(description="Feature engineering")
+    parser.add_argument(
+        '--esparsa', action='store_true',
+        help="Mantém o One-Hot Encoding em uma matriz CSR e grava data/features_engineered.npz"
+    )
+    parser.add_argument(
+        '--entrada', default='data/features_processadas.csv',
+        help="Features pré-processadas, CSV ou Parquet (saída de src.data.processar_dados)"
+    )
+    parser.add_argument('--target', default='data/target.csv', help="CSV com a variável target")
+    parser.add_argument(
+        '--plano', action='store_true',
+        help="Gera só as features selecionadas no ajuste anterior (plano de data/transformadores_features.joblib)"
+    )
+    args = parser.parse_args()
+    
     try:
         logger.info("Carregando dados processados...")
-        X = pd.read_csv('data/features_processadas.csv')
-        y = pd.read_csv('data/target.csv')
+        if args.entrada.endswith('.parquet'):
+            X = pd.read_parquet(args.entrada)
+        else:
+            X = pd.read_csv(args.entrada)
+        X = compactar_tipos(X, converter_floats=True)
+        y = pd.read_csv(args.target)
         
         colunas_numericas = [
             'age', 'fnlwgt', 'education-num',
@@ -251,16 +589,30 @@ def main():
             'sex', 'native-country'
         ]
         
+        preprocessamento = joblib.load('data/transformadores.joblib')
+        
+        plano = None
+        if args.plano:
+            plano = joblib.load('data/transformadores_features.joblib').get('plano_features')
+            if plano is None:
+                raise ValueError("Os transformadores salvos não têm plano de features; rode sem --plano")
+        
         X_transformed, transformadores = engenharia_features(
             X=X,
             y=y,
             colunas_numericas=colunas_numericas,
             colunas_categoricas=colunas_categoricas,
-            k_features=20
+            k_features=20,
+            esparsa=args.esparsa,
+            plano=plano,
+            preprocessamento=preprocessamento
         )
         
         logger.info("Salvando dados transformados...")
-        X_transformed.to_csv('data/features_engineered.csv', index=False)
+        if args.esparsa:
+            sparse.save_npz('data/features_engineered.npz', X_transformed)
+        else:
+            X_transformed.to_csv('data/features_engineered.csv', index=False)
         joblib.dump(transformadores, 'data/transformadores_features.joblib')
         
         logger.info("Processo concluído com sucesso!")
@@ -3,17 +3,41 @@ Módulo responsável pelo pré-processamento dos dados.
 Realiza limpeza, transformação e preparação das features para modelagem.
 """
 
+import numpy as np
 import pandas as pd
-from typing import Tuple, Dict, Any
+from contextlib import nullcontext
+from typing import Tuple, Dict, Any, Optional
 from sklearn.preprocessing import StandardScaler, LabelEncoder
 from sklearn.impute import SimpleImputer
 from src.utils.logger import configurar_logger
+from src.data.tipos import eh_compacto, menor_inteiro
+from src.utils.memoria import MedidorPicoMemoria
 
 logger = configurar_logger('preprocessamento')
 
+def eh_numerica(dtype) -> bool:
+    """Colunas imputadas com a estratégia configurada; as demais usam a moda."""
+    return pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype)
+
+def calcular_moda_categorica(valores: pd.Series) -> Optional[str]:
+    """
+    Calcula a moda de uma coluna `category` pelas contagens das categorias,
+    sem materializar as strings, com o desempate do
+    SimpleImputer(strategy='most_frequent'): o menor valor.
+    
+    Returns:
+        A moda, ou None se a coluna só tiver nulos
+    """
+    contagens = valores.value_counts(sort=False)
+    if len(contagens) == 0 or contagens.max() == 0:
+        return None
+    return min(contagens.index[contagens.to_numpy() == contagens.max()])
+
 def remover_valores_nulos(
     X: pd.DataFrame,
-    estrategia: Dict[str, str]
+    estrategia: Dict[str, str],
+    inplace: bool = False,
+    executor: Optional["ExecutorColunas"] = None
 ) -> pd.DataFrame:
     """
     Remove ou imputa valores nulos no DataFrame.
@@ -22,25 +46,41 @@ def remover_valores_nulos(
         X: DataFrame com as features
         estrategia: Dicionário com a estratégia de imputação para cada coluna
                    Exemplo: {'coluna1': 'mean', 'coluna2': 'most_frequent'}
+        inplace: Se True, altera X em vez de trabalhar em uma cópia
+        executor: Pool que processa as colunas em paralelo (opcional)
     
     Returns:
         DataFrame com valores nulos tratados
     """
     logger.info("Iniciando tratamento de valores nulos...")
-    X_limpo = X.copy()
+    X_limpo = X if inplace else X.copy()
     
     try:
+        if executor is not None:
+            executor.imputar(X_limpo, estrategia)
+            return X_limpo
+        
         for coluna, metodo in estrategia.items():
             if coluna in X_limpo.columns:
                 logger.info(f"Tratando valores nulos em {coluna} usando {metodo}")
+                valores_antes = X_limpo[coluna].isnull().sum()
                 
-                if X_limpo[coluna].dtype in ['int64', 'float64']:
-                    imputer = SimpleImputer(strategy=metodo)
+                if isinstance(X_limpo[coluna].dtype, pd.CategoricalDtype):
+                    moda = calcular_moda_categorica(X_limpo[coluna])
+                    if moda is not None:
+                        X_limpo[coluna] = X_limpo[coluna].fillna(moda)
                 else:
-                    imputer = SimpleImputer(strategy='most_frequent')
+                    if eh_numerica(X_limpo[coluna].dtype):
+                        imputer = SimpleImputer(strategy=metodo)
+                    else:
+                        imputer = SimpleImputer(strategy='most_frequent')
+                    imputados = imputer.fit_transform(X_limpo[[coluna]]).ravel()
+                    if len(imputados) == len(X_limpo):
+                        X_limpo.loc[:, coluna] = imputados
+                    else:
+                        # Coluna sem nenhum valor observado: o SimpleImputer a descarta
+                        logger.warning(f"Coluna {coluna} sem valores observados: mantida sem imputação")
                 
-                valores_antes = X_limpo[coluna].isnull().sum()
-                X_limpo.loc[:, coluna] = imputer.fit_transform(X_limpo[[coluna]]).ravel()
                 valores_depois = X_limpo[coluna].isnull().sum()
                 
                 logger.info(f"Valores nulos em {coluna}: {valores_antes} -> {valores_depois}")
@@ -51,11 +91,53 @@ def remover_valores_nulos(
             
     return X_limpo
 
+def calcular_limites_outliers(
+    valores: pd.Series,
+    metodo: str = 'iqr',
+    limite: float = 1.5
+) -> Optional[Tuple[float, float]]:
+    """
+    Calcula os limites abaixo e acima dos quais um valor é outlier.
+    
+    Args:
+        valores: Valores de uma coluna numérica
+        metodo: 'iqr' para Interquartile Range ou 'zscore' para Z-Score
+        limite: Limite para considerar outlier (1.5 para IQR, 3 para Z-Score)
+    
+    Returns:
+        Tuple com os limites inferior e superior, ou None se o método for desconhecido
+    """
+    if metodo == 'iqr':
+        Q1 = valores.quantile(0.25)
+        Q3 = valores.quantile(0.75)
+        IQR = Q3 - Q1
+        return Q1 - limite * IQR, Q3 + limite * IQR
+    
+    if metodo == 'zscore':
+        mean = valores.mean()
+        std = valores.std()
+        return mean - limite * std, mean + limite * std
+    
+    return None
+
+def limitar_valores(valores: pd.Series, limite_inferior: float, limite_superior: float) -> pd.Series:
+    """
+    Limita os valores ao intervalo; colunas compactas (inteiros pequenos,
+    float32) saem em float32 em vez do float64 que o clip produz.
+    """
+    limitados = valores.clip(limite_inferior, limite_superior)
+    if eh_compacto(valores.dtype):
+        limitados = limitados.astype(np.float32)
+    return limitados
+
 def tratar_outliers(
     X: pd.DataFrame,
     colunas_numericas: list,
     metodo: str = 'iqr',
-    limite: float = 1.5
+    limite: float = 1.5,
+    inplace: bool = False,
+    executor: Optional["ExecutorColunas"] = None,
+    limites: Optional[Dict[str, Tuple[float, float]]] = None
 ) -> pd.DataFrame:
     """
     Trata outliers nas colunas numéricas especificadas.
@@ -65,42 +147,39 @@ def tratar_outliers(
         colunas_numericas: Lista de colunas numéricas para tratar outliers
         metodo: 'iqr' para Interquartile Range ou 'zscore' para Z-Score
         limite: Limite para considerar outlier (1.5 para IQR, 3 para Z-Score)
+        inplace: Se True, altera X em vez de trabalhar em uma cópia
+        executor: Pool que processa as colunas em paralelo (opcional)
+        limites: Dicionário que, se informado, recebe os limites aplicados a cada coluna
     
     Returns:
         DataFrame com outliers tratados
     """
     logger.info(f"Iniciando tratamento de outliers usando método: {metodo}")
-    X_limpo = X.copy()
+    X_limpo = X if inplace else X.copy()
     
     try:
+        if executor is not None:
+            executor.limitar_outliers(X_limpo, colunas_numericas, metodo, limite, limites)
+            return X_limpo
+        
         for coluna in colunas_numericas:
             if coluna not in X_limpo.columns:
                 logger.warning(f"Coluna {coluna} não encontrada no DataFrame")
                 continue
                 
             logger.info(f"Tratando outliers em {coluna}")
-            valores_antes = len(X_limpo)
+            valores = X_limpo[coluna]
+            limites_coluna = calcular_limites_outliers(valores, metodo, limite)
+            if limites_coluna is None:
+                logger.warning(f"Método de outliers desconhecido: {metodo}")
+                continue
+            limite_inferior, limite_superior = limites_coluna
+            if limites is not None:
+                limites[coluna] = limites_coluna
             
-            if metodo == 'iqr':
-                Q1 = X_limpo[coluna].quantile(0.25)
-                Q3 = X_limpo[coluna].quantile(0.75)
-                IQR = Q3 - Q1
-                
-                limite_inferior = Q1 - limite * IQR
-                limite_superior = Q3 + limite * IQR
-                
-                X_limpo[coluna] = X_limpo[coluna].clip(limite_inferior, limite_superior)
-                
-            elif metodo == 'zscore':
-                mean = X_limpo[coluna].mean()
-                std = X_limpo[coluna].std()
-                
-                X_limpo[coluna] = X_limpo[coluna].clip(
-                    mean - limite * std,
-                    mean + limite * std
-                )
-                
-            valores_alterados = (X_limpo[coluna] != X[coluna]).sum()
+            # Contados antes de limitar, sem comparar com uma cópia da coluna
+            valores_alterados = int(((valores < limite_inferior) | (valores > limite_superior)).sum())
+            X_limpo[coluna] = limitar_valores(valores, limite_inferior, limite_superior)
             logger.info(f"Valores modificados em {coluna}: {valores_alterados}")
             
     except Exception as e:
@@ -111,7 +190,8 @@ def tratar_outliers(
 
 def normalizar_features(
     X: pd.DataFrame,
-    colunas_numericas: list
+    colunas_numericas: list,
+    inplace: bool = False
 ) -> Tuple[pd.DataFrame, StandardScaler]:
     """
     Normaliza as features numéricas usando StandardScaler.
@@ -119,6 +199,11 @@ def normalizar_features(
     Args:
         X: DataFrame com as features
         colunas_numericas: Lista de colunas numéricas para normalizar
+        inplace: Se True, altera X, uma coluna por vez, em vez de trabalhar
+                 em uma cópia
+    
+    Se todas as colunas forem compactas (ver `src.data.tipos`), as features
+    normalizadas saem em float32; caso contrário, em float64.
         
     Returns:
         Tuple com:
@@ -126,15 +211,30 @@ def normalizar_features(
         - Objeto StandardScaler ajustado
     """
     logger.info("Iniciando normalização das features...")
-    X_norm = X.copy()
+    X_norm = X if inplace else X.copy()
     
     try:
         colunas_faltantes = [col for col in colunas_numericas if col not in X_norm.columns]
         if colunas_faltantes:
             raise ValueError(f"Colunas não encontradas: {colunas_faltantes}")
         
+        tipos = X_norm[colunas_numericas].dtypes
+        tipo_saida = np.float32 if all(eh_compacto(t) for t in tipos) else np.float64
+        
         scaler = StandardScaler()
-        X_norm[colunas_numericas] = scaler.fit_transform(X[colunas_numericas])
+        if inplace:
+            # Mesmas operações de scaler.transform (no tipo que ele usaria),
+            # sem a matriz com todas as colunas
+            tipo_calculo = np.float32 if np.result_type(*tipos) == np.float32 else np.float64
+            scaler.fit(X_norm[colunas_numericas])
+            for i, coluna in enumerate(colunas_numericas):
+                valores = X_norm[coluna].to_numpy(dtype=tipo_calculo, copy=True)
+                # Em float64 mesmo com colunas float32, como as operações in-place do scaler
+                np.subtract(valores, scaler.mean_[i], out=valores, dtype=np.float64)
+                np.divide(valores, scaler.scale_[i], out=valores, dtype=np.float64)
+                X_norm[coluna] = valores.astype(tipo_saida, copy=False)
+        else:
+            X_norm[colunas_numericas] = scaler.fit_transform(X[colunas_numericas]).astype(tipo_saida, copy=False)
         
         for coluna in colunas_numericas:
             media = X_norm[coluna].mean()
@@ -147,9 +247,41 @@ def normalizar_features(
     
     return X_norm, scaler
 
+def codificar_categoria(valores: pd.Series) -> Tuple[np.ndarray, LabelEncoder]:
+    """
+    Codifica uma coluna `category` a partir dos códigos do pandas, sem
+    operações de string por linha.
+    
+    O LabelEncoder resultante é igual ao ajustado em
+    `valores.fillna('MISSING').astype(str)`: classes são as categorias
+    presentes (mais 'MISSING' se houver nulos), ordenadas como texto. Os
+    códigos saem no menor tipo inteiro que comporta as classes.
+    
+    Returns:
+        Tuple com os códigos e o LabelEncoder ajustado
+    """
+    categorias = [str(c) for c in valores.cat.categories]
+    codigos = valores.cat.codes.to_numpy()
+    presentes = np.bincount(codigos[codigos >= 0], minlength=len(categorias)) > 0
+    classes = {c for c, presente in zip(categorias, presentes) if presente}
+    if (codigos < 0).any():
+        classes.add('MISSING')
+    
+    le = LabelEncoder()
+    le.classes_ = np.array(sorted(classes), dtype=object)
+    posicoes = {c: i for i, c in enumerate(le.classes_)}
+    # O último item atende aos nulos, cujo código no pandas é -1
+    mapa = np.array(
+        [posicoes.get(c, -1) for c in categorias] + [posicoes.get('MISSING', -1)],
+        dtype=menor_inteiro(-1, len(le.classes_))
+    )
+    return mapa[codigos], le
+
 def codificar_categoricas(
     X: pd.DataFrame,
-    colunas_categoricas: list
+    colunas_categoricas: list,
+    inplace: bool = False,
+    executor: Optional["ExecutorColunas"] = None
 ) -> Tuple[pd.DataFrame, Dict[str, LabelEncoder]]:
     """
     Codifica variáveis categóricas usando LabelEncoder.
@@ -157,6 +289,8 @@ def codificar_categoricas(
     Args:
         X: DataFrame com as features
         colunas_categoricas: Lista de colunas categóricas para codificar
+        inplace: Se True, altera X em vez de trabalhar em uma cópia
+        executor: Pool que processa as colunas em paralelo (opcional)
         
     Returns:
         Tuple com:
@@ -164,10 +298,13 @@ def codificar_categoricas(
         - Dicionário com os LabelEncoders ajustados
     """
     logger.info("Iniciando codificação de variáveis categóricas...")
-    X_cod = X.copy()
+    X_cod = X if inplace else X.copy()
     encoders = {}
     
     try:
+        if executor is not None:
+            return X_cod, executor.codificar(X_cod, colunas_categoricas)
+        
         for coluna in colunas_categoricas:
             if coluna not in X_cod.columns:
                 logger.warning(f"Coluna {coluna} não encontrada no DataFrame")
@@ -175,11 +312,13 @@ def codificar_categoricas(
                 
             logger.info(f"Codificando coluna: {coluna}")
             
-            X_cod[coluna] = X_cod[coluna].fillna('MISSING')
-            X_cod[coluna] = X_cod[coluna].astype(str)
-            
-            le = LabelEncoder()
-            X_cod[coluna] = le.fit_transform(X_cod[coluna])
+            if isinstance(X_cod[coluna].dtype, pd.CategoricalDtype):
+                codigos, le = codificar_categoria(X_cod[coluna])
+                X_cod[coluna] = codigos
+            else:
+                valores = X_cod[coluna].fillna('MISSING').astype(str)
+                le = LabelEncoder()
+                X_cod[coluna] = le.fit_transform(valores)
             encoders[coluna] = le
             
             num_classes = len(le.classes_)
@@ -195,41 +334,87 @@ def preprocessar_dados(
     X: pd.DataFrame,
     colunas_numericas: list,
     colunas_categoricas: list,
-    estrategia_nulos: Dict[str, str]
+    estrategia_nulos: Dict[str, str],
+    inplace: bool = False,
+    n_workers: int = 1,
+    medir_memoria: bool = False
 ) -> Tuple[pd.DataFrame, Dict[str, Any]]:
     """
     Realiza todo o pipeline de pré-processamento dos dados.
     
+    Por padrão cada etapa trabalha em uma cópia do DataFrame. Com
+    `inplace=True`, todas as etapas alteram o próprio X, coluna a coluna, e
+    o pico de memória fica perto do tamanho dos dados em vez de várias
+    cópias deles; o resultado é o mesmo. Com `medir_memoria=True`, o pico de
+    RSS de cada etapa é registrado no log.
+    
+    Com `n_workers > 1`, a imputação, o tratamento de outliers e a
+    codificação processam as colunas em paralelo em um pool de processos
+    (`src.data.preprocessamento_paralelo`), também com o mesmo resultado.
+    
     Args:
         X: DataFrame com as features
         colunas_numericas: Lista de colunas numéricas
         colunas_categoricas: Lista de colunas categóricas
         estrategia_nulos: Dicionário com estratégia para tratamento de nulos
+        inplace: Se True, X é alterado e devolvido como DataFrame processado
+        n_workers: Número de processos para as etapas por coluna (1 = sequencial)
+        medir_memoria: Se True, mede o pico de RSS de cada etapa (`MedidorPicoMemoria`)
         
     Returns:
         Tuple com:
         - DataFrame processado
-        - Dicionário com os objetos de transformação ajustados
+        - Dicionário com os objetos de transformação ajustados: 'scaler' e
+          'encoders', mais os limites de outliers ('limites') e o tipo das
+          numéricas normalizadas ('tipo_numericas'), que a API reproduz
     """
-    logger.info("Iniciando pipeline de pré-processamento...")
+    logger.info(f"Iniciando pipeline de pré-processamento{' (in-place)' if inplace else ''}...")
     logger.info(f"Shape inicial dos dados: {X.shape}")
     
+    executor = None
+    if n_workers > 1:
+        from src.data.preprocessamento_paralelo import ExecutorColunas
+        executor = ExecutorColunas(n_workers)
+        logger.info(f"Etapas por coluna em paralelo com {n_workers} processos")
+    
     try:
-        X_processado = remover_valores_nulos(X, estrategia_nulos)
+        medir = MedidorPicoMemoria if medir_memoria else nullcontext
+        picos = {}
+        with medir() as medidor:
+            X_processado = remover_valores_nulos(X, estrategia_nulos, inplace=inplace, executor=executor)
+        picos['nulos'] = medidor
         logger.info("Valores nulos tratados com sucesso")
         
-        X_processado = tratar_outliers(X_processado, colunas_numericas)
+        limites = {}
+        with medir() as medidor:
+            X_processado = tratar_outliers(
+                X_processado, colunas_numericas, inplace=inplace, executor=executor, limites=limites
+            )
+        picos['outliers'] = medidor
         logger.info("Outliers tratados com sucesso")
         
-        X_processado, scaler = normalizar_features(X_processado, colunas_numericas)
+        with medir() as medidor:
+            X_processado, scaler = normalizar_features(X_processado, colunas_numericas, inplace=inplace)
+        picos['normalizacao'] = medidor
         logger.info("Features normalizadas com sucesso")
         
-        X_processado, encoders = codificar_categoricas(X_processado, colunas_categoricas)
+        with medir() as medidor:
+            X_processado, encoders = codificar_categoricas(
+                X_processado, colunas_categoricas, inplace=inplace, executor=executor
+            )
+        picos['codificacao'] = medidor
         logger.info("Variáveis categóricas codificadas com sucesso")
         
+        if medir_memoria:
+            for etapa, medidor in picos.items():
+                logger.info(f"Memória na etapa {etapa}: {medidor.formatar()}")
+            logger.info(f"Pico de RSS do pipeline: {max(m.pico_bytes for m in picos.values()) / 2 ** 20:.0f} MB")
+        
         transformadores = {
             'scaler': scaler,
-            'encoders': encoders
+            'encoders': encoders,
+            'limites': limites,
+            'tipo_numericas': np.result_type(*X_processado[colunas_numericas].dtypes).name
         }
         
         logger.info(f"Shape final dos dados: {X_processado.shape}")
@@ -239,4 +424,8 @@ def preprocessar_dados(
         
     except Exception as e:
         logger.error(f"Erro durante o pré-processamento: {str(e)}")
-        raise
\ No newline at end of file
+        raise
+    
+    finally:
+        if executor is not None:
+            executor.encerrar()
\ No newline at end of file
@@ -0,0 +1,321 @@
+"""
+Pré-processamento em blocos, para arquivos maiores que a memória.
+
+Aplica as mesmas etapas de `preprocessar_dados` (imputação de nulos,
+limitação de outliers, normalização e codificação das categóricas), mas
+separa o ajuste da transformação e lê a entrada em blocos de CSV ou
+Parquet. O ajuste percorre a entrada duas vezes:
+
+1. contagem de valores das colunas numéricas e das colunas com imputação,
+   de onde saem os valores imputados e os limites de outliers (quantis
+   exatos, com a mesma interpolação do pandas);
+2. `StandardScaler.partial_fit` sobre os blocos já imputados e limitados,
+   e o vocabulário de cada coluna categórica.
+
+A transformação processa um bloco por vez e grava a saída incrementalmente.
+A memória usada depende do tamanho do bloco e do número de valores
+distintos das colunas numéricas, não do número de linhas.
+"""
+
+import os
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, Iterator, List, Optional, Union
+from sklearn.preprocessing import StandardScaler, LabelEncoder
+from src.utils.logger import configurar_logger
+
+logger = configurar_logger('preprocessamento_incremental')
+
+TAMANHO_BLOCO_PADRAO = 100_000
+
+Fonte = Union[str, pd.DataFrame]
+
+def _quantil(contagens: pd.Series, q: float) -> float:
+    """
+    Quantil com interpolação linear (como `Series.quantile`) a partir da
+    contagem de cada valor, em qualquer ordem.
+    """
+    contagens = contagens.sort_index()
+    acumulado = contagens.to_numpy().cumsum()
+    valores = contagens.index.to_numpy(dtype=np.float64)
+    posicao = q * (acumulado[-1] - 1)
+    abaixo = int(np.floor(posicao))
+    acima = int(np.ceil(posicao))
+    valor_abaixo = valores[np.searchsorted(acumulado, abaixo, side='right')]
+    valor_acima = valores[np.searchsorted(acumulado, acima, side='right')]
+    return valor_abaixo + (valor_acima - valor_abaixo) * (posicao - abaixo)
+
+def _valor_imputacao(contagens: pd.Series, metodo: str, numerica: bool) -> Any:
+    """Valor usado por `SimpleImputer` para a estratégia, a partir das contagens."""
+    if contagens.empty:
+        return None
+    if not numerica or metodo == 'most_frequent':
+        # Em empate, o SimpleImputer usa o menor valor
+        maximo = contagens.max()
+        return min(contagens.index[contagens == maximo])
+    valores = contagens.index.to_numpy(dtype=np.float64)
+    if metodo == 'mean':
+        return float(np.average(valores, weights=contagens.to_numpy()))
+    if metodo == 'median':
+        return _quantil(contagens, 0.5)
+    raise ValueError(f"Estratégia de imputação não suportada em blocos: {metodo}")
+
+class PreprocessadorIncremental:
+    """
+    Pré-processamento ajustável e aplicável em blocos.
+
+    Exemplo:
+        preprocessador = PreprocessadorIncremental(COLUNAS_NUMERICAS, COLUNAS_CATEGORICAS, ESTRATEGIA_NULOS)
+        preprocessador.fit('dados.csv')
+        preprocessador.transform('dados.csv', 'features_processadas.parquet')
+    """
+
+    def __init__(
+        self,
+        colunas_numericas: List[str],
+        colunas_categoricas: List[str],
+        estrategia_nulos: Dict[str, str],
+        metodo_outliers: str = 'iqr',
+        limite_outliers: float = 1.5,
+        tamanho_bloco: int = TAMANHO_BLOCO_PADRAO
+    ):
+        """
+        Args:
+            colunas_numericas: Colunas com limitação de outliers e normalização
+            colunas_categoricas: Colunas codificadas como inteiros
+            estrategia_nulos: Estratégia de imputação por coluna
+                              ('mean', 'median' ou 'most_frequent')
+            metodo_outliers: 'iqr' ou 'zscore', como em `tratar_outliers`
+            limite_outliers: Multiplicador do IQR ou do desvio padrão
+            tamanho_bloco: Linhas lidas e processadas por vez
+        """
+        if metodo_outliers not in ('iqr', 'zscore'):
+            raise ValueError(f"Método de outliers desconhecido: {metodo_outliers}")
+        self.colunas_numericas = list(colunas_numericas)
+        self.colunas_categoricas = list(colunas_categoricas)
+        self.estrategia_nulos = dict(estrategia_nulos)
+        self.metodo_outliers = metodo_outliers
+        self.limite_outliers = limite_outliers
+        self.tamanho_bloco = tamanho_bloco
+
+        self.valores_imputacao: Dict[str, Any] = {}
+        self.limites: Dict[str, tuple] = {}
+        self.scaler: Optional[StandardScaler] = None
+        self.vocabularios: Dict[str, np.ndarray] = {}
+        self.n_linhas = 0
+
+    def ler_blocos(self, fonte: Fonte) -> Iterator[pd.DataFrame]:
+        """
+        Lê a fonte em blocos de `tamanho_bloco` linhas.
+
+        Args:
+            fonte: Caminho de um CSV ou Parquet (pela extensão) ou um DataFrame
+        """
+        if isinstance(fonte, pd.DataFrame):
+            for inicio in range(0, len(fonte), self.tamanho_bloco):
+                yield fonte.iloc[inicio:inicio + self.tamanho_bloco].copy()
+        elif str(fonte).endswith('.parquet'):
+            import pyarrow.parquet as pq
+            for lote in pq.ParquetFile(fonte).iter_batches(batch_size=self.tamanho_bloco):
+                yield lote.to_pandas()
+        else:
+            # Categóricas sempre como texto: um bloco só com nulos não vira float
+            tipos = {coluna: object for coluna in self.colunas_categoricas}
+            yield from pd.read_csv(fonte, chunksize=self.tamanho_bloco, dtype=tipos)
+
+    def fit(self, fonte: Fonte) -> 'PreprocessadorIncremental':
+        """
+        Ajusta as estatísticas percorrendo a fonte duas vezes, em blocos.
+
+        Args:
+            fonte: Caminho de um CSV ou Parquet, ou um DataFrame
+
+        Returns:
+            O próprio preprocessador
+        """
+        logger.info(f"Ajustando pré-processamento em blocos de {self.tamanho_bloco} linhas...")
+
+        # 1ª passada: contagens de valores e de nulos
+        colunas_contadas = list(dict.fromkeys(list(self.estrategia_nulos) + self.colunas_numericas))
+        contagens: Dict[str, pd.Series] = {}
+        nulos: Dict[str, int] = {}
+        numericas: Dict[str, bool] = {}
+        self.n_linhas = 0
+        for bloco in self.ler_blocos(fonte):
+            self.n_linhas += len(bloco)
+            for coluna in colunas_contadas:
+                if coluna not in bloco.columns:
+                    continue
+                serie = bloco[coluna]
+                numericas[coluna] = numericas.get(coluna, True) and pd.api.types.is_numeric_dtype(serie)
+                atual = serie.value_counts(dropna=True)
+                contagens[coluna] = atual if coluna not in contagens else contagens[coluna].add(atual, fill_value=0)
+                nulos[coluna] = nulos.get(coluna, 0) + int(serie.isna().sum())
+
+        colunas_faltantes = [coluna for coluna in self.colunas_numericas if coluna not in contagens]
+        if colunas_faltantes:
+            raise ValueError(f"Colunas não encontradas: {colunas_faltantes}")
+
+        self.valores_imputacao = {}
+        for coluna, metodo in self.estrategia_nulos.items():
+            if coluna not in contagens:
+                continue
+            valor = _valor_imputacao(contagens[coluna], metodo, numericas[coluna])
+            self.valores_imputacao[coluna] = valor
+            logger.info(f"Imputação de {coluna} ({metodo}): {valor} em {nulos[coluna]} valores nulos")
+            if nulos[coluna] and valor is not None:
+                contagens[coluna] = contagens[coluna].add(pd.Series({valor: nulos[coluna]}), fill_value=0)
+
+        self.limites = {}
+        for coluna in self.colunas_numericas:
+            if coluna not in contagens:
+                continue
+            contagem = contagens[coluna]
+            if self.metodo_outliers == 'iqr':
+                q1 = _quantil(contagem, 0.25)
+                q3 = _quantil(contagem, 0.75)
+                iqr = q3 - q1
+                self.limites[coluna] = (q1 - self.limite_outliers * iqr, q3 + self.limite_outliers * iqr)
+            else:
+                valores = contagem.index.to_numpy(dtype=np.float64)
+                pesos = contagem.to_numpy(dtype=np.float64)
+                media = np.average(valores, weights=pesos)
+                desvio = np.sqrt(np.sum(pesos * (valores - media) ** 2) / (pesos.sum() - 1))
+                self.limites[coluna] = (media - self.limite_outliers * desvio, media + self.limite_outliers * desvio)
+            logger.info(f"Limites de outliers em {coluna}: {self.limites[coluna]}")
+
+        # 2ª passada: normalização e vocabulário das categóricas
+        self.scaler = StandardScaler()
+        vocabularios: Dict[str, set] = {coluna: set() for coluna in self.colunas_categoricas}
+        for bloco in self.ler_blocos(fonte):
+            self._imputar(bloco)
+            self._limitar(bloco)
+            self.scaler.partial_fit(bloco[self.colunas_numericas])
+            for coluna in self.colunas_categoricas:
+                if coluna in bloco.columns:
+                    vocabularios[coluna].update(bloco[coluna].fillna('MISSING').astype(str).unique())
+        self.vocabularios = {
+            coluna: np.array(sorted(valores), dtype=object)
+            for coluna, valores in vocabularios.items() if valores
+        }
+        for coluna, vocabulario in self.vocabularios.items():
+            logger.info(f"Coluna {coluna}: {len(vocabulario)} classes únicas")
+
+        logger.info(f"Ajuste concluído sobre {self.n_linhas} linhas")
+        return self
+
+    def _imputar(self, bloco: pd.DataFrame):
+        for coluna, valor in self.valores_imputacao.items():
+            if valor is not None and coluna in bloco.columns:
+                bloco[coluna] = bloco[coluna].fillna(valor)
+
+    def _limitar(self, bloco: pd.DataFrame):
+        for coluna, (inferior, superior) in self.limites.items():
+            bloco[coluna] = bloco[coluna].clip(inferior, superior)
+
+    def transformar_bloco(self, bloco: pd.DataFrame) -> pd.DataFrame:
+        """
+        Aplica as etapas ajustadas a um bloco (alterando-o).
+
+        Raises:
+            ValueError: Se o bloco tiver categorias que não apareceram no ajuste
+        """
+        if self.scaler is None:
+            raise ValueError("O preprocessador ainda não foi ajustado (fit)")
+        self._imputar(bloco)
+        self._limitar(bloco)
+        bloco[self.colunas_numericas] = self.scaler.transform(bloco[self.colunas_numericas])
+        for coluna, vocabulario in self.vocabularios.items():
+            valores = bloco[coluna].fillna('MISSING').astype(str).to_numpy(dtype=object)
+            codigos = np.searchsorted(vocabulario, valores)
+            desconhecidos = (codigos >= len(vocabulario)) | (vocabulario[np.minimum(codigos, len(vocabulario) - 1)] != valores)
+            if desconhecidos.any():
+                raise ValueError(f"Categorias não vistas no ajuste em {coluna}: {sorted(set(valores[desconhecidos]))[:10]}")
+            bloco[coluna] = codigos.astype(np.int64)
+        return bloco
+
+    def transformar_blocos(self, fonte: Fonte) -> Iterator[pd.DataFrame]:
+        """Lê e transforma a fonte um bloco por vez."""
+        for bloco in self.ler_blocos(fonte):
+            yield self.transformar_bloco(bloco)
+
+    def transform(
+        self,
+        fonte: Fonte,
+        destino: str,
+        coluna_target: Optional[str] = None,
+        destino_target: Optional[str] = None
+    ) -> int:
+        """
+        Transforma a fonte em blocos e grava cada bloco assim que fica pronto.
+
+        Args:
+            fonte: Caminho de um CSV ou Parquet, ou um DataFrame
+            destino: Arquivo de saída, CSV ou Parquet (pela extensão)
+            coluna_target: Se informada, a coluna é retirada das features e
+                           gravada em `destino_target`, como o `target.csv`
+                           do pipeline em memória
+            destino_target: CSV do target; por padrão, `target.csv` no
+                            diretório de `destino`
+
+        Returns:
+            Número de linhas gravadas
+
+        Raises:
+            ValueError: Se `coluna_target` não estiver na fonte
+        """
+        logger.info(f"Transformando em blocos para {destino}...")
+        diretorio = os.path.dirname(destino)
+        if diretorio:
+            os.makedirs(diretorio, exist_ok=True)
+        if coluna_target is not None and destino_target is None:
+            destino_target = os.path.join(diretorio, 'target.csv')
+
+        gravador = None
+        linhas = 0
+        try:
+            for i, bloco in enumerate(self.transformar_blocos(fonte)):
+                if coluna_target is not None:
+                    if coluna_target not in bloco.columns:
+                        raise ValueError(f"Coluna target '{coluna_target}' não encontrada na entrada")
+                    bloco.pop(coluna_target).to_frame().to_csv(
+                        destino_target, mode='w' if i == 0 else 'a', header=i == 0, index=False
+                    )
+                if destino.endswith('.parquet'):
+                    import pyarrow as pa
+                    import pyarrow.parquet as pq
+                    tabela = pa.Table.from_pandas(bloco, preserve_index=False)
+                    if gravador is None:
+                        gravador = pq.ParquetWriter(destino, tabela.schema)
+                    gravador.write_table(tabela)
+                else:
+                    bloco.to_csv(destino, mode='w' if i == 0 else 'a', header=i == 0, index=False)
+                linhas += len(bloco)
+        finally:
+            if gravador is not None:
+                gravador.close()
+
+        logger.info(f"{linhas} linhas gravadas em {destino}")
+        if coluna_target is not None:
+            logger.info(f"Target gravado em {destino_target}")
+        return linhas
+
+    def transformadores(self) -> Dict[str, Any]:
+        """
+        Returns:
+            Dicionário no formato de `preprocessar_dados` ('scaler',
+            'encoders', 'limites' e 'tipo_numericas'), para salvar em
+            `data/transformadores.joblib`
+        """
+        encoders = {}
+        for coluna, vocabulario in self.vocabularios.items():
+            encoder = LabelEncoder()
+            encoder.classes_ = vocabulario
+            encoders[coluna] = encoder
+        # Os blocos são normalizados pelo scaler em float64
+        return {
+            'scaler': self.scaler,
+            'encoders': encoders,
+            'limites': dict(self.limites),
+            'tipo_numericas': 'float64'
+        }
@@ -0,0 +1,303 @@
+"""
+Execução paralela, coluna a coluna, das etapas de pré-processamento.
+
+A imputação de nulos, a limitação de outliers e a codificação das
+categóricas são independentes entre colunas. `ExecutorColunas` distribui
+cada coluna para um pool de processos. Os dados vão por memória
+compartilhada (`multiprocessing.shared_memory`) em vez de cópias
+serializadas: colunas numéricas como arrays NumPy e colunas de texto como os
+buffers de um array Arrow. Cada worker escreve o resultado da sua coluna em
+outro bloco compartilhado e devolve só valores pequenos (valor imputado,
+classes, contagens).
+
+Os resultados são aplicados ao DataFrame na ordem das colunas, qualquer que
+seja a ordem em que os workers terminam, e são iguais aos de
+`src.data.preprocessamento`: as mesmas funções do pandas/scikit-learn nas
+colunas numéricas e, nas de texto, a moda com o mesmo desempate do
+`SimpleImputer` e as classes ordenadas como no `LabelEncoder`. Colunas
+`category` (ver `src.data.tipos`) já trazem códigos e contagens e são
+tratadas no próprio processo principal.
+"""
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from sklearn.impute import SimpleImputer
+from sklearn.preprocessing import LabelEncoder
+from src.data.preprocessamento import (
+    calcular_limites_outliers, calcular_moda_categorica, codificar_categoria, eh_numerica
+)
+from src.data.tipos import eh_compacto
+from src.utils.logger import configurar_logger
+
+logger = configurar_logger('preprocessamento_paralelo')
+
+def _criar_bloco(tamanho: int) -> SharedMemory:
+    return SharedMemory(create=True, size=max(tamanho, 1))
+
+def _abrir_bloco(nome: str) -> SharedMemory:
+    # Os workers do pool usam o mesmo resource_tracker do processo
+    # principal, que cria os blocos e os remove depois de ler os resultados
+    return SharedMemory(name=nome)
+
+def _compartilhar_numerica(valores: np.ndarray) -> Tuple[SharedMemory, Dict[str, Any]]:
+    bloco = _criar_bloco(valores.nbytes)
+    np.ndarray(valores.shape, dtype=valores.dtype, buffer=bloco.buf)[:] = valores
+    return bloco, {'bloco': bloco.name, 'tipo': 'numerica', 'dtype': valores.dtype.str, 'n': len(valores)}
+
+def _compartilhar_texto(valores: pd.Series) -> Tuple[SharedMemory, Dict[str, Any]]:
+    array = pa.array(valores.to_numpy(dtype=object), type=pa.large_string(), from_pandas=True)
+    buffers = array.buffers()
+    tamanhos = [buffer.size if buffer is not None else 0 for buffer in buffers]
+    bloco = _criar_bloco(sum(tamanhos))
+    posicao = 0
+    for buffer, tamanho in zip(buffers, tamanhos):
+        if tamanho:
+            bloco.buf[posicao:posicao + tamanho] = memoryview(buffer).cast('B')
+        posicao += tamanho
+    return bloco, {
+        'bloco': bloco.name, 'tipo': 'texto', 'n': len(array),
+        'tamanhos': tamanhos, 'nulos': array.null_count
+    }
+
+def _ler_coluna(bloco: SharedMemory, descricao: Dict[str, Any]) -> Any:
+    """Array NumPy ou Arrow sobre o bloco compartilhado, sem cópia."""
+    if descricao['tipo'] == 'numerica':
+        return np.ndarray((descricao['n'],), dtype=np.dtype(descricao['dtype']), buffer=bloco.buf)
+    buffers, posicao = [], 0
+    for tamanho in descricao['tamanhos']:
+        buffers.append(pa.py_buffer(bloco.buf[posicao:posicao + tamanho]) if tamanho else None)
+        posicao += tamanho
+    return pa.Array.from_buffers(pa.large_string(), descricao['n'], buffers, null_count=descricao['nulos'])
+
+def _escrever_saida(nome: str, valores: np.ndarray) -> str:
+    bloco = _abrir_bloco(nome)
+    try:
+        np.ndarray(valores.shape, dtype=valores.dtype, buffer=bloco.buf)[:] = valores
+    finally:
+        bloco.close()
+    return valores.dtype.str
+
+def _moda(valores: pa.Array) -> Optional[str]:
+    # Mesmo desempate do SimpleImputer(strategy='most_frequent'): o menor valor
+    contagens = pc.value_counts(valores.drop_null())
+    if len(contagens) == 0:
+        return None
+    maximo = pc.max(contagens.field('counts')).as_py()
+    return min(pc.filter(contagens.field('values'), pc.equal(contagens.field('counts'), maximo)).to_pylist())
+
+def _tarefa_imputar(descricao: Dict[str, Any], metodo: str, saida: Optional[str]) -> Tuple[Any, int]:
+    """
+    Returns:
+        Tuple com o valor imputado (colunas de texto) ou o dtype do
+        resultado escrito em `saida` (numéricas) e o número de nulos; o
+        primeiro é None se a coluna não tiver nenhum valor observado
+    """
+    bloco = _abrir_bloco(descricao['bloco'])
+    try:
+        valores = _ler_coluna(bloco, descricao)
+        if descricao['tipo'] == 'numerica':
+            nulos = int(np.isnan(valores).sum()) if valores.dtype.kind == 'f' else 0
+            imputados = SimpleImputer(strategy=metodo).fit_transform(valores.reshape(-1, 1)).ravel()
+            n = len(valores)
+            del valores
+            if len(imputados) != n:
+                # Coluna sem nenhum valor observado: o SimpleImputer a descarta
+                return None, nulos
+            return _escrever_saida(saida, imputados), nulos
+        nulos = valores.null_count
+        valor = _moda(valores)
+        del valores
+        return valor, nulos
+    finally:
+        bloco.close()
+
+def _tarefa_limitar(
+    descricao: Dict[str, Any], saida: str, metodo: str, limite: float
+) -> Tuple[Optional[str], int, Optional[Tuple[float, float]]]:
+    bloco = _abrir_bloco(descricao['bloco'])
+    try:
+        valores = pd.Series(_ler_coluna(bloco, descricao), copy=False)
+        limites = calcular_limites_outliers(valores, metodo, limite)
+        if limites is None:
+            del valores
+            return None, 0, None
+        limite_inferior, limite_superior = limites
+        valores_alterados = int(((valores < limite_inferior) | (valores > limite_superior)).sum())
+        dtype = _escrever_saida(saida, valores.clip(limite_inferior, limite_superior).to_numpy())
+        del valores
+        return dtype, valores_alterados, limites
+    finally:
+        bloco.close()
+
+def _tarefa_codificar(descricao: Dict[str, Any], saida: str) -> List[str]:
+    bloco = _abrir_bloco(descricao['bloco'])
+    try:
+        valores = _ler_coluna(bloco, descricao).fill_null('MISSING')
+        # A ordem binária de UTF-8 é a ordem dos code points, a mesma do np.unique do LabelEncoder
+        classes = pc.unique(valores)
+        classes = classes.take(pc.sort_indices(classes))
+        codigos = pc.index_in(valores, value_set=classes).to_numpy(zero_copy_only=False)
+        _escrever_saida(saida, codigos.astype(np.int64))
+        del valores
+        return classes.to_pylist()
+    finally:
+        bloco.close()
+
+class ExecutorColunas:
+    """
+    Pool de processos que executa as etapas de pré-processamento coluna a coluna.
+
+    Exemplo:
+        with ExecutorColunas(n_workers=4) as executor:
+            executor.imputar(X, estrategia_nulos)
+            executor.limitar_outliers(X, colunas_numericas)
+            encoders = executor.codificar(X, colunas_categoricas)
+
+    Os métodos alteram o próprio DataFrame recebido.
+    """
+
+    def __init__(self, n_workers: int):
+        self.n_workers = n_workers
+        self._pool = ProcessPoolExecutor(max_workers=n_workers)
+
+    def __enter__(self) -> "ExecutorColunas":
+        return self
+
+    def __exit__(self, *excecao):
+        self.encerrar()
+        return False
+
+    def encerrar(self) -> None:
+        self._pool.shutdown()
+
+    def _executar(self, tarefas: List[Tuple[Callable, Tuple]]) -> List[Any]:
+        """Envia todas as tarefas ao pool e devolve os resultados na ordem em que foram enviadas."""
+        futuros = [self._pool.submit(funcao, *args) for funcao, args in tarefas]
+        return [futuro.result() for futuro in futuros]
+
+    @staticmethod
+    def _ler_saida(bloco: SharedMemory, n: int, dtype: str) -> np.ndarray:
+        # Copia para fora do bloco, que é removido em seguida
+        return np.ndarray((n,), dtype=np.dtype(dtype), buffer=bloco.buf).copy()
+
+    @staticmethod
+    def _liberar(blocos: List[SharedMemory]) -> None:
+        for bloco in blocos:
+            bloco.close()
+            bloco.unlink()
+
+    def imputar(self, X: pd.DataFrame, estrategia: Dict[str, str]) -> None:
+        """Equivalente paralelo de `remover_valores_nulos`."""
+        blocos, tarefas, colunas = [], [], []
+        try:
+            for coluna, metodo in estrategia.items():
+                if coluna not in X.columns:
+                    continue
+                if isinstance(X[coluna].dtype, pd.CategoricalDtype):
+                    # Categorias já têm as contagens; não vale enviar ao pool
+                    nulos = X[coluna].isnull().sum()
+                    moda = calcular_moda_categorica(X[coluna])
+                    if moda is not None:
+                        X[coluna] = X[coluna].fillna(moda)
+                    logger.info(f"Valores nulos em {coluna}: {nulos} -> {X[coluna].isnull().sum()}")
+                elif eh_numerica(X[coluna].dtype):
+                    bloco, descricao = _compartilhar_numerica(X[coluna].to_numpy())
+                    saida = _criar_bloco(len(X) * 8)
+                    blocos += [bloco, saida]
+                    tarefas.append((_tarefa_imputar, (descricao, metodo, saida.name)))
+                    colunas.append((coluna, saida))
+                else:
+                    bloco, descricao = _compartilhar_texto(X[coluna])
+                    blocos.append(bloco)
+                    tarefas.append((_tarefa_imputar, (descricao, 'most_frequent', None)))
+                    colunas.append((coluna, None))
+
+            for (coluna, saida), (valor, nulos) in zip(colunas, self._executar(tarefas)):
+                if valor is None:
+                    logger.warning(f"Coluna {coluna} sem valores observados: mantida sem imputação")
+                elif saida is not None:
+                    X.loc[:, coluna] = self._ler_saida(saida, len(X), valor)
+                else:
+                    X[coluna] = X[coluna].fillna(valor)
+                logger.info(f"Valores nulos em {coluna}: {nulos} -> {X[coluna].isnull().sum()}")
+        finally:
+            self._liberar(blocos)
+
+    def limitar_outliers(
+        self,
+        X: pd.DataFrame,
+        colunas_numericas: list,
+        metodo: str = 'iqr',
+        limite: float = 1.5,
+        limites: Optional[Dict[str, Tuple[float, float]]] = None
+    ) -> None:
+        """Equivalente paralelo de `tratar_outliers`."""
+        blocos, tarefas, colunas = [], [], []
+        try:
+            for coluna in colunas_numericas:
+                if coluna not in X.columns:
+                    logger.warning(f"Coluna {coluna} não encontrada no DataFrame")
+                    continue
+                valores = X[coluna].to_numpy()
+                bloco, descricao = _compartilhar_numerica(valores)
+                # Espaço para o resultado mesmo se o clip converter inteiros em float64
+                saida = _criar_bloco(len(X) * max(valores.dtype.itemsize, 8))
+                blocos += [bloco, saida]
+                tarefas.append((_tarefa_limitar, (descricao, saida.name, metodo, limite)))
+                colunas.append((coluna, saida))
+
+            for (coluna, saida), (dtype, valores_alterados, limites_coluna) in zip(colunas, self._executar(tarefas)):
+                if dtype is None:
+                    logger.warning(f"Método de outliers desconhecido: {metodo}")
+                    continue
+                if limites is not None:
+                    limites[coluna] = limites_coluna
+                limitados = self._ler_saida(saida, len(X), dtype)
+                X[coluna] = limitados.astype(np.float32) if eh_compacto(X[coluna].dtype) else limitados
+                logger.info(f"Valores modificados em {coluna}: {valores_alterados}")
+        finally:
+            self._liberar(blocos)
+
+    def codificar(self, X: pd.DataFrame, colunas_categoricas: list) -> Dict[str, LabelEncoder]:
+        """Equivalente paralelo de `codificar_categoricas`; devolve os LabelEncoders ajustados."""
+        blocos, tarefas, colunas = [], [], []
+        encoders = {}
+        try:
+            for coluna in colunas_categoricas:
+                if coluna not in X.columns:
+                    logger.warning(f"Coluna {coluna} não encontrada no DataFrame")
+                    continue
+                # Reserva a posição: os encoders ficam na ordem das colunas
+                encoders[coluna] = None
+                valores = X[coluna]
+                if isinstance(valores.dtype, pd.CategoricalDtype):
+                    codigos, encoders[coluna] = codificar_categoria(valores)
+                    X[coluna] = codigos
+                    logger.info(f"Coluna {coluna}: {len(encoders[coluna].classes_)} classes únicas")
+                    continue
+                if valores.dtype != object:
+                    valores = valores.fillna('MISSING').astype(str)
+                try:
+                    bloco, descricao = _compartilhar_texto(valores)
+                except (pa.ArrowInvalid, pa.ArrowTypeError):
+                    # Objetos que não são texto: converte aqui, como o modo sequencial
+                    bloco, descricao = _compartilhar_texto(valores.fillna('MISSING').astype(str))
+                saida = _criar_bloco(len(X) * 8)
+                blocos += [bloco, saida]
+                tarefas.append((_tarefa_codificar, (descricao, saida.name)))
+                colunas.append((coluna, saida))
+
+            for (coluna, saida), classes in zip(colunas, self._executar(tarefas)):
+                le = LabelEncoder()
+                le.classes_ = np.array(classes, dtype=object)
+                X[coluna] = self._ler_saida(saida, len(X), '<i8')
+                encoders[coluna] = le
+                logger.info(f"Coluna {coluna}: {len(classes)} classes únicas")
+        finally:
+            self._liberar(blocos)
+        return encoders
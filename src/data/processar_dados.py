@@ -1,10 +1,22 @@
 """
 Script para executar o pipeline de pré-processamento nos dados.
+
+Uso:
+    python -m src.data.processar_dados
+        Baixa o Adult do UCI e processa tudo em memória.
+    python -m src.data.processar_dados --entrada dados.csv --saida data/features_processadas.parquet
+        Processa um arquivo local (CSV ou Parquet) em blocos, sem carregá-lo
+        inteiro; a coluna target (`--coluna-target`, padrão: income) vai para
+        data/target.csv e as demais colunas fora das listas abaixo são
+        mantidas como estão. Em seguida:
+    python -m src.data.feature_engineering --entrada data/features_processadas.parquet
 """
 
-from src.data.data_acquisition import carregar_dados
 from src.data.preprocessamento import preprocessar_dados
+from src.data.preprocessamento_incremental import PreprocessadorIncremental, TAMANHO_BLOCO_PADRAO
 from src.utils.logger import configurar_logger
+from typing import Optional
+import argparse
 import joblib
 import os
 
@@ -27,11 +39,54 @@ ESTRATEGIA_NULOS = {
     'native-country': 'most_frequent'
 }
 
+def processar_em_blocos(entrada: str, saida: str, tamanho_bloco: int, coluna_target: Optional[str] = 'income'):
+    """
+    Ajusta e aplica o pré-processamento em blocos a um arquivo local.
+    
+    Args:
+        entrada: CSV ou Parquet com as features brutas
+        saida: Arquivo de saída, CSV ou Parquet
+        tamanho_bloco: Linhas processadas por vez
+        coluna_target: Coluna gravada em data/target.csv, fora das features;
+                       None se a entrada não tiver target
+    """
+    preprocessador = PreprocessadorIncremental(
+        colunas_numericas=COLUNAS_NUMERICAS,
+        colunas_categoricas=COLUNAS_CATEGORICAS,
+        estrategia_nulos=ESTRATEGIA_NULOS,
+        tamanho_bloco=tamanho_bloco
+    )
+    preprocessador.fit(entrada)
+    if not os.path.exists('data'):
+        os.makedirs('data')
+    preprocessador.transform(entrada, saida, coluna_target, 'data/target.csv' if coluna_target else None)
+    joblib.dump(preprocessador.transformadores(), 'data/transformadores.joblib')
+
 def main():
     """
     Função principal para executar o processamento dos dados.
     """
+    parser = argparse.ArgumentParser(description="Pré-processamento dos dados")
+    parser.add_argument('--entrada', help="CSV ou Parquet local, processado em blocos")
+    parser.add_argument('--saida', default='data/features_processadas.csv', help="Arquivo de saída (CSV ou Parquet)")
+    parser.add_argument(
+        '--coluna-target', default='income',
+        help="Coluna target da entrada em blocos, gravada em data/target.csv (vazio se não houver)"
+    )
+    parser.add_argument('--tamanho-bloco', type=int, default=TAMANHO_BLOCO_PADRAO, help="Linhas por bloco")
+    parser.add_argument('--inplace', action='store_true', help="Processa em memória sem copiar os dados a cada etapa")
+    parser.add_argument('--workers', type=int, default=1, help="Processos para as etapas por coluna (1 = sequencial)")
+    parser.add_argument('--medir-memoria', action='store_true', help="Registra no log o pico de RSS de cada etapa")
+    args = parser.parse_args()
+    
     try:
+        if args.entrada:
+            logger.info(f"Processando {args.entrada} em blocos de {args.tamanho_bloco} linhas...")
+            processar_em_blocos(args.entrada, args.saida, args.tamanho_bloco, args.coluna_target or None)
+            logger.info("Processamento concluído com sucesso!")
+            return
+        
+        from src.data.data_acquisition import carregar_dados
         logger.info("Carregando dados...")
         X, y, metadados = carregar_dados()
         
@@ -40,7 +95,10 @@ def main():
             X=X,
             colunas_numericas=COLUNAS_NUMERICAS,
             colunas_categoricas=COLUNAS_CATEGORICAS,
-            estrategia_nulos=ESTRATEGIA_NULOS
+            estrategia_nulos=ESTRATEGIA_NULOS,
+            inplace=args.inplace,
+            n_workers=args.workers,
+            medir_memoria=args.medir_memoria
         )
         
         if not os.path.exists('data'):
@@ -0,0 +1,84 @@
+"""
+Política de tipos compactos do pipeline de dados.
+
+Os dados chegam do UCI com colunas de texto em `object` e números em
+`int64`. `compactar_tipos` aplica a política usada da aquisição ao modelo:
+campos nominais como `category` do pandas (códigos inteiros e um único
+vocabulário por coluna), inteiros na menor largura que comporta os valores
+da coluna e, opcionalmente, `float32` nas colunas float (features
+normalizadas). O pré-processamento e o feature engineering preservam esses
+tipos: uma coluna que entra compacta sai compacta (ver `eh_compacto`).
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict
+
+INTEIROS = [np.int8, np.int16, np.int32, np.int64]
+
+def menor_inteiro(minimo: int, maximo: int) -> np.dtype:
+    """
+    Returns:
+        O menor tipo inteiro com sinal que comporta o intervalo [minimo, maximo]
+    """
+    for tipo in INTEIROS:
+        limites = np.iinfo(tipo)
+        if limites.min <= minimo and maximo <= limites.max:
+            return np.dtype(tipo)
+    return np.dtype(np.int64)
+
+def eh_compacto(dtype) -> bool:
+    """
+    Indica se uma coluna já segue a política de tipos compactos: `category`
+    ou número com menos de 64 bits.
+    """
+    if isinstance(dtype, pd.CategoricalDtype):
+        return True
+    return pd.api.types.is_numeric_dtype(dtype) and np.dtype(dtype).itemsize < 8
+
+def compactar_coluna(valores: pd.Series, converter_floats: bool = False) -> pd.Series:
+    """
+    Converte uma coluna para o tipo compacto correspondente.
+
+    Args:
+        valores: Coluna original
+        converter_floats: Se True, colunas float64 passam para float32
+
+    Returns:
+        A coluna convertida, ou a própria coluna se não houver tipo menor
+    """
+    dtype = valores.dtype
+    if isinstance(dtype, pd.CategoricalDtype) or pd.api.types.is_bool_dtype(dtype):
+        return valores
+    if pd.api.types.is_object_dtype(dtype) or pd.api.types.is_string_dtype(dtype):
+        return valores.astype('category')
+    if pd.api.types.is_integer_dtype(dtype):
+        if len(valores) == 0:
+            return valores
+        return valores.astype(menor_inteiro(int(valores.min()), int(valores.max())))
+    if converter_floats and dtype == np.float64:
+        return valores.astype(np.float32)
+    return valores
+
+def compactar_tipos(X: pd.DataFrame, converter_floats: bool = False) -> pd.DataFrame:
+    """
+    Aplica a política de tipos compactos a todas as colunas.
+
+    Args:
+        X: DataFrame original (não é alterado)
+        converter_floats: Se True, colunas float64 passam para float32
+
+    Returns:
+        DataFrame com as colunas convertidas
+    """
+    return pd.DataFrame(
+        {coluna: compactar_coluna(X[coluna], converter_floats) for coluna in X.columns},
+        index=X.index
+    )
+
+def memoria_colunas(X: pd.DataFrame) -> Dict[str, int]:
+    """
+    Returns:
+        Bytes ocupados por coluna, contando o conteúdo das strings
+    """
+    return X.memory_usage(deep=True, index=False).to_dict()
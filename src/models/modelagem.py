@@ -5,7 +5,8 @@ Implementa diferentes algoritmos e técnicas de avaliação.
 
 import pandas as pd
 import numpy as np
-from typing import Dict, Any, List, Tuple
+from scipy import sparse
+from typing import Dict, Any, List, Tuple, Union
 import joblib
 from sklearn.model_selection import train_test_split, GridSearchCV
 from sklearn.metrics import (
@@ -16,7 +17,10 @@ from sklearn.linear_model import LogisticRegression
 import xgboost as xgb
 import matplotlib.pyplot as plt
 import seaborn as sns
+from src.data.tipos import compactar_tipos
 from src.utils.logger import configurar_logger
+from src.models.serializacao import exportar_artefatos_mmap
+from src.models.registro import registrar_modelo
 import os
 import sys
 import logging
@@ -24,18 +28,27 @@ import logging
 logger = configurar_logger('modelagem')
 logger.setLevel(logging.DEBUG)
 
-def carregar_dados() -> Tuple[pd.DataFrame, pd.Series]:
+def carregar_dados() -> Tuple[Union[pd.DataFrame, sparse.csr_matrix], pd.Series]:
     """
     Carrega os dados processados para modelagem.
     
+    Se os transformadores de features foram gerados no modo esparso
+    (`formato` 'csr'), as features são a matriz CSR de
+    `data/features_engineered.npz`; os modelos são treinados sobre ela.
+    
     Returns:
         Tuple com features e target
     """
     logger.debug("Iniciando carregamento dos dados...")
     
     try:
-        logger.debug("Tentando ler features_engineered.csv...")
-        X = pd.read_csv('data/features_engineered.csv')
+        transformadores = joblib.load('data/transformadores_features.joblib')
+        if transformadores.get('formato') == 'csr':
+            logger.debug("Tentando ler features_engineered.npz...")
+            X = sparse.load_npz('data/features_engineered.npz').tocsr()
+        else:
+            logger.debug("Tentando ler features_engineered.csv...")
+            X = compactar_tipos(pd.read_csv('data/features_engineered.csv'), converter_floats=True)
         logger.debug(f"Features carregadas com sucesso. Shape: {X.shape}")
         
         logger.debug("Tentando ler target.csv...")
@@ -333,6 +346,24 @@ def main():
         joblib.dump(melhor_modelo, 'models/melhor_modelo.joblib')
         df_resultados_finais.to_csv('models/resultados_modelos.csv')
         
+        logger.info("Exportando artefatos para o modo de serviço mapeado em memória...")
+        exportar_artefatos_mmap('models/melhor_modelo.joblib', 'data/transformadores_features.joblib')
+        
+        logger.info("Registrando versões no registro de modelos...")
+        versoes_registradas = {}
+        for nome, modelo in modelos_otimizados.items():
+            nome_otimizado = f"{nome}_otimizado"
+            versoes_registradas[nome_otimizado] = registrar_modelo(
+                modelo, nome_otimizado, 'data/transformadores_features.joblib',
+                metricas=resultados_otimizados[nome],
+                padrao=nome_otimizado == melhor_modelo_nome
+            )
+        if melhor_modelo_nome not in versoes_registradas:
+            registrar_modelo(
+                melhor_modelo, melhor_modelo_nome, 'data/transformadores_features.joblib',
+                metricas=resultados[melhor_modelo_nome], padrao=True
+            )
+        
         logger.info("Processo de modelagem concluído com sucesso!")
         
     except Exception as e:
@@ -0,0 +1,155 @@
+"""
+Registro versionado de modelos em disco.
+
+Cada versão registrada fica em um diretório próprio, com o modelo, uma
+cópia dos transformadores usados no treino e os metadados (algoritmo,
+métricas, parâmetros). O índice `indice.json` lista as versões e indica a
+versão padrão. Versões registradas não são alteradas depois de gravadas.
+
+Estrutura:
+    models/registro/
+        indice.json
+        20250309-142501-xgboost/
+            modelo.joblib
+            transformadores.joblib
+            metadados.json
+"""
+
+import json
+import os
+import re
+import shutil
+import time
+import joblib
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from src.utils.logger import configurar_logger
+
+logger = configurar_logger('registro_modelos')
+
+DIRETORIO_REGISTRO_PADRAO = 'models/registro'
+ARQUIVO_INDICE = 'indice.json'
+ARQUIVO_MODELO = 'modelo.joblib'
+ARQUIVO_TRANSFORMADORES = 'transformadores.joblib'
+ARQUIVO_METADADOS = 'metadados.json'
+
+class VersaoNaoEncontradaError(KeyError):
+    """Versão ausente do registro."""
+
+def _gravar_json(caminho: str, conteudo: Dict[str, Any]):
+    temporario = f"{caminho}.tmp"
+    with open(temporario, 'w') as f:
+        json.dump(conteudo, f, indent=2, default=str)
+    os.replace(temporario, caminho)
+
+def ler_indice(diretorio: str = DIRETORIO_REGISTRO_PADRAO) -> Dict[str, Any]:
+    """
+    Lê o índice do registro.
+
+    Returns:
+        Dicionário com 'versoes' (lista, da mais antiga para a mais nova) e
+        'padrao' (versão padrão ou None); vazio se o registro não existir
+    """
+    caminho = os.path.join(diretorio, ARQUIVO_INDICE)
+    if not os.path.exists(caminho):
+        return {'versoes': [], 'padrao': None}
+    with open(caminho) as f:
+        return json.load(f)
+
+def registrar_modelo(
+    model: Any,
+    nome: str,
+    caminho_transformadores: str,
+    metricas: Optional[Dict[str, float]] = None,
+    padrao: bool = False,
+    diretorio: str = DIRETORIO_REGISTRO_PADRAO
+) -> str:
+    """
+    Grava uma nova versão no registro.
+
+    Args:
+        model: Modelo treinado
+        nome: Nome descritivo (ex.: 'XGBoost_otimizado')
+        caminho_transformadores: Transformadores usados para gerar as features
+        metricas: Métricas de avaliação do modelo
+        padrao: Se True, a versão passa a ser a padrão
+        diretorio: Diretório do registro
+
+    Returns:
+        Identificador da versão
+    """
+    slug = re.sub(r'[^a-z0-9]+', '-', nome.lower()).strip('-')
+    versao = f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{slug}"
+    destino = os.path.join(diretorio, versao)
+    sufixo = 1
+    while os.path.exists(destino):
+        sufixo += 1
+        destino = os.path.join(diretorio, f"{versao}-{sufixo}")
+    versao = os.path.basename(destino)
+
+    # Grava em um diretório temporário e renomeia: a versão aparece completa
+    temporario = os.path.join(diretorio, f".tmp-{versao}")
+    os.makedirs(temporario)
+    joblib.dump(model, os.path.join(temporario, ARQUIVO_MODELO))
+    shutil.copyfile(caminho_transformadores, os.path.join(temporario, ARQUIVO_TRANSFORMADORES))
+    parametros = model.get_params() if hasattr(model, 'get_params') else {}
+    _gravar_json(os.path.join(temporario, ARQUIVO_METADADOS), {
+        'versao': versao,
+        'nome': nome,
+        'algoritmo': type(model).__name__,
+        'metricas': metricas or {},
+        'parametros': parametros,
+        'criado_em': time.time()
+    })
+    os.replace(temporario, destino)
+
+    indice = ler_indice(diretorio)
+    indice['versoes'].append(versao)
+    if padrao or indice.get('padrao') is None:
+        indice['padrao'] = versao
+    _gravar_json(os.path.join(diretorio, ARQUIVO_INDICE), indice)
+
+    logger.info(f"Modelo {nome} registrado como versão {versao}{' (padrão)' if indice['padrao'] == versao else ''}")
+    return versao
+
+def definir_padrao(versao: str, diretorio: str = DIRETORIO_REGISTRO_PADRAO):
+    """Marca uma versão existente como padrão."""
+    indice = ler_indice(diretorio)
+    if versao not in indice['versoes']:
+        raise VersaoNaoEncontradaError(versao)
+    indice['padrao'] = versao
+    _gravar_json(os.path.join(diretorio, ARQUIVO_INDICE), indice)
+
+def caminhos_versao(versao: str, diretorio: str = DIRETORIO_REGISTRO_PADRAO) -> Dict[str, str]:
+    """
+    Caminhos dos arquivos de uma versão.
+
+    Raises:
+        VersaoNaoEncontradaError: Se a versão não estiver no registro
+    """
+    base = os.path.join(diretorio, versao)
+    if os.path.sep in versao or versao.startswith('.') or not os.path.isdir(base):
+        raise VersaoNaoEncontradaError(versao)
+    return {
+        'modelo': os.path.join(base, ARQUIVO_MODELO),
+        'transformadores': os.path.join(base, ARQUIVO_TRANSFORMADORES),
+        'metadados': os.path.join(base, ARQUIVO_METADADOS)
+    }
+
+def ler_metadados(versao: str, diretorio: str = DIRETORIO_REGISTRO_PADRAO) -> Dict[str, Any]:
+    with open(caminhos_versao(versao, diretorio)['metadados']) as f:
+        return json.load(f)
+
+def listar_versoes(diretorio: str = DIRETORIO_REGISTRO_PADRAO) -> List[Dict[str, Any]]:
+    """
+    Lista as versões registradas com seus metadados.
+
+    Returns:
+        Lista de metadados, da versão mais antiga para a mais nova, com a
+        chave 'padrao' indicando a versão padrão
+    """
+    indice = ler_indice(diretorio)
+    return [
+        {**ler_metadados(versao, diretorio), 'padrao': versao == indice.get('padrao')}
+        for versao in indice['versoes']
+    ]
@@ -0,0 +1,145 @@
+"""
+Exportação dos artefatos de serviço em um layout mapeável em memória.
+
+No layout padrão, cada worker da API faz `joblib.load` do modelo e dos
+transformadores e mantém uma cópia própria no heap. No layout exportado
+aqui, as partes baseadas em arrays NumPy são gravadas sem compressão e
+carregadas com `mmap_mode='r'`: os arrays passam a ser páginas somente
+leitura do arquivo, compartilhadas entre os processos pelo cache de páginas
+do sistema operacional. O booster do XGBoost é gravado no formato nativo
+(UBJSON); a biblioteca o desserializa para estruturas próprias, portanto
+ele carrega sem pickle, mas continua privado a cada processo.
+
+Uso (a partir da raiz do projeto, após o treinamento):
+    python -m src.models.serializacao
+"""
+
+import json
+import os
+import time
+import joblib
+from typing import Any, Dict, List, Tuple
+from src.utils.logger import configurar_logger
+
+logger = configurar_logger('serializacao')
+
+DIRETORIO_MMAP_PADRAO = 'models/mmap'
+ARQUIVO_MANIFESTO = 'manifesto.json'
+ARQUIVO_TRANSFORMADORES = 'transformadores.joblib'
+ARQUIVO_MODELO_JOBLIB = 'modelo.joblib'
+ARQUIVO_MODELO_XGBOOST = 'modelo.ubj'
+
+def exportar_artefatos_mmap(
+    caminho_modelo: str,
+    caminho_transformadores: str,
+    diretorio: str = DIRETORIO_MMAP_PADRAO
+) -> Dict[str, Any]:
+    """
+    Grava o modelo e os transformadores no layout mapeável.
+
+    Os arquivos são gravados com nomes temporários e o manifesto por último,
+    de modo que um leitor nunca veja um diretório pela metade.
+
+    Args:
+        caminho_modelo: Modelo serializado com joblib
+        caminho_transformadores: Transformadores serializados com joblib
+        diretorio: Diretório de saída
+
+    Returns:
+        Manifesto gravado
+    """
+    os.makedirs(diretorio, exist_ok=True)
+    model = joblib.load(caminho_modelo)
+    transformers = joblib.load(caminho_transformadores)
+
+    def gravar(nome: str, escrever) -> str:
+        # O prefixo preserva a extensão, que define o formato do XGBoost
+        temporario = os.path.join(diretorio, f".tmp-{nome}")
+        escrever(temporario)
+        os.replace(temporario, os.path.join(diretorio, nome))
+        return nome
+
+    if hasattr(model, 'get_booster'):
+        formato = 'xgboost'
+        # O formato nativo guarda os atributos do wrapper do scikit-learn
+        # (classes, tipo de estimador) junto com as árvores
+        arquivo_modelo = gravar(ARQUIVO_MODELO_XGBOOST, model.save_model)
+    else:
+        formato = 'joblib'
+        arquivo_modelo = gravar(ARQUIVO_MODELO_JOBLIB, lambda caminho: joblib.dump(model, caminho))
+    arquivo_transformadores = gravar(
+        ARQUIVO_TRANSFORMADORES, lambda caminho: joblib.dump(transformers, caminho)
+    )
+
+    manifesto = {
+        'formato_modelo': formato,
+        'classe_modelo': f"{type(model).__module__}.{type(model).__name__}",
+        'modelo': arquivo_modelo,
+        'transformadores': arquivo_transformadores,
+        'origem': {'modelo': caminho_modelo, 'transformadores': caminho_transformadores},
+        'exportado_em': time.time()
+    }
+
+    def escrever_manifesto(caminho: str):
+        with open(caminho, 'w') as f:
+            json.dump(manifesto, f, indent=2)
+
+    gravar(ARQUIVO_MANIFESTO, escrever_manifesto)
+    logger.info(f"Artefatos exportados para {diretorio} (modelo: {formato})")
+    return manifesto
+
+def ler_manifesto(diretorio: str) -> Dict[str, Any]:
+    with open(os.path.join(diretorio, ARQUIVO_MANIFESTO)) as f:
+        return json.load(f)
+
+def arquivos_artefatos_mmap(diretorio: str) -> List[str]:
+    """Caminhos dos arquivos do layout, na ordem usada para calcular a versão."""
+    manifesto = ler_manifesto(diretorio)
+    return [
+        os.path.join(diretorio, ARQUIVO_MANIFESTO),
+        os.path.join(diretorio, manifesto['modelo']),
+        os.path.join(diretorio, manifesto['transformadores'])
+    ]
+
+def carregar_artefatos_mmap(diretorio: str) -> Tuple[Any, Dict[str, Any]]:
+    """
+    Carrega o modelo e os transformadores do layout mapeável.
+
+    Args:
+        diretorio: Diretório gerado por `exportar_artefatos_mmap`
+
+    Returns:
+        Tuple com o modelo e o dicionário de transformadores
+    """
+    manifesto = ler_manifesto(diretorio)
+    caminho_modelo = os.path.join(diretorio, manifesto['modelo'])
+
+    if manifesto['formato_modelo'] == 'xgboost':
+        import xgboost as xgb
+        classes = {'XGBClassifier': xgb.XGBClassifier, 'XGBRegressor': xgb.XGBRegressor}
+        nome_classe = manifesto['classe_modelo'].rsplit('.', 1)[-1]
+        model = classes.get(nome_classe, xgb.XGBClassifier)()
+        model.load_model(caminho_modelo)
+    else:
+        model = joblib.load(caminho_modelo, mmap_mode='r')
+
+    transformers = joblib.load(
+        os.path.join(diretorio, manifesto['transformadores']), mmap_mode='r'
+    )
+    return model, transformers
+
+def main():
+    """
+    Exporta os artefatos atuais para o layout mapeável.
+    """
+    try:
+        exportar_artefatos_mmap(
+            'models/melhor_modelo.joblib',
+            'data/transformadores_features.joblib'
+        )
+    except Exception as e:
+        logger.error(f"Erro ao exportar artefatos: {str(e)}")
+        raise
+
+if __name__ == "__main__":
+    main()
@@ -139,9 +139,9 @@ st.markdown("# 💰 Calculadora de Renda")
 API_URL = "http://localhost:8000"
 
 def check_api_status():
-    """Verifica se a API está online."""
+    """Verifica se a API está online e pronta para previsões."""
     try:
-        response = requests.get(f"{API_URL}/health")
+        response = requests.get(f"{API_URL}/readyz")
         logger.debug(f"Status da API: {response.status_code}")
         logger.debug(f"Resposta da API: {response.json()}")
         return response.status_code == 200
@@ -222,6 +222,54 @@ sexo_map = {
     "Feminino": 0
 }
 
+# Campos variados na análise "e se?" (/predict/whatif): só os que a pessoa pode mudar
+campos_acionaveis = {
+    "education": ("Escolaridade", escolaridade_map),
+    "occupation": ("Área de Atuação", ocupacao_map),
+    "workclass": ("Tipo de Trabalho", tipo_trabalho_map)
+}
+
+# Ganho mínimo (em pontos percentuais) para uma mudança virar dica
+GANHO_MINIMO_DICA = 0.5
+
+def montar_variacoes(hours_per_week):
+    """Valores alternativos testados para cada campo acionável."""
+    variacoes = {
+        campo: sorted(set(mapa.values()))
+        for campo, (_, mapa) in campos_acionaveis.items()
+    }
+    horas = {hours_per_week + 5, hours_per_week + 10, 40, 45, 50, 60}
+    variacoes["hours_per_week"] = sorted(h for h in horas if 1 <= h <= 100 and h != hours_per_week)
+    return variacoes
+
+def montar_dicas(variacoes):
+    """
+    Escolhe, para cada campo, a alternativa que mais aumenta a probabilidade
+    de renda alta e a descreve como dica, da maior para a menor melhora.
+    """
+    nomes = {
+        campo: (rotulo, {codigo: nome for nome, codigo in reversed(list(mapa.items()))})
+        for campo, (rotulo, mapa) in campos_acionaveis.items()
+    }
+    melhores = {}
+    for variacao in variacoes:
+        campo, valor = next(iter(variacao["changes"].items()))
+        if campo not in melhores or variacao["delta"] > melhores[campo][1]:
+            melhores[campo] = (valor, variacao["delta"])
+    
+    dicas = []
+    for campo, (valor, delta) in sorted(melhores.items(), key=lambda item: -item[1][1]):
+        ganho = delta * 100
+        if ganho < GANHO_MINIMO_DICA:
+            continue
+        if campo == "hours_per_week":
+            descricao = f"Trabalhar {valor} horas por semana"
+        else:
+            rotulo, nomes_campo = nomes[campo]
+            descricao = f"{rotulo}: {nomes_campo[valor]}"
+        dicas.append(f"{descricao} (+{ganho:.1f} p.p.)")
+    return dicas
+
 col_form, col_results = st.columns([5, 4], gap="medium")
 
 with col_form:
@@ -283,11 +331,15 @@ with col_results:
                 
                 try:
                     with st.spinner("Analisando seus dados..."):
-                        response = requests.post(f"{API_URL}/predict", json=input_data, timeout=30)
+                        response = requests.post(
+                            f"{API_URL}/predict/whatif",
+                            json={"record": input_data, "variations": montar_variacoes(hours_per_week)},
+                            timeout=30
+                        )
                     
                     if response.status_code == 200:
                         result = response.json()
-                        prob_high = result["probability_>50K"] * 100
+                        prob_high = result["baseline"]["probability_>50K"] * 100
                         
                         if prob_high >= 70:
                             potential = "Alto"
@@ -313,29 +365,32 @@ with col_results:
                         """, unsafe_allow_html=True)
                         
                         st.markdown("### 💡 Dicas")
-                        st.markdown("Para melhorar ainda mais:")
-                        
-                        if prob_high < 40:
-                            dicas = [
-                                "Invista em educação continuada",
-                                "Busque certificações profissionais",
-                                "Desenvolva habilidades técnicas específicas",
-                                "Explore oportunidades de networking"
-                            ]
-                        elif prob_high < 70:
-                            dicas = [
-                                "Busque certificações profissionais",
-                                "Desenvolva habilidades de liderança",
-                                "Considere empreender na sua área",
-                                "Amplie sua rede de contatos profissionais"
-                            ]
+                        dicas = montar_dicas(result["variations"])
+                        if dicas:
+                            st.markdown("Mudanças que mais aumentariam sua chance, segundo o modelo:")
                         else:
-                            dicas = [
-                                "Mantenha-se atualizado com tendências do mercado",
-                                "Desenvolva sua rede de contatos",
-                                "Considere mentorar outros profissionais",
-                                "Explore oportunidades de investimento"
-                            ]
+                            st.markdown("Para melhorar ainda mais:")
+                            if prob_high < 40:
+                                dicas = [
+                                    "Invista em educação continuada",
+                                    "Busque certificações profissionais",
+                                    "Desenvolva habilidades técnicas específicas",
+                                    "Explore oportunidades de networking"
+                                ]
+                            elif prob_high < 70:
+                                dicas = [
+                                    "Busque certificações profissionais",
+                                    "Desenvolva habilidades de liderança",
+                                    "Considere empreender na sua área",
+                                    "Amplie sua rede de contatos profissionais"
+                                ]
+                            else:
+                                dicas = [
+                                    "Mantenha-se atualizado com tendências do mercado",
+                                    "Desenvolva sua rede de contatos",
+                                    "Considere mentorar outros profissionais",
+                                    "Explore oportunidades de investimento"
+                                ]
                         
                         for dica in dicas:
                             st.markdown(f"- {dica}")
@@ -0,0 +1,99 @@
+"""
+Medição do pico de memória (RSS) de um trecho de código, a partir de /proc (Linux).
+
+O pico do processo (VmHWM) não é alterado: zerá-lo afetaria qualquer outra
+medição do processo. Se o trecho eleva o VmHWM, o valor lido no fim é o
+pico dele; senão, o pico é o maior RSS amostrado por uma thread durante o
+trecho.
+"""
+
+import os
+import resource
+import threading
+from typing import Dict, Optional
+
+def ler_memoria_processo() -> Dict[str, int]:
+    """
+    Returns:
+        Dicionário com 'rss' (atual) e 'pico' (VmHWM), em bytes; usa
+        `getrusage` para o pico se /proc não estiver disponível
+    """
+    try:
+        with open("/proc/self/status") as f:
+            campos = dict(linha.split(":", 1) for linha in f if ":" in linha)
+        return {
+            "rss": int(campos["VmRSS"].split()[0]) * 1024,
+            "pico": int(campos["VmHWM"].split()[0]) * 1024
+        }
+    except (OSError, KeyError):
+        pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+        return {"rss": pico, "pico": pico}
+
+def ler_rss() -> Optional[int]:
+    """RSS atual em bytes, lido de /proc/self/statm; None se indisponível."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+class MedidorPicoMemoria:
+    """
+    Mede o pico de RSS de um bloco `with`.
+
+    Exemplo:
+        with MedidorPicoMemoria() as medidor:
+            processar()
+        logger.info(f"Pico: {medidor.pico_bytes / 2 ** 20:.0f} MB")
+    """
+
+    def __init__(self, intervalo_segundos: float = 0.002):
+        """
+        Args:
+            intervalo_segundos: Intervalo da amostragem do RSS durante o bloco
+        """
+        self.intervalo_segundos = intervalo_segundos
+        self.rss_inicial: Optional[int] = None
+        self.pico_bytes: Optional[int] = None
+        # True se o bloco elevou o VmHWM, e então o pico é exato
+        self.pico_exato = False
+        self._pico_processo_inicial = 0
+        self._pico_amostrado = 0
+        self._parar = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _amostrar(self):
+        while not self._parar.wait(self.intervalo_segundos):
+            rss = ler_rss()
+            if rss is not None and rss > self._pico_amostrado:
+                self._pico_amostrado = rss
+
+    def __enter__(self) -> "MedidorPicoMemoria":
+        inicial = ler_memoria_processo()
+        self.rss_inicial = inicial["rss"]
+        self._pico_processo_inicial = inicial["pico"]
+        self._pico_amostrado = self.rss_inicial
+        self._parar.clear()
+        self._thread = threading.Thread(target=self._amostrar, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *excecao):
+        self._parar.set()
+        self._thread.join()
+        final = ler_memoria_processo()
+        self.pico_exato = final["pico"] > self._pico_processo_inicial
+        self.pico_bytes = final["pico"] if self.pico_exato else max(self._pico_amostrado, final["rss"])
+        return False
+
+    @property
+    def acrescimo_bytes(self) -> Optional[int]:
+        """Quanto o pico passou do RSS do início do bloco."""
+        if self.pico_bytes is None:
+            return None
+        return max(self.pico_bytes - self.rss_inicial, 0)
+
+    def formatar(self) -> str:
+        """Resumo de uma linha para os logs."""
+        texto = f"pico de RSS {self.pico_bytes / 2 ** 20:.0f} MB (+{self.acrescimo_bytes / 2 ** 20:.0f} MB)"
+        return texto if self.pico_exato else f"{texto}, amostrado"
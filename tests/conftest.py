@@ -0,0 +1,139 @@
+"""
+Fixtures compartilhadas pelos testes: pipeline ajustado sobre dados
+sintéticos no formato do Adult, sem depender dos artefatos de `data/` e
+`models/` gerados pelo treino.
+"""
+
+import os
+import joblib
+import numpy as np
+import pytest
+import pandas as pd
+from typing import Dict
+from sklearn.linear_model import LogisticRegression
+from src.data.especificacao_features import ANOS_ESTUDO
+from src.data.feature_engineering import engenharia_features
+from src.data.preprocessamento import preprocessar_dados
+from src.data.processar_dados import COLUNAS_NUMERICAS, COLUNAS_CATEGORICAS, ESTRATEGIA_NULOS
+from src.data.tipos import compactar_tipos
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def gerar_adult(n: int, seed: int) -> pd.DataFrame:
+    """
+    Registros brutos no formato do Adult, com as categorias dos encoders de
+    `data/transformadores.joblib` e valores ausentes em `workclass`,
+    `occupation` e `native-country`.
+    """
+    rng = np.random.default_rng(seed)
+    encoders = joblib.load(os.path.join(RAIZ, 'data', 'transformadores.joblib'))['encoders']
+
+    def sortear(coluna: str) -> np.ndarray:
+        categorias = [str(c) for c in encoders[coluna].classes_ if c not in ('?', 'MISSING')]
+        return rng.choice(np.array(categorias, dtype=object), size=n)
+
+    education = sortear('education')
+    X = pd.DataFrame({
+        'age': np.clip(rng.gamma(4.0, 5.5, n) + 17, 17, 90).astype(np.int64),
+        'workclass': sortear('workclass'),
+        'fnlwgt': np.clip(rng.lognormal(12.0, 0.5, n), 12285, 1490400).astype(np.int64),
+        'education': education,
+        'education-num': pd.Series(education).map(ANOS_ESTUDO).to_numpy(np.int64),
+        'marital-status': sortear('marital-status'),
+        'occupation': sortear('occupation'),
+        'relationship': sortear('relationship'),
+        'race': sortear('race'),
+        'sex': sortear('sex'),
+        'capital-gain': np.where(rng.random(n) < 0.08, rng.lognormal(8.5, 1.2, n), 0).astype(np.int64),
+        'capital-loss': np.where(rng.random(n) < 0.05, rng.normal(1900, 350, n), 0).clip(0).astype(np.int64),
+        'hours-per-week': np.clip(rng.normal(40, 12, n), 1, 99).astype(np.int64),
+        'native-country': sortear('native-country')
+    })
+    for coluna in ['workclass', 'occupation', 'native-country']:
+        X.loc[rng.random(n) < 0.02, coluna] = np.nan
+    return X
+
+@pytest.fixture(scope='session')
+def dados_adult():
+    """Registros brutos sintéticos e target ligado à escolaridade e às horas trabalhadas."""
+    X = gerar_adult(5000, seed=7)
+    renda_alta = (X['education-num'] >= 13) | (X['hours-per-week'] >= 50)
+    y = pd.DataFrame({'income': np.where(renda_alta, '>50K', '<=50K')})
+    return X, y
+
+@pytest.fixture(scope='session')
+def dados_processados(dados_adult):
+    """Features sintéticas pré-processadas, target e transformadores do pré-processamento."""
+    X, y = dados_adult
+    X_processado, preprocessamento = preprocessar_dados(
+        compactar_tipos(X), COLUNAS_NUMERICAS, COLUNAS_CATEGORICAS, ESTRATEGIA_NULOS
+    )
+    return X_processado, y, preprocessamento
+
+@pytest.fixture(scope='session')
+def features(dados_processados):
+    """Features selecionadas, alvo binário e transformadores do feature engineering."""
+    X, y, preprocessamento = dados_processados
+    X_features, transformadores = engenharia_features(
+        X, y, COLUNAS_NUMERICAS, COLUNAS_CATEGORICAS, preprocessamento=preprocessamento
+    )
+    alvo = (y['income'] == '>50K').astype(int).to_numpy()
+    return X_features, alvo, transformadores
+
+@pytest.fixture(scope='session')
+def api(features, tmp_path_factory):
+    """
+    Módulo `src.api.api` importado em um diretório com um modelo e os
+    transformadores ajustados sobre os dados sintéticos (a importação
+    carrega `models/melhor_modelo.joblib`).
+    """
+    X_features, alvo, transformadores = features
+    diretorio = tmp_path_factory.mktemp('artefatos')
+    os.makedirs(diretorio / 'models')
+    os.makedirs(diretorio / 'data')
+    joblib.dump(LogisticRegression(max_iter=1000).fit(X_features, alvo), diretorio / 'models' / 'melhor_modelo.joblib')
+    joblib.dump(transformadores, diretorio / 'data' / 'transformadores_features.joblib')
+
+    anterior = os.getcwd()
+    os.chdir(diretorio)
+    try:
+        from src.api import api as modulo
+        yield modulo
+    finally:
+        os.chdir(anterior)
+
+def gerar_entradas(n: int, seed: int) -> Dict[str, np.ndarray]:
+    """
+    Campos brutos da API (nomes de InputData -> array), incluindo idades,
+    horas e códigos fora das faixas vistas no treino.
+    """
+    rng = np.random.default_rng(seed)
+    return {
+        'age': rng.integers(-5, 121, n),
+        'workclass': rng.integers(-1, 11, n),
+        'education': rng.integers(-2, 19, n),
+        'marital_status': rng.integers(-1, 9, n),
+        'occupation': rng.integers(-1, 17, n),
+        'relationship': rng.integers(-1, 8, n),
+        'race': rng.integers(-1, 7, n),
+        'sex': rng.integers(-1, 4, n),
+        'capital_gain': rng.choice([0, 0, 0, 594, 2174, 99999], n),
+        'capital_loss': rng.choice([0, 0, 0, 1902, 4356], n),
+        'hours_per_week': rng.integers(0, 200, n),
+        'native_country': rng.integers(-1, 45, n)
+    }
+
+@pytest.fixture(scope='session')
+def entradas():
+    """Gerador `entradas(n, seed)` de colunas brutas da API (ver `gerar_entradas`)."""
+    return gerar_entradas
+
+@pytest.fixture(scope='session')
+def registros():
+    """Registros brutos no formato JSON da API, com os aliases de InputData."""
+    colunas = gerar_entradas(500, seed=11)
+    aliases = {'marital_status': 'marital-status', 'native_country': 'native-country'}
+    return [
+        {aliases.get(campo, campo): int(valores[i]) for campo, valores in colunas.items()}
+        for i in range(500)
+    ]
@@ -0,0 +1,66 @@
+"""
+Lotes Arrow IPC em `/predict/batch`: paridade com o lote JSON, limite de
+linhas e pontuação linha a linha quando a passada vetorizada falha.
+"""
+
+import numpy as np
+import pyarrow as pa
+import pytest
+
+def stream_arrow(registros, tamanho_batch=None):
+    """Serializa registros (dicionários com os aliases) como stream Arrow IPC."""
+    tabela = pa.Table.from_pylist(registros)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, tabela.schema) as writer:
+        for batch in tabela.to_batches(max_chunksize=tamanho_batch):
+            writer.write_batch(batch)
+    return sink.getvalue().to_pybytes()
+
+def ler_resposta(corpo):
+    tabela = pa.ipc.open_stream(pa.py_buffer(corpo)).read_all()
+    return tabela.to_pylist(), tabela.schema.metadata
+
+def test_arrow_igual_ao_lote_json(api, registros):
+    registros = [dict(registro) for registro in registros[:50]]
+    registros[3]['age'] = None
+
+    resultados, metadados = ler_resposta(api.processar_lote_arrow(stream_arrow(registros, 16)))
+    esperado = api.processar_lote(registros)['results']
+
+    assert metadados[b'failed'] == b'1' and metadados[b'succeeded'] == b'49'
+    assert 'age' in resultados[3]['error']
+    for resultado, referencia in zip(resultados, esperado):
+        if 'error' in referencia:
+            assert resultado['prediction'] is None
+            continue
+        assert resultado['prediction'] == referencia['prediction']
+        assert resultado['probability_>50K'] == referencia['probability_>50K']
+
+def test_limite_verificado_antes_da_validacao(api, registros, monkeypatch):
+    monkeypatch.setattr(api, 'MAX_REGISTROS_LOTE_ARROW', 10)
+    # Sem a coluna 'age': a validação das colunas recusaria o lote com 422
+    incompletos = [{campo: valor for campo, valor in registro.items() if campo != 'age'} for registro in registros[:16]]
+
+    with pytest.raises(api.LoteGrandeError):
+        api.processar_lote_arrow(stream_arrow(incompletos, 8))
+
+def test_falha_vetorizada_pontua_linha_a_linha(api, registros, monkeypatch):
+    transformar_colunas = api.transformar_colunas
+
+    def transformar_com_falha(colunas, artefatos):
+        if np.any(colunas['age'] == 999):
+            raise ValueError("idade inválida")
+        return transformar_colunas(colunas, artefatos)
+
+    monkeypatch.setattr(api, 'transformar_colunas', transformar_com_falha)
+    registros = [dict(registro) for registro in registros[:10]]
+    registros[2]['age'] = 999
+    registros[5]['sex'] = None
+
+    resultados, metadados = ler_resposta(api.processar_lote_arrow(stream_arrow(registros)))
+
+    assert metadados[b'succeeded'] == b'8' and metadados[b'failed'] == b'2'
+    assert resultados[2]['error'] == "idade inválida"
+    assert 'sex' in resultados[5]['error']
+    assert all(resultado['error'] is None for i, resultado in enumerate(resultados) if i not in (2, 5))
+    assert [resultado['index'] for resultado in resultados] == list(range(10))
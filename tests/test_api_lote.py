@@ -0,0 +1,70 @@
+"""
+Lotes JSON em `/predict/batch`: erros por linha, paridade com `/predict` e
+pontuação linha a linha quando a passada vetorizada falha.
+"""
+
+import asyncio
+import httpx
+import numpy as np
+import pytest
+
+def enviar(app, caminho, corpo):
+    async def requisicao():
+        transporte = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transporte, base_url='http://teste') as cliente:
+            return await cliente.post(caminho, json=corpo)
+
+    return asyncio.run(requisicao())
+
+def test_lote_igual_a_previsoes_individuais(api, registros):
+    lote = [dict(registro) for registro in registros[:20]]
+    del lote[4]['age']
+    lote[9]['sex'] = 'masculino'
+
+    resposta = enviar(api.app, '/predict/batch', lote)
+    corpo = resposta.json()
+
+    assert resposta.status_code == 200
+    assert (corpo['total'], corpo['succeeded'], corpo['failed']) == (20, 18, 2)
+    assert [resultado['index'] for resultado in corpo['results']] == list(range(20))
+    assert 'age' in corpo['results'][4]['error']
+    assert 'sex' in corpo['results'][9]['error']
+    for i in [i for i in range(20) if i not in (4, 9)]:
+        individual = enviar(api.app, '/predict', lote[i]).json()
+        resultado = corpo['results'][i]
+        assert resultado['prediction'] == individual['prediction']
+        assert resultado['probability_>50K'] == pytest.approx(individual['probability_>50K'], rel=1e-12)
+
+def test_falha_vetorizada_pontua_linha_a_linha(api, registros, monkeypatch):
+    transformar_colunas = api.transformar_colunas
+
+    def transformar_com_falha(colunas, artefatos):
+        if np.any(colunas['age'] == 999):
+            raise ValueError("idade inválida")
+        return transformar_colunas(colunas, artefatos)
+
+    monkeypatch.setattr(api, 'transformar_colunas', transformar_com_falha)
+    lote = [dict(registro) for registro in registros[:10]]
+    lote[6]['age'] = 999
+
+    # Com os artefatos explícitos, o lote não passa pelo cache
+    corpo = api.processar_lote(lote, api.gerenciador_modelo.atual)
+    esperado = api.processar_lote(lote[:6] + lote[7:], api.gerenciador_modelo.atual)['results']
+
+    assert (corpo['succeeded'], corpo['failed']) == (9, 1)
+    assert corpo['results'][6] == {'index': 6, 'error': "idade inválida"}
+    for resultado, referencia in zip(corpo['results'][:6] + corpo['results'][7:], esperado):
+        assert resultado['prediction'] == referencia['prediction']
+        assert resultado['probability_>50K'] == pytest.approx(referencia['probability_>50K'], rel=1e-12)
+
+def test_lote_acima_do_limite_responde_413(api, registros, monkeypatch):
+    monkeypatch.setattr(api, 'MAX_REGISTROS_LOTE', 5)
+
+    resposta = enviar(api.app, '/predict/batch', registros[:6])
+
+    assert resposta.status_code == 413
+
+def test_corpo_que_nao_e_lista_responde_422(api, registros):
+    resposta = enviar(api.app, '/predict/batch', registros[0])
+
+    assert resposta.status_code == 422
@@ -0,0 +1,86 @@
+"""
+Pontuação em streaming (`/predict/stream`): paridade com o lote JSON e a
+resposta `RespostaStreaming`.
+"""
+
+import asyncio
+import json
+import httpx
+import pytest
+from starlette.background import BackgroundTask
+from src.api.streaming import RespostaStreaming
+
+def assert_mesmo_resultado(resultados, esperado):
+    # Blocos de tamanhos diferentes mudam a ordem das somas do modelo: as
+    # probabilidades podem diferir no último bit
+    assert len(resultados) == len(esperado)
+    for resultado, referencia in zip(resultados, esperado):
+        assert resultado.keys() == referencia.keys()
+        for chave, valor in referencia.items():
+            if chave.startswith('probability_'):
+                assert resultado[chave] == pytest.approx(valor, rel=1e-12)
+            else:
+                assert resultado[chave] == valor
+
+def enviar(app, caminho, corpo, tipo):
+    async def requisicao():
+        async def partes():
+            # Corpo em pedaços que cortam as linhas no meio
+            for inicio in range(0, len(corpo), 1000):
+                yield corpo[inicio:inicio + 1000]
+
+        transporte = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transporte, base_url='http://teste') as cliente:
+            return await cliente.post(caminho, content=partes(), headers={'content-type': tipo})
+
+    return asyncio.run(requisicao())
+
+def test_ndjson_igual_ao_lote_json(api, registros, monkeypatch):
+    monkeypatch.setattr(api, 'STREAM_TAMANHO_BLOCO', 16)
+    linhas = [json.dumps(registro) for registro in registros[:60]]
+    linhas[7] = '{"age": '
+    corpo = ('\n'.join(linhas) + '\n').encode()
+
+    resposta = enviar(api.app, '/predict/stream', corpo, 'application/x-ndjson')
+    resultados = [json.loads(linha) for linha in resposta.text.splitlines()]
+    esperado = api.processar_lote(registros[:60])['results']
+
+    assert resposta.status_code == 200
+    assert 'content-length' not in resposta.headers
+    assert resposta.headers['content-type'] == 'application/x-ndjson'
+    assert [resultado['index'] for resultado in resultados] == list(range(60))
+    assert 'error' in resultados[7]
+    assert_mesmo_resultado(resultados[:7] + resultados[8:], esperado[:7] + esperado[8:])
+
+def test_csv_igual_ao_lote_json(api, registros):
+    campos = list(registros[0])
+    corpo = '\n'.join([','.join(campos)] + [
+        ','.join(str(registro[campo]) for campo in campos) for registro in registros[:40]
+    ]).encode()
+
+    resposta = enviar(api.app, '/predict/stream', corpo, 'text/csv')
+    resultados = [json.loads(linha) for linha in resposta.text.splitlines()]
+
+    assert_mesmo_resultado(resultados, api.processar_lote(registros[:40])['results'])
+
+def test_resposta_streaming_cabecalhos_e_tarefa_de_fundo():
+    executadas = []
+
+    async def processar(partes):
+        async for parte in partes:
+            yield parte.upper()
+
+    async def app(scope, receive, send):
+        resposta = RespostaStreaming(
+            processar, headers={'x-teste': '1'}, media_type='text/plain',
+            background=BackgroundTask(executadas.append, 'fim')
+        )
+        await resposta(scope, receive, send)
+
+    resposta = enviar(app, '/', b'abc\n' * 600, 'text/plain')
+
+    assert resposta.text == 'ABC\n' * 600
+    assert resposta.headers['x-teste'] == '1'
+    assert resposta.headers['content-type'].startswith('text/plain')
+    assert 'content-length' not in resposta.headers
+    assert executadas == ['fim']
@@ -0,0 +1,66 @@
+"""
+Cache LRU de previsões (`CachePrevisoes`) e sua integração com a pontuação
+em lote da API.
+"""
+
+import pytest
+from src.api import cache as modulo_cache
+from src.api.cache import CachePrevisoes
+
+def test_remove_a_entrada_menos_usada():
+    cache = CachePrevisoes(max_entradas=2)
+    cache.guardar('a', 1)
+    cache.guardar('b', 2)
+    assert cache.obter('a') == 1
+
+    cache.guardar('c', 3)
+
+    assert cache.obter('b') is None
+    assert cache.obter('a') == 1 and cache.obter('c') == 3
+    assert cache.remocoes == 1 and len(cache) == 2
+
+def test_entrada_expira_apos_o_ttl(monkeypatch):
+    agora = [100.0]
+    monkeypatch.setattr(modulo_cache.time, 'monotonic', lambda: agora[0])
+    cache = CachePrevisoes(ttl_segundos=10)
+    cache.guardar('a', 1)
+
+    agora[0] = 109.9
+    assert cache.obter('a') == 1
+    agora[0] = 110.0
+    assert cache.obter('a') is None
+    assert cache.expiracoes == 1 and len(cache) == 0
+
+def test_troca_de_versao_invalida_e_descarta_valores_antigos():
+    cache = CachePrevisoes()
+    cache.definir_versao('v1')
+    cache.guardar('a', 1, 'v1')
+
+    cache.definir_versao('v2')
+    # Resultado calculado com a versão anterior, concluído depois da troca
+    cache.guardar('b', 2, 'v1')
+
+    assert cache.obter('a') is None and cache.obter('b') is None
+    assert cache.invalidacoes == 1
+
+def test_lote_pontua_apenas_registros_fora_do_cache(api, registros, monkeypatch):
+    validos = [api.InputData.model_validate(registro) for registro in registros[100:110]]
+    api.cache_previsoes.invalidar()
+    api.prever_registros_com_cache(validos[:4])
+
+    pontuados = []
+    prever_registros = api.prever_registros
+
+    def prever_registrando(lote, artefatos=None):
+        pontuados.append(len(lote))
+        return prever_registros(lote, artefatos)
+
+    monkeypatch.setattr(api, 'prever_registros', prever_registrando)
+    resultados = api.prever_registros_com_cache(validos)
+
+    assert pontuados == [6]
+    for resultado, referencia in zip(resultados, prever_registros(validos)):
+        assert resultado['prediction'] == referencia['prediction']
+        assert resultado['probability_>50K'] == pytest.approx(referencia['probability_>50K'], rel=1e-12)
+    assert api.prever_registros_com_cache(validos) == resultados
+    assert pontuados == [6]
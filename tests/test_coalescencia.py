@@ -0,0 +1,110 @@
+"""
+Coalescência de previsões idênticas em andamento (`CoalescedorPrevisoes`).
+"""
+
+import asyncio
+import time
+import httpx
+import pytest
+from src.api.coalescencia import CoalescedorPrevisoes
+
+def test_requisicoes_identicas_compartilham_uma_computacao():
+    async def cenario():
+        coalescedor = CoalescedorPrevisoes()
+        liberar = asyncio.Event()
+        chamadas = []
+
+        async def calcular(valor):
+            chamadas.append(valor)
+            await liberar.wait()
+            return {'valor': valor}
+
+        requisicoes = [
+            asyncio.ensure_future(coalescedor.executar(chave, lambda chave=chave: calcular(chave)))
+            for chave in ['a', 'a', 'b', 'a']
+        ]
+        await asyncio.sleep(0)
+        em_andamento = coalescedor.estatisticas()['in_flight']
+        liberar.set()
+        return await asyncio.gather(*requisicoes), chamadas, em_andamento, coalescedor.estatisticas()
+
+    resultados, chamadas, em_andamento, estatisticas = asyncio.run(cenario())
+    assert resultados == [{'valor': 'a'}, {'valor': 'a'}, {'valor': 'b'}, {'valor': 'a'}]
+    assert sorted(chamadas) == ['a', 'b']
+    assert em_andamento == 2 and estatisticas['in_flight'] == 0
+    assert (estatisticas['computations'], estatisticas['coalesced']) == (2, 2)
+
+def test_excecao_e_propagada_a_todas_as_requisicoes():
+    async def cenario():
+        coalescedor = CoalescedorPrevisoes()
+
+        async def calcular():
+            await asyncio.sleep(0)
+            raise ValueError("falhou")
+
+        return await asyncio.gather(
+            coalescedor.executar('a', calcular), coalescedor.executar('a', calcular),
+            return_exceptions=True
+        )
+
+    resultados = asyncio.run(cenario())
+    assert all(isinstance(resultado, ValueError) for resultado in resultados)
+
+def test_cancelar_uma_requisicao_nao_afeta_as_demais():
+    async def cenario():
+        coalescedor = CoalescedorPrevisoes()
+        liberar = asyncio.Event()
+
+        async def calcular():
+            await liberar.wait()
+            return 1
+
+        primeira = asyncio.ensure_future(coalescedor.executar('a', calcular))
+        segunda = asyncio.ensure_future(coalescedor.executar('a', calcular))
+        await asyncio.sleep(0)
+        primeira.cancel()
+        await asyncio.sleep(0)
+        liberar.set()
+        with pytest.raises(asyncio.CancelledError):
+            await primeira
+        return await segunda
+
+    assert asyncio.run(cenario()) == 1
+
+def test_nova_computacao_depois_da_conclusao():
+    async def cenario():
+        coalescedor = CoalescedorPrevisoes()
+        contador = iter(range(10))
+
+        async def calcular():
+            return next(contador)
+
+        return [await coalescedor.executar('a', calcular) for _ in range(3)]
+
+    assert asyncio.run(cenario()) == [0, 1, 2]
+
+def test_predict_concorrentes_identicos_pontuam_uma_vez(api, registros, monkeypatch):
+    chamadas = []
+    prever_registros = api.prever_registros
+    coalescidas = api.coalescedor_previsoes.coalescidas
+
+    def prever_registrando(lote, artefatos=None):
+        chamadas.append(len(lote))
+        # Pontua só depois que as outras requisições chegaram ao coalescedor
+        limite = time.monotonic() + 5
+        while api.coalescedor_previsoes.coalescidas < coalescidas + 7 and time.monotonic() < limite:
+            time.sleep(0.001)
+        return prever_registros(lote, artefatos)
+
+    monkeypatch.setattr(api, 'prever_registros', prever_registrando)
+    monkeypatch.setattr(api, 'cache_previsoes', None)
+
+    async def cenario():
+        transporte = httpx.ASGITransport(app=api.app)
+        async with httpx.AsyncClient(transport=transporte, base_url='http://teste') as cliente:
+            return await asyncio.gather(*(cliente.post('/predict', json=registros[200]) for _ in range(8)))
+
+    respostas = asyncio.run(cenario())
+    assert all(resposta.status_code == 200 for resposta in respostas)
+    assert len({resposta.text for resposta in respostas}) == 1
+    assert chamadas == [1]
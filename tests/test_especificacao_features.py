@@ -0,0 +1,67 @@
+"""
+Paridade entre treino e API da especificação de features: a entrada do
+modelo é idêntica, bit a bit, no treino (denso e esparso), no treino em
+blocos (`aplicar_features_em_blocos`) e na API, a partir dos campos brutos
+de `InputData`, em um único lote e em lotes do tamanho dos da fila de
+micro-batch. Os dois modos de tipos do pré-processamento são cobertos
+(compactos em float32 e float64).
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import sparse
+from src.api.transformador import construir_transformador
+from src.data.feature_engineering import aplicar_features_em_blocos, engenharia_features
+from src.data.preprocessamento import preprocessar_dados
+from src.data.processar_dados import COLUNAS_NUMERICAS, COLUNAS_CATEGORICAS, ESTRATEGIA_NULOS
+from src.data.tipos import compactar_tipos
+
+TAMANHO_BLOCO = 700
+TAMANHO_LOTE_API = 64
+
+def campos_api(X_bruto, X_processado):
+    """Numéricas brutas e códigos das categóricas, com os nomes de campo de `InputData`."""
+    numericas = ['age', 'capital-gain', 'capital-loss', 'hours-per-week']
+    categoricas = [c for c in COLUNAS_CATEGORICAS if c in X_processado.columns]
+    campos = {c.replace('-', '_'): X_bruto[c].to_numpy(dtype=np.int64) for c in numericas}
+    campos.update({c.replace('-', '_'): X_processado[c].to_numpy(dtype=np.int64) for c in categoricas})
+    return campos
+
+def densa(X):
+    if sparse.issparse(X):
+        return X.toarray().astype(np.float64)
+    return X.to_numpy(dtype=np.float64)
+
+@pytest.fixture(scope='module', params=[True, False], ids=['compactos', 'padrao'])
+def processados(request, dados_adult):
+    X, y = dados_adult
+    X_processado, preprocessamento = preprocessar_dados(
+        compactar_tipos(X) if request.param else X.copy(),
+        COLUNAS_NUMERICAS, COLUNAS_CATEGORICAS, ESTRATEGIA_NULOS
+    )
+    return X, X_processado, y, preprocessamento
+
+@pytest.mark.parametrize('esparsa', [False, True])
+def test_treino_blocos_e_api_iguais(processados, esparsa):
+    X_bruto, X_processado, y, preprocessamento = processados
+    n = len(X_processado)
+    treino, transformadores = engenharia_features(
+        X_processado, y, COLUNAS_NUMERICAS, COLUNAS_CATEGORICAS,
+        esparsa=esparsa, preprocessamento=preprocessamento
+    )
+    referencia = densa(treino)
+
+    blocos = (X_processado.iloc[i:i + TAMANHO_BLOCO] for i in range(0, n, TAMANHO_BLOCO))
+    partes = list(aplicar_features_em_blocos(blocos, transformadores))
+    np.testing.assert_array_equal(densa(sparse.vstack(partes) if esparsa else pd.concat(partes)), referencia)
+
+    transformador = construir_transformador(transformadores)
+    campos = campos_api(X_bruto, X_processado)
+    np.testing.assert_array_equal(transformador.transformar(campos), referencia)
+
+    lotes = [
+        transformador.transformar({c: v[i:i + TAMANHO_LOTE_API] for c, v in campos.items()})
+        for i in range(0, n, TAMANHO_LOTE_API)
+    ]
+    np.testing.assert_array_equal(np.vstack(lotes), referencia)
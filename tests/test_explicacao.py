@@ -0,0 +1,64 @@
+"""
+Explicações por feature (`ExplicadorModelo`): o valor base somado às
+contribuições reproduz a margem (log-odds) do modelo.
+"""
+
+import asyncio
+import httpx
+import numpy as np
+import pytest
+import xgboost as xgb
+from sklearn.linear_model import LogisticRegression
+from sklearn.tree import DecisionTreeClassifier
+from src.api.explicacao import ExplicadorModelo
+
+@pytest.fixture(scope='module')
+def matriz(features):
+    X_features, alvo, _ = features
+    return np.asarray(X_features, dtype=np.float64), alvo, list(X_features.columns)
+
+def test_soma_igual_a_margem_do_xgboost(matriz):
+    X, alvo, nomes = matriz
+    model = xgb.XGBClassifier(n_estimators=50, max_depth=4, n_jobs=1).fit(X, alvo)
+
+    contribuicoes, base = ExplicadorModelo(model, nomes).contribuicoes(X)
+    margem = model.get_booster().predict(xgb.DMatrix(X), output_margin=True)
+
+    assert contribuicoes.shape == X.shape
+    # Contribuições e margem são acumuladas em float32, em ordens diferentes
+    np.testing.assert_allclose(base + contribuicoes.sum(axis=1, dtype=np.float64), margem, rtol=0, atol=1e-4)
+
+def test_soma_igual_a_margem_da_regressao_logistica(matriz):
+    X, alvo, nomes = matriz
+    model = LogisticRegression(max_iter=1000).fit(X, alvo)
+
+    explicacoes = ExplicadorModelo(model, nomes).explicar(X[:50])
+    soma = [explicacao['base_value'] + sum(explicacao['contributions'].values()) for explicacao in explicacoes]
+
+    assert list(explicacoes[0]['contributions']) == nomes
+    np.testing.assert_allclose(soma, model.decision_function(X[:50]), rtol=0, atol=1e-9)
+
+def test_modelo_sem_suporte(matriz):
+    X, alvo, nomes = matriz
+
+    with pytest.raises(ValueError, match='DecisionTreeClassifier'):
+        ExplicadorModelo(DecisionTreeClassifier(max_depth=2).fit(X, alvo), nomes)
+
+def test_explicacao_da_api_reproduz_a_probabilidade(api, registros):
+    async def requisicao():
+        transporte = httpx.ASGITransport(app=api.app)
+        async with httpx.AsyncClient(transport=transporte, base_url='http://teste') as cliente:
+            individual = await cliente.post('/predict', params={'explain': 'true'}, json=registros[400])
+            lote = await cliente.post(
+                '/predict/batch', params={'explain': 'true'}, json=[registros[400], {'age': 1}]
+            )
+            return individual.json(), lote.json()
+
+    individual, lote = asyncio.run(requisicao())
+    explicacao = individual['explanation']
+    logit = explicacao['base_value'] + sum(explicacao['contributions'].values())
+
+    assert 1 / (1 + np.exp(-logit)) == pytest.approx(individual['probability_>50K'], rel=1e-9)
+    assert list(explicacao['contributions']) == api.gerenciador_modelo.atual.transformador.colunas_saida
+    assert lote['results'][0]['explanation']['contributions'] == pytest.approx(explicacao['contributions'])
+    assert 'explanation' not in lote['results'][1]
@@ -0,0 +1,41 @@
+"""
+Plano de features (`registrar_plano_features`): gerar só as features
+mantidas pelo seletor produz as mesmas colunas que o pipeline completo,
+denso e esparso, e a mesma entrada para o modelo na API.
+"""
+
+import numpy as np
+import pandas as pd
+from src.api.transformador import construir_transformador
+from src.data.feature_engineering import engenharia_features
+from src.data.processar_dados import COLUNAS_NUMERICAS, COLUNAS_CATEGORICAS
+
+def test_plano_igual_ao_pipeline_completo(dados_processados, features, entradas):
+    X, y, preprocessamento = dados_processados
+    completo, _, transformadores = features
+
+    do_plano, transformadores_plano = engenharia_features(
+        X, y, COLUNAS_NUMERICAS, COLUNAS_CATEGORICAS,
+        plano=transformadores['plano_features'], preprocessamento=preprocessamento
+    )
+
+    pd.testing.assert_frame_equal(do_plano, completo, check_exact=True)
+    colunas = entradas(5000, seed=3)
+    np.testing.assert_array_equal(
+        construir_transformador(transformadores_plano).transformar(colunas),
+        construir_transformador(transformadores).transformar(colunas)
+    )
+
+def test_plano_esparso_igual_ao_pipeline_completo(dados_processados):
+    X, y, preprocessamento = dados_processados
+    esparso, transformadores = engenharia_features(
+        X, y, COLUNAS_NUMERICAS, COLUNAS_CATEGORICAS, esparsa=True, preprocessamento=preprocessamento
+    )
+
+    esparso_plano, _ = engenharia_features(
+        X, y, COLUNAS_NUMERICAS, COLUNAS_CATEGORICAS, esparsa=True,
+        plano=transformadores['plano_features'], preprocessamento=preprocessamento
+    )
+
+    assert esparso_plano.shape == esparso.shape
+    assert esparso_plano.nnz == esparso.nnz and (esparso_plano != esparso).nnz == 0
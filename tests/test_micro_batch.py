@@ -0,0 +1,63 @@
+"""Encerramento do micro-batcher com chamadas pendentes."""
+
+import asyncio
+from src.api.micro_batch import MicroBatcher, MicroBatcherParadoError
+
+def test_parar_resolve_lote_em_andamento_e_fila():
+    async def cenario():
+        liberar = asyncio.Event()
+
+        async def executar(funcao, itens):
+            await liberar.wait()
+            return funcao(itens)
+
+        batcher = MicroBatcher(lambda itens: itens, max_lote=2, espera_max_ms=0, executar=executar)
+        chamadas = [asyncio.ensure_future(batcher.submeter(i)) for i in range(5)]
+        # Deixa o primeiro lote ser retirado da fila e ficar em pontuação
+        for _ in range(5):
+            await asyncio.sleep(0)
+        assert len(batcher._lote_atual) == 2 and batcher._fila.qsize() == 3
+
+        await batcher.parar()
+        return await asyncio.wait_for(asyncio.gather(*chamadas, return_exceptions=True), 1)
+
+    resultados = asyncio.run(cenario())
+    assert all(isinstance(r, MicroBatcherParadoError) for r in resultados)
+
+def test_pontua_em_lotes():
+    async def cenario():
+        batcher = MicroBatcher(lambda itens: [2 * i for i in itens], max_lote=4)
+        resultados = await asyncio.gather(*(batcher.submeter(i) for i in range(10)))
+        await batcher.parar()
+        return resultados, batcher.lotes
+
+    resultados, lotes = asyncio.run(cenario())
+    assert resultados == [2 * i for i in range(10)]
+    assert lotes >= 3
+
+def test_itens_enfileirados_no_prazo_sao_pontuados():
+    async def cenario():
+        loop = asyncio.get_running_loop()
+        batcher = MicroBatcher(lambda itens: itens, max_lote=64, espera_max_ms=2)
+        chamadas, itens = [], []
+
+        def submeter(i):
+            itens.append(i)
+            chamadas.append(asyncio.ensure_future(batcher.submeter(i)))
+
+        for rodada in range(20):
+            submeter((rodada, -1))
+            await asyncio.sleep(0)
+            # Enche a fila em torno do prazo do lote em coleta
+            for j, atraso in enumerate([0.0018, 0.0019, 0.002, 0.002, 0.0021, 0.0022]):
+                loop.call_later(atraso, submeter, (rodada, j))
+            await asyncio.sleep(0.004)
+
+        await asyncio.sleep(0.01)
+        resultados = await asyncio.wait_for(asyncio.gather(*chamadas), 1)
+        await batcher.parar()
+        return itens, resultados, batcher.itens
+
+    itens, resultados, pontuados = asyncio.run(cenario())
+    assert len(itens) == 140 and pontuados == 140
+    assert resultados == itens
@@ -0,0 +1,90 @@
+"""
+Recarga dos artefatos sem interrupção (`GerenciadorModelo`): troca atômica
+da versão e manutenção da versão anterior quando a nova falha.
+"""
+
+import os
+import joblib
+import pytest
+from sklearn.linear_model import LogisticRegression
+from src.api.modelo import GerenciadorModelo
+
+@pytest.fixture
+def artefatos_em_disco(features, tmp_path):
+    """Caminhos do modelo e dos transformadores e função que troca o modelo."""
+    X_features, alvo, transformadores = features
+    caminho_modelo = str(tmp_path / 'modelo.joblib')
+    caminho_transformadores = str(tmp_path / 'transformadores.joblib')
+    joblib.dump(transformadores, caminho_transformadores)
+
+    def gravar_modelo(C, conteudo=None):
+        if conteudo is None:
+            joblib.dump(LogisticRegression(C=C, max_iter=1000).fit(X_features, alvo), caminho_modelo)
+        else:
+            with open(caminho_modelo, 'wb') as arquivo:
+                arquivo.write(conteudo)
+        # Garante uma nova versão mesmo que a gravação caia no mesmo instante
+        info = os.stat(caminho_modelo)
+        os.utime(caminho_modelo, ns=(info.st_atime_ns, info.st_mtime_ns + 10 ** 9))
+
+    gravar_modelo(1.0)
+    return caminho_modelo, caminho_transformadores, gravar_modelo
+
+def test_sem_mudanca_em_disco_nao_recarrega(artefatos_em_disco):
+    caminho_modelo, caminho_transformadores, _ = artefatos_em_disco
+    gerenciador = GerenciadorModelo(caminho_modelo, caminho_transformadores)
+    versao = gerenciador.inicializar().versao
+
+    assert gerenciador.recarregar() == {'reloaded': False, 'model_version': versao}
+    assert gerenciador.recarregar(forcar=True)['reloaded'] is True
+    assert gerenciador.recargas == 1
+
+def test_recarga_troca_a_versao_sem_alterar_a_anterior(artefatos_em_disco, features):
+    caminho_modelo, caminho_transformadores, gravar_modelo = artefatos_em_disco
+    publicadas = []
+    gerenciador = GerenciadorModelo(caminho_modelo, caminho_transformadores)
+    gerenciador.ao_trocar(publicadas.append)
+    # Versão lida por uma requisição em andamento
+    anterior = gerenciador.inicializar()
+    modelo_anterior = anterior.model
+
+    gravar_modelo(0.01)
+    resultado = gerenciador.recarregar()
+
+    assert resultado['reloaded'] is True
+    assert resultado['previous_version'] == anterior.versao
+    assert resultado['model_version'] == gerenciador.atual.versao != anterior.versao
+    assert publicadas == [anterior, gerenciador.atual]
+    assert anterior.model is modelo_anterior and anterior.model.C == 1.0
+    assert gerenciador.atual.model.C == 0.01
+
+    X = features[0].iloc[:5]
+    assert (gerenciador.atual.model.predict_proba(X) != anterior.model.predict_proba(X)).any()
+
+def test_validacao_com_falha_mantem_a_versao_atual(artefatos_em_disco):
+    caminho_modelo, caminho_transformadores, gravar_modelo = artefatos_em_disco
+
+    def validar(artefatos):
+        if artefatos.model.C != 1.0:
+            raise ValueError("previsão de teste falhou")
+
+    gerenciador = GerenciadorModelo(caminho_modelo, caminho_transformadores, validar=validar)
+    atual = gerenciador.inicializar()
+
+    gravar_modelo(0.01)
+    resultado = gerenciador.recarregar()
+
+    assert resultado == {'reloaded': False, 'model_version': atual.versao, 'error': "previsão de teste falhou"}
+    assert gerenciador.atual is atual
+    assert gerenciador.falhas_recarga == 1
+
+def test_arquivo_corrompido_mantem_a_versao_atual(artefatos_em_disco):
+    caminho_modelo, caminho_transformadores, gravar_modelo = artefatos_em_disco
+    gerenciador = GerenciadorModelo(caminho_modelo, caminho_transformadores)
+    atual = gerenciador.inicializar()
+
+    gravar_modelo(None, conteudo=b'corrompido')
+    resultado = gerenciador.recarregar()
+
+    assert resultado['reloaded'] is False and 'error' in resultado
+    assert gerenciador.atual is atual
@@ -0,0 +1,90 @@
+"""
+Paridade entre o motor de inferência NumPy (`src.api.motor_numpy`) e
+`predict`/`predict_proba` dos modelos de referência.
+
+Para o XGBoost, as margens devem ser idênticas às do booster e a
+probabilidade positiva fica a no máximo 2 ulp de float32 (a sigmoide do
+XGBoost usa a expf da libm, que nem sempre é corretamente arredondada, e o
+erro de 1 ulp na exponencial pode virar 2 ulp no quociente); para a
+regressão logística, as probabilidades devem ser idênticas.
+"""
+
+import numpy as np
+import pytest
+import xgboost as xgb
+from sklearn.linear_model import LogisticRegression
+from src.api.motor_numpy import construir_motor, MotorArvores, MotorLinear
+
+def com_ausentes(X: np.ndarray, proporcao: float = 0.1, seed: int = 1) -> np.ndarray:
+    """Cópia de X com uma fração de valores substituída por NaN."""
+    X = X.copy()
+    X[np.random.default_rng(seed).random(X.shape) < proporcao] = np.nan
+    return X
+
+@pytest.fixture(scope='module')
+def matriz(features):
+    X_features, alvo, _ = features
+    return np.asarray(X_features, dtype=np.float64), alvo
+
+@pytest.fixture(scope='module')
+def xgboost(matriz):
+    X, alvo = matriz
+    return xgb.XGBClassifier(n_estimators=50, max_depth=4, n_jobs=1).fit(X, alvo)
+
+@pytest.fixture(scope='module')
+def logistica(matriz):
+    X, alvo = matriz
+    return LogisticRegression(max_iter=1000).fit(X, alvo)
+
+@pytest.mark.parametrize('ausentes', [False, True])
+@pytest.mark.parametrize('caminho', ['numpy', 'inplace_predict'])
+def test_motor_arvores_igual_ao_xgboost(matriz, xgboost, caminho, ausentes):
+    X = com_ausentes(matriz[0]) if ausentes else matriz[0]
+    # limite_linhas=len(X) força a descida em NumPy; 1 força inplace_predict
+    motor = construir_motor(xgboost, len(X) if caminho == 'numpy' else 1)
+    assert isinstance(motor, MotorArvores)
+
+    predicoes, probabilidades = motor.prever(X)
+    referencia = xgboost.predict_proba(X)
+
+    np.testing.assert_array_equal(predicoes, xgboost.predict(X))
+    # A coluna negativa é 1 - p nos dois lados; a diferença é medida em p
+    np.testing.assert_array_max_ulp(probabilidades[:, 1], referencia[:, 1], maxulp=2)
+
+@pytest.mark.parametrize('ausentes', [False, True])
+def test_limite_padrao_escolhe_o_caminho_pelo_tamanho_do_lote(matriz, xgboost, ausentes):
+    X = com_ausentes(matriz[0]) if ausentes else matriz[0]
+    motor = construir_motor(xgboost)
+    assert len(X) > motor.limite_linhas + 1
+    margem = motor.margem
+    chamadas = []
+    motor.margem = lambda X: chamadas.append(len(X)) or margem(X)
+
+    for n in [1, motor.limite_linhas, motor.limite_linhas + 1, len(X)]:
+        predicoes, probabilidades = motor.prever(X[:n])
+        referencia = xgboost.predict_proba(X[:n])
+
+        np.testing.assert_array_equal(predicoes, xgboost.predict(X[:n]))
+        np.testing.assert_array_max_ulp(probabilidades[:, 1], referencia[:, 1], maxulp=2)
+
+    # Só os lotes até o limite passam pela descida em NumPy
+    assert chamadas == [1, motor.limite_linhas]
+
+@pytest.mark.parametrize('ausentes', [False, True])
+def test_margem_igual_a_do_booster(matriz, xgboost, ausentes):
+    X = com_ausentes(matriz[0]) if ausentes else matriz[0]
+    motor = construir_motor(xgboost)
+
+    margem = xgboost.get_booster().predict(xgb.DMatrix(X), output_margin=True)
+
+    np.testing.assert_array_equal(motor.margem(X), margem)
+
+def test_motor_linear_igual_a_regressao_logistica(matriz, logistica):
+    X = matriz[0]
+    motor = construir_motor(logistica)
+    assert isinstance(motor, MotorLinear)
+
+    predicoes, probabilidades = motor.prever(X)
+
+    np.testing.assert_array_equal(predicoes, logistica.predict(X))
+    np.testing.assert_array_equal(probabilidades, logistica.predict_proba(X))
@@ -0,0 +1,36 @@
+"""
+One-Hot Encoding esparso (`engenharia_features(..., esparsa=True)`): mesmas
+features e valores que o modo denso, e um XGBoost treinado em CSR pontua
+igual quando recebe a matriz densa com zeros como NaN (como a API faz).
+"""
+
+import numpy as np
+import pytest
+import xgboost as xgb
+from scipy import sparse
+from src.data.feature_engineering import engenharia_features
+from src.data.processar_dados import COLUNAS_NUMERICAS, COLUNAS_CATEGORICAS
+
+@pytest.fixture(scope='module')
+def esparsas(dados_processados):
+    X, y, preprocessamento = dados_processados
+    return engenharia_features(
+        X, y, COLUNAS_NUMERICAS, COLUNAS_CATEGORICAS, esparsa=True, preprocessamento=preprocessamento
+    )
+
+def test_esparso_igual_ao_denso(features, esparsas):
+    denso = features[0]
+    esparso, transformadores = esparsas
+
+    assert sparse.isspmatrix_csr(esparso)
+    assert transformadores['nomes_features'] == list(denso.columns)
+    np.testing.assert_array_equal(esparso.toarray(), denso.to_numpy(dtype=np.float32))
+
+def test_xgboost_esparso_igual_com_zeros_como_nan(features, esparsas):
+    esparso, _ = esparsas
+    modelo = xgb.XGBClassifier(n_estimators=50, n_jobs=1).fit(esparso, features[1])
+
+    matriz = esparso.toarray().astype(np.float64)
+    matriz[matriz == 0] = np.nan
+
+    np.testing.assert_array_equal(modelo.predict_proba(matriz), modelo.predict_proba(esparso))
@@ -0,0 +1,48 @@
+"""
+Paridade do pré-processamento em blocos (`PreprocessadorIncremental`) com
+os valores calculados sobre o DataFrame inteiro e com `preprocessar_dados`
+(códigos idênticos e features numéricas a até 1e-9).
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.impute import SimpleImputer
+from src.data.preprocessamento import preprocessar_dados
+from src.data.preprocessamento_incremental import PreprocessadorIncremental
+from src.data.processar_dados import COLUNAS_NUMERICAS, COLUNAS_CATEGORICAS, ESTRATEGIA_NULOS
+
+@pytest.fixture
+def dados():
+    # O valor mais frequente é o maior: a ordem de `value_counts` não é a dos valores
+    valores = [100.0, 1.0, 100.0, np.nan, 4.0, 0.0, 100.0, 3.0, 2.0, np.nan, 100.0, 7.0]
+    return pd.DataFrame({'valor': valores})
+
+@pytest.mark.parametrize('tamanho_bloco', [10_000, 5])
+@pytest.mark.parametrize('metodo', ['median', 'mean', 'most_frequent'])
+def test_imputacao_igual_ao_simple_imputer(dados, metodo, tamanho_bloco):
+    preprocessador = PreprocessadorIncremental(['valor'], [], {'valor': metodo}, tamanho_bloco=tamanho_bloco)
+    preprocessador.fit(dados)
+
+    esperado = SimpleImputer(strategy=metodo).fit(dados[['valor']]).statistics_[0]
+
+    assert preprocessador.valores_imputacao['valor'] == pytest.approx(esperado)
+
+def test_blocos_iguais_a_preprocessar_dados(dados_adult):
+    X = dados_adult[0]
+    referencia, transformadores = preprocessar_dados(X, COLUNAS_NUMERICAS, COLUNAS_CATEGORICAS, ESTRATEGIA_NULOS)
+
+    preprocessador = PreprocessadorIncremental(
+        COLUNAS_NUMERICAS, COLUNAS_CATEGORICAS, ESTRATEGIA_NULOS, tamanho_bloco=len(X) // 7
+    ).fit(X)
+    resultado = pd.concat(list(preprocessador.transformar_blocos(X)))
+
+    for coluna in COLUNAS_CATEGORICAS:
+        np.testing.assert_array_equal(resultado[coluna].to_numpy(), referencia[coluna].to_numpy())
+        np.testing.assert_array_equal(
+            preprocessador.transformadores()['encoders'][coluna].classes_,
+            transformadores['encoders'][coluna].classes_
+        )
+    np.testing.assert_allclose(
+        resultado[COLUNAS_NUMERICAS].to_numpy(), referencia[COLUNAS_NUMERICAS].to_numpy(), rtol=0, atol=1e-9
+    )
@@ -0,0 +1,31 @@
+"""
+Modo in-place de `preprocessar_dados`: mesmo DataFrame e mesmos
+transformadores que o modo padrão, alterando o próprio X.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from src.data.preprocessamento import preprocessar_dados
+from src.data.processar_dados import COLUNAS_NUMERICAS, COLUNAS_CATEGORICAS, ESTRATEGIA_NULOS
+from src.data.tipos import compactar_tipos
+
+@pytest.mark.parametrize('compactar', [False, True])
+def test_inplace_igual_ao_modo_padrao(dados_adult, compactar):
+    X = compactar_tipos(dados_adult[0]) if compactar else dados_adult[0]
+    original = X.copy()
+
+    referencia, transformadores = preprocessar_dados(X, COLUNAS_NUMERICAS, COLUNAS_CATEGORICAS, ESTRATEGIA_NULOS)
+    pd.testing.assert_frame_equal(X, original)
+
+    alterado = X.copy()
+    resultado, transformadores_inplace = preprocessar_dados(
+        alterado, COLUNAS_NUMERICAS, COLUNAS_CATEGORICAS, ESTRATEGIA_NULOS, inplace=True
+    )
+
+    assert resultado is alterado
+    pd.testing.assert_frame_equal(resultado, referencia, check_exact=True)
+    np.testing.assert_array_equal(transformadores_inplace['scaler'].mean_, transformadores['scaler'].mean_)
+    np.testing.assert_array_equal(transformadores_inplace['scaler'].scale_, transformadores['scaler'].scale_)
+    for coluna, encoder in transformadores['encoders'].items():
+        np.testing.assert_array_equal(transformadores_inplace['encoders'][coluna].classes_, encoder.classes_)
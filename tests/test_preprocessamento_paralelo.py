@@ -0,0 +1,78 @@
+"""
+Paridade entre as etapas executadas coluna a coluna em paralelo
+(`ExecutorColunas`) e o modo sequencial de `src.data.preprocessamento`.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from src.data.preprocessamento import (
+    codificar_categoricas, preprocessar_dados, remover_valores_nulos, tratar_outliers
+)
+from src.data.preprocessamento_paralelo import ExecutorColunas
+from src.data.processar_dados import COLUNAS_NUMERICAS, COLUNAS_CATEGORICAS, ESTRATEGIA_NULOS
+
+@pytest.fixture(scope='module')
+def executor():
+    with ExecutorColunas(n_workers=2) as executor:
+        yield executor
+
+@pytest.fixture
+def dados():
+    rng = np.random.default_rng(5)
+    n = 2000
+    numerica = rng.normal(40, 12, n)
+    numerica[rng.random(n) < 0.1] = np.nan
+    # Texto ausente como NaN, como nos dados do Adult
+    texto = rng.choice(np.array(['Private', 'Self-emp', 'Gov', np.nan], dtype=object), n, p=[0.6, 0.2, 0.15, 0.05])
+    return pd.DataFrame({
+        'age': numerica,
+        'hours-per-week': rng.integers(1, 99, n).astype(np.int64),
+        'workclass': texto,
+        'race': pd.Categorical(rng.choice(['White', 'Black', None], n, p=[0.7, 0.25, 0.05])),
+        'vazia': np.full(n, np.nan)
+    })
+
+ESTRATEGIA = {'age': 'median', 'workclass': 'most_frequent', 'race': 'most_frequent'}
+
+def test_imputacao_igual_a_sequencial(dados, executor):
+    esperado = remover_valores_nulos(dados, ESTRATEGIA)
+    paralelo = remover_valores_nulos(dados, ESTRATEGIA, executor=executor)
+
+    pd.testing.assert_frame_equal(paralelo, esperado)
+
+def test_coluna_sem_valores_fica_sem_imputacao(dados, executor):
+    estrategia = {**ESTRATEGIA, 'vazia': 'mean'}
+
+    esperado = remover_valores_nulos(dados, estrategia)
+    paralelo = remover_valores_nulos(dados, estrategia, executor=executor)
+
+    pd.testing.assert_frame_equal(paralelo, esperado)
+    assert paralelo['vazia'].isna().all()
+    assert paralelo['age'].notna().all()
+
+def test_outliers_e_codificacao_iguais_a_sequencial(dados, executor):
+    X = remover_valores_nulos(dados, ESTRATEGIA)
+    colunas_numericas = ['age', 'hours-per-week']
+
+    esperado = tratar_outliers(X, colunas_numericas)
+    paralelo = tratar_outliers(X, colunas_numericas, executor=executor)
+    pd.testing.assert_frame_equal(paralelo, esperado)
+
+    esperado, encoders = codificar_categoricas(esperado, ['workclass', 'race'])
+    paralelo, encoders_paralelo = codificar_categoricas(paralelo, ['workclass', 'race'], executor=executor)
+    pd.testing.assert_frame_equal(paralelo, esperado)
+    for coluna, encoder in encoders.items():
+        np.testing.assert_array_equal(encoders_paralelo[coluna].classes_, encoder.classes_)
+
+def test_pipeline_paralelo_igual_ao_sequencial(dados_adult):
+    X = dados_adult[0]
+
+    referencia, transformadores = preprocessar_dados(X, COLUNAS_NUMERICAS, COLUNAS_CATEGORICAS, ESTRATEGIA_NULOS)
+    resultado, transformadores_paralelo = preprocessar_dados(
+        X, COLUNAS_NUMERICAS, COLUNAS_CATEGORICAS, ESTRATEGIA_NULOS, n_workers=2
+    )
+
+    pd.testing.assert_frame_equal(resultado, referencia, check_exact=True)
+    for coluna, encoder in transformadores['encoders'].items():
+        np.testing.assert_array_equal(transformadores_paralelo['encoders'][coluna].classes_, encoder.classes_)
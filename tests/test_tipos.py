@@ -0,0 +1,47 @@
+"""
+Política de tipos compactos (`src.data.tipos`): o pipeline produz as mesmas
+classes e códigos e as mesmas features a menos da precisão float32.
+"""
+
+import numpy as np
+import pandas as pd
+from src.data.feature_engineering import engenharia_features
+from src.data.preprocessamento import preprocessar_dados
+from src.data.processar_dados import COLUNAS_NUMERICAS, COLUNAS_CATEGORICAS, ESTRATEGIA_NULOS
+from src.data.tipos import compactar_tipos, memoria_colunas
+
+def test_compactar_tipos_reduz_a_memoria(dados_adult):
+    X = dados_adult[0]
+
+    compacto = compactar_tipos(X)
+
+    for coluna in COLUNAS_CATEGORICAS:
+        assert isinstance(compacto[coluna].dtype, pd.CategoricalDtype)
+        pd.testing.assert_series_equal(compacto[coluna].astype(object), X[coluna], check_dtype=False)
+    assert compacto['age'].dtype == np.int8
+    np.testing.assert_array_equal(compacto['age'].to_numpy(), X['age'].to_numpy())
+    assert sum(memoria_colunas(compacto).values()) < sum(memoria_colunas(X).values()) / 4
+
+def test_pipeline_compacto_igual_ao_padrao(dados_adult, dados_processados, features):
+    X, y = dados_adult
+    compacto, transformadores_compactos = dados_processados[0], dados_processados[2]
+    padrao, transformadores = preprocessar_dados(X, COLUNAS_NUMERICAS, COLUNAS_CATEGORICAS, ESTRATEGIA_NULOS)
+
+    for coluna in COLUNAS_CATEGORICAS:
+        np.testing.assert_array_equal(compacto[coluna].to_numpy(), padrao[coluna].to_numpy())
+        np.testing.assert_array_equal(
+            transformadores_compactos['encoders'][coluna].classes_, transformadores['encoders'][coluna].classes_
+        )
+    np.testing.assert_allclose(
+        compacto[COLUNAS_NUMERICAS].to_numpy(), padrao[COLUNAS_NUMERICAS].to_numpy(), rtol=1e-5, atol=1e-5
+    )
+
+    features_padrao, _ = engenharia_features(
+        padrao, y, COLUNAS_NUMERICAS, COLUNAS_CATEGORICAS, preprocessamento=transformadores
+    )
+    features_compactas = features[0]
+    assert list(features_compactas.columns) == list(features_padrao.columns)
+    np.testing.assert_allclose(
+        features_compactas.to_numpy(dtype=np.float64), features_padrao.to_numpy(dtype=np.float64),
+        rtol=1e-5, atol=1e-5
+    )
@@ -0,0 +1,40 @@
+"""
+Paridade entre o transformador compilado da API (`TransformadorCompilado`)
+e a implementação de referência em pandas (`transformar_features`).
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from src.api.transformador import construir_transformador
+from src.data.feature_engineering import engenharia_features
+from src.data.processar_dados import COLUNAS_NUMERICAS, COLUNAS_CATEGORICAS
+
+@pytest.fixture(scope='module')
+def transformadores_plano(dados_processados, features):
+    X, y, preprocessamento = dados_processados
+    _, transformadores = engenharia_features(
+        X, y, COLUNAS_NUMERICAS, COLUNAS_CATEGORICAS,
+        plano=features[2]['plano_features'], preprocessamento=preprocessamento
+    )
+    return transformadores
+
+@pytest.mark.parametrize('n', [1, 5000])
+def test_compilado_igual_a_referencia(api, features, entradas, n):
+    transformadores = features[2]
+    colunas = entradas(n, seed=n)
+
+    compilado = construir_transformador(transformadores).transformar(colunas)
+    referencia = api.transformar_features(pd.DataFrame(colunas), transformadores)
+
+    assert compilado.shape == (n, 20)
+    np.testing.assert_array_equal(compilado, np.asarray(referencia, dtype=np.float64))
+
+@pytest.mark.parametrize('n', [1, 5000])
+def test_compilado_igual_a_referencia_com_plano(api, transformadores_plano, entradas, n):
+    colunas = entradas(n, seed=n + 1)
+
+    compilado = construir_transformador(transformadores_plano).transformar(colunas)
+    referencia = api.transformar_features(pd.DataFrame(colunas), transformadores_plano)
+
+    np.testing.assert_array_equal(compilado, np.asarray(referencia, dtype=np.float64))
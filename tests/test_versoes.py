@@ -0,0 +1,65 @@
+"""
+Registro de modelos na API: roteamento por versão e validação da divisão
+de tráfego de `API_ROTEAMENTO_PESOS`.
+"""
+
+import asyncio
+import pytest
+from fastapi import HTTPException
+from sklearn.linear_model import LogisticRegression
+from starlette.requests import Request
+from src.models.registro import registrar_modelo
+
+@pytest.fixture
+def registro(api, features, tmp_path, monkeypatch):
+    """Registro temporário com uma versão, usado pela API durante o teste."""
+    X_features, alvo, _ = features
+    diretorio = str(tmp_path / 'registro')
+    versao = registrar_modelo(
+        LogisticRegression(C=0.01, max_iter=1000).fit(X_features, alvo), 'Logistic C=0.01',
+        api.CAMINHO_TRANSFORMADORES, diretorio=diretorio
+    )
+    monkeypatch.setattr(api, 'REGISTRO_DIRETORIO', diretorio)
+    monkeypatch.setattr(api.versoes_residentes, 'diretorio_registro', diretorio)
+    return versao
+
+def requisicao(cabecalhos=None):
+    return Request({
+        'type': 'http',
+        'method': 'POST',
+        'path': '/predict',
+        'query_string': b'',
+        'headers': [(nome.lower().encode(), valor.encode()) for nome, valor in (cabecalhos or {}).items()]
+    })
+
+def test_cabecalho_escolhe_a_versao_do_registro(api, registro, registros):
+    artefatos = asyncio.run(api.resolver_artefatos(requisicao({'X-Model-Version': registro}), 'predict'))
+    padrao = api.prever_registros([api.InputData.model_validate(registros[0])])[0]
+    resultado = api.prever_registros([api.InputData.model_validate(registros[0])], artefatos)[0]
+
+    assert artefatos.versao == registro
+    assert resultado['model_version'] == registro
+    assert resultado['probability_>50K'] != padrao['probability_>50K']
+
+def test_versao_explicita_desconhecida_responde_404(api, registro):
+    with pytest.raises(HTTPException) as erro:
+        asyncio.run(api.resolver_artefatos(requisicao({'X-Model-Version': 'inexistente'}), 'predict'))
+
+    assert erro.value.status_code == 404
+
+def test_validar_roteamento_aceita_versoes_conhecidas(api, registro):
+    api.validar_roteamento([
+        ('padrao', 0.5), (registro, 0.3), (api.gerenciador_modelo.atual.versao, 0.2)
+    ])
+
+def test_validar_roteamento_recusa_versao_desconhecida(api, registro):
+    with pytest.raises(ValueError, match='inexistente'):
+        api.validar_roteamento([('padrao', 0.9), ('inexistente', 0.1)])
+
+def test_versao_removida_sai_da_divisao(api, registro, monkeypatch):
+    monkeypatch.setattr(api, 'ROTEAMENTO_PESOS', [('removida', 1.0)])
+
+    artefatos = asyncio.run(api.resolver_artefatos(requisicao(), 'predict'))
+
+    assert artefatos is None
+    assert api.ROTEAMENTO_PESOS == []
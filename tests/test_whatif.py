@@ -0,0 +1,69 @@
+"""
+Sensibilidade "e se?" (`/predict/whatif`): cada linha da grade contrafactual
+pontuada igual ao registro alterado enviado sozinho.
+"""
+
+import asyncio
+import httpx
+import pytest
+
+def enviar(app, corpo):
+    async def requisicao():
+        transporte = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transporte, base_url='http://teste') as cliente:
+            return await cliente.post('/predict/whatif', json=corpo)
+
+    return asyncio.run(requisicao())
+
+def prever(api, registro, **alteracoes):
+    dados = api.InputData.model_validate({**registro, **alteracoes})
+    return api.prever_registros([dados], api.gerenciador_modelo.atual)[0]
+
+@pytest.mark.parametrize('combinar', [False, True])
+def test_variacoes_iguais_a_registros_alterados(api, registros, combinar):
+    registro = registros[300]
+    variacoes = {'education': [9, 12, 13], 'hours_per_week': [20, 50], 'marital-status': [1]}
+
+    resposta = enviar(api.app, {'record': registro, 'variations': variacoes, 'combine': combinar})
+    corpo = resposta.json()
+
+    assert resposta.status_code == 200
+    assert len(corpo['variations']) == (3 * 2 * 1 if combinar else 3 + 2 + 1)
+    base = prever(api, registro)
+    assert corpo['baseline']['probability_>50K'] == pytest.approx(base['probability_>50K'], rel=1e-12)
+    for variacao in corpo['variations']:
+        esperado = prever(api, registro, **variacao['changes'])
+        assert variacao['prediction'] == esperado['prediction']
+        assert variacao['probability_>50K'] == pytest.approx(esperado['probability_>50K'], rel=1e-12)
+        assert variacao['delta'] == pytest.approx(
+            variacao['probability_>50K'] - corpo['baseline']['probability_>50K'], abs=1e-15
+        )
+    if combinar:
+        assert {tuple(sorted(v['changes'].items())) for v in corpo['variations']} == {
+            (('education', e), ('hours_per_week', h), ('marital-status', 1))
+            for e in [9, 12, 13] for h in [20, 50]
+        }
+
+def test_variacoes_padrao_usam_as_categorias_do_treino(api, registros):
+    artefatos = api.gerenciador_modelo.atual
+    padrao = api.variacoes_padrao(artefatos)
+
+    corpo = enviar(api.app, {'record': registros[301]}).json()
+
+    assert len(corpo['variations']) == sum(len(valores) for valores in padrao.values())
+    assert padrao['hours_per_week'] == api.WHATIF_HORAS_PADRAO
+
+def test_campo_desconhecido_responde_422(api, registros):
+    resposta = enviar(api.app, {'record': registros[0], 'variations': {'salario': [1]}})
+
+    assert resposta.status_code == 422
+    assert 'salario' in resposta.json()['detail']
+
+def test_grade_acima_do_limite_responde_413(api, registros, monkeypatch):
+    monkeypatch.setattr(api, 'MAX_REGISTROS_WHATIF', 5)
+    variacoes = {'education': [9, 12, 13], 'hours_per_week': [20, 50]}
+
+    assert enviar(api.app, {'record': registros[0], 'variations': variacoes}).status_code == 200
+    # Combinadas, as mesmas variações formam uma grade de 3 x 2 linhas
+    resposta = enviar(api.app, {'record': registros[0], 'variations': variacoes, 'combine': True})
+    assert resposta.status_code == 413